@@ -8,17 +8,19 @@ from datetime import datetime
 from typing import AsyncGenerator, Optional
 
 from fastapi import BackgroundTasks, Depends, HTTPException, Header, Request, status
-from jose import JWTError, jwt  # Keeping for backward compatibility
+from jose import JWTError
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
 from app.core.logging import get_logger
-from app.db.session import get_db
+from app.core.security import decode_token
+from app.db.session import get_db, get_read_db
 from app.db.unit_of_work import UnitOfWork
+from app.events import UserUpdatedEvent
 from app.middleware.multi_tenancy import get_current_organization_id, current_organization_id
 from app.models import User
 from app.repositories.user import UserRepository
 from app.services.clerk_service import clerk_service
+from app.services.user_cache import load_user, load_user_by_clerk_id
 
 logger = get_logger(__name__)
 
@@ -37,6 +39,19 @@ async def get_unit_of_work(
         yield uow
 
 
+async def get_read_unit_of_work(
+    db: AsyncSession = Depends(get_read_db)
+) -> AsyncGenerator[UnitOfWork, None]:
+    """
+    Get a read-only Unit of Work served by a read replica when available.
+    
+    Yields:
+        UnitOfWork instance
+    """
+    async with UnitOfWork(db, read_only=True) as uow:
+        yield uow
+
+
 # Individual repository dependencies
 async def get_user_repository(
     db: AsyncSession = Depends(get_db)
@@ -103,6 +118,7 @@ async def get_wallet_repository(
 
 # Authentication dependencies
 async def get_current_user_optional(
+    request: Request,
     authorization: Optional[str] = Header(None),
     db: AsyncSession = Depends(get_db),
     user_repository: UserRepository = Depends(get_user_repository)
@@ -111,6 +127,7 @@ async def get_current_user_optional(
     Get current user from Clerk session token (optional).
     
     Args:
+        request: Incoming request
         authorization: Authorization header value
         db: Database session
         user_repository: User repository instance
@@ -121,6 +138,11 @@ async def get_current_user_optional(
     if not authorization:
         return None
     
+    # Reuse the user already loaded by JWTAuthMiddleware for this request
+    user = getattr(request.state, "user", None)
+    if user is not None:
+        return user
+    
     try:
         # Extract token from "Bearer {token}"
         scheme, token = authorization.split()
@@ -131,17 +153,13 @@ async def get_current_user_optional(
         if token.count(".") == 2:
             try:
                 # Decode JWT token (legacy method)
-                payload = jwt.decode(
-                    token,
-                    settings.SECRET_KEY,
-                    algorithms=[settings.ALGORITHM]
-                )
+                payload = decode_token(token)
                 
                 user_id: str = payload.get("sub")
                 if user_id is None:
                     return None
                 
-                user = await user_repository.get(db, id=user_id)
+                user = await load_user(db, user_id)
                 
                 if user is None:
                     return None
@@ -152,16 +170,22 @@ async def get_current_user_optional(
                 # Fall through to try Clerk if JWT fails
                 pass
         
-        # Use Clerk to verify the token
-        clerk_user_data = await clerk_service.get_user_by_token(token)
-        clerk_id = clerk_user_data.get("id")
+        # Verify the Clerk session token locally against Clerk's signing keys
+        claims = await clerk_service.verify_token(token)
+        clerk_id = claims.get("sub")
         
         if not clerk_id:
             logger.warning("Invalid Clerk token - no user ID")
             return None
             
-        # Try to find user by clerk_id first
-        user = await user_repository.get_by_clerk_id(db, clerk_id=clerk_id)
+        # Known users are only reconciled with their Clerk profile once per
+        # sync interval
+        user = await load_user_by_clerk_id(db, clerk_id)
+        if user and not await clerk_service.claim_profile_sync(clerk_id):
+            logger.debug("Authenticated via Clerk", user_id=str(user.id))
+            return user
+        
+        clerk_user_data = await clerk_service.get_user_profile(clerk_id)
         
         # If not found, try email
         if not user and clerk_user_data.get("email_addresses"):
@@ -172,6 +196,9 @@ async def get_current_user_optional(
         # If we found a user but clerk_id doesn't match, update it
         if user and user.clerk_id != clerk_id:
             user = await user_repository.update(db, db_obj=user, obj_in={"clerk_id": clerk_id})
+            async with UnitOfWork(db) as uow:
+                uow.add_event(UserUpdatedEvent(user_id=str(user.id), updated_fields=["clerk_id"]))
+                await uow.commit()
             
         # If still no user, create one
         if not user:
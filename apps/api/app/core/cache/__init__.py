@@ -0,0 +1,34 @@
+"""
+Application cache: in-process LRU+TTL tier, optional Redis tier, a
+``@cached`` decorator for repository reads, tag invalidation driven by
+domain events and single-flight coalescing of concurrent loads.
+"""
+
+from .backends import CacheBackend, MemoryCacheBackend, RedisCacheBackend
+from .decorators import cached, coalesced
+from .invalidation import entity_tag, event_tags, organization_tag
+from .singleflight import SingleFlight, single_flight
+from .tiered import TieredCache, build_cache, close_cache, get_cache, set_cache
+
+__all__ = [
+    # Backends
+    "CacheBackend",
+    "MemoryCacheBackend",
+    "RedisCacheBackend",
+    # Cache
+    "TieredCache",
+    "build_cache",
+    "close_cache",
+    "get_cache",
+    "set_cache",
+    # Decorators
+    "cached",
+    "coalesced",
+    # Coalescing
+    "SingleFlight",
+    "single_flight",
+    # Tags
+    "entity_tag",
+    "event_tags",
+    "organization_tag",
+]
@@ -0,0 +1,245 @@
+"""
+Cache storage backends.
+
+Backends store opaque bytes under string keys with a TTL, and index keys by
+tags so that every entry derived from an entity can be dropped at once.
+"""
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Dict, Iterable, Optional, Set, Tuple
+
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+
+class CacheBackend(ABC):
+    """Abstract base class for cache backends."""
+    
+    @abstractmethod
+    async def get(self, key: str) -> Optional[bytes]:
+        """Get a cached value.
+        
+        Args:
+            key: Cache key
+        
+        Returns:
+            Cached bytes, or None on a miss
+        """
+        pass
+    
+    @abstractmethod
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl: float,
+        tags: Iterable[str] = ()
+    ) -> None:
+        """Store a value.
+        
+        Args:
+            key: Cache key
+            value: Bytes to store
+            ttl: Seconds the value stays valid
+            tags: Tags the key is invalidated by
+        """
+        pass
+    
+    @abstractmethod
+    async def delete(self, key: str) -> None:
+        """Drop a key.
+        
+        Args:
+            key: Cache key
+        """
+        pass
+    
+    @abstractmethod
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Drop every key stored with any of the tags.
+        
+        Args:
+            tags: Tags to invalidate
+        
+        Returns:
+            Number of keys dropped
+        """
+        pass
+    
+    @abstractmethod
+    async def clear(self) -> None:
+        """Drop every key."""
+        pass
+    
+    async def close(self) -> None:
+        """Release backend resources."""
+        pass
+
+
+class MemoryCacheBackend(CacheBackend):
+    """In-process LRU cache with per-key TTL.
+    
+    Also serves as a local stand-in for the Redis tier in tests and
+    single-process deployments.
+    """
+    
+    def __init__(self, max_entries: int = 10000):
+        """Initialize the backend.
+        
+        Args:
+            max_entries: Keys kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        # key -> (value, expires at (monotonic), tags)
+        self._entries: "OrderedDict[str, Tuple[bytes, float, Tuple[str, ...]]]" = OrderedDict()
+        self._tags: Dict[str, Set[str]] = {}
+    
+    def __len__(self) -> int:
+        return len(self._entries)
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        value, expires_at, _ = entry
+        if time.monotonic() >= expires_at:
+            self._remove(key)
+            return None
+        self._entries.move_to_end(key)
+        return value
+    
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl: float,
+        tags: Iterable[str] = ()
+    ) -> None:
+        self._remove(key)
+        tags = tuple(tags)
+        self._entries[key] = (value, time.monotonic() + ttl, tags)
+        for tag in tags:
+            self._tags.setdefault(tag, set()).add(key)
+        
+        while len(self._entries) > self.max_entries:
+            self._remove(next(iter(self._entries)))
+    
+    async def delete(self, key: str) -> None:
+        self._remove(key)
+    
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        dropped = 0
+        for tag in tags:
+            for key in self._tags.pop(tag, ()):
+                if key in self._entries:
+                    self._remove(key)
+                    dropped += 1
+        return dropped
+    
+    async def clear(self) -> None:
+        self._entries.clear()
+        self._tags.clear()
+    
+    def _remove(self, key: str) -> None:
+        """Drop a key and its tag index entries."""
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return
+        for tag in entry[2]:
+            keys = self._tags.get(tag)
+            if keys is not None:
+                keys.discard(key)
+                if not keys:
+                    del self._tags[tag]
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis-backed cache shared by all workers.
+    
+    Tags are Redis sets of the keys stored with them. Redis errors are
+    logged and treated as misses so an unavailable Redis degrades to the
+    database instead of failing requests.
+    """
+    
+    def __init__(self, url: str, prefix: str = "wedi:cache:"):
+        """Initialize the backend.
+        
+        Args:
+            url: Redis connection URL
+            prefix: Prefix of every key written by the cache
+        """
+        self.url = url
+        self.prefix = prefix
+        self._client = None
+    
+    def _get_client(self):
+        """Get or lazily create the Redis client."""
+        if self._client is None:
+            from redis import asyncio as redis
+            
+            self._client = redis.from_url(self.url)
+        return self._client
+    
+    def _tag_key(self, tag: str) -> str:
+        return f"{self.prefix}tag:{tag}"
+    
+    async def get(self, key: str) -> Optional[bytes]:
+        try:
+            return await self._get_client().get(self.prefix + key)
+        except Exception as e:
+            logger.warning("redis_cache_get_failed", key=key, error=str(e))
+            return None
+    
+    async def set(
+        self,
+        key: str,
+        value: bytes,
+        ttl: float,
+        tags: Iterable[str] = ()
+    ) -> None:
+        ttl = max(int(ttl), 1)
+        try:
+            pipe = self._get_client().pipeline(transaction=False)
+            pipe.set(self.prefix + key, value, ex=ttl)
+            for tag in tags:
+                pipe.sadd(self._tag_key(tag), self.prefix + key)
+                pipe.expire(self._tag_key(tag), ttl)
+            await pipe.execute()
+        except Exception as e:
+            logger.warning("redis_cache_set_failed", key=key, error=str(e))
+    
+    async def delete(self, key: str) -> None:
+        try:
+            await self._get_client().delete(self.prefix + key)
+        except Exception as e:
+            logger.warning("redis_cache_delete_failed", key=key, error=str(e))
+    
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        tag_keys = [self._tag_key(tag) for tag in tags]
+        if not tag_keys:
+            return 0
+        try:
+            client = self._get_client()
+            keys: Set[bytes] = set()
+            for tag_key in tag_keys:
+                keys.update(await client.smembers(tag_key))
+            await client.delete(*tag_keys, *keys)
+            return len(keys)
+        except Exception as e:
+            logger.warning("redis_cache_invalidate_failed", tags=tag_keys, error=str(e))
+            return 0
+    
+    async def clear(self) -> None:
+        try:
+            client = self._get_client()
+            async for key in client.scan_iter(match=f"{self.prefix}*"):
+                await client.delete(key)
+        except Exception as e:
+            logger.warning("redis_cache_clear_failed", error=str(e))
+    
+    async def close(self) -> None:
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
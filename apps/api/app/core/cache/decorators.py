@@ -0,0 +1,217 @@
+"""
+Read-through caching and single-flight coalescing of repository read
+methods.
+"""
+import hashlib
+import inspect
+import pickle
+from contextlib import asynccontextmanager
+from functools import wraps
+from typing import Any, AsyncGenerator, Callable, Dict, Iterable, Optional, Sequence, Union
+
+from sqlalchemy import inspect as sa_inspect
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache.singleflight import single_flight
+from app.core.cache.tiered import get_cache
+from app.db.session import db_manager, has_pending_writes, release_connection
+
+# A tag is a template formatted with the call's arguments, e.g.
+# "payment_link:{payment_link_id}", or a callable deriving tags from the
+# result and the arguments
+TagSpec = Union[str, Callable[[Any, Dict[str, Any]], Iterable[str]]]
+
+# Arguments that never take part in the cache key
+_IGNORED_ARGUMENTS = {"self", "db"}
+
+
+def _is_mapped_instance(value: Any) -> bool:
+    """Whether a value is an ORM entity."""
+    state = sa_inspect(value, raiseerr=False)
+    return state is not None and hasattr(state, "mapper")
+
+
+def _contains_entities(value: Any) -> bool:
+    """Whether a value is an ORM entity or a list holding one."""
+    if isinstance(value, list):
+        return any(_is_mapped_instance(item) for item in value)
+    return _is_mapped_instance(value)
+
+
+async def _attach(db: Any, value: Any) -> Any:
+    """Merge cached ORM entities into the caller's session.
+    
+    ``merge(load=False)`` copies the cached state without querying, so the
+    returned entities behave like freshly loaded ones.
+    """
+    if db is None:
+        return value
+    if isinstance(value, list):
+        return [await _attach(db, item) for item in value]
+    if _is_mapped_instance(value):
+        return await db.merge(value, load=False)
+    return value
+
+
+@asynccontextmanager
+async def _load_session(db: AsyncSession) -> AsyncGenerator[AsyncSession, None]:
+    """Open a short-lived read-only session on the same engine as ``db``.
+    
+    A coalesced load serves several callers, so it must not depend on the
+    lifetime or the concurrent use of the session of whichever caller
+    happened to start it.
+    """
+    session = db_manager.async_session_factory(bind=db.bind)
+    session.info["read_only"] = True
+    try:
+        yield session
+    finally:
+        await session.rollback()
+        await session.close()
+
+
+def _build_key(namespace: str, arguments: Dict[str, Any]) -> str:
+    """Build a stable cache key from the call's arguments."""
+    parts = sorted(
+        (name, repr(value)) for name, value in arguments.items()
+        if name not in _IGNORED_ARGUMENTS
+    )
+    digest = hashlib.sha1(repr(parts).encode()).hexdigest()
+    return f"{namespace}:{digest}"
+
+
+def _build_tags(tags: Sequence[TagSpec], result: Any, arguments: Dict[str, Any]) -> list:
+    """Resolve tag specs for a call."""
+    resolved = []
+    for tag in tags:
+        if callable(tag):
+            resolved.extend(tag(result, arguments))
+        else:
+            resolved.append(tag.format(**arguments))
+    return resolved
+
+
+def cached(
+    namespace: str,
+    *,
+    tags: Sequence[TagSpec] = (),
+    ttl: Optional[float] = None,
+    cache_none: bool = False
+) -> Callable:
+    """Cache the results of an async repository read method.
+    
+    Results are keyed by the method's arguments (except ``self`` and
+    ``db``) and dropped when one of their tags is invalidated, normally by
+    the domain event of an entity they were built from. ORM entities served
+    from the cache are merged into the caller's session.
+    
+    Args:
+        namespace: Cache key prefix and metrics name
+        tags: Tag templates or callables (see ``TagSpec``)
+        ttl: Seconds entries stay in the shared tier (default from settings)
+        cache_none: Whether to cache None results
+    
+    Usage:
+        @cached(
+            "payment_link.statistics",
+            tags=["payment_link:{payment_link_id}"]
+        )
+        async def get_link_statistics(self, db, *, payment_link_id):
+            ...
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            cache = get_cache()
+            if cache is None:
+                return await func(*args, **kwargs)
+            
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            key = _build_key(namespace, arguments)
+            db = arguments.get("db")
+            
+            found, value = await cache.get(key, namespace)
+            if found:
+                return await _attach(db, value)
+            
+            result = await func(*args, **kwargs)
+            if result is not None or cache_none:
+                await cache.set(
+                    key,
+                    result,
+                    tags=_build_tags(tags, result, arguments),
+                    ttl=ttl,
+                    namespace=namespace
+                )
+            return result
+        
+        return wrapper
+    
+    return decorator
+
+
+def coalesced(namespace: str) -> Callable:
+    """Coalesce concurrent identical calls of an async read method.
+    
+    Calls with the same arguments (except ``self`` and ``db``) that arrive
+    while one is running wait for its result instead of running again.
+    The load runs on its own short-lived read-only session, bound to the
+    same engine as the caller's, so it never sees a caller's uncommitted
+    changes. Each caller's read transaction is ended first, so a request
+    never holds two pooled connections at once; callers with pending
+    writes read through their own session without coalescing instead.
+    Every caller receives ORM entities as copies merged into its own
+    session; other results are shared and must be treated as read-only.
+    Stack it under ``@cached`` to protect cache misses.
+    
+    Args:
+        namespace: Coalescing key prefix and metrics name
+    
+    Usage:
+        @cached("organization.stats", tags=[...])
+        @coalesced("organization.stats")
+        async def get_stats(self, db, *, organization_id):
+            ...
+    """
+    def decorator(func: Callable) -> Callable:
+        signature = inspect.signature(func)
+        
+        @wraps(func)
+        async def wrapper(*args, **kwargs):
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            arguments = dict(bound.arguments)
+            db = arguments.get("db")
+            if db is not None:
+                if has_pending_writes(db):
+                    # The connection can't be released and a load elsewhere
+                    # wouldn't see the writes
+                    return await func(*args, **kwargs)
+                await release_connection(db)
+            
+            async def load():
+                if db is None:
+                    return await func(*args, **kwargs), None
+                async with _load_session(db) as session:
+                    bound.arguments["db"] = session
+                    result = await func(*bound.args, **bound.kwargs)
+                    # Entities of the load session are handed out as copies
+                    snapshot = pickle.dumps(result) if _contains_entities(result) else None
+                return result, snapshot
+            
+            (result, snapshot), _ = await single_flight.do(
+                _build_key(namespace, arguments),
+                load,
+                namespace
+            )
+            if snapshot is not None:
+                return await _attach(db, pickle.loads(snapshot))
+            return result
+        
+        return wrapper
+    
+    return decorator
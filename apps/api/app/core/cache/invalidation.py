@@ -0,0 +1,69 @@
+"""
+Tag conventions and domain-event-driven invalidation.
+
+Cached reads are tagged with the entities they were built from:
+
+- ``entity_tag("payment_link", id)`` for data of one entity
+- ``organization_tag("payment_link", organization_id)`` for data of all of
+  an organization's entities of a type (lists, counts, stats)
+
+Every published domain event invalidates the entity tag of its aggregate,
+the organization tag of its aggregate type when the event carries an
+``organization_id``, and the entity tags of other entities it references
+through ``<type>_id`` fields (e.g. a payment order's ``payment_link_id``).
+"""
+from typing import List
+
+from app.core.cache.tiered import get_cache
+from app.core.logging import get_logger
+from app.events.local import subscribe
+from app.events.publisher import DomainEvent
+
+logger = get_logger(__name__)
+
+
+def entity_tag(entity_type: str, entity_id: str) -> str:
+    """Tag of data derived from a single entity."""
+    return f"{entity_type}:{entity_id}"
+
+
+def organization_tag(entity_type: str, organization_id: str) -> str:
+    """Tag of data derived from all of an organization's entities of a type."""
+    return f"{entity_type}:organization:{organization_id}"
+
+
+def event_tags(event: DomainEvent) -> List[str]:
+    """Get the cache tags a domain event invalidates.
+    
+    Args:
+        event: Published domain event
+    
+    Returns:
+        Tags to invalidate
+    """
+    tags = [entity_tag(event.aggregate_type, event.aggregate_id)]
+    for field, value in event.data.items():
+        if not value or not isinstance(value, str):
+            continue
+        if field == "organization_id":
+            tags.append(organization_tag(event.aggregate_type, value))
+            tags.append(entity_tag("organization", value))
+        elif field.endswith("_id"):
+            tags.append(entity_tag(field[:-3], value))
+    return tags
+
+
+@subscribe("*")
+async def invalidate_for_event(event: DomainEvent) -> None:
+    """Drop cached reads affected by a published domain event."""
+    cache = get_cache()
+    if cache is None:
+        return
+    tags = event_tags(event)
+    dropped = await cache.invalidate_tags(tags)
+    logger.debug(
+        "cache_invalidated",
+        event_type=event.event_type,
+        tags=tags,
+        dropped=dropped
+    )
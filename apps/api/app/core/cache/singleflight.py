@@ -0,0 +1,68 @@
+"""
+Single-flight coalescing of concurrent identical loads.
+
+While a load for a key is in flight, further callers for the same key wait
+for it instead of starting their own, so a burst of requests for a cold
+key (e.g. right after a cache entry expired) costs one query or API call.
+"""
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+from app.core.monitoring import get_coalescing_metrics
+
+
+class SingleFlight:
+    """Collapse concurrent loads of the same key into one."""
+    
+    def __init__(self):
+        """Initialize the group."""
+        self._flights: Dict[str, asyncio.Task] = {}
+    
+    def __len__(self) -> int:
+        return len(self._flights)
+    
+    async def do(
+        self,
+        key: str,
+        load: Callable[[], Awaitable[Any]],
+        namespace: str = "default"
+    ) -> Tuple[Any, bool]:
+        """Run a load, or join the one already in flight for the key.
+        
+        The load runs in its own task, so a caller that is cancelled while
+        waiting doesn't cancel it for the others. Every caller gets the same
+        value, or the same exception.
+        
+        Args:
+            key: Key identifying the load
+            load: Coroutine function performing the load
+            namespace: Metrics namespace of the call
+        
+        Returns:
+            The loaded value, and whether it was shared with a load started
+            by another caller
+        """
+        metrics = get_coalescing_metrics(namespace)
+        task = self._flights.get(key)
+        shared = task is not None
+        if shared:
+            metrics.record_call(deduplicated=True)
+        else:
+            metrics.record_call(deduplicated=False)
+            task = asyncio.ensure_future(load())
+            self._flights[key] = task
+            task.add_done_callback(lambda _: self._forget(key, task))
+        
+        return await asyncio.shield(task), shared
+    
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        """Drop a finished flight so the next call loads again."""
+        if self._flights.get(key) is task:
+            del self._flights[key]
+        if not task.cancelled():
+            # Mark the exception retrieved when no caller was left to await it
+            task.exception()
+
+
+# Application single-flight group
+single_flight = SingleFlight()
@@ -0,0 +1,188 @@
+"""
+Two-tier cache: in-process memory (L1) in front of a shared backend (L2).
+"""
+import pickle
+from typing import Any, Iterable, Optional, Tuple
+
+from app.core.cache.backends import CacheBackend, MemoryCacheBackend, RedisCacheBackend
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.monitoring import get_cache_metrics
+
+logger = get_logger(__name__)
+
+
+class TieredCache:
+    """Read-through cache over a memory tier and an optional shared tier.
+    
+    Values are pickled, together with their tags so that an entry promoted
+    from L2 to L1 stays invalidatable. Only the application writes to the
+    cache, so its contents are trusted.
+    """
+    
+    def __init__(
+        self,
+        l1: CacheBackend,
+        l2: Optional[CacheBackend] = None,
+        *,
+        l1_ttl: float = 30,
+        l2_ttl: float = 300
+    ):
+        """Initialize the cache.
+        
+        Args:
+            l1: In-process tier
+            l2: Shared tier, if any
+            l1_ttl: Default seconds an entry stays in L1
+            l2_ttl: Default seconds an entry stays in L2
+        """
+        self.l1 = l1
+        self.l2 = l2
+        self.l1_ttl = l1_ttl
+        self.l2_ttl = l2_ttl
+    
+    async def get(self, key: str, namespace: str = "default") -> Tuple[bool, Any]:
+        """Look a key up in L1, then L2.
+        
+        Args:
+            key: Cache key
+            namespace: Metrics namespace of the lookup
+        
+        Returns:
+            Whether the key was found, and the cached value
+        """
+        metrics = get_cache_metrics(namespace)
+        
+        raw = await self.l1.get(key)
+        if raw is not None:
+            metrics.record_hit("l1")
+            return True, pickle.loads(raw)[1]
+        
+        if self.l2 is not None:
+            raw = await self.l2.get(key)
+            if raw is not None:
+                metrics.record_hit("l2")
+                tags, value = pickle.loads(raw)
+                await self.l1.set(key, raw, self.l1_ttl, tags)
+                return True, value
+        
+        metrics.record_miss()
+        return False, None
+    
+    async def set(
+        self,
+        key: str,
+        value: Any,
+        *,
+        tags: Iterable[str] = (),
+        ttl: Optional[float] = None,
+        namespace: str = "default"
+    ) -> None:
+        """Store a value in every tier.
+        
+        Args:
+            key: Cache key
+            value: Picklable value
+            tags: Tags the entry is invalidated by
+            ttl: Seconds the entry stays in L2 (L1 keeps at most its own TTL)
+            namespace: Metrics namespace of the write
+        """
+        tags = tuple(tags)
+        raw = pickle.dumps((tags, value))
+        l2_ttl = ttl if ttl is not None else self.l2_ttl
+        
+        await self.l1.set(key, raw, min(self.l1_ttl, l2_ttl), tags)
+        if self.l2 is not None:
+            await self.l2.set(key, raw, l2_ttl, tags)
+        get_cache_metrics(namespace).record_set()
+    
+    async def invalidate_tags(self, tags: Iterable[str]) -> int:
+        """Drop every entry stored with any of the tags, in every tier.
+        
+        Args:
+            tags: Tags to invalidate
+        
+        Returns:
+            Number of entries dropped from L1
+        """
+        tags = list(tags)
+        dropped = await self.l1.invalidate_tags(tags)
+        if self.l2 is not None:
+            await self.l2.invalidate_tags(tags)
+        if dropped:
+            get_cache_metrics("invalidation").record_invalidation(dropped)
+        return dropped
+    
+    async def clear(self) -> None:
+        """Drop every entry in every tier."""
+        await self.l1.clear()
+        if self.l2 is not None:
+            await self.l2.clear()
+    
+    async def close(self) -> None:
+        """Release the tiers' resources."""
+        await self.l1.close()
+        if self.l2 is not None:
+            await self.l2.close()
+
+
+def build_cache() -> TieredCache:
+    """Build the application cache from settings.
+    
+    ``CACHE_L2_BACKEND`` selects the shared tier: "redis" (used when
+    ``REDIS_URL`` is set), "local" for an in-process stand-in, or "none".
+    
+    Returns:
+        Configured cache
+    """
+    l2: Optional[CacheBackend] = None
+    if settings.CACHE_L2_BACKEND == "redis":
+        if settings.REDIS_URL:
+            l2 = RedisCacheBackend(settings.REDIS_URL)
+        else:
+            logger.info("cache_l2_disabled", reason="REDIS_URL not set")
+    elif settings.CACHE_L2_BACKEND == "local":
+        l2 = MemoryCacheBackend(max_entries=settings.CACHE_L1_MAX_ENTRIES)
+    
+    return TieredCache(
+        MemoryCacheBackend(max_entries=settings.CACHE_L1_MAX_ENTRIES),
+        l2,
+        l1_ttl=settings.CACHE_L1_TTL_SECONDS,
+        l2_ttl=settings.CACHE_L2_TTL_SECONDS
+    )
+
+
+# Application cache - built on first use
+_cache: Optional[TieredCache] = None
+
+
+def get_cache() -> Optional[TieredCache]:
+    """Get the application cache.
+    
+    Returns:
+        Cache instance, or None when caching is disabled
+    """
+    global _cache
+    if not settings.CACHE_ENABLED:
+        return None
+    if _cache is None:
+        _cache = build_cache()
+    return _cache
+
+
+def set_cache(cache: Optional[TieredCache]) -> None:
+    """Replace the application cache (e.g. in tests).
+    
+    Args:
+        cache: Cache instance, or None to rebuild from settings on next use
+    """
+    global _cache
+    _cache = cache
+
+
+async def close_cache() -> None:
+    """Close the application cache."""
+    global _cache
+    if _cache is not None:
+        await _cache.close()
+        _cache = None
@@ -25,15 +25,57 @@ class Settings(BaseSettings):
     DATABASE_MAX_OVERFLOW: int = 10
     DATABASE_POOL_TIMEOUT: int = 30
     DATABASE_POOL_RECYCLE: int = 3600
+    DATABASE_POOL_PRE_PING: bool = True
+    # managed (in-process pool), external (behind pgbouncer) or serverless (no pool)
+    DATABASE_POOL_MODE: str = "managed"
+    # Read replicas for reporting/dashboard reads
+    DATABASE_REPLICA_URLS: list[str] = []
+    DATABASE_REPLICA_MAX_LAG_SECONDS: float = 5.0
+    DATABASE_REPLICA_LAG_CHECK_INTERVAL: int = 5
+    # Connections of the primary reserved for sequence block reservations
+    DATABASE_SEQUENCE_POOL_SIZE: int = 2
+    # Order numbers reserved per database round trip by each worker
+    ORDER_NUMBER_BLOCK_SIZE: int = 20
+    # Payment link short codes reserved per database round trip
+    SHORT_CODE_BLOCK_SIZE: int = 100
+    
+    # Public payment page cache
+    PAYMENT_PAGE_CACHE_TTL_SECONDS: int = 30
+    PAYMENT_PAGE_CACHE_MAX_ENTRIES: int = 10000
+    
+    # Authenticated user snapshots
+    USER_CACHE_TTL_SECONDS: int = 60
+    USER_CACHE_MAX_ENTRIES: int = 10000
+    # Clerk ID -> user ID mappings; checked against the user on every read
+    USER_CLERK_ID_CACHE_TTL_SECONDS: int = 3600
+    
+    # Thread pools for blocking work; CPU workers default to the core count
+    EXECUTOR_CPU_WORKERS: Optional[int] = None
+    EXECUTOR_IO_WORKERS: int = 16
+    EXECUTOR_MAX_QUEUE: int = 256
     
     # Redis (for caching/sessions)
     REDIS_URL: Optional[str] = None
     
+    # Repository read cache: in-process L1 in front of a shared L2
+    # ("redis" when REDIS_URL is set, "local" for an in-process stand-in,
+    # or "none")
+    CACHE_ENABLED: bool = True
+    CACHE_L1_TTL_SECONDS: int = 30
+    CACHE_L1_MAX_ENTRIES: int = 10000
+    CACHE_L2_TTL_SECONDS: int = 300
+    CACHE_L2_BACKEND: str = "redis"
+    
     # Security
     SECRET_KEY: str = "your-secret-key-here"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     REFRESH_TOKEN_EXPIRE_DAYS: int = 7
     ALGORITHM: str = "HS256"
+    # Verified token claims cached until each token's expiry
+    TOKEN_CACHE_MAX_ENTRIES: int = 10000
+    # Key of the payment link short code permutation; changing it may make
+    # new codes collide with existing ones
+    SHORT_CODE_KEY: str = "wedi-short-codes"
     
     # CORS
     ALLOWED_ORIGINS: list[str] = ["http://localhost:3000", "https://api.wedi.la", "https://wedi.la", "https://app.wedi.la", "https://pay.wedi.la"]
@@ -52,6 +94,40 @@ class Settings(BaseSettings):
     
     # External services
     REDPANDA_BOOTSTRAP_SERVERS: str = "localhost:9092"
+    # Background event publishing: bounded queue drained in batches by lanes
+    # keyed by aggregate ID
+    EVENT_QUEUE_MAX_SIZE: int = 10000
+    EVENT_BATCH_SIZE: int = 500
+    EVENT_LINGER_MS: int = 5
+    EVENT_DRAIN_LANES: int = 8
+    EVENT_SEND_RETRIES: int = 3
+    EVENT_SEND_TIMEOUT_MS: int = 5000
+    # Local disk spill log for events the broker can't take in time. Each
+    # worker process claims its own slot directory under EVENT_SPILL_DIR
+    EVENT_SPILL_ENABLED: bool = True
+    EVENT_SPILL_DIR: str = "var/event-spill"
+    EVENT_SPILL_SEGMENT_BYTES: int = 16 * 1024 * 1024
+    EVENT_SPILL_MAX_BYTES: int = 1024 * 1024 * 1024
+    EVENT_SPILL_FSYNC_INTERVAL_MS: int = 50
+    # Transactional outbox: events are stored with the state change that
+    # produced them and relayed to the broker by background workers
+    EVENT_OUTBOX_ENABLED: bool = True
+    EVENT_RELAY_WORKERS: int = 1
+    EVENT_RELAY_BATCH_SIZE: int = 500
+    EVENT_RELAY_POLL_INTERVAL_MS: int = 200
+    # File-backed broker used with EVENT_BUS_TYPE=local for development and
+    # load tests. Retention limits apply per partition
+    LOCAL_BROKER_DIR: str = "var/local-broker"
+    LOCAL_BROKER_PARTITIONS: int = 8
+    LOCAL_BROKER_SEGMENT_BYTES: int = 16 * 1024 * 1024
+    LOCAL_BROKER_RETENTION_MS: int = 24 * 60 * 60 * 1000
+    LOCAL_BROKER_RETENTION_BYTES: int = 1024 * 1024 * 1024
+    # Event consumers: handler batches, records buffered per partition before
+    # fetching pauses, and reruns of a failing batch before dead-lettering
+    EVENT_CONSUMER_BATCH_SIZE: int = 500
+    EVENT_CONSUMER_MAX_PENDING: int = 2000
+    EVENT_CONSUMER_RETRIES: int = 3
+    EVENT_CONSUMER_RETRY_BACKOFF_MS: int = 200
     
     # Payment providers
     YOINT_API_URL: str = "https://api.yoint.com"
@@ -65,6 +141,14 @@ class Settings(BaseSettings):
     CLERK_SECRET_KEY: Optional[str] = None
     CLERK_FRONTEND_API: Optional[str] = None
     CLERK_JWT_VERIFICATION_KEY: Optional[str] = None
+    # Session tokens are verified locally against the instance's JWKS
+    CLERK_JWKS_URL: Optional[str] = None
+    CLERK_JWKS_REFRESH_SECONDS: int = 3600
+    CLERK_AUTHORIZED_PARTIES: list[str] = []
+    # Clerk user profiles are cached, and local users re-synced from them
+    # at most once per interval
+    CLERK_PROFILE_CACHE_TTL_SECONDS: int = 300
+    CLERK_PROFILE_SYNC_INTERVAL_SECONDS: int = 900
     
     # Circle Wallet
     CIRCLE_API_KEY: Optional[str] = None
@@ -44,8 +44,14 @@ class WediException(Exception):
 class RepositoryException(WediException):
     """Base exception for repository operations."""
     
-    def __init__(self, message: str, code: str = "REPOSITORY_ERROR", **kwargs):
-        super().__init__(message, code, status_code=500, **kwargs)
+    def __init__(
+        self,
+        message: str,
+        code: str = "REPOSITORY_ERROR",
+        status_code: int = 500,
+        **kwargs
+    ):
+        super().__init__(message, code, status_code=status_code, **kwargs)
 
 
 class NotFoundError(RepositoryException):
@@ -98,6 +104,22 @@ class BusinessRuleViolation(WediException):
         )
 
 
+class InvalidStateTransition(WediException):
+    """Raised when an entity can't move from its current status."""
+    
+    def __init__(self, resource: str, current_status: Any, new_status: Any):
+        super().__init__(
+            message=f"Cannot transition {resource} from {current_status} to {new_status}",
+            code="INVALID_STATE_TRANSITION",
+            status_code=409,
+            details={
+                "resource": resource,
+                "current_status": str(current_status),
+                "new_status": str(new_status)
+            }
+        )
+
+
 class InsufficientPermissions(WediException):
     """Raised when user lacks required permissions."""
     
@@ -259,6 +281,20 @@ class KYCProviderError(ExternalServiceError):
         ) 
 
 
+# Runtime Exceptions
+
+class ExecutorSaturated(WediException):
+    """Raised when too many calls are waiting for a blocking-work thread pool."""
+    
+    def __init__(self, executor: str, max_queue: int):
+        super().__init__(
+            message=f"Too many calls waiting for the {executor} executor",
+            code="EXECUTOR_SATURATED",
+            status_code=503,
+            details={"executor": executor, "max_queue": max_queue}
+        )
+
+
 class UnauthorizedException(WediException):
     """Raised when a user is not authorized to access a resource."""
     
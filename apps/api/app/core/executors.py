@@ -0,0 +1,211 @@
+"""
+Bounded thread pools for blocking work.
+
+Blocking calls must not run on the event loop thread, where they stall
+every in-flight request. They run in one of two pools instead:
+
+- cpu_executor: CPU-bound work (bcrypt, signature verification). Sized
+  to the cores, since more threads only contend for the GIL.
+- io_executor: blocking I/O (synchronous SDK and HTTP clients).
+
+Each pool runs at most max_workers calls at a time. Further calls wait on
+the event loop, so a cancelled caller never occupies a thread, and calls
+beyond max_queue waiting are rejected with ExecutorSaturated.
+"""
+import asyncio
+import contextvars
+import functools
+import os
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Deque, Optional, TypeVar
+
+from app.core.config import settings
+from app.core.exceptions import ExecutorSaturated
+from app.core.logging import get_logger
+from app.core.monitoring import register_executor_metrics
+
+logger = get_logger(__name__)
+
+T = TypeVar("T")
+
+
+class BoundedExecutor:
+    """Thread pool with bounded concurrency and a bounded wait queue."""
+    
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        """Initialize the executor.
+        
+        Threads are started on first use.
+        
+        Args:
+            name: Pool name used in thread names and metrics
+            max_workers: Maximum concurrent calls
+            max_queue: Maximum calls waiting for a worker
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self.running = 0
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self.metrics = register_executor_metrics(name, max_workers, max_queue)
+        self.metrics.bind_executor(self)
+    
+    @property
+    def queue_depth(self) -> int:
+        """Number of calls waiting for a worker."""
+        return sum(1 for waiter in self._waiters if not waiter.done())
+    
+    async def run(self, func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+        """Run a blocking function in the pool.
+        
+        The function runs with a copy of the caller's context variables.
+        
+        Args:
+            func: Blocking function
+            *args: Positional arguments for func
+            **kwargs: Keyword arguments for func
+        
+        Returns:
+            The function's return value
+        
+        Raises:
+            ExecutorSaturated: If the wait queue is full
+        """
+        queued_at = time.perf_counter()
+        await self._acquire()
+        started_at = time.perf_counter()
+        self.metrics.record_start(started_at - queued_at)
+        
+        loop = asyncio.get_running_loop()
+        call = functools.partial(contextvars.copy_context().run, func, *args, **kwargs)
+        try:
+            future = self._get_executor().submit(call)
+        except BaseException:
+            self._release()
+            raise
+        
+        def done(_) -> None:
+            # Free the slot when the thread finishes, even if the caller
+            # stopped waiting for it
+            run_time = time.perf_counter() - started_at
+            try:
+                loop.call_soon_threadsafe(self._finish, run_time)
+            except RuntimeError:
+                # The event loop is closed
+                pass
+        
+        future.add_done_callback(done)
+        return await asyncio.wrap_future(future)
+    
+    def shutdown(self, wait: bool = True) -> None:
+        """Stop the pool's threads.
+        
+        The pool starts new threads if it's used again.
+        
+        Args:
+            wait: Whether to wait for running calls to finish
+        """
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=wait)
+    
+    async def _acquire(self) -> None:
+        """Wait for a free worker slot."""
+        if self.running < self.max_workers and not self._waiters:
+            self.running += 1
+            return
+        
+        if self.queue_depth >= self.max_queue:
+            self.metrics.record_rejection()
+            logger.warning("executor_saturated", executor=self.name, max_queue=self.max_queue)
+            raise ExecutorSaturated(self.name, self.max_queue)
+        
+        waiter = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        self.metrics.record_queue_depth(self.queue_depth)
+        try:
+            # _release hands its slot over by resolving the waiter
+            await waiter
+        except asyncio.CancelledError:
+            if waiter.done() and not waiter.cancelled():
+                self._release()
+            raise
+        finally:
+            if waiter in self._waiters:
+                self._waiters.remove(waiter)
+    
+    def _finish(self, run_time: float) -> None:
+        """Record a finished call and free its slot.
+        
+        Args:
+            run_time: Seconds the call ran in its thread
+        """
+        self.metrics.record_finish(run_time)
+        self._release()
+    
+    def _release(self) -> None:
+        """Free a worker slot, handing it to the next waiting call."""
+        while self._waiters:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                return
+        self.running -= 1
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        """Get the thread pool, creating it on first use."""
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_workers,
+                thread_name_prefix=f"wedi-{self.name}"
+            )
+        return self._executor
+
+
+cpu_executor = BoundedExecutor(
+    "cpu",
+    max_workers=settings.EXECUTOR_CPU_WORKERS or os.cpu_count() or 1,
+    max_queue=settings.EXECUTOR_MAX_QUEUE
+)
+io_executor = BoundedExecutor(
+    "io",
+    max_workers=settings.EXECUTOR_IO_WORKERS,
+    max_queue=settings.EXECUTOR_MAX_QUEUE
+)
+
+
+async def run_cpu_bound(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run CPU-bound work in the CPU pool.
+    
+    Args:
+        func: CPU-bound function
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+    
+    Returns:
+        The function's return value
+    """
+    return await cpu_executor.run(func, *args, **kwargs)
+
+
+async def run_blocking_io(func: Callable[..., T], *args: Any, **kwargs: Any) -> T:
+    """Run blocking I/O in the I/O pool.
+    
+    Args:
+        func: Blocking function
+        *args: Positional arguments for func
+        **kwargs: Keyword arguments for func
+    
+    Returns:
+        The function's return value
+    """
+    return await io_executor.run(func, *args, **kwargs)
+
+
+def shutdown_executors() -> None:
+    """Stop the threads of both pools."""
+    cpu_executor.shutdown()
+    io_executor.shutdown()
@@ -2,10 +2,11 @@
 Performance monitoring and metrics utilities.
 """
 import time
+import weakref
 from contextlib import asynccontextmanager, contextmanager
 from datetime import datetime
 from functools import wraps
-from typing import Any, Callable, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional
 
 from app.core.logging import logger
 
@@ -351,6 +352,902 @@ class RepositoryMetrics:
         )
 
 
+class PoolMetrics:
+    """Track connection pool activity for a single database engine.
+    
+    Counters are recorded by the instrumented pool classes in
+    ``app.db.pool``; live gauges (checked out, overflow, idle) are read
+    from the pool currently bound to this tracker.
+    """
+    
+    def __init__(self, name: str, mode: str):
+        """Initialize the pool metrics.
+        
+        Args:
+            name: Engine name (e.g. "primary")
+            mode: Pool mode the engine was created with
+        """
+        self.name = name
+        self.mode = mode
+        self._pool_ref: Optional[weakref.ReferenceType] = None
+        self.reset()
+    
+    def reset(self) -> None:
+        """Reset all counters."""
+        self.checkouts = 0
+        self.checkout_timeouts = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.connects = 0
+        self.connect_errors = 0
+        self.total_connect_time = 0.0
+        self.max_connect_time = 0.0
+        self.releases = 0
+        self.total_hold_time = 0.0
+        self.max_hold_time = 0.0
+    
+    def bind_pool(self, pool: Any) -> None:
+        """Bind the pool whose live gauges should be reported.
+        
+        Args:
+            pool: SQLAlchemy pool instance
+        """
+        self._pool_ref = weakref.ref(pool)
+    
+    def record_checkout(self, wait_time: float, timed_out: bool = False) -> None:
+        """Record a connection checkout.
+        
+        Args:
+            wait_time: Seconds spent waiting for a connection
+            timed_out: Whether the checkout hit the pool timeout
+        """
+        if timed_out:
+            self.checkout_timeouts += 1
+            logger.warning(
+                "db_pool_checkout_timeout",
+                pool=self.name,
+                wait_time=wait_time
+            )
+        else:
+            self.checkouts += 1
+        self.total_wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+    
+    def record_connect(self, duration: float, success: bool = True) -> None:
+        """Record the opening of a new DBAPI connection.
+        
+        Args:
+            duration: Seconds spent establishing the connection
+            success: Whether the connection was established
+        """
+        if success:
+            self.connects += 1
+        else:
+            self.connect_errors += 1
+        self.total_connect_time += duration
+        self.max_connect_time = max(self.max_connect_time, duration)
+    
+    def record_release(self, hold_time: float) -> None:
+        """Record a connection returned to the pool.
+        
+        Args:
+            hold_time: Seconds the connection was checked out
+        """
+        self.releases += 1
+        self.total_hold_time += hold_time
+        self.max_hold_time = max(self.max_hold_time, hold_time)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get current pool statistics.
+        
+        Returns:
+            Counters plus live gauges for the bound pool
+        """
+        attempts = self.checkouts + self.checkout_timeouts
+        connect_attempts = self.connects + self.connect_errors
+        stats: Dict[str, Any] = {
+            "mode": self.mode,
+            "checkouts": self.checkouts,
+            "checkout_timeouts": self.checkout_timeouts,
+            "avg_wait_time": self.total_wait_time / attempts if attempts else 0.0,
+            "max_wait_time": self.max_wait_time,
+            "connects": self.connects,
+            "connect_errors": self.connect_errors,
+            "avg_connect_time": (
+                self.total_connect_time / connect_attempts if connect_attempts else 0.0
+            ),
+            "max_connect_time": self.max_connect_time,
+            "avg_hold_time": self.total_hold_time / self.releases if self.releases else 0.0,
+            "max_hold_time": self.max_hold_time,
+        }
+        
+        pool = self._pool_ref() if self._pool_ref else None
+        if pool is not None and hasattr(pool, "checkedout"):
+            stats.update({
+                "size": pool.size(),
+                "checked_out": pool.checkedout(),
+                "checked_in": pool.checkedin(),
+                "overflow": max(pool.overflow(), 0),
+            })
+        return stats
+
+
+# Pool metrics registered by database engines, keyed by engine name
+_pool_metrics: Dict[str, PoolMetrics] = {}
+
+
+def register_pool_metrics(name: str, mode: str) -> PoolMetrics:
+    """Create (or replace) the metrics tracker for a database engine.
+    
+    Args:
+        name: Engine name
+        mode: Pool mode
+        
+    Returns:
+        Pool metrics tracker
+    """
+    metrics = PoolMetrics(name, mode)
+    _pool_metrics[name] = metrics
+    return metrics
+
+
+def get_pool_stats() -> Dict[str, Dict[str, Any]]:
+    """Get statistics for every registered connection pool.
+    
+    Returns:
+        Pool statistics keyed by engine name
+    """
+    return {name: metrics.snapshot() for name, metrics in _pool_metrics.items()}
+
+
+class CacheMetrics:
+    """Track hit and miss counts of a cache namespace."""
+    
+    def __init__(self, name: str):
+        """Initialize the cache metrics.
+        
+        Args:
+            name: Cache namespace (e.g. "payment_link.by_short_code")
+        """
+        self.name = name
+        self.reset()
+    
+    def reset(self) -> None:
+        """Reset all counters."""
+        self.l1_hits = 0
+        self.l2_hits = 0
+        self.misses = 0
+        self.sets = 0
+        self.invalidations = 0
+    
+    def record_hit(self, tier: str) -> None:
+        """Record a lookup served from the cache.
+        
+        Args:
+            tier: Tier that served the lookup ("l1" or "l2")
+        """
+        if tier == "l1":
+            self.l1_hits += 1
+        else:
+            self.l2_hits += 1
+    
+    def record_miss(self) -> None:
+        """Record a lookup that had to be computed."""
+        self.misses += 1
+    
+    def record_set(self) -> None:
+        """Record a value written to the cache."""
+        self.sets += 1
+    
+    def record_invalidation(self, count: int = 1) -> None:
+        """Record entries dropped by invalidation.
+        
+        Args:
+            count: Number of entries dropped
+        """
+        self.invalidations += count
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get current cache statistics.
+        
+        Returns:
+            Counters plus the hit ratio
+        """
+        hits = self.l1_hits + self.l2_hits
+        lookups = hits + self.misses
+        return {
+            "l1_hits": self.l1_hits,
+            "l2_hits": self.l2_hits,
+            "misses": self.misses,
+            "sets": self.sets,
+            "invalidations": self.invalidations,
+            "hit_ratio": hits / lookups if lookups else 0.0,
+        }
+
+
+# Cache metrics keyed by namespace
+_cache_metrics: Dict[str, CacheMetrics] = {}
+
+
+def get_cache_metrics(name: str) -> CacheMetrics:
+    """Get (or create) the metrics tracker of a cache namespace.
+    
+    Args:
+        name: Cache namespace
+        
+    Returns:
+        Cache metrics tracker
+    """
+    metrics = _cache_metrics.get(name)
+    if metrics is None:
+        metrics = _cache_metrics[name] = CacheMetrics(name)
+    return metrics
+
+
+def get_cache_stats() -> Dict[str, Dict[str, Any]]:
+    """Get statistics for every cache namespace.
+    
+    Returns:
+        Cache statistics keyed by namespace
+    """
+    return {name: metrics.snapshot() for name, metrics in _cache_metrics.items()}
+
+
+class CoalescingMetrics:
+    """Track how many calls of a namespace joined an in-flight load."""
+    
+    def __init__(self, name: str):
+        """Initialize the coalescing metrics.
+        
+        Args:
+            name: Coalescing namespace (e.g. "organization.stats")
+        """
+        self.name = name
+        self.reset()
+    
+    def reset(self) -> None:
+        """Reset all counters."""
+        self.calls = 0
+        self.deduplicated = 0
+    
+    def record_call(self, deduplicated: bool) -> None:
+        """Record a call.
+        
+        Args:
+            deduplicated: Whether the call joined a load already in flight
+        """
+        self.calls += 1
+        if deduplicated:
+            self.deduplicated += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get current coalescing statistics.
+        
+        Returns:
+            Counters plus the share of deduplicated calls
+        """
+        return {
+            "calls": self.calls,
+            "loads": self.calls - self.deduplicated,
+            "deduplicated": self.deduplicated,
+            "dedup_ratio": self.deduplicated / self.calls if self.calls else 0.0,
+        }
+
+
+# Coalescing metrics keyed by namespace
+_coalescing_metrics: Dict[str, CoalescingMetrics] = {}
+
+
+def get_coalescing_metrics(name: str) -> CoalescingMetrics:
+    """Get (or create) the metrics tracker of a coalescing namespace.
+    
+    Args:
+        name: Coalescing namespace
+        
+    Returns:
+        Coalescing metrics tracker
+    """
+    metrics = _coalescing_metrics.get(name)
+    if metrics is None:
+        metrics = _coalescing_metrics[name] = CoalescingMetrics(name)
+    return metrics
+
+
+def get_coalescing_stats() -> Dict[str, Dict[str, Any]]:
+    """Get statistics for every coalescing namespace.
+    
+    Returns:
+        Coalescing statistics keyed by namespace
+    """
+    return {name: metrics.snapshot() for name, metrics in _coalescing_metrics.items()}
+
+
+class ExecutorMetrics:
+    """Track calls run by a blocking-work thread pool.
+    
+    Counters are recorded by ``app.core.executors.BoundedExecutor``; live
+    gauges (running, queue depth) are read from the bound executor.
+    """
+    
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        """Initialize the executor metrics.
+        
+        Args:
+            name: Executor name (e.g. "cpu")
+            max_workers: Maximum concurrent calls
+            max_queue: Maximum calls waiting for a worker
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._executor_ref: Optional[weakref.ReferenceType] = None
+        self.reset()
+    
+    def reset(self) -> None:
+        """Reset all counters."""
+        self.started = 0
+        self.finished = 0
+        self.rejected = 0
+        self.total_wait_time = 0.0
+        self.max_wait_time = 0.0
+        self.total_run_time = 0.0
+        self.max_run_time = 0.0
+        self.max_queue_depth = 0
+    
+    def bind_executor(self, executor: Any) -> None:
+        """Bind the executor whose live gauges should be reported.
+        
+        Args:
+            executor: BoundedExecutor instance
+        """
+        self._executor_ref = weakref.ref(executor)
+    
+    def record_start(self, wait_time: float) -> None:
+        """Record a call starting on a worker.
+        
+        Args:
+            wait_time: Seconds the call waited for a worker
+        """
+        self.started += 1
+        self.total_wait_time += wait_time
+        self.max_wait_time = max(self.max_wait_time, wait_time)
+    
+    def record_finish(self, run_time: float) -> None:
+        """Record a call finishing.
+        
+        Args:
+            run_time: Seconds the call ran on its worker
+        """
+        self.finished += 1
+        self.total_run_time += run_time
+        self.max_run_time = max(self.max_run_time, run_time)
+    
+    def record_queue_depth(self, depth: int) -> None:
+        """Record the queue depth after a call started waiting.
+        
+        Args:
+            depth: Calls waiting for a worker
+        """
+        self.max_queue_depth = max(self.max_queue_depth, depth)
+    
+    def record_rejection(self) -> None:
+        """Record a call rejected because the queue was full."""
+        self.rejected += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get current executor statistics.
+        
+        Returns:
+            Counters plus live gauges for the bound executor
+        """
+        stats: Dict[str, Any] = {
+            "max_workers": self.max_workers,
+            "max_queue": self.max_queue,
+            "started": self.started,
+            "finished": self.finished,
+            "rejected": self.rejected,
+            "avg_wait_time": self.total_wait_time / self.started if self.started else 0.0,
+            "max_wait_time": self.max_wait_time,
+            "avg_run_time": self.total_run_time / self.finished if self.finished else 0.0,
+            "max_run_time": self.max_run_time,
+            "max_queue_depth": self.max_queue_depth,
+        }
+        
+        executor = self._executor_ref() if self._executor_ref else None
+        if executor is not None:
+            stats.update({
+                "running": executor.running,
+                "queue_depth": executor.queue_depth,
+            })
+        return stats
+
+
+# Executor metrics registered by thread pools, keyed by executor name
+_executor_metrics: Dict[str, ExecutorMetrics] = {}
+
+
+def register_executor_metrics(name: str, max_workers: int, max_queue: int) -> ExecutorMetrics:
+    """Create (or replace) the metrics tracker for a thread pool.
+    
+    Args:
+        name: Executor name
+        max_workers: Maximum concurrent calls
+        max_queue: Maximum calls waiting for a worker
+        
+    Returns:
+        Executor metrics tracker
+    """
+    metrics = ExecutorMetrics(name, max_workers, max_queue)
+    _executor_metrics[name] = metrics
+    return metrics
+
+
+def get_executor_stats() -> Dict[str, Dict[str, Any]]:
+    """Get statistics for every registered thread pool.
+    
+    Returns:
+        Executor statistics keyed by executor name
+    """
+    return {name: metrics.snapshot() for name, metrics in _executor_metrics.items()}
+
+
+class EventPipelineMetrics:
+    """Track events flowing through a background publishing pipeline.
+    
+    Counters are recorded by ``app.events.pipeline.EventPipeline``; the
+    live queue depth is read from the bound pipeline.
+    """
+    
+    def __init__(self, name: str, max_queue_size: int):
+        """Initialize the pipeline metrics.
+        
+        Args:
+            name: Pipeline name (e.g. "redpanda")
+            max_queue_size: Maximum events queued or in flight
+        """
+        self.name = name
+        self.max_queue_size = max_queue_size
+        self._pipeline_ref: Optional[weakref.ReferenceType] = None
+        self.reset()
+    
+    def reset(self) -> None:
+        """Reset all counters."""
+        self.enqueued = 0
+        self.delivered = 0
+        self.failed = 0
+        self.batches = 0
+        self.total_enqueue_wait = 0.0
+        self.max_enqueue_wait = 0.0
+        self.total_delivery_time = 0.0
+        self.max_delivery_time = 0.0
+    
+    def bind_pipeline(self, pipeline: Any) -> None:
+        """Bind the pipeline whose queue depth should be reported.
+        
+        Args:
+            pipeline: EventPipeline instance
+        """
+        self._pipeline_ref = weakref.ref(pipeline)
+    
+    def record_enqueue(self, wait_time: float) -> None:
+        """Record an event entering the queue.
+        
+        Args:
+            wait_time: Seconds the publisher waited for room in the queue
+        """
+        self.enqueued += 1
+        self.total_enqueue_wait += wait_time
+        self.max_enqueue_wait = max(self.max_enqueue_wait, wait_time)
+    
+    def record_batch(self, delivery_times: List[float]) -> None:
+        """Record a delivered batch.
+        
+        Args:
+            delivery_times: Seconds from enqueue to delivery, per event
+        """
+        self.batches += 1
+        self.delivered += len(delivery_times)
+        self.total_delivery_time += sum(delivery_times)
+        self.max_delivery_time = max(self.max_delivery_time, *delivery_times)
+    
+    def record_failure(self, count: int) -> None:
+        """Record events dropped after their batch kept failing.
+        
+        Args:
+            count: Number of dropped events
+        """
+        self.failed += count
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get current pipeline statistics.
+        
+        Returns:
+            Counters plus the live queue depth of the bound pipeline
+        """
+        stats: Dict[str, Any] = {
+            "max_queue_size": self.max_queue_size,
+            "enqueued": self.enqueued,
+            "delivered": self.delivered,
+            "failed": self.failed,
+            "batches": self.batches,
+            "avg_batch_size": self.delivered / self.batches if self.batches else 0.0,
+            "avg_enqueue_wait": self.total_enqueue_wait / self.enqueued if self.enqueued else 0.0,
+            "max_enqueue_wait": self.max_enqueue_wait,
+            "avg_delivery_time": (
+                self.total_delivery_time / self.delivered if self.delivered else 0.0
+            ),
+            "max_delivery_time": self.max_delivery_time,
+        }
+        
+        pipeline = self._pipeline_ref() if self._pipeline_ref else None
+        if pipeline is not None:
+            stats["queue_depth"] = pipeline.queue_depth
+        return stats
+
+
+# Event pipeline metrics registered by publishers, keyed by pipeline name
+_event_pipeline_metrics: Dict[str, EventPipelineMetrics] = {}
+
+
+def register_event_pipeline_metrics(name: str, max_queue_size: int) -> EventPipelineMetrics:
+    """Create (or replace) the metrics tracker for an event pipeline.
+    
+    Args:
+        name: Pipeline name
+        max_queue_size: Maximum events queued or in flight
+        
+    Returns:
+        Event pipeline metrics tracker
+    """
+    metrics = EventPipelineMetrics(name, max_queue_size)
+    _event_pipeline_metrics[name] = metrics
+    return metrics
+
+
+def get_event_pipeline_stats() -> Dict[str, Dict[str, Any]]:
+    """Get statistics for every registered event pipeline.
+    
+    Returns:
+        Event pipeline statistics keyed by pipeline name
+    """
+    return {name: metrics.snapshot() for name, metrics in _event_pipeline_metrics.items()}
+
+
+class SpillLogMetrics:
+    """Track events parked in a local disk spill log.
+    
+    Counters are recorded by ``app.events.spill.SpillLog``; disk usage and
+    backlog are read from the bound log.
+    """
+    
+    def __init__(self, name: str, max_bytes: int):
+        """Initialize the spill log metrics.
+        
+        Args:
+            name: Spill log name (e.g. "redpanda")
+            max_bytes: Maximum disk usage of the log
+        """
+        self.name = name
+        self.max_bytes = max_bytes
+        self._log_ref: Optional[weakref.ReferenceType] = None
+        self.reset()
+    
+    def reset(self) -> None:
+        """Reset all counters."""
+        self.spilled = 0
+        self.replayed = 0
+        self.dropped = 0
+        self.fsyncs = 0
+        self.total_fsync_time = 0.0
+        self.max_fsync_time = 0.0
+    
+    def bind_log(self, log: Any) -> None:
+        """Bind the spill log whose disk usage should be reported.
+        
+        Args:
+            log: SpillLog instance
+        """
+        self._log_ref = weakref.ref(log)
+    
+    def record_spill(self, count: int) -> None:
+        """Record events written to the log.
+        
+        Args:
+            count: Number of events
+        """
+        self.spilled += count
+    
+    def record_replay(self, count: int) -> None:
+        """Record events read back from the log and delivered.
+        
+        Args:
+            count: Number of events
+        """
+        self.replayed += count
+    
+    def record_drop(self, count: int) -> None:
+        """Record events rejected because the log was full.
+        
+        Args:
+            count: Number of events
+        """
+        self.dropped += count
+    
+    def record_fsync(self, fsync_time: float) -> None:
+        """Record a batched fsync.
+        
+        Args:
+            fsync_time: Seconds the fsync took
+        """
+        self.fsyncs += 1
+        self.total_fsync_time += fsync_time
+        self.max_fsync_time = max(self.max_fsync_time, fsync_time)
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get current spill log statistics.
+        
+        Returns:
+            Counters plus the live disk usage of the bound log
+        """
+        stats: Dict[str, Any] = {
+            "max_bytes": self.max_bytes,
+            "spilled": self.spilled,
+            "replayed": self.replayed,
+            "dropped": self.dropped,
+            "fsyncs": self.fsyncs,
+            "avg_fsync_time": self.total_fsync_time / self.fsyncs if self.fsyncs else 0.0,
+            "max_fsync_time": self.max_fsync_time,
+        }
+        
+        log = self._log_ref() if self._log_ref else None
+        if log is not None:
+            stats["disk_bytes"] = log.disk_bytes
+            stats["backlog_bytes"] = log.backlog_bytes
+            stats["orphaned_bytes"] = log.orphaned_bytes
+            stats["segments"] = log.segment_count
+        return stats
+
+
+# Spill log metrics registered by event pipelines, keyed by log name
+_spill_log_metrics: Dict[str, SpillLogMetrics] = {}
+
+
+def register_spill_log_metrics(name: str, max_bytes: int) -> SpillLogMetrics:
+    """Create (or replace) the metrics tracker for a spill log.
+    
+    Args:
+        name: Spill log name
+        max_bytes: Maximum disk usage of the log
+        
+    Returns:
+        Spill log metrics tracker
+    """
+    metrics = SpillLogMetrics(name, max_bytes)
+    _spill_log_metrics[name] = metrics
+    return metrics
+
+
+def get_spill_log_stats() -> Dict[str, Dict[str, Any]]:
+    """Get statistics for every registered spill log.
+    
+    Returns:
+        Spill log statistics keyed by log name
+    """
+    return {name: metrics.snapshot() for name, metrics in _spill_log_metrics.items()}
+
+
+class OutboxRelayMetrics:
+    """Track events relayed from the transactional outbox to the broker.
+    
+    Counters are recorded by ``app.events.outbox.OutboxRelay``.
+    """
+    
+    def __init__(self, name: str):
+        """Initialize the relay metrics.
+        
+        Args:
+            name: Relay name (e.g. "payment_event")
+        """
+        self.name = name
+        self.reset()
+    
+    def reset(self) -> None:
+        """Reset all counters."""
+        self.relayed = 0
+        self.batches = 0
+        self.failures = 0
+        self.total_batch_time = 0.0
+        self.max_batch_time = 0.0
+        self.total_lag = 0.0
+        self.max_lag = 0.0
+    
+    def record_batch(self, batch_time: float, lags: List[float]) -> None:
+        """Record a relayed batch.
+        
+        Args:
+            batch_time: Seconds to claim, send and mark the batch
+            lags: Seconds from each event's occurrence to its delivery
+        """
+        self.batches += 1
+        self.relayed += len(lags)
+        self.total_batch_time += batch_time
+        self.max_batch_time = max(self.max_batch_time, batch_time)
+        self.total_lag += sum(lags)
+        self.max_lag = max(self.max_lag, *lags)
+    
+    def record_failure(self) -> None:
+        """Record a batch that couldn't be delivered and stays pending."""
+        self.failures += 1
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get current relay statistics.
+        
+        Returns:
+            Relay counters and timings
+        """
+        return {
+            "relayed": self.relayed,
+            "batches": self.batches,
+            "failures": self.failures,
+            "avg_batch_size": self.relayed / self.batches if self.batches else 0.0,
+            "avg_batch_time": self.total_batch_time / self.batches if self.batches else 0.0,
+            "max_batch_time": self.max_batch_time,
+            "avg_lag": self.total_lag / self.relayed if self.relayed else 0.0,
+            "max_lag": self.max_lag,
+        }
+
+
+# Outbox relay metrics, keyed by relay name
+_outbox_relay_metrics: Dict[str, OutboxRelayMetrics] = {}
+
+
+def register_outbox_relay_metrics(name: str) -> OutboxRelayMetrics:
+    """Get the metrics tracker for an outbox relay, creating it on first use.
+    
+    Relay workers of the same name share one tracker.
+    
+    Args:
+        name: Relay name
+    
+    Returns:
+        Outbox relay metrics tracker
+    """
+    if name not in _outbox_relay_metrics:
+        _outbox_relay_metrics[name] = OutboxRelayMetrics(name)
+    return _outbox_relay_metrics[name]
+
+
+def get_outbox_relay_stats() -> Dict[str, Dict[str, Any]]:
+    """Get statistics for every outbox relay.
+    
+    Returns:
+        Outbox relay statistics keyed by relay name
+    """
+    return {name: metrics.snapshot() for name, metrics in _outbox_relay_metrics.items()}
+
+
+class EventConsumerMetrics:
+    """Track events handled by a consumer group member.
+    
+    Counters are recorded by ``app.events.consumer.EventConsumer``.
+    """
+    
+    def __init__(self, group_id: str):
+        """Initialize the consumer metrics.
+        
+        Args:
+            group_id: Consumer group (e.g. "payment_page_projection")
+        """
+        self.group_id = group_id
+        self.reset()
+    
+    def reset(self) -> None:
+        """Reset all counters."""
+        self.consumed = 0
+        self.handled = 0
+        self.batches = 0
+        self.handler_failures = 0
+        self.dead_lettered = 0
+        self.commit_failures = 0
+        self.worker_failures = 0
+        self.total_handler_time = 0.0
+        self.max_handler_time = 0.0
+        # Records not yet handled, by "topic:partition"
+        self.lag: Dict[str, int] = {}
+    
+    def record_consumed(self, count: int) -> None:
+        """Record records fetched from the broker.
+        
+        Args:
+            count: Number of records
+        """
+        self.consumed += count
+    
+    def record_batch(self, count: int, handler_time: float) -> None:
+        """Record a batch handled by a handler.
+        
+        Args:
+            count: Number of events in the batch
+            handler_time: Seconds the handler took
+        """
+        self.batches += 1
+        self.handled += count
+        self.total_handler_time += handler_time
+        self.max_handler_time = max(self.max_handler_time, handler_time)
+    
+    def record_handler_failure(self) -> None:
+        """Record a failed handler call."""
+        self.handler_failures += 1
+    
+    def record_dead_letter(self) -> None:
+        """Record an event written to the dead letter topic."""
+        self.dead_lettered += 1
+    
+    def record_commit_failure(self) -> None:
+        """Record an offset commit that failed."""
+        self.commit_failures += 1
+    
+    def record_worker_failure(self) -> None:
+        """Record a partition worker that died and was restarted."""
+        self.worker_failures += 1
+    
+    def record_lag(self, lag: Dict[str, int]) -> None:
+        """Record the lag of the partitions the member owns.
+        
+        Args:
+            lag: Records not yet handled, by "topic:partition"
+        """
+        self.lag = lag
+    
+    def snapshot(self) -> Dict[str, Any]:
+        """Get current consumer statistics.
+        
+        Returns:
+            Consumer counters, timings and lag
+        """
+        return {
+            "consumed": self.consumed,
+            "handled": self.handled,
+            "batches": self.batches,
+            "handler_failures": self.handler_failures,
+            "dead_lettered": self.dead_lettered,
+            "commit_failures": self.commit_failures,
+            "worker_failures": self.worker_failures,
+            "avg_batch_size": self.handled / self.batches if self.batches else 0.0,
+            "avg_handler_time": self.total_handler_time / self.batches if self.batches else 0.0,
+            "max_handler_time": self.max_handler_time,
+            "lag": dict(self.lag),
+            "total_lag": sum(self.lag.values()),
+        }
+
+
+# Event consumer metrics, keyed by consumer group
+_event_consumer_metrics: Dict[str, EventConsumerMetrics] = {}
+
+
+def register_event_consumer_metrics(group_id: str) -> EventConsumerMetrics:
+    """Create (or replace) the metrics tracker for a consumer group.
+    
+    Args:
+        group_id: Consumer group
+    
+    Returns:
+        Event consumer metrics tracker
+    """
+    metrics = EventConsumerMetrics(group_id)
+    _event_consumer_metrics[group_id] = metrics
+    return metrics
+
+
+def get_event_consumer_stats() -> Dict[str, Dict[str, Any]]:
+    """Get statistics for every event consumer.
+    
+    Returns:
+        Event consumer statistics keyed by consumer group
+    """
+    return {name: metrics.snapshot() for name, metrics in _event_consumer_metrics.items()}
+
+
 # Helper function to get current performance stats
 def get_performance_report() -> Dict[str, Any]:
     """Get a comprehensive performance report.
@@ -376,5 +1273,13 @@ def get_performance_report() -> Dict[str, Any]:
             "total_errors": total_errors,
             "success_rate": overall_success_rate
         },
-        "operations": stats
+        "operations": stats,
+        "database_pools": get_pool_stats(),
+        "caches": get_cache_stats(),
+        "coalescing": get_coalescing_stats(),
+        "executors": get_executor_stats(),
+        "event_pipelines": get_event_pipeline_stats(),
+        "spill_logs": get_spill_log_stats(),
+        "outbox_relays": get_outbox_relay_stats(),
+        "event_consumers": get_event_consumer_stats()
     } 
\ No newline at end of file
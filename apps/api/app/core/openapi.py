@@ -9,6 +9,8 @@ from typing import Dict, List, Any
 from fastapi import FastAPI
 from fastapi.openapi.utils import get_openapi
 
+from app.middleware.public_paths import PUBLIC_ROUTE
+
 
 def custom_openapi_schema(app: FastAPI) -> Dict[str, Any]:
     """
@@ -379,7 +381,7 @@ def configure_scalar_ui(app: FastAPI) -> None:
     """
     from fastapi.responses import HTMLResponse
     
-    @app.get("/docs", include_in_schema=False)
+    @app.get("/docs", include_in_schema=False, openapi_extra=PUBLIC_ROUTE)
     async def scalar_docs() -> HTMLResponse:
         """Serve Scalar documentation UI."""
         return HTMLResponse(content=f"""
@@ -4,13 +4,17 @@ Security utilities for authentication and authorization.
 This module provides JWT token management, password hashing,
 and other security-related functions.
 """
+import hashlib
+import time
+from collections import OrderedDict
 from datetime import datetime, timedelta, timezone
-from typing import Any, Dict, Optional, Union
+from typing import Any, Dict, Optional, Tuple, Union
 
 from jose import JWTError, jwt
 from passlib.context import CryptContext
 
 from app.core.config import settings
+from app.core.executors import run_cpu_bound
 from app.core.logging import get_logger
 
 logger = get_logger(__name__)
@@ -19,10 +23,12 @@ logger = get_logger(__name__)
 pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
 
 
-def verify_password(plain_password: str, hashed_password: str) -> bool:
+async def verify_password(plain_password: str, hashed_password: str) -> bool:
     """
     Verify a password against its hash.
     
+    bcrypt runs in the CPU thread pool, off the event loop.
+    
     Args:
         plain_password: Plain text password
         hashed_password: Hashed password
@@ -30,20 +36,22 @@ def verify_password(plain_password: str, hashed_password: str) -> bool:
     Returns:
         True if password matches
     """
-    return pwd_context.verify(plain_password, hashed_password)
+    return await run_cpu_bound(pwd_context.verify, plain_password, hashed_password)
 
 
-def get_password_hash(password: str) -> str:
+async def get_password_hash(password: str) -> str:
     """
     Hash a password.
     
+    bcrypt runs in the CPU thread pool, off the event loop.
+    
     Args:
         password: Plain text password
         
     Returns:
         Hashed password
     """
-    return pwd_context.hash(password)
+    return await run_cpu_bound(pwd_context.hash, password)
 
 
 def create_access_token(
@@ -130,10 +138,109 @@ def create_refresh_token(
     return encoded_jwt
 
 
+class TokenClaimsCache:
+    """
+    LRU cache of verified token claims keyed by token digest.
+    
+    Claims are kept until the token's ``exp``, so a token is verified once
+    however many times it is decoded. Revoked tokens are remembered until
+    they would have expired anyway.
+    """
+    
+    def __init__(self, max_entries: int = 10000):
+        """
+        Initialize the cache.
+        
+        Args:
+            max_entries: Tokens kept before the least recently used is evicted
+        """
+        self.max_entries = max_entries
+        # digest -> (claims, exp as a UNIX timestamp)
+        self._claims: "OrderedDict[str, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        # digest -> exp as a UNIX timestamp
+        self._revoked: Dict[str, float] = {}
+    
+    @staticmethod
+    def digest(token: str) -> str:
+        """Get the cache key of a token."""
+        return hashlib.sha256(token.encode()).hexdigest()
+    
+    def get(self, digest: str) -> Optional[Dict[str, Any]]:
+        """
+        Get the claims of an unexpired cached token.
+        
+        Args:
+            digest: Token digest
+            
+        Returns:
+            Copy of the claims, or None if absent or expired
+        """
+        entry = self._claims.get(digest)
+        if entry is None:
+            return None
+        claims, expires_at = entry
+        if time.time() >= expires_at:
+            del self._claims[digest]
+            return None
+        self._claims.move_to_end(digest)
+        return dict(claims)
+    
+    def set(self, digest: str, claims: Dict[str, Any]) -> None:
+        """
+        Cache verified claims until the token expires.
+        
+        Tokens without an ``exp`` claim are not cached.
+        
+        Args:
+            digest: Token digest
+            claims: Verified claims
+        """
+        expires_at = claims.get("exp")
+        if not isinstance(expires_at, (int, float)):
+            return
+        self._claims[digest] = (dict(claims), float(expires_at))
+        self._claims.move_to_end(digest)
+        while len(self._claims) > self.max_entries:
+            self._claims.popitem(last=False)
+    
+    def is_revoked(self, digest: str) -> bool:
+        """Check whether a token has been revoked."""
+        return digest in self._revoked
+    
+    def revoke(self, digest: str, expires_at: float) -> None:
+        """
+        Revoke a token.
+        
+        Args:
+            digest: Token digest
+            expires_at: When the token expires, after which it needn't be
+                remembered
+        """
+        self._claims.pop(digest, None)
+        now = time.time()
+        self._revoked = {
+            key: exp for key, exp in self._revoked.items() if exp > now
+        }
+        self._revoked[digest] = expires_at
+    
+    def clear(self) -> None:
+        """Drop every cached claim and revocation."""
+        self._claims.clear()
+        self._revoked.clear()
+
+
+# Verified claims shared by every caller of decode_token
+token_claims_cache = TokenClaimsCache(max_entries=settings.TOKEN_CACHE_MAX_ENTRIES)
+
+
 def decode_token(token: str) -> Dict[str, Any]:
     """
     Decode and verify a JWT token.
     
+    Verified claims are cached until the token expires, so repeated decodes
+    of a token (e.g. by middleware and route dependencies) verify its
+    signature once.
+    
     Args:
         token: JWT token to decode
         
@@ -141,18 +248,57 @@ def decode_token(token: str) -> Dict[str, Any]:
         Token payload
         
     Raises:
-        JWTError: If token is invalid or expired
+        JWTError: If token is invalid, expired or revoked
     """
+    digest = token_claims_cache.digest(token)
+    if token_claims_cache.is_revoked(digest):
+        logger.warning("JWT decode error: token has been revoked")
+        raise JWTError("Token has been revoked")
+    
+    payload = token_claims_cache.get(digest)
+    if payload is not None:
+        return payload
+    
     try:
         payload = jwt.decode(
             token,
             settings.SECRET_KEY,
             algorithms=[settings.ALGORITHM]
         )
-        return payload
     except JWTError as e:
         logger.warning(f"JWT decode error: {e}")
         raise
+    
+    token_claims_cache.set(digest, payload)
+    return payload
+
+
+def revoke_token(token: str) -> None:
+    """
+    Revoke a token so decode_token rejects it until it expires.
+    
+    Revocations are kept in this process's claims cache only: other workers
+    and instances keep accepting the token until it expires, and a restart
+    forgets it. Nothing calls this yet; a logout or key-compromise flow
+    needs a revocation list shared between processes.
+    
+    Args:
+        token: JWT token to revoke
+        
+    Raises:
+        JWTError: If token is invalid
+    """
+    payload = jwt.decode(
+        token,
+        settings.SECRET_KEY,
+        algorithms=[settings.ALGORITHM],
+        options={"verify_exp": False}
+    )
+    expires_at = payload.get("exp")
+    if not isinstance(expires_at, (int, float)):
+        # Tokens without an expiry must be remembered for good
+        expires_at = float("inf")
+    token_claims_cache.revoke(token_claims_cache.digest(token), float(expires_at))
 
 
 def verify_token_type(payload: Dict[str, Any], expected_type: str) -> bool:
@@ -0,0 +1,85 @@
+"""
+Short codes that are unique by construction.
+
+A short code is a sequence number run through a keyed permutation and
+written in base 36. Distinct numbers always give distinct codes, so codes
+never need to be checked against the database, while consecutive numbers
+give unrelated-looking codes that don't reveal how many links exist.
+
+The permutation is a small Feistel network over the smallest even number
+of bits that covers the ``36 ** length`` code space, cycle-walked into it.
+"""
+import hashlib
+import hmac
+
+from app.core.config import settings
+
+ALPHABET = "0123456789abcdefghijklmnopqrstuvwxyz"
+
+_ROUNDS = 4
+
+
+class ShortCodeEncoder:
+    """Map sequence numbers to fixed-length, shuffled base-36 codes."""
+    
+    def __init__(self, key: str, length: int = 8):
+        """Initialize the encoder.
+        
+        Args:
+            key: Permutation key; changing it maps numbers to other codes,
+                which may collide with codes issued under the old key
+            length: Code length in characters
+        """
+        self.length = length
+        self.capacity = len(ALPHABET) ** length
+        # The domain is at most 4x the code space, so cycle-walking takes
+        # few extra rounds on average
+        self._half_bits = ((self.capacity - 1).bit_length() + 1) // 2
+        self._half_mask = (1 << self._half_bits) - 1
+        self._key = key.encode()
+    
+    def _round(self, value: int, round_number: int) -> int:
+        """Keyed round function of the Feistel network."""
+        digest = hmac.new(
+            self._key,
+            f"{round_number}:{value}".encode(),
+            hashlib.sha256
+        ).digest()
+        return int.from_bytes(digest[:8], "big") & self._half_mask
+    
+    def _permute(self, value: int) -> int:
+        """Apply the Feistel permutation to a value of the domain."""
+        left, right = value >> self._half_bits, value & self._half_mask
+        for round_number in range(_ROUNDS):
+            left, right = right, left ^ self._round(right, round_number)
+        return (left << self._half_bits) | right
+    
+    def encode(self, number: int) -> str:
+        """Encode a sequence number as a short code.
+        
+        Args:
+            number: Sequence number, from 0 up to the encoder's capacity
+        
+        Returns:
+            Short code of ``length`` characters
+        
+        Raises:
+            ValueError: If the number is outside the code space
+        """
+        if not 0 <= number < self.capacity:
+            raise ValueError(f"Short code number {number} is out of range")
+        
+        # Cycle-walk: re-permute until the value lands in the code space,
+        # which keeps the mapping a bijection on [0, capacity)
+        value = self._permute(number)
+        while value >= self.capacity:
+            value = self._permute(value)
+        
+        chars = []
+        for _ in range(self.length):
+            value, index = divmod(value, len(ALPHABET))
+            chars.append(ALPHABET[index])
+        return "".join(reversed(chars))
+
+
+short_code_encoder = ShortCodeEncoder(settings.SHORT_CODE_KEY)
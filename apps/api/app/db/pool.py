@@ -0,0 +1,137 @@
+"""
+Connection pool modes and instrumentation for database engines.
+"""
+import time
+from enum import Enum
+from typing import Any, Dict, Optional, Type
+from uuid import uuid4
+
+from sqlalchemy import exc
+from sqlalchemy.engine import make_url
+from sqlalchemy.pool import AsyncAdaptedQueuePool, NullPool, Pool
+
+from app.core.config import settings
+from app.core.monitoring import PoolMetrics, register_pool_metrics
+
+
+class PoolMode(str, Enum):
+    """How an engine manages its database connections."""
+
+    # SQLAlchemy keeps a pool of warm connections sized by DATABASE_POOL_*
+    MANAGED = "managed"
+    # An external pooler (pgbouncer in transaction mode) multiplexes server
+    # connections, so nothing may depend on per-connection session state
+    EXTERNAL = "external"
+    # Every checkout opens a fresh connection (short-lived serverless workers)
+    SERVERLESS = "serverless"
+
+
+class _InstrumentedPoolMixin:
+    """Record checkout wait, connect latency and hold time into PoolMetrics."""
+
+    metrics: PoolMetrics
+
+    def __init__(self, *args: Any, **kwargs: Any):
+        super().__init__(*args, **kwargs)
+        self.metrics.bind_pool(self)
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            record = super()._do_get()
+        except exc.TimeoutError:
+            self.metrics.record_checkout(time.perf_counter() - start, timed_out=True)
+            raise
+        now = time.perf_counter()
+        self.metrics.record_checkout(now - start)
+        record.info["checked_out_at"] = now
+        return record
+
+    def _do_return_conn(self, record):
+        checked_out_at = record.info.pop("checked_out_at", None)
+        if checked_out_at is not None:
+            self.metrics.record_release(time.perf_counter() - checked_out_at)
+        super()._do_return_conn(record)
+
+    def _create_connection(self):
+        start = time.perf_counter()
+        try:
+            record = super()._create_connection()
+        except Exception:
+            self.metrics.record_connect(time.perf_counter() - start, success=False)
+            raise
+        self.metrics.record_connect(time.perf_counter() - start)
+        return record
+
+
+class InstrumentedAsyncQueuePool(_InstrumentedPoolMixin, AsyncAdaptedQueuePool):
+    """Async queue pool with telemetry."""
+
+
+class InstrumentedNullPool(_InstrumentedPoolMixin, NullPool):
+    """Non-pooling pool with telemetry."""
+
+
+def _bind_metrics(pool_class: Type[Pool], metrics: PoolMetrics) -> Type[Pool]:
+    """Create a pool subclass bound to a metrics tracker.
+
+    The binding lives on the class so that pools recreated by
+    ``engine.dispose()`` keep reporting to the same tracker.
+    """
+    return type(pool_class.__name__, (pool_class,), {"metrics": metrics})
+
+
+def _unique_statement_name() -> str:
+    """Name prepared statements uniquely so they never collide across
+    server connections handed out by an external pooler."""
+    return f"__asyncpg_{uuid4()}__"
+
+
+def build_engine_options(
+    database_url: str,
+    mode: PoolMode,
+    *,
+    name: str = "primary",
+    pool_size: Optional[int] = None
+) -> Dict[str, Any]:
+    """Build ``create_async_engine`` keyword arguments for a pool mode.
+
+    Args:
+        database_url: Database connection URL
+        mode: Pool mode to configure
+        name: Engine name used for metrics
+        pool_size: Fixed pool size without overflow; defaults to
+            DATABASE_POOL_SIZE plus DATABASE_MAX_OVERFLOW
+
+    Returns:
+        Engine keyword arguments
+    """
+    metrics = register_pool_metrics(name, mode.value)
+    options: Dict[str, Any] = {
+        "echo": settings.DEBUG,
+        "pool_pre_ping": settings.DATABASE_POOL_PRE_PING,
+    }
+
+    if mode == PoolMode.SERVERLESS:
+        options["poolclass"] = _bind_metrics(InstrumentedNullPool, metrics)
+        return options
+
+    options.update(
+        poolclass=_bind_metrics(InstrumentedAsyncQueuePool, metrics),
+        pool_size=pool_size or settings.DATABASE_POOL_SIZE,
+        max_overflow=0 if pool_size else settings.DATABASE_MAX_OVERFLOW,
+        pool_timeout=settings.DATABASE_POOL_TIMEOUT,
+        pool_recycle=settings.DATABASE_POOL_RECYCLE,
+    )
+
+    if mode == PoolMode.EXTERNAL and make_url(database_url).drivername == "postgresql+asyncpg":
+        # pgbouncer in transaction mode may run each transaction on a different
+        # server connection: disable both statement caches and keep prepared
+        # statement names unique so no statement outlives its transaction.
+        options["connect_args"] = {
+            "statement_cache_size": 0,
+            "prepared_statement_cache_size": 0,
+            "prepared_statement_name_func": _unique_statement_name,
+        }
+
+    return options
@@ -0,0 +1,144 @@
+"""
+Block-allocated counters for human-readable sequence numbers.
+
+Each (scope, period) pair, e.g. (organization ID, day), has a row in
+``sequence_counter``. A worker reserves a block of values with one atomic
+upsert-and-increment and then hands them out from memory, so allocating a
+number needs no scan and concurrent workers never get the same value.
+Values left in a block when a worker stops are skipped: sequences are
+unique and increasing per worker, but may have gaps.
+
+A counter can be seeded from values already stored elsewhere, e.g. order
+numbers issued before the counter existed; the seed is read once, when the
+counter row is first inserted.
+"""
+import asyncio
+from typing import Callable, Dict, Optional, Tuple
+
+from sqlalchemy import Integer, cast, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncEngine
+from sqlalchemy.sql.expression import ColumnElement
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.db.session import db_manager
+from app.models import PaymentOrder, SequenceCounter
+
+logger = get_logger(__name__)
+
+
+class SequenceAllocator:
+    """Hands out counter values from blocks reserved in the database."""
+    
+    def __init__(
+        self,
+        block_size: int = 1,
+        seed: Optional[Callable[[str, str], ColumnElement]] = None
+    ):
+        """Initialize the allocator.
+        
+        Args:
+            block_size: Values reserved per database round trip
+            seed: Builds a scalar subquery for the highest value already
+                used by a (scope, period) counter, or NULL if none
+        """
+        if block_size < 1:
+            raise ValueError("block_size must be at least 1")
+        self.block_size = block_size
+        self.seed = seed
+        # (scope, period) -> (next value, last reserved value)
+        self._blocks: Dict[Tuple[str, str], Tuple[int, int]] = {}
+        # One lock per counter, so a reservation only holds up its own counter
+        self._locks: Dict[Tuple[str, str], asyncio.Lock] = {}
+    
+    async def next_value(self, scope: str, period: str) -> int:
+        """Allocate the next value of a counter.
+        
+        Args:
+            scope: Counter scope, e.g. an organization ID
+            period: Counter period, e.g. a YYYYMMDD date
+        
+        Returns:
+            Allocated value, starting after the seed (or at 1) for a new counter
+        """
+        key = (scope, period)
+        async with self._locks.setdefault(key, asyncio.Lock()):
+            next_value, last_value = self._blocks.get(key, (1, 0))
+            if next_value > last_value:
+                next_value, last_value = await self._reserve_block(
+                    db_manager.sequence_engine, scope, period
+                )
+                self._discard_before(period)
+            self._blocks[key] = (next_value + 1, last_value)
+            return next_value
+    
+    async def _reserve_block(
+        self,
+        engine: AsyncEngine,
+        scope: str,
+        period: str
+    ) -> Tuple[int, int]:
+        """Reserve the next block of a counter.
+        
+        The increment commits in its own transaction, so a rollback of the
+        caller's transaction can't hand the same block to another worker.
+        It runs on the primary's dedicated sequence pool: a request that
+        already holds a connection of the main pool never waits on that pool
+        for a second one.
+        
+        Returns:
+            First and last value of the block
+        """
+        async with engine.begin() as connection:
+            dialect = connection.dialect.name
+            dialect_insert = sqlite.insert if dialect == "sqlite" else postgresql.insert
+            first_value = self.block_size
+            if self.seed is not None:
+                first_value = func.coalesce(self.seed(scope, period), 0) + self.block_size
+            stmt = dialect_insert(SequenceCounter).values(
+                scope=scope,
+                period=period,
+                value=first_value
+            )
+            stmt = stmt.on_conflict_do_update(
+                index_elements=["scope", "period"],
+                set_={"value": SequenceCounter.value + self.block_size}
+            ).returning(SequenceCounter.value)
+            last_value = (await connection.execute(stmt)).scalar_one()
+        
+        logger.debug(
+            "sequence_block_reserved",
+            scope=scope,
+            period=period,
+            last_value=last_value
+        )
+        return last_value - self.block_size + 1, last_value
+    
+    def _discard_before(self, period: str) -> None:
+        """Forget blocks of earlier periods; they will not be used again."""
+        for key in [key for key in self._blocks if key[1] < period]:
+            del self._blocks[key]
+        for key in [key for key in self._locks if key[1] < period]:
+            del self._locks[key]
+
+
+def _last_order_number(organization_id: str, date_prefix: str) -> ColumnElement:
+    """Highest order number sequence already stored for an organization and day."""
+    return select(
+        func.max(cast(func.substr(PaymentOrder.order_number, len(date_prefix) + 2), Integer))
+    ).where(
+        PaymentOrder.organization_id == organization_id,
+        PaymentOrder.order_number.like(f"{date_prefix}-%")
+    ).scalar_subquery()
+
+
+# Order numbers are allocated per organization and day, continuing after
+# orders numbered before the counter existed
+order_number_allocator = SequenceAllocator(
+    block_size=settings.ORDER_NUMBER_BLOCK_SIZE,
+    seed=_last_order_number
+)
+
+# Payment link short codes are encoded from one global sequence
+short_code_allocator = SequenceAllocator(block_size=settings.SHORT_CODE_BLOCK_SIZE)
@@ -1,44 +1,257 @@
 """
 Database session management using SQLAlchemy 2.0 with async support.
 """
+import asyncio
+import itertools
+import time
 from contextlib import asynccontextmanager
-from typing import AsyncGenerator
+from contextvars import ContextVar
+from typing import AsyncGenerator, List, Optional
 
+from sqlalchemy import event, text
 from sqlalchemy.ext.asyncio import (
+    AsyncEngine,
     AsyncSession,
     async_sessionmaker,
     create_async_engine,
 )
-from sqlalchemy.pool import NullPool
+from sqlalchemy.orm import Session
 
 from app.core.config import settings
+from app.core.logging import get_logger
+from app.db.pool import PoolMode, build_engine_options
 from app.models import Base
 
+logger = get_logger(__name__)
+
+# Set once the current request has committed writes, so that its
+# subsequent reads observe them (read-your-writes)
+_primary_pinned: ContextVar[bool] = ContextVar("primary_pinned", default=False)
+
+
+def pin_to_primary() -> None:
+    """Route all further reads of the current request to the primary."""
+    _primary_pinned.set(True)
+
+
+def is_pinned_to_primary() -> bool:
+    """Check whether reads of the current request must use the primary."""
+    return _primary_pinned.get()
+
+
+class TrackedSession(Session):
+    """Session that records whether it has written to the database."""
+
+
+@event.listens_for(TrackedSession, "after_flush")
+def _mark_writes(session: Session, flush_context) -> None:
+    """Remember that the current transaction has written rows."""
+    session.info["has_writes"] = True
+
+
+@event.listens_for(TrackedSession, "do_orm_execute")
+def _mark_statement_writes(orm_execute_state) -> None:
+    """Remember bulk ORM INSERT/UPDATE/DELETE statements as writes."""
+    if orm_execute_state.is_insert or orm_execute_state.is_update or orm_execute_state.is_delete:
+        orm_execute_state.session.info["has_writes"] = True
+
+
+@event.listens_for(TrackedSession, "after_commit")
+def _pin_after_write(session: Session) -> None:
+    """Pin the request to the primary once its writes are committed."""
+    if session.info.pop("has_writes", False):
+        pin_to_primary()
+
+
+@event.listens_for(TrackedSession, "after_rollback")
+def _clear_writes(session: Session) -> None:
+    """Forget writes that were rolled back."""
+    session.info.pop("has_writes", None)
+
+
+@event.listens_for(TrackedSession, "before_flush")
+def _reject_replica_writes(session: Session, flush_context, instances) -> None:
+    """Prevent accidental writes through read-only replica sessions."""
+    if session.info.get("read_only") and (session.new or session.dirty or session.deleted):
+        raise RuntimeError("Cannot flush changes through a read-only session")
+
+
+class RequestSession:
+    """A database session shared by everything that handles one request.
+    
+    The session is opened on first use, so requests that never touch the
+    database never check out a connection, and middleware and route
+    dependencies reuse the same session (and identity map).
+    """
+    
+    def __init__(self, manager: "DatabaseManager"):
+        """Initialize the request scope.
+        
+        Args:
+            manager: Database manager that creates the session
+        """
+        self._manager = manager
+        self._session: Optional[AsyncSession] = None
+    
+    @property
+    def is_open(self) -> bool:
+        """Whether the session has been created."""
+        return self._session is not None
+    
+    def get(self) -> AsyncSession:
+        """Get the request session, creating it on first use."""
+        if self._session is None:
+            self._session = self._manager.async_session_factory()
+        return self._session
+    
+    async def close(self) -> None:
+        """Close the session (rolling back anything left uncommitted)."""
+        if self._session is not None:
+            await self._session.close()
+            self._session = None
+
+
+_request_session: ContextVar[Optional[RequestSession]] = ContextVar(
+    "request_session", default=None
+)
+
+
+def get_request_session() -> Optional[RequestSession]:
+    """Get the session scope of the current request, if any."""
+    return _request_session.get()
+
+
+def has_pending_writes(session: AsyncSession) -> bool:
+    """Check whether a session has writes not yet committed.
+    
+    Args:
+        session: Database session
+        
+    Returns:
+        True if the session has unflushed changes or flushed, uncommitted writes
+    """
+    return bool(
+        session.new
+        or session.dirty
+        or session.deleted
+        or session.sync_session.info.get("has_writes")
+    )
+
+
+async def release_connection(session: AsyncSession) -> bool:
+    """Return the session's connection to the pool before slow non-DB work.
+    
+    A transaction that has only read is ended so the connection goes back
+    to the pool; the next statement checks out a connection again. Loaded
+    objects stay usable because sessions don't expire them on commit.
+    Transactions with pending writes are left untouched so their atomicity
+    is preserved.
+    
+    Args:
+        session: Database session
+        
+    Returns:
+        True if a connection was released
+        
+    Example:
+        wallet = await repository.get_or_404(db, id=wallet_id)
+        await release_connection(db)
+        balances = await circle_service.get_balances(wallet_id=circle_wallet_id)
+    """
+    if not session.in_transaction() or has_pending_writes(session):
+        return False
+    # Nothing was written, so committing only ends the read transaction
+    await session.commit()
+    return True
+
+
+class ReplicaEngine:
+    """A read replica engine together with its last observed replication lag."""
+    
+    def __init__(self, name: str, engine: AsyncEngine):
+        """Initialize the replica.
+        
+        Args:
+            name: Replica name used in logs and metrics
+            engine: Async engine connected to the replica
+        """
+        self.name = name
+        self.engine = engine
+        # Unknown until the first lag check succeeds
+        self.lag_seconds: Optional[float] = None
+        self.checked_at: Optional[float] = None
+    
+    @property
+    def is_available(self) -> bool:
+        """Whether the replica is reachable and within the allowed lag."""
+        return (
+            self.lag_seconds is not None
+            and self.lag_seconds <= settings.DATABASE_REPLICA_MAX_LAG_SECONDS
+        )
+
 
 class DatabaseManager:
     """Manages database connections and sessions."""
     
-    def __init__(self, database_url: str):
+    def __init__(
+        self,
+        database_url: str,
+        pool_mode: Optional[str] = None,
+        replica_urls: Optional[List[str]] = None
+    ):
         """Initialize the database manager.
         
         Args:
             database_url: PostgreSQL connection URL with asyncpg driver
+            pool_mode: Pool mode (managed, external or serverless);
+                defaults to settings.DATABASE_POOL_MODE
+            replica_urls: Read replica URLs; defaults to
+                settings.DATABASE_REPLICA_URLS
         """
-        # Create async engine with connection pooling
+        self.pool_mode = PoolMode((pool_mode or settings.DATABASE_POOL_MODE).lower())
+        
+        # Create async engine configured for the selected pool mode
         self.engine = create_async_engine(
             database_url,
-            echo=settings.DEBUG,
-            pool_size=settings.DATABASE_POOL_SIZE,
-            max_overflow=settings.DATABASE_MAX_OVERFLOW,
-            pool_pre_ping=True,  # Verify connections before using
-            # Use NullPool for serverless environments
-            poolclass=NullPool if settings.ENVIRONMENT == "production" else None,
+            **build_engine_options(database_url, self.pool_mode, name="primary")
+        )
+        
+        # Sequence blocks are reserved in their own transactions, on a small
+        # pool of the primary, so a request holding a pooled connection never
+        # waits on the main pool for a second one
+        self.sequence_engine = create_async_engine(
+            database_url,
+            **build_engine_options(
+                database_url,
+                self.pool_mode,
+                name="sequences",
+                pool_size=settings.DATABASE_SEQUENCE_POOL_SIZE
+            )
         )
         
+        # Create one engine per read replica
+        if replica_urls is None:
+            replica_urls = settings.DATABASE_REPLICA_URLS
+        self.replicas: List[ReplicaEngine] = []
+        for index, replica_url in enumerate(replica_urls):
+            name = f"replica_{index}"
+            self.replicas.append(
+                ReplicaEngine(
+                    name,
+                    create_async_engine(
+                        replica_url,
+                        **build_engine_options(replica_url, self.pool_mode, name=name)
+                    )
+                )
+            )
+        self._replica_cycle = itertools.cycle(self.replicas) if self.replicas else None
+        self._lag_monitor: Optional[asyncio.Task] = None
+        
         # Create async session factory
         self.async_session_factory = async_sessionmaker(
             self.engine,
             class_=AsyncSession,
+            sync_session_class=TrackedSession,
             expire_on_commit=False,  # Don't expire objects after commit
             autoflush=False,  # Don't auto-flush before queries
             autocommit=False,  # Use transactions
@@ -76,8 +289,90 @@ class DatabaseManager:
             finally:
                 await session.close()
     
+    def select_read_engine(self) -> AsyncEngine:
+        """Choose the engine to serve a read-only session.
+        
+        Replicas are used round-robin, skipping those that are lagging or
+        unreachable. The primary is used when no replica is available or
+        when the current request has been pinned to it.
+        
+        Returns:
+            Engine to read from
+        """
+        if self._replica_cycle is None or is_pinned_to_primary():
+            return self.engine
+        
+        for _ in range(len(self.replicas)):
+            replica = next(self._replica_cycle)
+            if replica.is_available:
+                return replica.engine
+        
+        logger.warning("no_replica_available", replicas=len(self.replicas))
+        return self.engine
+    
+    @asynccontextmanager
+    async def read_session(self) -> AsyncGenerator[AsyncSession, None]:
+        """Provide a read-only session, balanced across read replicas.
+        
+        Yields:
+            AsyncSession: Read-only database session
+            
+        Example:
+            async with db_manager.read_session() as session:
+                stats = await repository.get_stats(session, organization_id=org_id)
+        """
+        async with self.async_session_factory(bind=self.select_read_engine()) as session:
+            session.info["read_only"] = True
+            try:
+                yield session
+            finally:
+                # Nothing to commit; just end the read transaction
+                await session.rollback()
+                await session.close()
+    
+    async def check_replica_lag(self) -> None:
+        """Measure replication lag on every replica."""
+        for replica in self.replicas:
+            try:
+                async with replica.engine.connect() as conn:
+                    if conn.dialect.name == "postgresql":
+                        result = await conn.execute(text(
+                            "SELECT CASE "
+                            "WHEN pg_last_wal_receive_lsn() = pg_last_wal_replay_lsn() THEN 0 "
+                            "ELSE COALESCE(EXTRACT(EPOCH FROM now() - pg_last_xact_replay_timestamp()), 0) "
+                            "END"
+                        ))
+                        replica.lag_seconds = float(result.scalar_one() or 0)
+                    else:
+                        replica.lag_seconds = 0.0
+            except Exception as e:
+                logger.warning(
+                    "replica_lag_check_failed",
+                    replica=replica.name,
+                    error=str(e)
+                )
+                replica.lag_seconds = None
+            replica.checked_at = time.monotonic()
+    
+    async def _monitor_replica_lag(self) -> None:
+        """Periodically refresh replica lag until cancelled."""
+        while True:
+            await self.check_replica_lag()
+            await asyncio.sleep(settings.DATABASE_REPLICA_LAG_CHECK_INTERVAL)
+    
+    def start_replica_monitor(self) -> None:
+        """Start the background replica lag monitor (no-op without replicas)."""
+        if self.replicas and self._lag_monitor is None:
+            self._lag_monitor = asyncio.create_task(self._monitor_replica_lag())
+    
     async def close(self) -> None:
-        """Close the database engine."""
+        """Close the database engines."""
+        if self._lag_monitor is not None:
+            self._lag_monitor.cancel()
+            self._lag_monitor = None
+        for replica in self.replicas:
+            await replica.engine.dispose()
+        await self.sequence_engine.dispose()
         await self.engine.dispose()
 
 
@@ -89,7 +384,9 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
     """
     Dependency to get database session.
     
-    This is used in FastAPI dependency injection.
+    This is used in FastAPI dependency injection. Inside a request scope
+    (opened by RequestContextMiddleware) the request's shared session is
+    reused; otherwise a new session is opened.
     
     Yields:
         AsyncSession: Database session
@@ -99,7 +396,56 @@ async def get_db() -> AsyncGenerator[AsyncSession, None]:
         async def get_users(db: AsyncSession = Depends(get_db)):
             # Use db session
     """
-    async with db_manager.session() as session:
+    scope = get_request_session()
+    if scope is None:
+        async with db_manager.session() as session:
+            yield session
+        return
+    
+    session = scope.get()
+    try:
+        yield session
+        await session.commit()
+    except Exception:
+        await session.rollback()
+        raise
+
+
+@asynccontextmanager
+async def request_session_scope() -> AsyncGenerator[RequestSession, None]:
+    """
+    Open a lazily created session shared by the current request.
+    
+    Yields:
+        RequestSession: Request session scope
+    """
+    scope = RequestSession(db_manager)
+    token = _request_session.set(scope)
+    pinned_token = _primary_pinned.set(False)
+    try:
+        yield scope
+    finally:
+        _primary_pinned.reset(pinned_token)
+        _request_session.reset(token)
+        await scope.close()
+
+
+async def get_read_db() -> AsyncGenerator[AsyncSession, None]:
+    """
+    Dependency to get a read-only database session.
+    
+    Reads are served by a read replica when one is configured and in sync,
+    otherwise by the primary.
+    
+    Yields:
+        AsyncSession: Read-only database session
+        
+    Example:
+        @router.get("/stats")
+        async def get_stats(db: AsyncSession = Depends(get_read_db)):
+            # Use db session for reporting queries
+    """
+    async with db_manager.read_session() as session:
         yield session
 
 
@@ -112,6 +458,14 @@ async def init_db() -> None:
     await db_manager.create_tables()
 
 
+async def start_db_monitors() -> None:
+    """Start background database monitors.
+    
+    This is called during application startup.
+    """
+    db_manager.start_replica_monitor()
+
+
 async def close_db() -> None:
     """Close database connections.
     
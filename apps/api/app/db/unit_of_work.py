@@ -7,9 +7,11 @@ from typing import TYPE_CHECKING, Any, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.db.session import db_manager
+from app.core.config import settings
+from app.db.session import db_manager, release_connection
 
 if TYPE_CHECKING:
+    from app.events.publisher import DomainEvent
     # Import repositories to avoid circular imports
     from app.repositories.agent import AgentRepository
     from app.repositories.customer import CustomerRepository
@@ -35,23 +37,48 @@ class UnitOfWork:
             user = await uow.users.create(db=uow.session, obj_in=user_data)
             org = await uow.organizations.create(db=uow.session, obj_in=org_data)
             await uow.commit()
+    
+    Sessions take a connection on the first statement and return it at
+    commit; release() hands back a read-only transaction's connection so
+    slow non-DB work doesn't pin a pool slot:
+        async with UnitOfWork() as uow:
+            link = await uow.payment_links.get(uow.session, id=link_id)
+            await uow.release()
+            await external_service.notify(link)
+    
+    Domain events staged with add_event are written to the event outbox in
+    the committed transaction, and relayed to the broker afterwards:
+        async with UnitOfWork() as uow:
+            link = await uow.payment_links.create(db=uow.session, obj_in=link_data)
+            uow.add_event(PaymentLinkCreatedEvent(payment_link_id=link.id, ...))
+            await uow.commit()
+    
+    Read-only units of work are served by a read replica when available:
+        async with UnitOfWork(read_only=True) as uow:
+            stats = await uow.organizations.get_stats(uow.session, organization_id=org_id)
     """
     
-    def __init__(self, session: Optional[AsyncSession] = None):
+    def __init__(self, session: Optional[AsyncSession] = None, read_only: bool = False):
         """
         Initialize Unit of Work.
         
         Args:
             session: Optional existing database session to use
+            read_only: Open a read-only (replica) session when no session is given
         """
         self._session = session
+        self.read_only = read_only
         self._repositories_cache: dict[str, Any] = {}
+        self._events: list[DomainEvent] = []
     
     async def __aenter__(self) -> UnitOfWork:
         """Enter the async context manager."""
         if self._session is None:
             # Create a new session if none provided
-            self._session_context = db_manager.session()
+            if self.read_only:
+                self._session_context = db_manager.read_session()
+            else:
+                self._session_context = db_manager.session()
             self._session = await self._session_context.__aenter__()
         return self
     
@@ -60,8 +87,9 @@ class UnitOfWork:
         if hasattr(self, "_session_context"):
             # Let the session context manager handle commit/rollback
             await self._session_context.__aexit__(exc_type, exc_val, exc_tb)
-        # Clear repository cache
+        # Clear repository cache and events that weren't committed
         self._repositories_cache.clear()
+        self._events.clear()
     
     @property
     def session(self) -> AsyncSession:
@@ -70,12 +98,57 @@ class UnitOfWork:
             raise RuntimeError("UnitOfWork must be used within async context manager")
         return self._session
     
+    async def release(self) -> bool:
+        """Return the connection to the pool before slow non-DB work.
+        
+        Only read-only transactions are ended; pending writes keep their
+        connection until commit. The next statement checks out a new one.
+        
+        Returns:
+            True if a connection was released
+        """
+        return await release_connection(self.session)
+    
+    def add_event(self, event: DomainEvent) -> None:
+        """Stage a domain event to be published with the next commit.
+        
+        Args:
+            event: Domain event produced by this unit of work
+        """
+        if self.read_only:
+            raise RuntimeError("Cannot add events to a read-only UnitOfWork")
+        self._events.append(event)
+    
     async def commit(self) -> None:
-        """Commit the current transaction."""
-        await self.session.commit()
+        """Commit the current transaction.
+        
+        Staged events are written to the event outbox in the same
+        transaction, then dispatched to in-process handlers. With the outbox
+        disabled they're published after the commit instead.
+        """
+        if self.read_only:
+            raise RuntimeError("Cannot commit a read-only UnitOfWork")
+        
+        events, self._events = self._events, []
+        if not events:
+            await self.session.commit()
+            return
+        
+        from app.events.local import dispatch
+        from app.events.outbox import write_outbox
+        from app.events.publisher import publish_events
+        
+        if settings.EVENT_OUTBOX_ENABLED:
+            await write_outbox(self.session, events)
+            await self.session.commit()
+            await dispatch(events)
+        else:
+            await self.session.commit()
+            await publish_events(events)
     
     async def rollback(self) -> None:
-        """Rollback the current transaction."""
+        """Rollback the current transaction and discard staged events."""
+        self._events.clear()
         await self.session.rollback()
     
     async def flush(self) -> None:
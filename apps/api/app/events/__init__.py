@@ -21,6 +21,7 @@ from .domain_events import (
     ProductCreatedEvent,
     ProductPriceUpdatedEvent,
     UserCreatedEvent,
+    UserUpdatedEvent,
     UserVerifiedEvent,
     UserWalletLinkedEvent,
     WalletCreatedEvent,
@@ -53,6 +54,7 @@ __all__ = [
     "publish_events",
     # Domain events
     "UserCreatedEvent",
+    "UserUpdatedEvent",
     "UserVerifiedEvent",
     "UserWalletLinkedEvent",
     "OrganizationCreatedEvent",
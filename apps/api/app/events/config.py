@@ -9,17 +9,105 @@ from typing import Optional
 
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.events.consumer import EventConsumer
+from app.events.local_broker import LocalBroker, LocalConsumer, LocalProducer
 from app.events.publisher import (
     EventPublisher,
     InMemoryEventPublisher,
+    LocalEventPublisher,
     LoggingEventPublisher,
     RedpandaEventPublisher,
     set_event_publisher,
 )
+from app.events.spill import SpillLog
 
 logger = get_logger(__name__)
 
 
+def create_local_broker() -> LocalBroker:
+    """Create a LocalBroker from the LOCAL_BROKER_* settings.
+    
+    Returns:
+        Broker on LOCAL_BROKER_DIR, shared by every process using it
+    """
+    return LocalBroker(
+        settings.LOCAL_BROKER_DIR,
+        partitions=settings.LOCAL_BROKER_PARTITIONS,
+        segment_bytes=settings.LOCAL_BROKER_SEGMENT_BYTES,
+        retention_ms=settings.LOCAL_BROKER_RETENTION_MS,
+        retention_bytes=settings.LOCAL_BROKER_RETENTION_BYTES
+    )
+
+
+def create_event_consumer(group_id: str, **options) -> EventConsumer:
+    """Create a consumer group member for the configured event bus.
+    
+    Args:
+        group_id: Consumer group
+        **options: EventConsumer options overriding the settings (e.g.
+            topics)
+    
+    Returns:
+        Event consumer; register handlers before starting it
+    
+    Raises:
+        ValueError: If the event bus can't be consumed from
+    """
+    event_bus_type = getattr(settings, "EVENT_BUS_TYPE", "logging").lower()
+    batch_size = options.get("batch_size", settings.EVENT_CONSUMER_BATCH_SIZE)
+    
+    if event_bus_type == "redpanda" or event_bus_type == "kafka":
+        bootstrap_servers = getattr(
+            settings,
+            "KAFKA_BOOTSTRAP_SERVERS",
+            "localhost:9092"
+        )
+        
+        def consumer_factory(topics):
+            from aiokafka import AIOKafkaConsumer
+            
+            return AIOKafkaConsumer(
+                *topics,
+                bootstrap_servers=bootstrap_servers,
+                client_id="wedi-api",
+                group_id=group_id,
+                enable_auto_commit=False,  # Committed after handling
+                auto_offset_reset="earliest",
+                max_poll_records=batch_size
+            )
+        
+        def producer_factory():
+            from aiokafka import AIOKafkaProducer
+            
+            return AIOKafkaProducer(
+                bootstrap_servers=bootstrap_servers,
+                client_id="wedi-api",
+                acks="all"
+            )
+    
+    elif event_bus_type == "local":
+        broker = create_local_broker()
+        
+        def consumer_factory(topics):
+            return LocalConsumer(broker, *topics, group_id=group_id, max_poll_records=batch_size)
+        
+        def producer_factory():
+            return LocalProducer(broker)
+    
+    else:
+        raise ValueError(f"Event bus {event_bus_type!r} has no broker to consume from")
+    
+    config = {
+        "topic_prefix": getattr(settings, "EVENT_TOPIC_PREFIX", "wedi.events"),
+        "batch_size": batch_size,
+        "max_pending": settings.EVENT_CONSUMER_MAX_PENDING,
+        "retries": settings.EVENT_CONSUMER_RETRIES,
+        "retry_backoff_ms": settings.EVENT_CONSUMER_RETRY_BACKOFF_MS,
+    }
+    config.update(options)
+    return EventConsumer(group_id, consumer_factory, producer_factory, **config)
+
+
 def configure_event_publisher() -> EventPublisher:
     """Configure the event publisher based on settings.
     
@@ -55,9 +143,50 @@ def configure_event_publisher() -> EventPublisher:
                 "compression_type": "gzip",
                 "acks": "all",  # Wait for all replicas
                 "enable_idempotence": True,  # Prevent duplicates
-                "max_in_flight_requests_per_connection": 5,
-                "retries": 3,
+                "linger_ms": settings.EVENT_LINGER_MS,
                 "retry_backoff_ms": 100,
+            },
+            pipeline_config={
+                "max_queue_size": settings.EVENT_QUEUE_MAX_SIZE,
+                "batch_size": settings.EVENT_BATCH_SIZE,
+                "linger_ms": settings.EVENT_LINGER_MS,
+                "lanes": settings.EVENT_DRAIN_LANES,
+                "retries": settings.EVENT_SEND_RETRIES,
+                "send_timeout_ms": settings.EVENT_SEND_TIMEOUT_MS,
+                "spill": SpillLog(
+                    settings.EVENT_SPILL_DIR,
+                    name="redpanda",
+                    segment_bytes=settings.EVENT_SPILL_SEGMENT_BYTES,
+                    max_bytes=settings.EVENT_SPILL_MAX_BYTES,
+                    fsync_interval_ms=settings.EVENT_SPILL_FSYNC_INTERVAL_MS
+                ) if settings.EVENT_SPILL_ENABLED else None,
+            }
+        )
+    
+    elif event_bus_type == "local":
+        # File-backed broker for development and load tests
+        topic_prefix = getattr(
+            settings,
+            "EVENT_TOPIC_PREFIX",
+            "wedi.events"
+        )
+        
+        logger.info(
+            "Configuring local broker event publisher",
+            directory=settings.LOCAL_BROKER_DIR,
+            partitions=settings.LOCAL_BROKER_PARTITIONS
+        )
+        
+        publisher = LocalEventPublisher(
+            broker=create_local_broker(),
+            topic_prefix=topic_prefix,
+            pipeline_config={
+                "max_queue_size": settings.EVENT_QUEUE_MAX_SIZE,
+                "batch_size": settings.EVENT_BATCH_SIZE,
+                "linger_ms": settings.EVENT_LINGER_MS,
+                "lanes": settings.EVENT_DRAIN_LANES,
+                "retries": settings.EVENT_SEND_RETRIES,
+                "send_timeout_ms": settings.EVENT_SEND_TIMEOUT_MS,
             }
         )
     
@@ -81,6 +210,9 @@ async def startup_event_publisher() -> None:
     """Initialize event publisher on application startup."""
     try:
         publisher = configure_event_publisher()
+        if isinstance(publisher, RedpandaEventPublisher):
+            # Replays events spilled to disk by a previous run
+            publisher.start()
         logger.info(
             "Event publisher initialized",
             publisher_type=type(publisher).__name__
@@ -103,7 +235,7 @@ async def shutdown_event_publisher() -> None:
     try:
         publisher = get_event_publisher()
         
-        # Close Redpanda producer if applicable
+        # Deliver queued events and close Redpanda producer if applicable
         if isinstance(publisher, RedpandaEventPublisher):
             await publisher.close()
             logger.info("Redpanda event publisher closed")
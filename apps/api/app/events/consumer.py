@@ -0,0 +1,518 @@
+"""
+Consumer runtime for domain events.
+
+An EventConsumer is one member of a consumer group. Handlers are registered
+by event type and receive events in batches, so a projection can write a
+whole batch in one statement. A fetch loop reads the partitions the group
+assigned to this member and hands each partition's records to its own
+worker task: partitions are processed concurrently, and the records of a
+partition strictly in offset order. Events are keyed by aggregate ID, so a
+handler sees each aggregate's events in the order they occurred.
+
+Offsets are committed once a batch was handled. Delivery is at least once:
+after a crash or a rebalance, records handled but not committed are handled
+again, so handlers must be idempotent (e.g. deduplicate by event_id). A
+worker that dies of an unexpected error is logged and restarted from the
+partition's last handled offset.
+
+A failing batch is retried with backoff. When it keeps failing, its events
+are handled one at a time, and those still failing are written with their
+error to the group's dead letter topic, "<topic>.<group>.dlq", so one bad
+event can't stall its partition.
+
+The runtime works with aiokafka against Redpanda and with the local broker;
+create_event_consumer in app.events.config builds one for EVENT_BUS_TYPE.
+"""
+import asyncio
+import json
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from app.core.logging import get_logger
+from app.core.monitoring import register_event_consumer_metrics
+from app.events.publisher import DomainEvent, get_topic_name
+
+logger = get_logger(__name__)
+
+BatchHandler = Callable[[List[DomainEvent]], Awaitable[None]]
+
+# Create the broker consumer for topics, and the dead letter producer
+ConsumerFactory = Callable[[List[str]], Any]
+ProducerFactory = Callable[[], Any]
+
+
+def _handler_name(handler: BatchHandler) -> str:
+    """Name a handler in logs; partials and callable objects have no __qualname__."""
+    return getattr(handler, "__qualname__", repr(handler))
+
+
+class EventConsumer:
+    """Consumer group member dispatching events to batch handlers."""
+    
+    def __init__(
+        self,
+        group_id: str,
+        consumer_factory: ConsumerFactory,
+        producer_factory: ProducerFactory,
+        topics: Optional[Iterable[str]] = None,
+        topic_prefix: str = "wedi.events",
+        batch_size: int = 500,
+        max_pending: int = 2000,
+        retries: int = 3,
+        retry_backoff_ms: int = 200,
+        poll_timeout_ms: int = 1000,
+        lag_interval_ms: int = 5000
+    ):
+        """Initialize the consumer.
+        
+        Args:
+            group_id: Consumer group sharing the partitions
+            consumer_factory: Creates the broker consumer (AIOKafkaConsumer
+                or LocalConsumer) of a list of topics, with auto commit
+                disabled
+            producer_factory: Creates the producer of the dead letter topic
+            topics: Topics to consume; by default the topics of the
+                aggregate types of the registered event types
+            topic_prefix: Prefix for topic names
+            batch_size: Maximum events passed to a handler at once
+            max_pending: Records fetched but not yet handled per partition
+                before fetching from it is paused
+            retries: Attempts to rerun a failed batch before its events are
+                handled one at a time
+            retry_backoff_ms: Delay before the first rerun, doubled for
+                each further one
+            poll_timeout_ms: Time a fetch waits for new records
+            lag_interval_ms: Interval between lag measurements
+        """
+        self.group_id = group_id
+        self.consumer_factory = consumer_factory
+        self.producer_factory = producer_factory
+        self.topics = list(topics) if topics else None
+        self.topic_prefix = topic_prefix
+        self.batch_size = batch_size
+        self.max_pending = max_pending
+        self.retries = retries
+        self.retry_backoff = retry_backoff_ms / 1000
+        self.poll_timeout_ms = poll_timeout_ms
+        self.lag_interval = lag_interval_ms / 1000
+        self._handlers: Dict[str, List[BatchHandler]] = {}
+        self._consumer = None
+        self._producer = None
+        self._fetch_task: Optional[asyncio.Task] = None
+        # Worker task and record queue per partition, and records queued
+        self._workers: Dict[Any, Tuple[asyncio.Task, asyncio.Queue]] = {}
+        self._pending: Dict[Any, int] = {}
+        # Offset of the next record to handle, per partition
+        self._handled: Dict[Any, int] = {}
+        # Partitions whose worker died, to restart from their handled offset
+        self._failed: Set[Any] = set()
+        self._lag_measured_at = 0.0
+        self.metrics = register_event_consumer_metrics(group_id)
+    
+    @property
+    def running(self) -> bool:
+        """Whether the fetch loop is running."""
+        return self._fetch_task is not None
+    
+    def handles(self, *event_types: str) -> Callable[[BatchHandler], BatchHandler]:
+        """Register an async batch handler for event types.
+        
+        Args:
+            *event_types: Event types (e.g. "payment_link.updated") to
+                handle, or "*" for every event of the consumed topics
+        
+        Returns:
+            Decorator registering the handler
+        
+        Example:
+            @consumer.handles("payment_link.created", "payment_link.updated")
+            async def project_links(events: List[DomainEvent]) -> None:
+                ...
+        """
+        def decorator(handler: BatchHandler) -> BatchHandler:
+            self.register(handler, *event_types)
+            return handler
+        return decorator
+    
+    def register(self, handler: BatchHandler, *event_types: str) -> None:
+        """Register an async batch handler for event types.
+        
+        Args:
+            handler: Coroutine function taking a list of events
+            *event_types: Event types to handle, or "*" for every event
+        """
+        for event_type in event_types:
+            self._handlers.setdefault(event_type, []).append(handler)
+    
+    def subscribed_topics(self) -> List[str]:
+        """Get the topics this consumer reads.
+        
+        Returns:
+            Configured topics, or those of the handled event types
+        
+        Raises:
+            ValueError: If no topics were configured and there are no
+                handlers, or one takes every event type
+        """
+        if self.topics:
+            return self.topics
+        if "*" in self._handlers:
+            raise ValueError("Consumers with '*' handlers need explicit topics")
+        if not self._handlers:
+            raise ValueError(f"No handlers registered for consumer group {self.group_id}")
+        
+        # Event types are named "<aggregate type>.<event>"
+        return sorted({
+            get_topic_name(event_type.split(".", 1)[0], self.topic_prefix)
+            for event_type in self._handlers
+        })
+    
+    async def start(self) -> None:
+        """Join the consumer group and start consuming."""
+        if self._fetch_task is not None:
+            return
+        
+        topics = self.subscribed_topics()
+        self._consumer = self.consumer_factory(topics)
+        await self._consumer.start()
+        self._fetch_task = asyncio.create_task(self._fetch(), name=f"{self.group_id}-fetch")
+        logger.info("event_consumer_started", group=self.group_id, topics=topics)
+    
+    async def stop(self) -> None:
+        """Stop consuming and leave the consumer group.
+        
+        Batches being handled are cancelled; their records are handled
+        again by the partition's next owner.
+        """
+        if self._fetch_task is None:
+            return
+        
+        self._fetch_task.cancel()
+        await asyncio.gather(self._fetch_task, return_exceptions=True)
+        self._fetch_task = None
+        await self._stop_workers(list(self._workers))
+        
+        await self._consumer.stop()
+        self._consumer = None
+        if self._producer is not None:
+            await self._producer.stop()
+            self._producer = None
+        logger.info("event_consumer_stopped", group=self.group_id)
+    
+    async def run(self) -> None:
+        """Consume until cancelled, e.g. as the main task of a worker process."""
+        await self.start()
+        try:
+            await asyncio.Event().wait()
+        finally:
+            await self.stop()
+    
+    async def _fetch(self) -> None:
+        """Fetch records and hand them to the partition workers until cancelled."""
+        backoff = self.retry_backoff
+        while True:
+            try:
+                batches = await self._consumer.getmany(
+                    timeout_ms=self.poll_timeout_ms,
+                    max_records=self.batch_size
+                )
+                await self._sync_workers()
+                await self._measure_lag()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    "event_consumer_fetch_failed",
+                    group=self.group_id,
+                    error=str(e),
+                    error_type=type(e).__name__
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+                continue
+            backoff = self.retry_backoff
+            
+            for tp, records in batches.items():
+                if tp not in self._workers:
+                    # Revoked by a rebalance during the fetch
+                    continue
+                self.metrics.record_consumed(len(records))
+                # Until a batch is handled, a restart resumes at the first fetched record
+                self._handled.setdefault(tp, records[0].offset)
+                self._workers[tp][1].put_nowait(records)
+                self._pending[tp] += len(records)
+                if self._pending[tp] >= self.max_pending:
+                    self._consumer.pause(tp)
+    
+    async def _sync_workers(self) -> None:
+        """Start workers for assigned partitions and stop those of revoked ones."""
+        assignment: Set[Any] = self._consumer.assignment()
+        await self._stop_workers([tp for tp in self._workers if tp not in assignment])
+        
+        self._failed &= assignment
+        
+        for tp in assignment:
+            if tp not in self._workers:
+                if tp in self._failed:
+                    await self._rewind(tp)
+                queue: asyncio.Queue = asyncio.Queue()
+                task = asyncio.create_task(
+                    self._work(tp, queue),
+                    name=f"{self.group_id}-{tp.topic}-{tp.partition}"
+                )
+                task.add_done_callback(lambda task, tp=tp: self._worker_done(tp, task))
+                self._workers[tp] = (task, queue)
+                self._pending[tp] = 0
+    
+    def _worker_done(self, tp: Any, task: asyncio.Task) -> None:
+        """Schedule the restart of a worker that died of an error.
+        
+        Its queued records are dropped; the fetch loop rewinds the partition
+        to the last handled offset and starts a new worker.
+        """
+        if task.cancelled() or task.exception() is None:
+            return
+        
+        error = task.exception()
+        self.metrics.record_worker_failure()
+        logger.error(
+            "event_consumer_worker_failed",
+            group=self.group_id,
+            topic=tp.topic,
+            partition=tp.partition,
+            error=str(error),
+            error_type=type(error).__name__,
+            exc_info=error
+        )
+        if self._workers.get(tp, (None,))[0] is task:
+            del self._workers[tp]
+            self._pending.pop(tp, None)
+            self._failed.add(tp)
+    
+    async def _rewind(self, tp: Any) -> None:
+        """Move a partition back to the first record not yet handled."""
+        self._failed.discard(tp)
+        offset = self._handled.get(tp)
+        if offset is None:
+            offset = await self._consumer.committed(tp)
+        if offset is not None:
+            self._consumer.seek(tp, offset)
+        if tp in self._consumer.paused():
+            self._consumer.resume(tp)
+        logger.info(
+            "event_consumer_worker_restarted",
+            group=self.group_id,
+            topic=tp.topic,
+            partition=tp.partition,
+            offset=offset
+        )
+    
+    async def _stop_workers(self, partitions: List[Any]) -> None:
+        """Cancel the workers of partitions and drop their queued records."""
+        tasks = []
+        for tp in partitions:
+            task, _ = self._workers.pop(tp)
+            self._pending.pop(tp, None)
+            self._handled.pop(tp, None)
+            task.cancel()
+            tasks.append(task)
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def _work(self, tp: Any, queue: asyncio.Queue) -> None:
+        """Handle a partition's records in order and commit their offsets.
+        
+        Args:
+            tp: Topic partition
+            queue: Lists of fetched records, in offset order
+        """
+        while True:
+            records = list(await queue.get())
+            # Catch up on records that queued up meanwhile
+            while not queue.empty() and len(records) < self.batch_size:
+                records.extend(queue.get_nowait())
+            
+            await self._handle(records)
+            await self._commit(tp, records[-1].offset + 1)
+            
+            self._pending[tp] -= len(records)
+            if self._pending[tp] < self.max_pending and tp in self._consumer.paused():
+                self._consumer.resume(tp)
+    
+    async def _handle(self, records: List[Any]) -> None:
+        """Run the handlers of a partition's records.
+        
+        Each handler gets its events in one batch, in offset order.
+        Records that aren't valid events go to the dead letter topic.
+        
+        Args:
+            records: Consumer records, in offset order
+        """
+        batches: Dict[BatchHandler, List[Tuple[Any, DomainEvent]]] = {}
+        for record in records:
+            try:
+                event = DomainEvent.model_validate_json(record.value)
+            except Exception as e:
+                await self._dead_letter(record, None, e)
+                continue
+            
+            handlers = [*self._handlers.get(event.event_type, ()), *self._handlers.get("*", ())]
+            for handler in handlers:
+                batches.setdefault(handler, []).append((record, event))
+        
+        for handler, batch in batches.items():
+            await self._run_handler(handler, batch)
+    
+    async def _run_handler(self, handler: BatchHandler, batch: List[Tuple[Any, DomainEvent]]) -> None:
+        """Run a handler, retrying with backoff before isolating failing events.
+        
+        Args:
+            handler: Batch handler
+            batch: (record, event) pairs, in offset order
+        """
+        backoff = self.retry_backoff
+        for attempt in range(self.retries + 1):
+            try:
+                await self._call(handler, [event for _, event in batch])
+                return
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    "event_handler_failed",
+                    group=self.group_id,
+                    handler=_handler_name(handler),
+                    error=str(e),
+                    attempt=attempt + 1,
+                    event_count=len(batch)
+                )
+                error = e
+                if attempt < self.retries:
+                    await asyncio.sleep(backoff)
+                    backoff *= 2
+        
+        if len(batch) == 1:
+            await self._dead_letter(batch[0][0], handler, error)
+            return
+        
+        # Find the events that keep failing and handle the rest
+        for record, event in batch:
+            try:
+                await self._call(handler, [event])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                await self._dead_letter(record, handler, e)
+    
+    async def _call(self, handler: BatchHandler, events: List[DomainEvent]) -> None:
+        """Call a handler and record its timing or failure."""
+        started_at = time.perf_counter()
+        try:
+            await handler(events)
+        except asyncio.CancelledError:
+            raise
+        except Exception:
+            self.metrics.record_handler_failure()
+            raise
+        self.metrics.record_batch(len(events), time.perf_counter() - started_at)
+    
+    async def _dead_letter(self, record: Any, handler: Optional[BatchHandler], error: Exception) -> None:
+        """Write a record that couldn't be handled to the dead letter topic.
+        
+        Retries with backoff, capped at 30 seconds, until the broker takes
+        it: the partition doesn't move past a record that is neither
+        handled nor dead-lettered.
+        
+        Args:
+            record: Consumer record
+            handler: Handler that failed; None if the record isn't a valid
+                event
+            error: Last error
+        """
+        topic = f"{record.topic}.{self.group_id}.dlq"
+        value = json.dumps({
+            "group": self.group_id,
+            "topic": record.topic,
+            "partition": record.partition,
+            "offset": record.offset,
+            "handler": _handler_name(handler) if handler is not None else None,
+            "error": str(error),
+            "error_type": type(error).__name__,
+            "failed_at": datetime.utcnow().isoformat(),
+            "value": record.value.decode(errors="replace"),
+        }).encode()
+        
+        backoff = self.retry_backoff
+        while True:
+            try:
+                if self._producer is None:
+                    producer = self.producer_factory()
+                    await producer.start()
+                    self._producer = producer
+                await self._producer.send_and_wait(topic, value, key=record.key)
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(
+                    "dead_letter_failed",
+                    group=self.group_id,
+                    topic=topic,
+                    error=str(e)
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+        
+        self.metrics.record_dead_letter()
+        logger.error(
+            "event_dead_lettered",
+            group=self.group_id,
+            topic=record.topic,
+            partition=record.partition,
+            offset=record.offset,
+            dead_letter_topic=topic,
+            error=str(error),
+            error_type=type(error).__name__
+        )
+    
+    async def _commit(self, tp: Any, offset: int) -> None:
+        """Commit the offset of the next record to handle.
+        
+        A failed commit is only logged: the records are handled again if
+        no later commit of the partition succeeds.
+        
+        Args:
+            tp: Topic partition
+            offset: Offset after the last handled record
+        """
+        self._handled[tp] = offset
+        try:
+            await self._consumer.commit({tp: offset})
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            self.metrics.record_commit_failure()
+            logger.warning(
+                "event_consumer_commit_failed",
+                group=self.group_id,
+                topic=tp.topic,
+                partition=tp.partition,
+                error=str(e)
+            )
+    
+    async def _measure_lag(self) -> None:
+        """Record how far each owned partition is behind its end, when due."""
+        now = time.monotonic()
+        if now - self._lag_measured_at < self.lag_interval or not self._workers:
+            return
+        self._lag_measured_at = now
+        
+        partitions = list(self._workers)
+        end_offsets = await self._consumer.end_offsets(partitions)
+        lag = {}
+        for tp in partitions:
+            handled = self._handled.get(tp)
+            if handled is None:
+                handled = await self._consumer.committed(tp) or 0
+            lag[f"{tp.topic}:{tp.partition}"] = max(end_offsets[tp] - handled, 0)
+        self.metrics.record_lag(lag)
@@ -5,7 +5,7 @@ This module contains concrete event classes for different domain entities.
 """
 from datetime import datetime
 from decimal import Decimal
-from typing import Any, Dict, Optional
+from typing import Any, Dict, List, Optional
 
 from pydantic import Field
 
@@ -83,6 +83,25 @@ class UserWalletLinkedEvent(DomainEvent):
         )
 
 
+class UserUpdatedEvent(DomainEvent):
+    """Event emitted when a user's profile or account fields change."""
+    
+    def __init__(
+        self,
+        user_id: str,
+        updated_fields: List[str],
+        **kwargs
+    ):
+        """Initialize user updated event."""
+        super().__init__(
+            event_type="user.updated",
+            aggregate_id=user_id,
+            aggregate_type="user",
+            data={"updated_fields": sorted(updated_fields)},
+            **kwargs
+        )
+
+
 # Organization Events
 class OrganizationCreatedEvent(DomainEvent):
     """Event emitted when a new organization is created."""
@@ -6,6 +6,7 @@ that can be injected as a FastAPI dependency.
 """
 from typing import List, Optional
 
+from app.events.local import dispatch
 from app.events.publisher import (
     DomainEvent,
     EventPublisher,
@@ -42,14 +43,16 @@ class EventPublisherWrapper(EventPublisher):
     async def publish(self, event: DomainEvent) -> None:
         """Publish a single event."""
         await self._publisher.publish(event)
+        await dispatch([event])
     
     async def publish_event(self, event: DomainEvent) -> None:
         """Publish a single event (alias for publish)."""
-        await self._publisher.publish(event)
+        await self.publish(event)
     
     async def publish_batch(self, events: List[DomainEvent]) -> None:
         """Publish multiple events in batch."""
         await self._publisher.publish_batch(events)
+        await dispatch(events)
     
     def __getattr__(self, name):
         """Forward any other attributes to the wrapped publisher."""
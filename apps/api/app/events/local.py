@@ -0,0 +1,70 @@
+"""
+In-process event handlers.
+
+Handlers registered here run in the publishing process right after an event
+is published, e.g. to invalidate local caches. They are best effort: a
+failing handler is logged and never fails the publish.
+"""
+from collections import defaultdict
+from typing import TYPE_CHECKING, Awaitable, Callable, Dict, Iterable, List
+
+from app.core.logging import get_logger
+
+if TYPE_CHECKING:
+    from app.events.publisher import DomainEvent
+
+logger = get_logger(__name__)
+
+EventHandler = Callable[["DomainEvent"], Awaitable[None]]
+
+_handlers: Dict[str, List[EventHandler]] = defaultdict(list)
+
+
+def subscribe(*event_types: str) -> Callable[[EventHandler], EventHandler]:
+    """Register an async handler for event types.
+    
+    Args:
+        *event_types: Event types (e.g. "payment_link.updated") to handle,
+            or "*" for every event
+    
+    Returns:
+        Decorator registering the handler
+    
+    Example:
+        @subscribe("payment_link.updated")
+        async def on_link_updated(event: DomainEvent) -> None:
+            ...
+    """
+    def decorator(handler: EventHandler) -> EventHandler:
+        for event_type in event_types:
+            _handlers[event_type].append(handler)
+        return handler
+    return decorator
+
+
+def unsubscribe(handler: EventHandler) -> None:
+    """Remove a handler from every event type it handles."""
+    for handlers in _handlers.values():
+        if handler in handlers:
+            handlers.remove(handler)
+
+
+async def dispatch(events: Iterable["DomainEvent"]) -> None:
+    """Run the local handlers of published events.
+    
+    Args:
+        events: Published domain events
+    """
+    for event in events:
+        handlers = [*_handlers.get(event.event_type, ()), *_handlers.get("*", ())]
+        for handler in handlers:
+            try:
+                await handler(event)
+            except Exception as e:
+                logger.error(
+                    "local_event_handler_failed",
+                    event_type=event.event_type,
+                    event_id=event.event_id,
+                    handler=getattr(handler, "__qualname__", repr(handler)),
+                    error=str(e)
+                )
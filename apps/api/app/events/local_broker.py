@@ -0,0 +1,959 @@
+"""
+File-backed stand-in for a Kafka-compatible broker.
+
+Selected with EVENT_BUS_TYPE=local, it lets events flow end to end on one
+machine without Redpanda: records are partitioned by key, get offsets per
+partition, and are read by consumer groups that share the partitions and
+commit offsets, in this process or any other on the box, with consumer lag
+building up the way it does against a real broker.
+
+Layout under the broker directory:
+
+    <topic>/<partition>/<base offset>.log           append-only segments
+    <topic>/<partition>/lock                        serializes appends
+    __groups/<group>/<topic>/<partition>.offset     committed offset
+    __groups/<group>/<topic>/<partition>.lock       held by the owner
+    __groups/<group>/members/<member ID>            member heartbeats
+
+A record is a header (offset, timestamp, key length, value length, CRC32 of
+key and value) followed by the key and the value. Appends from every
+process are serialized by an flock on the partition. Files aren't fsynced:
+this broker is for development and load tests, not for surviving a machine
+crash. A partition starts a new segment every segment_bytes; closed
+segments are deleted once older than retention_ms or beyond
+retention_bytes, checked whenever a segment is rolled.
+
+Keys are hashed with CRC32 rather than Kafka's murmur2, so an aggregate
+lands on a different partition number than it would on Redpanda.
+
+Consumers of a group each claim a fair share of the partitions with
+non-blocking flocks, and hand partitions over as members join and leave,
+so a partition is read by one member at a time. Delivery is at least once:
+records consumed but not committed when a partition changes hands are read
+again by its next owner.
+"""
+import asyncio
+import fcntl
+import os
+import socket
+import struct
+import threading
+import time
+import zlib
+from bisect import bisect_right
+from itertools import count
+from math import ceil
+from pathlib import Path
+from typing import (
+    BinaryIO,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    NamedTuple,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+)
+from uuid import uuid4
+
+from app.core.executors import run_blocking_io
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Record header: offset, timestamp (ms), key length (-1 without a key),
+# value length, CRC32 of key and value
+_HEADER = struct.Struct(">QqiII")
+
+_SEGMENT_SUFFIX = ".log"
+_GROUPS = "__groups"
+_READ_CHUNK = 1024 * 1024
+
+
+class TopicPartition(NamedTuple):
+    """Partition of a topic."""
+    
+    topic: str
+    partition: int
+
+
+class RecordMetadata(NamedTuple):
+    """Position a record was appended at."""
+    
+    topic: str
+    partition: int
+    offset: int
+    timestamp: int
+
+
+class ConsumerRecord(NamedTuple):
+    """Record read from a partition."""
+    
+    topic: str
+    partition: int
+    offset: int
+    timestamp: int
+    key: Optional[bytes]
+    value: bytes
+
+
+# Read position: offset, segment and byte position of the record at offset
+_Cursor = Tuple[int, int, int]
+
+
+class _Partition:
+    """Segment files of one topic partition."""
+    
+    def __init__(self, path: Path, segment_bytes: int):
+        """Initialize the partition.
+        
+        Args:
+            path: Partition directory
+            segment_bytes: Size at which a new segment is started
+        """
+        self.path = path
+        self.segment_bytes = segment_bytes
+        self._lock = threading.Lock()
+        self._lock_file: Optional[BinaryIO] = None
+        self._writer: Optional[BinaryIO] = None
+        # Active segment and its size and next offset, as last seen
+        self._active = -1
+        self._size = 0
+        self._next_offset = 0
+    
+    def segments(self) -> List[int]:
+        """Get the base offsets of the segment files, oldest first."""
+        try:
+            names = os.listdir(self.path)
+        except FileNotFoundError:
+            return []
+        return sorted(
+            int(name[:-len(_SEGMENT_SUFFIX)])
+            for name in names if name.endswith(_SEGMENT_SUFFIX)
+        )
+    
+    def append(self, records: Sequence[Tuple[Optional[bytes], bytes]], timestamp: int) -> Tuple[int, bool]:
+        """Append records with consecutive offsets.
+        
+        Args:
+            records: (key, value) pairs, in order
+            timestamp: Append time in milliseconds
+        
+        Returns:
+            Offset of the first record, and whether a new segment was
+            started
+        """
+        with self._locked():
+            rolled = self._size >= self.segment_bytes
+            if rolled:
+                self._open_segment(self._next_offset)
+            
+            first_offset = self._next_offset
+            chunks = []
+            for key, value in records:
+                chunks.append(_encode(self._next_offset, timestamp, key, value))
+                self._next_offset += 1
+            
+            data = memoryview(b"".join(chunks))
+            while data:
+                data = data[self._writer.write(data):]
+            self._size += sum(len(chunk) for chunk in chunks)
+            return first_offset, rolled
+    
+    def end_offset(self) -> int:
+        """Get the offset the next appended record will get."""
+        with self._locked():
+            return self._next_offset
+    
+    def read(self, offset: int, max_records: int, cursor: Optional[_Cursor] = None) -> Tuple[List[Tuple[int, int, Optional[bytes], bytes]], Optional[_Cursor]]:
+        """Read records from an offset.
+        
+        Reading before the oldest record, deleted by retention, starts at
+        the oldest record.
+        
+        Args:
+            offset: Offset of the first record to read
+            max_records: Maximum records returned
+            cursor: Cursor returned by the previous read, which skips
+                scanning the segment for offset
+        
+        Returns:
+            (offset, timestamp, key, value) of each record, and the cursor
+            of the next read
+        """
+        segments = self.segments()
+        if not segments:
+            return [], None
+        
+        offset = max(offset, segments[0])
+        index = bisect_right(segments, offset) - 1
+        position = 0
+        if cursor is not None and cursor[0] == offset and cursor[1] == segments[index]:
+            position = cursor[2]
+        
+        records = []
+        while True:
+            try:
+                file = open(self._segment_path(segments[index]), "rb")
+            except FileNotFoundError:
+                # Deleted by retention since the listing
+                return self.read(offset, max_records)
+            
+            with file:
+                for record in _read_records(file, position):
+                    position = record[-1]
+                    if record[0] < offset:
+                        continue
+                    records.append(record[:-1])
+                    if len(records) == max_records:
+                        break
+            
+            if len(records) == max_records or index == len(segments) - 1:
+                break
+            index += 1
+            position = 0
+        
+        next_offset = records[-1][0] + 1 if records else offset
+        return records, (next_offset, segments[index], position)
+    
+    def enforce_retention(self, retention_ms: int, retention_bytes: int) -> int:
+        """Delete closed segments beyond the retention limits.
+        
+        Args:
+            retention_ms: Age after which a closed segment is deleted
+            retention_bytes: Partition size beyond which the oldest closed
+                segments are deleted
+        
+        Returns:
+            Number of segments deleted
+        """
+        segments = self.segments()
+        sizes = {}
+        for segment in segments:
+            try:
+                sizes[segment] = self._segment_path(segment).stat()
+            except FileNotFoundError:
+                pass
+        
+        total = sum(stat.st_size for stat in sizes.values())
+        cutoff = time.time() - retention_ms / 1000
+        deleted = 0
+        for segment in segments[:-1]:
+            stat = sizes.get(segment)
+            if stat is None:
+                continue
+            if stat.st_mtime >= cutoff and total <= retention_bytes:
+                break
+            try:
+                self._segment_path(segment).unlink()
+                deleted += 1
+            except FileNotFoundError:
+                pass
+            total -= stat.st_size
+        return deleted
+    
+    def close(self) -> None:
+        """Close the partition's files."""
+        with self._lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+                self._active = -1
+            if self._lock_file is not None:
+                self._lock_file.close()
+                self._lock_file = None
+    
+    def _locked(self) -> "_AppendLock":
+        """Lock the partition against appends of other threads and processes."""
+        return _AppendLock(self)
+    
+    def _catch_up(self) -> None:
+        """Pick up segments and records appended by other processes.
+        
+        Must hold the append lock. A torn record at the end of the active
+        segment, from a crash during an append, is truncated.
+        """
+        segments = self.segments()
+        active = segments[-1] if segments else 0
+        if active != self._active:
+            self._open_segment(active)
+        
+        size = os.fstat(self._writer.fileno()).st_size
+        if size == self._size:
+            return
+        
+        valid = self._size
+        with open(self._segment_path(active), "rb") as file:
+            for record in _read_records(file, self._size):
+                self._next_offset = record[0] + 1
+                valid = record[-1]
+        
+        if valid < size:
+            logger.warning(
+                "local_broker_segment_truncated",
+                partition=str(self.path),
+                segment=active,
+                lost_bytes=size - valid
+            )
+            os.truncate(self._segment_path(active), valid)
+        self._size = valid
+    
+    def _open_segment(self, segment: int) -> None:
+        """Switch appends to a segment, creating it if needed."""
+        if self._writer is not None:
+            self._writer.close()
+        self._writer = open(self._segment_path(segment), "ab", buffering=0)
+        self._active = segment
+        self._size = 0
+        self._next_offset = segment
+    
+    def _segment_path(self, segment: int) -> Path:
+        """Get the file of a segment."""
+        return self.path / f"{segment:020d}{_SEGMENT_SUFFIX}"
+
+
+class _AppendLock:
+    """Holds a partition's thread lock and flock, catching up on entry."""
+    
+    def __init__(self, partition: _Partition):
+        self.partition = partition
+    
+    def __enter__(self) -> None:
+        partition = self.partition
+        partition._lock.acquire()
+        try:
+            if partition._lock_file is None:
+                partition.path.mkdir(parents=True, exist_ok=True)
+                partition._lock_file = open(partition.path / "lock", "ab")
+            fcntl.flock(partition._lock_file, fcntl.LOCK_EX)
+        except BaseException:
+            partition._lock.release()
+            raise
+        try:
+            partition._catch_up()
+        except BaseException:
+            self.__exit__()
+            raise
+    
+    def __exit__(self, *exc_info) -> None:
+        fcntl.flock(self.partition._lock_file, fcntl.LOCK_UN)
+        self.partition._lock.release()
+
+
+class LocalBroker:
+    """Topics of partitioned segment files in a local directory."""
+    
+    def __init__(
+        self,
+        directory: str,
+        partitions: int = 8,
+        segment_bytes: int = 16 * 1024 * 1024,
+        retention_ms: int = 24 * 60 * 60 * 1000,
+        retention_bytes: int = 1024 * 1024 * 1024
+    ):
+        """Initialize the broker.
+        
+        Args:
+            directory: Directory holding the topics; processes sharing it
+                share the broker
+            partitions: Number of partitions of topics created by appends
+            segment_bytes: Size at which a partition starts a new segment
+            retention_ms: Age after which closed segments are deleted
+            retention_bytes: Partition size beyond which the oldest closed
+                segments are deleted
+        """
+        self.directory = Path(directory)
+        self.partitions = partitions
+        self.segment_bytes = segment_bytes
+        self.retention_ms = retention_ms
+        self.retention_bytes = retention_bytes
+        self._lock = threading.Lock()
+        self._topics: Dict[str, int] = {}
+        self._partitions: Dict[TopicPartition, _Partition] = {}
+        self._round_robin = count()
+    
+    def create_topic(self, topic: str, partitions: Optional[int] = None) -> int:
+        """Create a topic unless it exists.
+        
+        Args:
+            topic: Topic name
+            partitions: Number of partitions; the broker default when not
+                given
+        
+        Returns:
+            Number of partitions of the topic
+        """
+        with self._lock:
+            if topic not in self._topics:
+                existing = self.partitions_for(topic)
+                if not existing:
+                    for partition in range(partitions or self.partitions):
+                        (self.directory / topic / str(partition)).mkdir(parents=True, exist_ok=True)
+                    existing = self.partitions_for(topic)
+                self._topics[topic] = len(existing)
+            return self._topics[topic]
+    
+    def partitions_for(self, topic: str) -> List[int]:
+        """Get the partition numbers of a topic.
+        
+        Args:
+            topic: Topic name
+        
+        Returns:
+            Partition numbers; empty if the topic doesn't exist
+        """
+        try:
+            names = os.listdir(self.directory / topic)
+        except FileNotFoundError:
+            return []
+        return sorted(int(name) for name in names if name.isdigit())
+    
+    def topics(self) -> List[str]:
+        """Get the names of every topic."""
+        try:
+            names = os.listdir(self.directory)
+        except FileNotFoundError:
+            return []
+        return sorted(name for name in names if name != _GROUPS)
+    
+    def append(self, records: Sequence[Tuple[str, Optional[bytes], bytes]]) -> List[RecordMetadata]:
+        """Append records, creating their topics as needed.
+        
+        Records with a key go to the partition the key hashes to; records
+        without one are spread round-robin. Records of a partition keep
+        their order.
+        
+        Args:
+            records: (topic, key, value) triples
+        
+        Returns:
+            Position of each record, in the same order
+        """
+        timestamp = int(time.time() * 1000)
+        batches: Dict[TopicPartition, List[int]] = {}
+        for index, (topic, key, _) in enumerate(records):
+            partitions = self.create_topic(topic)
+            if key is None:
+                partition = next(self._round_robin) % partitions
+            else:
+                partition = zlib.crc32(key) % partitions
+            batches.setdefault(TopicPartition(topic, partition), []).append(index)
+        
+        metadata: List[Optional[RecordMetadata]] = [None] * len(records)
+        for tp, indexes in batches.items():
+            partition = self._partition(tp)
+            first_offset, rolled = partition.append(
+                [records[index][1:] for index in indexes],
+                timestamp
+            )
+            for position, index in enumerate(indexes):
+                metadata[index] = RecordMetadata(tp.topic, tp.partition, first_offset + position, timestamp)
+            if rolled:
+                partition.enforce_retention(self.retention_ms, self.retention_bytes)
+        return metadata
+    
+    def fetch(self, tp: TopicPartition, offset: int, max_records: int, cursor: Optional[_Cursor] = None) -> Tuple[List[ConsumerRecord], Optional[_Cursor]]:
+        """Read records of a partition from an offset.
+        
+        Offsets deleted by retention are skipped.
+        
+        Args:
+            tp: Topic partition
+            offset: Offset of the first record to read
+            max_records: Maximum records returned
+            cursor: Cursor returned by the previous fetch of the partition
+        
+        Returns:
+            Records in offset order, and the cursor for the next fetch
+        """
+        records, cursor = self._partition(tp).read(offset, max_records, cursor)
+        return [ConsumerRecord(tp.topic, tp.partition, *record) for record in records], cursor
+    
+    def log_start_offset(self, tp: TopicPartition) -> int:
+        """Get the offset of the oldest record kept."""
+        segments = self._partition(tp).segments()
+        return segments[0] if segments else 0
+    
+    def end_offset(self, tp: TopicPartition) -> int:
+        """Get the offset the next record appended to a partition will get."""
+        return self._partition(tp).end_offset()
+    
+    def committed(self, group: str, tp: TopicPartition) -> Optional[int]:
+        """Get a group's committed offset of a partition.
+        
+        Args:
+            group: Consumer group
+            tp: Topic partition
+        
+        Returns:
+            Offset of the next record to consume, or None if the group
+            never committed one
+        """
+        try:
+            return int(self._offset_path(group, tp).read_text())
+        except (FileNotFoundError, ValueError):
+            return None
+    
+    def commit(self, group: str, offsets: Dict[TopicPartition, int]) -> None:
+        """Store a group's offsets.
+        
+        Args:
+            group: Consumer group
+            offsets: Offset of the next record to consume, by partition
+        """
+        for tp, offset in offsets.items():
+            path = self._offset_path(group, tp)
+            path.parent.mkdir(parents=True, exist_ok=True)
+            temporary = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+            temporary.write_text(str(offset))
+            os.replace(temporary, path)
+    
+    def lag(self, group: str, topic: str) -> Dict[int, int]:
+        """Get a group's consumer lag on a topic.
+        
+        Args:
+            group: Consumer group
+            topic: Topic name
+        
+        Returns:
+            Records not yet committed by the group, by partition
+        """
+        lag = {}
+        for partition in self.partitions_for(topic):
+            tp = TopicPartition(topic, partition)
+            committed = self.committed(group, tp)
+            if committed is None:
+                committed = self.log_start_offset(tp)
+            lag[partition] = max(self.end_offset(tp) - committed, 0)
+        return lag
+    
+    def enforce_retention(self) -> int:
+        """Delete closed segments beyond the retention limits in every topic.
+        
+        Returns:
+            Number of segments deleted
+        """
+        deleted = 0
+        for topic in self.topics():
+            for partition in self.partitions_for(topic):
+                deleted += self._partition(TopicPartition(topic, partition)).enforce_retention(
+                    self.retention_ms,
+                    self.retention_bytes
+                )
+        return deleted
+    
+    def close(self) -> None:
+        """Close every open partition file."""
+        with self._lock:
+            partitions, self._partitions = self._partitions, {}
+        for partition in partitions.values():
+            partition.close()
+    
+    def group_path(self, group: str) -> Path:
+        """Get the directory of a consumer group's state."""
+        return self.directory / _GROUPS / group
+    
+    def _partition(self, tp: TopicPartition) -> _Partition:
+        """Get a partition's segment files."""
+        partition = self._partitions.get(tp)
+        if partition is None:
+            with self._lock:
+                partition = self._partitions.setdefault(tp, _Partition(
+                    self.directory / tp.topic / str(tp.partition),
+                    self.segment_bytes
+                ))
+        return partition
+    
+    def _offset_path(self, group: str, tp: TopicPartition) -> Path:
+        """Get the file of a group's committed offset."""
+        return self.group_path(group) / tp.topic / f"{tp.partition}.offset"
+
+
+class LocalProducer:
+    """Producer for a LocalBroker.
+    
+    Implements the part of AIOKafkaProducer's interface the event
+    publisher uses. Records sent in the same event loop iteration are
+    appended together, in one trip to the I/O thread pool.
+    """
+    
+    def __init__(self, broker: LocalBroker):
+        """Initialize the producer.
+        
+        Args:
+            broker: Broker to append to
+        """
+        self.broker = broker
+        self._pending: List[Tuple[str, Optional[bytes], bytes, asyncio.Future]] = []
+        self._flush_task: Optional[asyncio.Task] = None
+    
+    async def start(self) -> None:
+        """Start the producer."""
+    
+    async def send(self, topic: str, value: bytes, key: Optional[bytes] = None) -> asyncio.Future:
+        """Queue a record for appending.
+        
+        Args:
+            topic: Topic name
+            value: Record value
+            key: Record key choosing the partition
+        
+        Returns:
+            Future resolving to the record's RecordMetadata
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((topic, key, value, future))
+        if self._flush_task is None or self._flush_task.done():
+            self._flush_task = asyncio.create_task(self._flush(), name="local-broker-producer")
+        return future
+    
+    async def send_and_wait(self, topic: str, value: bytes, key: Optional[bytes] = None) -> RecordMetadata:
+        """Append a record and wait for its position."""
+        return await (await self.send(topic, value, key=key))
+    
+    async def stop(self) -> None:
+        """Append the records still queued."""
+        if self._flush_task is not None:
+            await asyncio.gather(self._flush_task, return_exceptions=True)
+            self._flush_task = None
+    
+    async def _flush(self) -> None:
+        """Append queued records until none are left."""
+        while self._pending:
+            batch, self._pending = self._pending, []
+            try:
+                metadata = await run_blocking_io(
+                    self.broker.append,
+                    [(topic, key, value) for topic, key, value, _ in batch]
+                )
+            except Exception as e:
+                for *_, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+            
+            for (*_, future), record in zip(batch, metadata):
+                if not future.done():
+                    future.set_result(record)
+
+
+class LocalConsumer:
+    """Member of a consumer group of a LocalBroker.
+    
+    Implements the part of AIOKafkaConsumer's interface the event consumer
+    runtime uses. Offsets aren't committed automatically. A partition
+    without a committed offset is read from its oldest record.
+    """
+    
+    def __init__(
+        self,
+        broker: LocalBroker,
+        *topics: str,
+        group_id: str,
+        max_poll_records: int = 500,
+        session_timeout_ms: int = 10000,
+        heartbeat_interval_ms: int = 1000,
+        fetch_interval_ms: int = 50
+    ):
+        """Initialize the consumer.
+        
+        Args:
+            broker: Broker to read from
+            *topics: Topics to consume
+            group_id: Consumer group sharing the partitions
+            max_poll_records: Maximum records returned by one getmany
+            session_timeout_ms: Time after its last heartbeat a member is
+                considered gone and its share handed to the others
+            heartbeat_interval_ms: Interval between heartbeats, which also
+                rebalance the partitions
+            fetch_interval_ms: Pause between reads of partitions without
+                new records while getmany waits
+        """
+        self.broker = broker
+        self.topics: Tuple[str, ...] = topics
+        self.group_id = group_id
+        self.max_poll_records = max_poll_records
+        self.session_timeout = session_timeout_ms / 1000
+        self.heartbeat_interval = heartbeat_interval_ms / 1000
+        self.fetch_interval = fetch_interval_ms / 1000
+        self.member_id = f"{socket.gethostname()}-{os.getpid()}-{uuid4().hex[:8]}"
+        self._lock = threading.Lock()
+        # Lock files of the partitions this member owns
+        self._owned: Dict[TopicPartition, BinaryIO] = {}
+        self._positions: Dict[TopicPartition, int] = {}
+        self._cursors: Dict[TopicPartition, _Cursor] = {}
+        self._paused: Set[TopicPartition] = set()
+        self._last_heartbeat = 0.0
+        self._next_partition = 0
+    
+    async def start(self) -> None:
+        """Join the group and claim a share of the partitions."""
+        await run_blocking_io(self._join)
+    
+    def subscribe(self, topics: Iterable[str]) -> None:
+        """Replace the consumed topics; partitions are claimed on the next poll."""
+        self.topics = tuple(topics)
+        self._last_heartbeat = 0.0
+    
+    def assignment(self) -> Set[TopicPartition]:
+        """Get the partitions this member owns."""
+        return set(self._owned)
+    
+    async def getmany(self, timeout_ms: int = 0, max_records: Optional[int] = None) -> Dict[TopicPartition, List[ConsumerRecord]]:
+        """Read the next records of the owned partitions.
+        
+        Args:
+            timeout_ms: Time to wait for records when none are available
+            max_records: Maximum records returned; max_poll_records when
+                not given
+        
+        Returns:
+            Records in offset order, by partition
+        """
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + timeout_ms / 1000
+        while True:
+            records = await run_blocking_io(self._poll, max_records or self.max_poll_records)
+            remaining = deadline - loop.time()
+            if records or remaining <= 0:
+                return records
+            await asyncio.sleep(min(self.fetch_interval, remaining))
+    
+    def pause(self, *partitions: TopicPartition) -> None:
+        """Stop reading from partitions until they're resumed."""
+        self._paused.update(partitions)
+    
+    def resume(self, *partitions: TopicPartition) -> None:
+        """Read from paused partitions again."""
+        self._paused.difference_update(partitions)
+    
+    def paused(self) -> Set[TopicPartition]:
+        """Get the paused partitions."""
+        return set(self._paused)
+    
+    def seek(self, tp: TopicPartition, offset: int) -> None:
+        """Move the read position of an owned partition."""
+        self._positions[tp] = offset
+    
+    async def position(self, tp: TopicPartition) -> int:
+        """Get the offset of the next record read from an owned partition."""
+        return self._positions[tp]
+    
+    async def committed(self, tp: TopicPartition) -> Optional[int]:
+        """Get the group's committed offset of a partition."""
+        return await run_blocking_io(self.broker.committed, self.group_id, tp)
+    
+    async def commit(self, offsets: Optional[Dict[TopicPartition, int]] = None) -> None:
+        """Commit offsets of owned partitions.
+        
+        Offsets of partitions handed over to another member are skipped;
+        their records are consumed again by the new owner.
+        
+        Args:
+            offsets: Offset of the next record to consume, by partition;
+                the current read positions when not given
+        """
+        if offsets is None:
+            offsets = dict(self._positions)
+        
+        owned = {tp: offset for tp, offset in offsets.items() if tp in self._owned}
+        if len(owned) < len(offsets):
+            logger.info(
+                "local_broker_commit_skipped",
+                group=self.group_id,
+                partitions=[str(tp) for tp in offsets if tp not in owned]
+            )
+        if owned:
+            await run_blocking_io(self.broker.commit, self.group_id, owned)
+    
+    async def end_offsets(self, partitions: Iterable[TopicPartition]) -> Dict[TopicPartition, int]:
+        """Get the end offsets of partitions."""
+        return await run_blocking_io(
+            lambda: {tp: self.broker.end_offset(tp) for tp in partitions}
+        )
+    
+    async def stop(self) -> None:
+        """Leave the group and release the owned partitions."""
+        await run_blocking_io(self._leave)
+    
+    def _poll(self, max_records: int) -> Dict[TopicPartition, List[ConsumerRecord]]:
+        """Heartbeat when due and read from the owned partitions.
+        
+        Partitions take turns being read first, so a busy partition can't
+        starve the others.
+        """
+        with self._lock:
+            if time.monotonic() - self._last_heartbeat >= self.heartbeat_interval:
+                self._heartbeat()
+            
+            partitions = sorted(set(self._owned).difference(self._paused))
+            if not partitions:
+                return {}
+            start = self._next_partition % len(partitions)
+            self._next_partition += 1
+            
+            result: Dict[TopicPartition, List[ConsumerRecord]] = {}
+            remaining = max_records
+            for tp in partitions[start:] + partitions[:start]:
+                if remaining <= 0:
+                    break
+                records, cursor = self.broker.fetch(
+                    tp,
+                    self._positions[tp],
+                    remaining,
+                    self._cursors.get(tp)
+                )
+                if cursor is not None:
+                    self._cursors[tp] = cursor
+                if records:
+                    result[tp] = records
+                    self._positions[tp] = records[-1].offset + 1
+                    remaining -= len(records)
+            return result
+    
+    def _join(self) -> None:
+        """Heartbeat right away."""
+        with self._lock:
+            self._heartbeat()
+    
+    def _heartbeat(self) -> None:
+        """Renew membership and rebalance the partitions.
+        
+        Must hold the member lock. Each live member owns at most its fair share of the partitions:
+        this member releases partitions beyond it and claims free ones up
+        to it.
+        """
+        self._last_heartbeat = time.monotonic()
+        members = self.broker.group_path(self.group_id) / "members"
+        members.mkdir(parents=True, exist_ok=True)
+        (members / self.member_id).touch()
+        
+        now = time.time()
+        live = 0
+        for entry in os.scandir(members):
+            try:
+                if now - entry.stat().st_mtime <= self.session_timeout:
+                    live += 1
+                elif entry.name != self.member_id:
+                    os.unlink(entry.path)
+            except FileNotFoundError:
+                pass
+        
+        partitions = [
+            TopicPartition(topic, partition)
+            for topic in self.topics
+            for partition in self.broker.partitions_for(topic)
+        ]
+        share = ceil(len(partitions) / max(live, 1))
+        
+        for tp in set(self._owned).difference(partitions):
+            self._release(tp)
+        for tp in sorted(self._owned)[share:]:
+            self._release(tp)
+        
+        for tp in partitions:
+            if len(self._owned) >= share:
+                break
+            if tp not in self._owned:
+                self._claim(tp)
+    
+    def _claim(self, tp: TopicPartition) -> None:
+        """Take a partition unless another member owns it."""
+        path = self.broker.group_path(self.group_id) / tp.topic / f"{tp.partition}.lock"
+        path.parent.mkdir(parents=True, exist_ok=True)
+        lock_file = open(path, "ab")
+        try:
+            fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            lock_file.close()
+            return
+        
+        committed = self.broker.committed(self.group_id, tp)
+        self._owned[tp] = lock_file
+        self._positions[tp] = committed if committed is not None else self.broker.log_start_offset(tp)
+        self._cursors.pop(tp, None)
+        logger.info(
+            "local_broker_partition_assigned",
+            group=self.group_id,
+            member=self.member_id,
+            topic=tp.topic,
+            partition=tp.partition,
+            offset=self._positions[tp]
+        )
+    
+    def _release(self, tp: TopicPartition) -> None:
+        """Hand a partition back to the group."""
+        self._owned.pop(tp).close()
+        self._positions.pop(tp, None)
+        self._cursors.pop(tp, None)
+        self._paused.discard(tp)
+        logger.info(
+            "local_broker_partition_released",
+            group=self.group_id,
+            member=self.member_id,
+            topic=tp.topic,
+            partition=tp.partition
+        )
+    
+    def _leave(self) -> None:
+        """Release every partition and remove the heartbeat file."""
+        with self._lock:
+            for tp in list(self._owned):
+                self._release(tp)
+            try:
+                (self.broker.group_path(self.group_id) / "members" / self.member_id).unlink()
+            except FileNotFoundError:
+                pass
+
+
+def _encode(offset: int, timestamp: int, key: Optional[bytes], value: bytes) -> bytes:
+    """Encode a record."""
+    body = (key or b"") + value
+    return _HEADER.pack(
+        offset,
+        timestamp,
+        -1 if key is None else len(key),
+        len(value),
+        zlib.crc32(body)
+    ) + body
+
+
+def _read_records(file: BinaryIO, position: int) -> Iterator[Tuple[int, int, Optional[bytes], bytes, int]]:
+    """Iterate over the complete records of a segment file.
+    
+    Stops at the end of the file, at a record still being written, or at a
+    corrupt record.
+    
+    Args:
+        file: Segment file
+        position: Byte position of the first record
+    
+    Yields:
+        (offset, timestamp, key, value, end position) of each record
+    """
+    file.seek(position)
+    buffer = b""
+    while True:
+        chunk = file.read(_READ_CHUNK)
+        if not chunk:
+            return
+        buffer += chunk
+        
+        start = 0
+        while start + _HEADER.size <= len(buffer):
+            offset, timestamp, key_length, value_length, crc = _HEADER.unpack_from(buffer, start)
+            body = start + _HEADER.size
+            value_start = body + max(key_length, 0)
+            end = value_start + value_length
+            if end > len(buffer):
+                break
+            if zlib.crc32(buffer[body:end]) != crc:
+                return
+            key = buffer[body:value_start] if key_length >= 0 else None
+            yield offset, timestamp, key, buffer[value_start:end], position + end
+            start = end
+        
+        buffer = buffer[start:]
+        position += start
@@ -0,0 +1,366 @@
+"""
+Transactional outbox for domain events.
+
+Events are written to the PaymentEvent table in the transaction of the
+state change that produced them, so a crash between commit and publish
+can't lose them. OutboxRelay workers then stream pending rows to the broker
+and record the topic, partition and offset each event was written to.
+
+Events are numbered per aggregate when they're written, from a counter row
+the writing transaction holds locked. A relay claims the oldest pending
+event of up to batch_size aggregates with FOR UPDATE SKIP LOCKED and sends
+each claimed aggregate's pending events in sequence order. Concurrent relays, in one process or many, skip each
+other's claims and so work on disjoint aggregates: throughput scales with
+the number of workers while each aggregate's events stay in order.
+
+Delivery is at least once: if the relay fails after the broker accepted a
+batch, the batch is sent again. Consumers deduplicate by event_id.
+"""
+import asyncio
+import time
+from datetime import datetime
+from typing import Dict, List, Optional, Sequence, Set, Tuple
+from uuid import uuid4
+
+from sqlalchemy import exists, func, insert, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.monitoring import register_outbox_relay_metrics
+from app.db.session import db_manager
+from app.events.publisher import DomainEvent, EventPublisher, get_event_publisher
+from app.models import PaymentEvent, SequenceCounter
+
+logger = get_logger(__name__)
+
+AggregateKey = Tuple[str, str]
+
+# SequenceCounter scope of event sequence numbers; the period is the
+# aggregate ID
+_SEQUENCE_SCOPE = "event"
+
+
+async def write_outbox(session: AsyncSession, events: Sequence[DomainEvent]) -> None:
+    """Write events to the outbox in the session's transaction.
+    
+    Each event gets the next sequence number of its aggregate, taken from
+    the aggregate's SequenceCounter row with an upsert-and-increment. The
+    row stays locked until the transaction ends, so concurrent writers of
+    an aggregate wait for each other instead of computing the same number,
+    and a rolled back transaction leaves no gap.
+    
+    Args:
+        session: Session of the transaction producing the events
+        events: Domain events, in the order they occurred
+    """
+    if not events:
+        return
+    
+    counts: Dict[AggregateKey, int] = {}
+    for event in events:
+        key = (event.aggregate_type, event.aggregate_id)
+        counts[key] = counts.get(key, 0) + 1
+    
+    # Lock counters in a fixed order so writers of several aggregates
+    # can't deadlock each other
+    sequences: Dict[AggregateKey, int] = {}
+    for key in sorted(counts):
+        last = await _reserve_sequence(session, key, counts[key])
+        sequences[key] = last - counts[key]
+    
+    rows = []
+    for event in events:
+        key = (event.aggregate_type, event.aggregate_id)
+        sequences[key] += 1
+        rows.append(_to_row(event, sequences[key]))
+    
+    await session.execute(insert(PaymentEvent), rows)
+
+
+async def _reserve_sequence(session: AsyncSession, key: AggregateKey, count: int) -> int:
+    """Advance an aggregate's event counter in the session's transaction.
+    
+    A new counter starts after the highest sequence number already stored
+    for the aggregate.
+    
+    Args:
+        session: Session of the transaction producing the events
+        key: Aggregate type and ID
+        count: Number of sequence numbers to take
+    
+    Returns:
+        Last sequence number taken
+    """
+    aggregate_type, aggregate_id = key
+    stored = (
+        select(func.coalesce(func.max(PaymentEvent.sequence_number), 0))
+        .where(
+            PaymentEvent.aggregate_type == aggregate_type,
+            PaymentEvent.aggregate_id == aggregate_id
+        )
+        .scalar_subquery()
+    )
+    
+    dialect_insert = sqlite.insert if session.bind.dialect.name == "sqlite" else postgresql.insert
+    stmt = dialect_insert(SequenceCounter).values(
+        scope=f"{_SEQUENCE_SCOPE}:{aggregate_type}",
+        period=aggregate_id,
+        value=stored + count
+    )
+    stmt = stmt.on_conflict_do_update(
+        index_elements=["scope", "period"],
+        set_={"value": SequenceCounter.value + count}
+    ).returning(SequenceCounter.value)
+    return (await session.execute(stmt)).scalar_one()
+
+
+async def claim_pending(session: AsyncSession, limit: int) -> List[PaymentEvent]:
+    """Lock pending outbox rows for relaying.
+    
+    Claims the oldest pending event of up to limit aggregates, skipping
+    rows locked by other relays, then loads the pending events of the
+    claimed aggregates, an equal share of limit each. The later events
+    need no lock of their own: no other relay can claim them while their
+    aggregate's head is locked. Locks are held until the session's
+    transaction ends.
+    
+    Args:
+        session: Relay session
+        limit: Maximum aggregates claimed and rows returned
+    
+    Returns:
+        Pending rows, ordered by aggregate and sequence number
+    """
+    earlier = aliased(PaymentEvent)
+    heads = (
+        select(PaymentEvent.aggregate_type, PaymentEvent.aggregate_id)
+        .where(
+            PaymentEvent.published_at.is_(None),
+            ~exists().where(
+                earlier.aggregate_type == PaymentEvent.aggregate_type,
+                earlier.aggregate_id == PaymentEvent.aggregate_id,
+                earlier.published_at.is_(None),
+                earlier.sequence_number < PaymentEvent.sequence_number
+            )
+        )
+        .order_by(PaymentEvent.occurred_at)
+        .limit(limit)
+        .with_for_update(skip_locked=True, of=PaymentEvent)
+    )
+    claimed: Set[AggregateKey] = {tuple(row) for row in (await session.execute(heads)).all()}
+    if not claimed:
+        return []
+    
+    # Share the batch so a long backlog can't crowd out the other heads
+    per_aggregate = max(1, limit // len(claimed))
+    pending = (
+        select(
+            PaymentEvent.id,
+            func.row_number().over(
+                partition_by=(PaymentEvent.aggregate_type, PaymentEvent.aggregate_id),
+                order_by=PaymentEvent.sequence_number
+            ).label("position")
+        )
+        .where(
+            PaymentEvent.published_at.is_(None),
+            tuple_(PaymentEvent.aggregate_type, PaymentEvent.aggregate_id).in_(sorted(claimed))
+        )
+        .subquery()
+    )
+    result = await session.execute(
+        select(PaymentEvent)
+        .join(pending, pending.c.id == PaymentEvent.id)
+        .where(pending.c.position <= per_aggregate)
+        .order_by(
+            PaymentEvent.aggregate_type,
+            PaymentEvent.aggregate_id,
+            PaymentEvent.sequence_number
+        )
+    )
+    return list(result.scalars())
+
+
+class OutboxRelay:
+    """Background workers streaming pending outbox rows to the broker."""
+    
+    def __init__(
+        self,
+        publisher: Optional[EventPublisher] = None,
+        name: str = "payment_event",
+        batch_size: int = 500,
+        poll_interval_ms: int = 200
+    ):
+        """Initialize the relay.
+        
+        Args:
+            publisher: Event publisher delivering the events; the global
+                publisher when not given
+            name: Relay name used in metrics and task names
+            batch_size: Maximum events relayed per transaction
+            poll_interval_ms: Pause after a batch that wasn't full
+        """
+        self.publisher = publisher
+        self.name = name
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval_ms / 1000
+        self._tasks: List[asyncio.Task] = []
+        self.metrics = register_outbox_relay_metrics(name)
+    
+    @property
+    def running(self) -> bool:
+        """Whether the workers are running."""
+        return bool(self._tasks)
+    
+    def start(self, workers: int = 1) -> None:
+        """Start the relay workers.
+        
+        Args:
+            workers: Number of concurrent workers, each with its own
+                connection
+        """
+        if self._tasks:
+            return
+        
+        self._tasks = [
+            asyncio.create_task(self._run(), name=f"{self.name}-relay-{index}")
+            for index in range(workers)
+        ]
+        logger.info("outbox_relay_started", relay=self.name, workers=workers)
+    
+    async def stop(self) -> None:
+        """Stop the relay workers.
+        
+        A batch being relayed is rolled back and stays pending.
+        """
+        tasks, self._tasks = self._tasks, []
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+    
+    async def relay_batch(self) -> int:
+        """Relay one batch of pending events.
+        
+        Returns:
+            Number of events relayed
+        """
+        started_at = time.perf_counter()
+        publisher = self.publisher or get_event_publisher()
+        
+        async with db_manager.session() as session:
+            rows = await claim_pending(session, self.batch_size)
+            if not rows:
+                return 0
+            
+            receipts = await publisher.deliver([_to_event(row) for row in rows])
+            
+            published_at = datetime.utcnow()
+            lags = []
+            for row, receipt in zip(rows, receipts):
+                lags.append((published_at - row.occurred_at).total_seconds())
+                row.published_at = published_at
+                if receipt is not None:
+                    row.kafka_topic = receipt.topic
+                    row.kafka_partition = receipt.partition
+                    row.kafka_offset = receipt.offset
+        
+        self.metrics.record_batch(time.perf_counter() - started_at, lags)
+        return len(lags)
+    
+    async def _run(self) -> None:
+        """Relay batches until cancelled."""
+        while True:
+            try:
+                relayed = await self.relay_batch()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self.metrics.record_failure()
+                logger.warning(
+                    "outbox_relay_failed",
+                    relay=self.name,
+                    error=str(e),
+                    error_type=type(e).__name__
+                )
+                relayed = 0
+            
+            # Keep going while there's a backlog
+            if relayed < self.batch_size:
+                await asyncio.sleep(self.poll_interval)
+
+
+def _to_row(event: DomainEvent, sequence_number: int) -> dict:
+    """Build the outbox row of an event.
+    
+    Args:
+        event: Domain event
+        sequence_number: Sequence number within the event's aggregate
+    
+    Returns:
+        PaymentEvent column values
+    """
+    payload = event.model_dump(mode="json")
+    payment_order_id = event.aggregate_id if event.aggregate_type == "payment_order" else None
+    
+    return {
+        "id": str(uuid4()),
+        "payment_order_id": payment_order_id,
+        "payment_order": payment_order_id,
+        "event_id": event.event_id,
+        "aggregate_type": event.aggregate_type,
+        "aggregate_id": event.aggregate_id,
+        "sequence_number": sequence_number,
+        "event_type": event.event_type,
+        "event_version": str(event.version),
+        "data": payload["data"],
+        "metadata_": {
+            "correlation_id": event.correlation_id,
+            "causation_id": event.causation_id,
+            "metadata": payload["metadata"],
+        },
+        "occurred_at": event.occurred_at,
+    }
+
+
+def _to_event(row: PaymentEvent) -> DomainEvent:
+    """Rebuild the domain event stored in an outbox row.
+    
+    Args:
+        row: Outbox row
+    
+    Returns:
+        Domain event with the original event ID and payload
+    """
+    envelope = row.metadata_ or {}
+    return DomainEvent(
+        event_id=row.event_id,
+        event_type=row.event_type,
+        aggregate_id=row.aggregate_id,
+        aggregate_type=row.aggregate_type,
+        occurred_at=row.occurred_at,
+        version=int(row.event_version),
+        correlation_id=envelope.get("correlation_id"),
+        causation_id=envelope.get("causation_id"),
+        metadata=envelope.get("metadata") or {},
+        data=row.data
+    )
+
+
+# Relay started with the application
+outbox_relay = OutboxRelay(
+    batch_size=settings.EVENT_RELAY_BATCH_SIZE,
+    poll_interval_ms=settings.EVENT_RELAY_POLL_INTERVAL_MS
+)
+
+
+def start_outbox_relay() -> None:
+    """Start the application's relay workers if the outbox is enabled."""
+    if settings.EVENT_OUTBOX_ENABLED and settings.EVENT_RELAY_WORKERS > 0:
+        outbox_relay.start(settings.EVENT_RELAY_WORKERS)
+
+
+async def stop_outbox_relay() -> None:
+    """Stop the application's relay workers."""
+    await outbox_relay.stop()
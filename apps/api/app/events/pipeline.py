@@ -0,0 +1,302 @@
+"""
+Background publishing pipeline for domain events.
+
+Publishing enqueues the event and returns; drain tasks send queued events
+to the broker in batches, so request latency doesn't depend on broker
+latency. Events are spread over a fixed number of lanes by aggregate ID,
+and each lane sends its batches one after the other, so events of an
+aggregate are delivered in the order they were published.
+
+The queue is bounded: when it's full, publishing waits for room
+(backpressure) instead of buffering without limit.
+
+With a SpillLog, lanes write batches to local disk instead of the broker
+when a batch keeps failing or timing out, so publishing keeps finding room
+while the broker is down or hung. A full queue alone is still backpressure:
+a healthy broker that is merely busy is never bypassed. A replay task sends
+the spilled events, in order, once the broker takes batches again. Lanes
+keep spilling until the backlog is replayed, so no event overtakes an older
+one of its aggregate.
+"""
+import asyncio
+import time
+import zlib
+from typing import TYPE_CHECKING, Any, Awaitable, Callable, List, Optional, Tuple
+
+from app.core.logging import get_logger
+from app.core.monitoring import register_event_pipeline_metrics
+
+if TYPE_CHECKING:
+    from app.events.publisher import DomainEvent
+    from app.events.spill import SpillLog
+
+logger = get_logger(__name__)
+
+BatchSender = Callable[[List["DomainEvent"]], Awaitable[Any]]
+
+
+class EventPipeline:
+    """Bounded queue of events drained to a broker in per-lane batches."""
+    
+    def __init__(
+        self,
+        send_batch: BatchSender,
+        name: str = "events",
+        max_queue_size: int = 10000,
+        batch_size: int = 500,
+        linger_ms: int = 5,
+        lanes: int = 8,
+        retries: int = 3,
+        retry_backoff_ms: int = 100,
+        send_timeout_ms: Optional[int] = None,
+        spill: Optional["SpillLog"] = None
+    ):
+        """Initialize the pipeline.
+        
+        Drain tasks are started on first publish.
+        
+        Args:
+            send_batch: Coroutine function delivering a batch of events in
+                order, raising if any of them couldn't be delivered
+            name: Pipeline name used in metrics
+            max_queue_size: Maximum events queued or in flight
+            batch_size: Maximum events per batch
+            linger_ms: Time a lane waits for more events before sending a
+                batch that isn't full
+            lanes: Number of drain tasks
+            retries: Attempts to resend a failed batch before dropping it
+            retry_backoff_ms: Delay before the first resend, doubled for
+                each further one
+            send_timeout_ms: Time after which a send attempt counts as
+                failed; no limit when not given
+            spill: Disk log for events the broker can't take in time;
+                without one, failed batches are dropped
+        """
+        self.send_batch = send_batch
+        self.name = name
+        self.max_queue_size = max_queue_size
+        self.batch_size = batch_size
+        self.linger = linger_ms / 1000
+        self.lane_count = lanes
+        self.retries = retries
+        self.retry_backoff = retry_backoff_ms / 1000
+        self.send_timeout = send_timeout_ms / 1000 if send_timeout_ms else None
+        self._slots = asyncio.Semaphore(max_queue_size)
+        self._pending = 0
+        self._lanes: List[asyncio.Queue] = []
+        self._tasks: List[asyncio.Task] = []
+        self.spill = spill
+        self._replay_task: Optional[asyncio.Task] = None
+        self.metrics = register_event_pipeline_metrics(name, max_queue_size)
+        self.metrics.bind_pipeline(self)
+    
+    @property
+    def queue_depth(self) -> int:
+        """Number of events queued or being sent."""
+        return self._pending
+    
+    @property
+    def running(self) -> bool:
+        """Whether the drain tasks are running."""
+        return bool(self._tasks)
+    
+    def start(self) -> None:
+        """Start the drain tasks, and replay events spilled before a restart."""
+        self._start()
+    
+    async def publish(self, event: "DomainEvent") -> None:
+        """Queue an event for delivery.
+        
+        Waits while the queue is full.
+        
+        Args:
+            event: Domain event to publish
+        """
+        self._start()
+        
+        queued_at = time.perf_counter()
+        await self._slots.acquire()
+        self._pending += 1
+        self.metrics.record_enqueue(time.perf_counter() - queued_at)
+        
+        lane = self._lanes[zlib.crc32(event.aggregate_id.encode()) % self.lane_count]
+        lane.put_nowait((event, time.perf_counter()))
+    
+    async def flush(self) -> None:
+        """Wait until every queued event has been sent, spilled or dropped."""
+        for lane in self._lanes:
+            await lane.join()
+    
+    async def close(self) -> None:
+        """Flush the queue and stop the drain tasks.
+        
+        Spilled events that weren't replayed yet stay on disk for the next
+        start.
+        """
+        if not self._tasks:
+            return
+        
+        await self.flush()
+        
+        tasks, self._tasks = self._tasks, []
+        if self._replay_task is not None:
+            tasks.append(self._replay_task)
+            self._replay_task = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._lanes = []
+        
+        if self.spill is not None:
+            await self.spill.close()
+    
+    def _start(self) -> None:
+        """Start the drain tasks if they aren't running."""
+        if self._tasks:
+            return
+        
+        self._lanes = [asyncio.Queue() for _ in range(self.lane_count)]
+        self._tasks = [
+            asyncio.create_task(self._drain(lane), name=f"{self.name}-lane-{index}")
+            for index, lane in enumerate(self._lanes)
+        ]
+        
+        if self.spill is not None:
+            self.spill.open()
+            if self.spill.backlog_bytes:
+                self._start_replay()
+    
+    async def _drain(self, lane: asyncio.Queue) -> None:
+        """Send a lane's events in batches, in order.
+        
+        Args:
+            lane: Queue of (event, enqueue time) pairs
+        """
+        while True:
+            batch: List[Tuple["DomainEvent", float]] = [await lane.get()]
+            
+            # Give a partial batch a moment to fill up
+            if self.linger > 0 and lane.qsize() < self.batch_size - 1:
+                await asyncio.sleep(self.linger)
+            while len(batch) < self.batch_size and not lane.empty():
+                batch.append(lane.get_nowait())
+            
+            try:
+                await self._send(batch)
+            finally:
+                self._pending -= len(batch)
+                for _ in batch:
+                    lane.task_done()
+                    self._slots.release()
+    
+    async def _send(self, batch: List[Tuple["DomainEvent", float]]) -> None:
+        """Send a batch, retrying with backoff before spilling or dropping it.
+        
+        Args:
+            batch: (event, enqueue time) pairs
+        """
+        events = [event for event, _ in batch]
+        backoff = self.retry_backoff
+        
+        for attempt in range(self.retries + 1):
+            if self._must_spill():
+                self._spill(events)
+                return
+            try:
+                await asyncio.wait_for(self.send_batch(events), self.send_timeout)
+                break
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                if attempt == self.retries and self.spill is not None:
+                    logger.warning(
+                        "event_batch_spilled",
+                        pipeline=self.name,
+                        error=str(e),
+                        event_count=len(events)
+                    )
+                    self._spill(events)
+                    return
+                if attempt == self.retries:
+                    self.metrics.record_failure(len(events))
+                    logger.error(
+                        "event_batch_dropped",
+                        pipeline=self.name,
+                        error=str(e),
+                        event_count=len(events),
+                        event_ids=[event.event_id for event in events]
+                    )
+                    return
+                logger.warning(
+                    "event_batch_retry",
+                    pipeline=self.name,
+                    error=str(e),
+                    attempt=attempt + 1,
+                    event_count=len(events)
+                )
+                await asyncio.sleep(backoff)
+                backoff *= 2
+        
+        now = time.perf_counter()
+        self.metrics.record_batch([now - queued_at for _, queued_at in batch])
+    
+    def _must_spill(self) -> bool:
+        """Whether lanes must write to the spill log instead of the broker.
+        
+        Spilled events are waiting to be replayed, and newer events must
+        queue up behind them. Only failed or timed out sends start spilling.
+        """
+        return self.spill is not None and self.spill.backlog_bytes > 0
+    
+    def _spill(self, events: List["DomainEvent"]) -> None:
+        """Write events to the spill log and make sure they get replayed.
+        
+        Args:
+            events: Domain events, in order
+        """
+        spilled = self.spill.append([event.model_dump_json().encode() for event in events])
+        if spilled < len(events):
+            self.metrics.record_failure(len(events) - spilled)
+        self._start_replay()
+    
+    def _start_replay(self) -> None:
+        """Start the replay task if it isn't running."""
+        if self._replay_task is None or self._replay_task.done():
+            self._replay_task = asyncio.create_task(self._replay(), name=f"{self.name}-replay")
+    
+    async def _replay(self) -> None:
+        """Send spilled events in order until the spill log is drained.
+        
+        Failed batches are retried with backoff, capped at 30 seconds,
+        until the broker takes them.
+        """
+        from app.events.publisher import DomainEvent
+        
+        backoff = self.retry_backoff
+        while self.spill.backlog_bytes:
+            payloads = self.spill.read(self.batch_size)
+            if not payloads:
+                # Skipped a corrupt segment tail
+                self.spill.commit()
+                continue
+            
+            try:
+                await asyncio.wait_for(
+                    self.send_batch([DomainEvent.model_validate_json(payload) for payload in payloads]),
+                    self.send_timeout
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.warning(
+                    "spill_replay_failed",
+                    pipeline=self.name,
+                    error=str(e),
+                    event_count=len(payloads)
+                )
+                await asyncio.sleep(backoff)
+                backoff = min(backoff * 2, 30.0)
+                continue
+            
+            self.spill.commit()
+            backoff = self.retry_backoff
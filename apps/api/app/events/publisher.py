@@ -4,15 +4,18 @@ Event publisher for domain events.
 This module provides interfaces and implementations for publishing
 domain events to various event buses/queues.
 """
-import json
+import asyncio
 from abc import ABC, abstractmethod
 from datetime import datetime
-from typing import Any, Dict, List, Optional, TypeVar
+from typing import Any, Dict, List, NamedTuple, Optional, TypeVar
 from uuid import uuid4
 
 from pydantic import BaseModel, Field
 
 from app.core.logging import get_logger
+from app.events.local import dispatch
+from app.events.local_broker import LocalBroker, LocalProducer
+from app.events.pipeline import EventPipeline
 
 logger = get_logger(__name__)
 
@@ -39,6 +42,29 @@ class DomainEvent(BaseModel):
         arbitrary_types_allowed = True
 
 
+class DeliveryReceipt(NamedTuple):
+    """Broker position an event was written to."""
+    
+    topic: str
+    partition: int
+    offset: int
+
+
+def get_topic_name(aggregate_type: str, topic_prefix: str = "wedi.events") -> str:
+    """Get the topic of an aggregate type's events.
+    
+    Args:
+        aggregate_type: Aggregate type (e.g. "payment_order")
+        topic_prefix: Prefix for topic names
+    
+    Returns:
+        Topic name (e.g. "wedi.events.payment.order")
+    """
+    # Use aggregate type as part of topic name
+    # e.g., wedi.events.payment.order, wedi.events.user
+    return f"{topic_prefix}.{aggregate_type.lower().replace('_', '.')}"
+
+
 class EventPublisher(ABC):
     """Abstract base class for event publishers."""
     
@@ -59,6 +85,21 @@ class EventPublisher(ABC):
             events: List of domain events to publish
         """
         pass
+    
+    async def deliver(self, events: List[DomainEvent]) -> List[Optional[DeliveryReceipt]]:
+        """Deliver events now and wait until the event bus has them.
+        
+        Used by the outbox relay, which records where each event landed.
+        Publishers without broker positions return None receipts.
+        
+        Args:
+            events: Domain events to deliver, in order
+        
+        Returns:
+            Receipt per event, in the same order
+        """
+        await self.publish_batch(events)
+        return [None] * len(events)
 
 
 class LoggingEventPublisher(EventPublisher):
@@ -89,13 +130,21 @@ class LoggingEventPublisher(EventPublisher):
 
 
 class RedpandaEventPublisher(EventPublisher):
-    """Event publisher for Redpanda (Kafka-compatible) message broker."""
+    """Event publisher for Redpanda (Kafka-compatible) message broker.
+    
+    Events are queued and sent by a background EventPipeline, so publishing
+    doesn't wait for the broker. Events of an aggregate keep their order.
+    """
+    
+    # Name of the publishing pipeline in metrics
+    pipeline_name = "redpanda"
     
     def __init__(
         self,
         bootstrap_servers: str,
         topic_prefix: str = "wedi.events",
-        producer_config: Optional[Dict[str, Any]] = None
+        producer_config: Optional[Dict[str, Any]] = None,
+        pipeline_config: Optional[Dict[str, Any]] = None
     ):
         """Initialize Redpanda publisher.
         
@@ -103,11 +152,15 @@ class RedpandaEventPublisher(EventPublisher):
             bootstrap_servers: Kafka bootstrap servers
             topic_prefix: Prefix for topic names
             producer_config: Additional producer configuration
+            pipeline_config: EventPipeline options (queue size, batch size,
+                linger, lanes, retries, spill log)
         """
         self.bootstrap_servers = bootstrap_servers
         self.topic_prefix = topic_prefix
         self.producer_config = producer_config or {}
         self._producer = None
+        self._producer_lock = asyncio.Lock()
+        self._pipeline = EventPipeline(self._send_batch, name=self.pipeline_name, **(pipeline_config or {}))
     
     async def _get_producer(self):
         """Get or create Kafka producer.
@@ -115,25 +168,34 @@ class RedpandaEventPublisher(EventPublisher):
         Returns:
             Kafka producer instance
         """
-        if self._producer is None:
-            try:
-                from aiokafka import AIOKafkaProducer
-                
-                self._producer = AIOKafkaProducer(
-                    bootstrap_servers=self.bootstrap_servers,
-                    value_serializer=lambda v: json.dumps(v).encode(),
-                    **self.producer_config
-                )
-                await self._producer.start()
-            except ImportError:
-                logger.error("aiokafka not installed. Install with: pip install aiokafka")
-                raise
-            except Exception as e:
-                logger.error(f"Failed to create Kafka producer: {e}")
-                raise
+        async with self._producer_lock:
+            if self._producer is None:
+                try:
+                    producer = self._create_producer()
+                    await producer.start()
+                    self._producer = producer
+                except ImportError:
+                    logger.error("aiokafka not installed. Install with: pip install aiokafka")
+                    raise
+                except Exception as e:
+                    logger.error(f"Failed to create Kafka producer: {e}")
+                    raise
         
         return self._producer
     
+    def _create_producer(self):
+        """Create the Kafka producer.
+        
+        Returns:
+            Producer that hasn't been started
+        """
+        from aiokafka import AIOKafkaProducer
+        
+        return AIOKafkaProducer(
+            bootstrap_servers=self.bootstrap_servers,
+            **self.producer_config
+        )
+    
     def _get_topic_name(self, event: DomainEvent) -> str:
         """Get topic name for event.
         
@@ -143,99 +205,126 @@ class RedpandaEventPublisher(EventPublisher):
         Returns:
             Topic name
         """
-        # Use aggregate type as part of topic name
-        # e.g., wedi.events.payment_order, wedi.events.user
-        aggregate_type = event.aggregate_type.lower().replace("_", ".")
-        return f"{self.topic_prefix}.{aggregate_type}"
+        return get_topic_name(event.aggregate_type, self.topic_prefix)
+    
+    def start(self) -> None:
+        """Start delivering, including events spilled to disk before a restart."""
+        self._pipeline.start()
     
     async def publish(self, event: DomainEvent) -> None:
-        """Publish event to Redpanda.
+        """Queue event for delivery to Redpanda.
+        
+        Waits only while the pipeline's queue is full and it has no spill
+        log.
         
         Args:
             event: Domain event to publish
         """
-        try:
-            producer = await self._get_producer()
-            topic = self._get_topic_name(event)
-            
-            # Use aggregate_id as key for ordering guarantees
-            key = event.aggregate_id.encode()
-            value = event.model_dump_json()
-            
-            await producer.send(
-                topic,
-                key=key,
-                value=value.encode()
-            )
-            
-            logger.debug(
-                f"Published event to Redpanda",
-                topic=topic,
-                event_type=event.event_type,
-                event_id=event.event_id
-            )
-            
-        except Exception as e:
-            logger.error(
-                f"Failed to publish event to Redpanda",
-                error=str(e),
-                event_type=event.event_type,
-                event_id=event.event_id
-            )
-            raise
+        await self._pipeline.publish(event)
     
     async def publish_batch(self, events: List[DomainEvent]) -> None:
-        """Publish batch of events to Redpanda.
+        """Queue batch of events for delivery to Redpanda.
         
         Args:
             events: List of domain events to publish
         """
-        # Group events by topic for efficiency
-        from collections import defaultdict
-        events_by_topic = defaultdict(list)
+        for event in events:
+            await self._pipeline.publish(event)
+    
+    async def deliver(self, events: List[DomainEvent]) -> List[Optional[DeliveryReceipt]]:
+        """Send events directly, bypassing the pipeline, and wait for acks.
+        
+        Args:
+            events: Domain events to deliver, in order
         
+        Returns:
+            Topic, partition and offset of each event
+        """
+        return await self._send_batch(events)
+    
+    async def _send_batch(self, events: List[DomainEvent]) -> List[DeliveryReceipt]:
+        """Send a batch of events and wait for the broker to acknowledge it.
+        
+        Called by the pipeline's drain tasks and by deliver. Events are
+        handed to the producer in order; it batches them per partition.
+        
+        Args:
+            events: Domain events to send
+        
+        Returns:
+            Topic, partition and offset of each event
+        """
+        producer = await self._get_producer()
+        
+        deliveries = []
         for event in events:
-            topic = self._get_topic_name(event)
-            events_by_topic[topic].append(event)
+            # Use aggregate_id as key for ordering guarantees
+            deliveries.append(await producer.send(
+                self._get_topic_name(event),
+                key=event.aggregate_id.encode(),
+                value=event.model_dump_json().encode()
+            ))
+        records = await asyncio.gather(*deliveries)
         
-        # Publish to each topic
-        for topic, topic_events in events_by_topic.items():
-            try:
-                producer = await self._get_producer()
-                
-                # Send all events for this topic
-                for event in topic_events:
-                    key = event.aggregate_id.encode()
-                    value = event.model_dump_json().encode()
-                    
-                    # Don't await each send for better performance
-                    producer.send(topic, key=key, value=value)
-                
-                # Flush to ensure all messages are sent
-                await producer.flush()
-                
-                logger.debug(
-                    f"Published batch to Redpanda",
-                    topic=topic,
-                    event_count=len(topic_events)
-                )
-                
-            except Exception as e:
-                logger.error(
-                    f"Failed to publish batch to Redpanda",
-                    error=str(e),
-                    topic=topic,
-                    event_count=len(topic_events)
-                )
-                raise
+        logger.debug("Published batch to Redpanda", event_count=len(events))
+        return [
+            DeliveryReceipt(record.topic, record.partition, record.offset)
+            for record in records
+        ]
+    
+    async def flush(self) -> None:
+        """Wait until every queued event has been delivered, spilled or dropped."""
+        await self._pipeline.flush()
     
     async def close(self):
-        """Close the producer connection."""
+        """Deliver queued events and close the producer connection."""
+        await self._pipeline.close()
         if self._producer:
             await self._producer.stop()
             self._producer = None
 
 
+class LocalEventPublisher(RedpandaEventPublisher):
+    """Event publisher writing to a file-backed LocalBroker.
+    
+    Stands in for Redpanda in development and load tests: events go through
+    the same pipeline, topics and keys, and are stored in partitions that
+    consumers in other processes can read.
+    """
+    
+    pipeline_name = "local"
+    
+    def __init__(
+        self,
+        broker: LocalBroker,
+        topic_prefix: str = "wedi.events",
+        pipeline_config: Optional[Dict[str, Any]] = None
+    ):
+        """Initialize local broker publisher.
+        
+        Args:
+            broker: Broker the events are appended to
+            topic_prefix: Prefix for topic names
+            pipeline_config: EventPipeline options (queue size, batch size,
+                linger, lanes, retries)
+        """
+        super().__init__(
+            bootstrap_servers=str(broker.directory),
+            topic_prefix=topic_prefix,
+            pipeline_config=pipeline_config
+        )
+        self.broker = broker
+    
+    def _create_producer(self) -> LocalProducer:
+        """Create a producer appending to the local broker."""
+        return LocalProducer(self.broker)
+    
+    async def close(self):
+        """Deliver queued events and close the broker's files."""
+        await super().close()
+        self.broker.close()
+
+
 class InMemoryEventPublisher(EventPublisher):
     """In-memory event publisher for testing."""
     
@@ -323,6 +412,7 @@ async def publish_event(event: DomainEvent) -> None:
     """
     publisher = get_event_publisher()
     await publisher.publish(event)
+    await dispatch([event])
 
 
 async def publish_events(events: List[DomainEvent]) -> None:
@@ -335,4 +425,5 @@ async def publish_events(events: List[DomainEvent]) -> None:
         return
     
     publisher = get_event_publisher()
-    await publisher.publish_batch(events) 
\ No newline at end of file
+    await publisher.publish_batch(events)
+    await dispatch(events) 
\ No newline at end of file
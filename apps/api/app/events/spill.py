@@ -0,0 +1,554 @@
+"""
+Local disk spill log for events the broker can't take right now.
+
+When the broker is down or falling behind, the event pipeline parks events
+here instead of waiting for it or dropping them, and replays them in order
+once it accepts batches again.
+
+The log is a directory of append-only segment files. Each record is a
+4-byte big-endian payload length, a 4-byte CRC32 of the payload and the
+payload. Appends go to the page cache and are fsynced in batches every
+fsync_interval_ms, so a crash loses at most that window. Replay reads
+records through a memory map of the segment and advances a checkpoint file;
+fully replayed segments are deleted. Disk usage is bounded by max_bytes,
+beyond which new events are rejected.
+
+Each process claims its own numbered slot directory, held with an flock,
+so worker processes never share a log and a restarted worker picks up the
+log its predecessor left behind. Slots left with a backlog by processes
+that are gone for good, e.g. after scaling down, are adopted when a log is
+opened: their records are copied behind its own backlog and replayed with
+it. A backlog that doesn't fit under max_bytes stays in place and is
+reported as orphaned.
+"""
+import asyncio
+import fcntl
+import json
+import mmap
+import os
+import struct
+import time
+import zlib
+from itertools import count
+from pathlib import Path
+from typing import BinaryIO, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from app.core.executors import run_blocking_io
+from app.core.logging import get_logger
+from app.core.monitoring import register_spill_log_metrics
+
+logger = get_logger(__name__)
+
+# Record header: payload length, payload CRC32
+_HEADER = struct.Struct(">II")
+
+_SEGMENT_SUFFIX = ".seg"
+_CHECKPOINT = "checkpoint.json"
+
+
+class SpillLog:
+    """Append-only, segmented write-ahead log of event payloads."""
+    
+    def __init__(
+        self,
+        directory: str,
+        name: str = "events",
+        segment_bytes: int = 16 * 1024 * 1024,
+        max_bytes: int = 1024 * 1024 * 1024,
+        fsync_interval_ms: int = 50
+    ):
+        """Initialize the spill log.
+        
+        Files are opened on first use.
+        
+        Args:
+            directory: Base directory holding the slot directories
+            name: Log name used in metrics
+            segment_bytes: Size at which a new segment file is started
+            max_bytes: Maximum disk usage; appends beyond it are rejected
+            fsync_interval_ms: Interval between batched fsyncs
+        """
+        self.directory = Path(directory)
+        self.name = name
+        self.segment_bytes = segment_bytes
+        self.max_bytes = max_bytes
+        self.fsync_interval = fsync_interval_ms / 1000
+        self.path: Optional[Path] = None
+        self._lock_file: Optional[BinaryIO] = None
+        # Segment IDs in order and their sizes in bytes
+        self._segments: List[int] = []
+        self._sizes: Dict[int, int] = {}
+        self._writer: Optional[BinaryIO] = None
+        # Rotated segment files waiting for their last fsync
+        self._retired: List[BinaryIO] = []
+        self._dirty = False
+        self._closing = False
+        # Replay position: segment ID and byte offset
+        self._read_segment = 0
+        self._read_offset = 0
+        self._pending_position: Optional[Tuple[int, int]] = None
+        self._pending_records = 0
+        self._sync_task: Optional[asyncio.Task] = None
+        # Backlog of unclaimed slots that couldn't be adopted
+        self.orphaned_bytes = 0
+        self.metrics = register_spill_log_metrics(name, max_bytes)
+        self.metrics.bind_log(self)
+    
+    @property
+    def disk_bytes(self) -> int:
+        """Bytes held in segment files."""
+        return sum(self._sizes.values())
+    
+    @property
+    def backlog_bytes(self) -> int:
+        """Bytes of records not yet replayed."""
+        return sum(
+            size for segment, size in self._sizes.items()
+            if segment >= self._read_segment
+        ) - (self._read_offset if self._read_segment in self._sizes else 0)
+    
+    @property
+    def segment_count(self) -> int:
+        """Number of segment files."""
+        return len(self._segments)
+    
+    def open(self) -> None:
+        """Claim a slot directory and recover the log left in it.
+        
+        A torn record at the end of the last segment, from a crash during
+        an append, is truncated. Backlogs of unclaimed slots are adopted.
+        """
+        if self.path is not None:
+            return
+        
+        self.path = self._claim_slot()
+        self._segments = sorted(
+            int(path.stem) for path in self.path.glob(f"*{_SEGMENT_SUFFIX}")
+        )
+        self._sizes = {
+            segment: self._segment_path(segment).stat().st_size
+            for segment in self._segments
+        }
+        
+        if self._segments:
+            self._recover(self._segments[-1])
+            self._writer = open(self._segment_path(self._segments[-1]), "ab")
+        else:
+            self._rotate()
+        self._load_checkpoint()
+        self._adopt_orphans()
+        
+        if self.backlog_bytes:
+            logger.info(
+                "spill_log_recovered",
+                spill_log=self.name,
+                path=str(self.path),
+                backlog_bytes=self.backlog_bytes
+            )
+    
+    def append(self, payloads: Sequence[bytes]) -> int:
+        """Append records to the log.
+        
+        Records are fsynced by the next batched sync. Must be called from
+        the event loop.
+        
+        Args:
+            payloads: Record payloads, in order
+        
+        Returns:
+            Number of records appended; the rest were rejected because the
+            log is full
+        """
+        self.open()
+        self._start_sync()
+        
+        appended = self._write(payloads)
+        if appended:
+            self._dirty = True
+            self.metrics.record_spill(appended)
+        if appended < len(payloads):
+            self.metrics.record_drop(len(payloads) - appended)
+            logger.error(
+                "spill_log_full",
+                spill_log=self.name,
+                max_bytes=self.max_bytes,
+                dropped=len(payloads) - appended
+            )
+        return appended
+    
+    def _write(self, payloads: Sequence[bytes]) -> int:
+        """Write records to the active segment, rotating as needed.
+        
+        Returns:
+            Number of records written before the log was full
+        """
+        disk_bytes = self.disk_bytes
+        written = 0
+        for payload in payloads:
+            record_size = _HEADER.size + len(payload)
+            if disk_bytes + record_size > self.max_bytes:
+                break
+            
+            active = self._segments[-1]
+            if self._sizes[active] and self._sizes[active] + record_size > self.segment_bytes:
+                self._rotate()
+                active = self._segments[-1]
+            
+            self._writer.write(_HEADER.pack(len(payload), zlib.crc32(payload)))
+            self._writer.write(payload)
+            self._sizes[active] += record_size
+            disk_bytes += record_size
+            written += 1
+        return written
+    
+    def read(self, max_records: int) -> List[bytes]:
+        """Read the next records to replay.
+        
+        Reading again without commit returns the same records.
+        
+        Args:
+            max_records: Maximum records returned
+        
+        Returns:
+            Record payloads, in append order
+        """
+        self.open()
+        
+        payloads: List[bytes] = []
+        index = self._segments.index(self._read_segment)
+        offset = self._read_offset
+        
+        while index < len(self._segments) and len(payloads) < max_records:
+            segment = self._segments[index]
+            size = self._sizes[segment]
+            if segment == self._segments[-1]:
+                # Make buffered appends visible to the map
+                self._writer.flush()
+            
+            if offset < size:
+                with open(self._segment_path(segment), "rb") as file, \
+                        mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ) as view:
+                    for start, end in _records(view, offset, size):
+                        payloads.append(view[start:end])
+                        offset = end
+                        if len(payloads) == max_records:
+                            break
+                    else:
+                        if offset < size:
+                            logger.error(
+                                "spill_segment_corrupt",
+                                spill_log=self.name,
+                                segment=segment,
+                                offset=offset
+                            )
+                            offset = size
+            
+            if offset < size or index == len(self._segments) - 1:
+                break
+            index += 1
+            offset = 0
+        
+        self._pending_position = (self._segments[index], offset)
+        self._pending_records = len(payloads)
+        return payloads
+    
+    def commit(self) -> None:
+        """Mark the records returned by the last read as replayed.
+        
+        Segments replayed to the end are deleted.
+        """
+        if self._pending_position is None:
+            return
+        
+        self._read_segment, self._read_offset = self._pending_position
+        self._pending_position = None
+        self.metrics.record_replay(self._pending_records)
+        self._pending_records = 0
+        
+        while self._segments and self._segments[0] < self._read_segment:
+            self._delete_segment(self._segments.pop(0))
+        
+        # Start over on an empty segment once everything was replayed
+        if not self.backlog_bytes and self._read_offset:
+            self._rotate()
+            self._delete_segment(self._segments.pop(0))
+            self._read_segment, self._read_offset = self._segments[-1], 0
+        
+        self._save_checkpoint()
+    
+    async def sync(self) -> None:
+        """Flush appended records and fsync the segment files."""
+        if not self._dirty:
+            return
+        self._dirty = False
+        
+        retired, self._retired = self._retired, []
+        for file in retired:
+            file.flush()
+        self._writer.flush()
+        
+        started_at = time.perf_counter()
+        try:
+            await run_blocking_io(_fsync_files, self._writer, retired)
+        except Exception:
+            self._dirty = True
+            self._retired = retired + self._retired
+            raise
+        self.metrics.record_fsync(time.perf_counter() - started_at)
+    
+    async def close(self) -> None:
+        """Fsync and close the log and release its slot."""
+        if self.path is None:
+            return
+        
+        # Let a running fsync finish rather than cancel it mid-flight
+        self._closing = True
+        if self._sync_task is not None:
+            await asyncio.gather(self._sync_task, return_exceptions=True)
+            self._sync_task = None
+        self._closing = False
+        await self.sync()
+        self._save_checkpoint()
+        
+        self._writer.close()
+        self._writer = None
+        self._lock_file.close()
+        self._lock_file = None
+        self.path = None
+    
+    def _claim_slot(self) -> Path:
+        """Lock the first slot directory not held by another process."""
+        for slot in count():
+            path = self.directory / str(slot)
+            path.mkdir(parents=True, exist_ok=True)
+            lock_file = open(path / "lock", "ab")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                lock_file.close()
+                continue
+            self._lock_file = lock_file
+            return path
+    
+    def _adopt_orphans(self) -> None:
+        """Take over the backlogs of slots no process holds.
+        
+        Records are copied and fsynced before the orphaned segments are
+        deleted, so a crash in between only replays them twice.
+        """
+        self.orphaned_bytes = 0
+        slots = sorted(
+            (path for path in self.directory.iterdir() if path.name.isdigit() and path != self.path),
+            key=lambda path: int(path.name)
+        )
+        for path in slots:
+            lock_file = open(path / "lock", "ab")
+            try:
+                fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except BlockingIOError:
+                # Held by a live process, which replays it
+                lock_file.close()
+                continue
+            
+            try:
+                backlog = _slot_backlog(path)
+                backlog_bytes = sum(end - start for _, start, end in backlog)
+                if not backlog_bytes:
+                    continue
+                if self.disk_bytes + backlog_bytes > self.max_bytes:
+                    self.orphaned_bytes += backlog_bytes
+                    logger.warning(
+                        "spill_slot_orphaned",
+                        spill_log=self.name,
+                        path=str(path),
+                        backlog_bytes=backlog_bytes
+                    )
+                    continue
+                
+                for segment_path, start, end in backlog:
+                    with open(segment_path, "rb") as file, \
+                            mmap.mmap(file.fileno(), end, access=mmap.ACCESS_READ) as view:
+                        self._write([view[first:last] for first, last in _records(view, start, end)])
+                self._writer.flush()
+                retired, self._retired = self._retired, []
+                for file in retired:
+                    file.flush()
+                _fsync_files(self._writer, retired)
+                
+                for segment_path in path.glob(f"*{_SEGMENT_SUFFIX}"):
+                    segment_path.unlink()
+                (path / _CHECKPOINT).unlink(missing_ok=True)
+                logger.info(
+                    "spill_slot_adopted",
+                    spill_log=self.name,
+                    path=str(path),
+                    backlog_bytes=backlog_bytes
+                )
+            finally:
+                lock_file.close()
+    
+    def _segment_path(self, segment: int) -> Path:
+        """Get the file of a segment."""
+        return self.path / f"{segment:020d}{_SEGMENT_SUFFIX}"
+    
+    def _rotate(self) -> None:
+        """Start a new active segment."""
+        if self._writer is not None:
+            self._writer.flush()
+            self._retired.append(self._writer)
+            self._dirty = True
+        
+        segment = self._segments[-1] + 1 if self._segments else 1
+        self._writer = open(self._segment_path(segment), "ab")
+        self._segments.append(segment)
+        self._sizes[segment] = 0
+    
+    def _delete_segment(self, segment: int) -> None:
+        """Remove a replayed segment file."""
+        del self._sizes[segment]
+        try:
+            self._segment_path(segment).unlink()
+        except FileNotFoundError:
+            pass
+    
+    def _recover(self, segment: int) -> None:
+        """Truncate a torn record at the end of a segment."""
+        size = self._sizes[segment]
+        if not size:
+            return
+        
+        valid = 0
+        with open(self._segment_path(segment), "rb") as file, \
+                mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ) as view:
+            for _, valid in _records(view, 0, size):
+                pass
+        
+        if valid < size:
+            logger.warning(
+                "spill_segment_truncated",
+                spill_log=self.name,
+                segment=segment,
+                lost_bytes=size - valid
+            )
+            os.truncate(self._segment_path(segment), valid)
+            self._sizes[segment] = valid
+    
+    def _load_checkpoint(self) -> None:
+        """Load the replay position, dropping segments before it."""
+        self._read_segment = self._segments[0]
+        self._read_offset = 0
+        
+        try:
+            checkpoint = json.loads((self.path / _CHECKPOINT).read_text())
+        except (FileNotFoundError, ValueError):
+            return
+        
+        if checkpoint["segment"] in self._sizes:
+            self._read_segment = checkpoint["segment"]
+            self._read_offset = min(checkpoint["offset"], self._sizes[self._read_segment])
+        while self._segments and self._segments[0] < self._read_segment:
+            self._delete_segment(self._segments.pop(0))
+    
+    def _save_checkpoint(self) -> None:
+        """Persist the replay position.
+        
+        The checkpoint isn't fsynced: after a crash, replay may resend
+        records that were already delivered.
+        """
+        temporary = self.path / f"{_CHECKPOINT}.tmp"
+        temporary.write_text(json.dumps({
+            "segment": self._read_segment,
+            "offset": self._read_offset,
+        }))
+        os.replace(temporary, self.path / _CHECKPOINT)
+    
+    def _start_sync(self) -> None:
+        """Start the batched fsync task if it isn't running."""
+        if self._sync_task is None or self._sync_task.done():
+            self._sync_task = asyncio.create_task(self._run_sync(), name=f"{self.name}-spill-sync")
+    
+    async def _run_sync(self) -> None:
+        """Fsync appended records every fsync interval until closed."""
+        while not self._closing:
+            await asyncio.sleep(self.fsync_interval)
+            try:
+                await self.sync()
+            except Exception as e:
+                logger.error("spill_log_sync_failed", spill_log=self.name, error=str(e))
+
+
+def _records(view: mmap.mmap, offset: int, size: int) -> Iterator[Tuple[int, int]]:
+    """Iterate over the valid records of a segment.
+    
+    Stops at the end of the segment or at the first torn or corrupt record.
+    
+    Args:
+        view: Memory map of the segment
+        offset: Offset of the first record
+        size: Size of the segment
+    
+    Yields:
+        Start and end offsets of each record's payload
+    """
+    while offset + _HEADER.size <= size:
+        length, crc = _HEADER.unpack_from(view, offset)
+        start = offset + _HEADER.size
+        end = start + length
+        if end > size or zlib.crc32(view[start:end]) != crc:
+            return
+        yield start, end
+        offset = end
+
+
+def _slot_backlog(path: Path) -> List[Tuple[Path, int, int]]:
+    """Find the records of a slot directory that weren't replayed.
+    
+    Args:
+        path: Slot directory
+    
+    Returns:
+        Segment file, first record offset and end of its valid records, for
+        each segment holding part of the backlog
+    """
+    segments = sorted(int(segment.stem) for segment in path.glob(f"*{_SEGMENT_SUFFIX}"))
+    position = (segments[0], 0) if segments else (0, 0)
+    try:
+        checkpoint = json.loads((path / _CHECKPOINT).read_text())
+        if checkpoint["segment"] in segments:
+            position = (checkpoint["segment"], checkpoint["offset"])
+    except (FileNotFoundError, ValueError):
+        pass
+    
+    backlog = []
+    for segment in segments:
+        if segment < position[0]:
+            continue
+        segment_path = path / f"{segment:020d}{_SEGMENT_SUFFIX}"
+        size = segment_path.stat().st_size
+        start = position[1] if segment == position[0] else 0
+        if start >= size:
+            continue
+        # A torn record at the end, from a crash during an append, is left out
+        end = start
+        with open(segment_path, "rb") as file, \
+                mmap.mmap(file.fileno(), size, access=mmap.ACCESS_READ) as view:
+            for _, end in _records(view, start, size):
+                pass
+        if end > start:
+            backlog.append((segment_path, start, end))
+    return backlog
+
+
+def _fsync_files(active: BinaryIO, retired: List[BinaryIO]) -> None:
+    """Fsync the active segment, and fsync and close rotated ones.
+    
+    Runs in the I/O thread pool.
+    
+    Args:
+        active: Active segment file
+        retired: Rotated segment files
+    """
+    for file in retired:
+        os.fsync(file.fileno())
+        file.close()
+    os.fsync(active.fileno())
@@ -12,15 +12,17 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from fastapi.responses import JSONResponse
 
+from app.core.cache import close_cache
 from app.core.config import settings
+from app.core.executors import shutdown_executors
 from app.core.logging import get_logger
 from app.core.openapi import configure_scalar_ui, custom_openapi_schema
-from app.db.session import init_db, close_db
+from app.db.session import init_db, close_db, start_db_monitors
 from app.events.config import shutdown_event_publisher, startup_event_publisher
-from app.middleware.auth import JWTAuthMiddleware
+from app.events.outbox import start_outbox_relay, stop_outbox_relay
 from app.middleware.exception_handler import register_exception_handlers
-from app.middleware.multi_tenancy import MultiTenancyMiddleware
-from app.middleware.request_id import RequestIDMiddleware
+from app.middleware.public_paths import PUBLIC_ROUTE, PublicPathMatcher
+from app.middleware.request_context import RequestContextMiddleware
 
 # Import routers when they exist
 # from app.api.v1 import auth, organizations, users, payment_links, payment_orders
@@ -46,11 +48,15 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
         # Initialize database
         # await init_db()
         # logger.info("Database initialized")
+        await start_db_monitors()
         
         # Initialize event publisher
         await startup_event_publisher()
         logger.info("Event publisher initialized")
         
+        # Relay events from the transactional outbox to the event bus
+        start_outbox_relay()
+        
         # TODO: Initialize other services
         # - Redis for caching
         # - Background task workers
@@ -66,14 +72,25 @@ async def lifespan(app: FastAPI) -> AsyncGenerator:
     logger.info("Shutting down Wedi Pay API...")
     
     try:
+        # Stop relaying before the publisher goes away
+        await stop_outbox_relay()
+        
         # Shutdown event publisher
         await shutdown_event_publisher()
         logger.info("Event publisher shut down")
         
+        # Close cache connections
+        await close_cache()
+        logger.info("Cache closed")
+        
         # Close database connections
         await close_db()
         logger.info("Database connections closed")
         
+        # Stop blocking-work thread pools
+        shutdown_executors()
+        logger.info("Executors shut down")
+        
         # TODO: Cleanup other services
         
     except Exception as e:
@@ -107,14 +124,9 @@ def create_application() -> FastAPI:
     
     # Add middleware stack (order matters - applied in reverse)
     
-    # Request ID middleware (should be first to process)
-    app.add_middleware(RequestIDMiddleware)
-    
-    # JWT Authentication middleware
-    app.add_middleware(JWTAuthMiddleware)
-    
-    # Multi-tenancy middleware (after auth to use user context)
-    app.add_middleware(MultiTenancyMiddleware)
+    # Request context middleware: shared DB session, JWT authentication,
+    # organization context and request ID, fused into one pure ASGI layer
+    app.add_middleware(RequestContextMiddleware)
     
     # Trusted host middleware for security
     if settings.ALLOWED_HOSTS:
@@ -143,7 +155,7 @@ def create_application() -> FastAPI:
     app.include_router(v1_router)
     
     # Root endpoints
-    @app.get("/", include_in_schema=False)
+    @app.get("/", include_in_schema=False, openapi_extra=PUBLIC_ROUTE)
     async def root() -> dict:
         """Root endpoint."""
         return {
@@ -154,7 +166,7 @@ def create_application() -> FastAPI:
             "docs": "/docs" if settings.ENVIRONMENT != "production" else None,
         }
     
-    @app.get("/health", include_in_schema=False)
+    @app.get("/health", include_in_schema=False, openapi_extra=PUBLIC_ROUTE)
     async def health_check() -> JSONResponse:
         """
         Health check endpoint.
@@ -172,7 +184,7 @@ def create_application() -> FastAPI:
             }
         )
     
-    @app.get("/api/v1/status", tags=["System"])
+    @app.get("/api/v1/status", tags=["System"], openapi_extra=PUBLIC_ROUTE)
     async def api_status() -> dict:
         """
         API status endpoint with more detailed information.
@@ -200,6 +212,9 @@ def create_application() -> FastAPI:
             }
         }
     
+    # Compile public route classification once all routes are registered
+    app.state.public_paths = PublicPathMatcher.from_app(app)
+    
     return app
 
 
@@ -4,19 +4,18 @@ JWT Authentication middleware.
 This middleware handles JWT token validation and user authentication
 for protected endpoints.
 """
-import re
 from typing import Optional
 
 from fastapi import HTTPException, Request, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 from jose import JWTError
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.responses import Response
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 from app.core.logging import get_logger
 from app.core.security import decode_token, verify_token_type
-from app.db.session import get_db
-from app.repositories.user import UserRepository
+from app.db.session import db_manager, get_request_session
+from app.middleware.public_paths import PublicPathMatcher, get_public_paths
+from app.services.user_cache import load_user
 
 logger = get_logger(__name__)
 
@@ -24,77 +23,79 @@ logger = get_logger(__name__)
 security = HTTPBearer(auto_error=False)
 
 
-class JWTAuthMiddleware(BaseHTTPMiddleware):
+class JWTAuthMiddleware:
     """
     JWT authentication middleware.
     
+    A pure ASGI middleware, so authentication runs in the request's own
+    task and responses are passed through without buffering.
+    
     This middleware:
     1. Extracts JWT tokens from Authorization header
     2. Validates and decodes the token
     3. Attaches user information to the request state
-    4. Allows public endpoints to pass through
+    4. Allows public endpoints, marked with PUBLIC_ROUTE, to pass through
     """
     
-    # Public endpoints that don't require authentication
-    PUBLIC_PATHS = {
-        "/",
-        "/health",
-        "/api/docs",
-        "/api/redoc",
-        "/api/openapi.json",
-        "/api/v1/status",
-        "/api/v1/auth/login",
-        "/api/v1/auth/register",
-        "/api/v1/auth/refresh",
-        "/api/v1/auth/forgot-password",
-        "/api/v1/auth/reset-password",
-        "/api/v1/auth/verify-email",
-        "/api/v1/auth/payload",  # For Clerk + Circle SIWE payload generation
-        "/api/v1/auth/validate-key",  # For integration key validation
-    }
-    
-    # Path prefixes that are always public
-    PUBLIC_PATH_PREFIXES = {
-        "/static",
-        "/public",
-    }
+    def __init__(self, app: ASGIApp, public_paths: Optional[PublicPathMatcher] = None) -> None:
+        """
+        Initialize the middleware.
+        
+        Args:
+            app: Next ASGI application
+            public_paths: Public path matcher; by default compiled from the
+                routes marked with PUBLIC_ROUTE on the serving application
+        """
+        self.app = app
+        self.public_paths = public_paths
     
-    # Path patterns that are public (regex patterns)
-    PUBLIC_PATH_PATTERNS = [
-        re.compile(r"^/api/v1/payment-links/by-short-code/[a-z0-9]+$"),
-    ]
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        """
+        Authenticate HTTP requests before passing them on.
+        
+        Args:
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
+        """
+        if scope["type"] == "http":
+            await self.authenticate(scope)
+        await self.app(scope, receive, send)
     
-    async def dispatch(self, request: Request, call_next) -> Response:
+    async def authenticate(self, scope: Scope) -> None:
         """
-        Process the request and validate JWT token if present.
+        Validate the JWT token, if present, and attach the user to the request.
+        
+        Public paths are left untouched. Otherwise request.state.user and
+        request.state.user_id are always set, to None when the request
+        isn't authenticated, and the endpoint decides if auth is required.
         
         Args:
-            request: Incoming request
-            call_next: Next middleware or endpoint
-            
-        Returns:
-            Response from the endpoint
+            scope: ASGI HTTP connection scope
         """
+        path = scope["path"]
+        
         # Check if path is public
-        if self._is_public_path(request.url.path):
-            return await call_next(request)
+        public_paths = self.public_paths or get_public_paths(scope.get("app"))
+        if public_paths(path):
+            return
+        
+        request = Request(scope)
+        request.state.user = None
+        request.state.user_id = None
         
         # Extract token from Authorization header
         auth_header = request.headers.get("Authorization")
         if not auth_header:
             # No auth header - let endpoint decide if auth is required
-            request.state.user = None
-            request.state.user_id = None
-            return await call_next(request)
+            return
         
         try:
             # Parse Bearer token
             scheme, token = auth_header.split()
             if scheme.lower() != "bearer":
                 logger.warning(f"Invalid auth scheme: {scheme}")
-                request.state.user = None
-                request.state.user_id = None
-                return await call_next(request)
+                return
             
             # Decode and validate token
             payload = decode_token(token)
@@ -102,68 +103,50 @@ class JWTAuthMiddleware(BaseHTTPMiddleware):
             # Verify it's an access token
             if not verify_token_type(payload, "access"):
                 logger.warning("Invalid token type")
-                request.state.user = None
-                request.state.user_id = None
-                return await call_next(request)
+                return
             
             # Extract user ID
             user_id = payload.get("sub")
             if not user_id:
                 logger.warning("No subject in token")
-                request.state.user = None
-                request.state.user_id = None
-                return await call_next(request)
+                return
             
             # Attach user ID to request
             request.state.user_id = user_id
             
-            # Optional: Load full user object (expensive, do only if needed)
-            # This could be moved to a dependency instead
-            if request.url.path.startswith("/api/v1/") and not request.url.path.startswith("/api/v1/auth/"):
-                async with get_db() as db:
-                    user_repo = UserRepository()
-                    user = await user_repo.get(db, id=user_id)
-                    if not user:
-                        logger.warning(f"User {user_id} not found")
-                        request.state.user = None
-                        request.state.user_id = None
-                    else:
-                        request.state.user = user
-            else:
-                request.state.user = None
+            # Load the full user once; route dependencies reuse request.state.user
+            if path.startswith("/api/v1/") and not path.startswith("/api/v1/auth/"):
+                user = await self._load_user(user_id)
+                if not user:
+                    logger.warning(f"User {user_id} not found")
+                    request.state.user_id = None
+                else:
+                    request.state.user = user
             
         except (ValueError, JWTError) as e:
             logger.warning(f"JWT validation error: {e}")
             request.state.user = None
             request.state.user_id = None
-        
-        return await call_next(request)
     
-    def _is_public_path(self, path: str) -> bool:
+    async def _load_user(self, user_id: str):
         """
-        Check if the path is public and doesn't require authentication.
+        Load the user through the request's shared session.
+        
+        Users are served from the snapshot cache when possible, so
+        authentication doesn't query the database in the steady state.
         
         Args:
-            path: Request path
+            user_id: User ID from the token
             
         Returns:
-            True if path is public
+            User if found, None otherwise
         """
-        # Exact match
-        if path in self.PUBLIC_PATHS:
-            return True
-        
-        # Prefix match
-        for prefix in self.PUBLIC_PATH_PREFIXES:
-            if path.startswith(prefix):
-                return True
-        
-        # Pattern match
-        for pattern in self.PUBLIC_PATH_PATTERNS:
-            if pattern.match(path):
-                return True
+        scope = get_request_session()
+        if scope is not None:
+            return await load_user(scope.get(), user_id)
         
-        return False
+        async with db_manager.session() as db:
+            return await load_user(db, user_id)
 
 
 async def get_current_user_from_token(
@@ -5,8 +5,7 @@ from contextvars import ContextVar
 from typing import Optional
 
 from fastapi import Request
-from starlette.middleware.base import BaseHTTPMiddleware
-from starlette.types import ASGIApp
+from starlette.types import ASGIApp, Receive, Scope, Send
 
 
 # Context variable to store the current organization ID
@@ -15,7 +14,7 @@ current_organization_id: ContextVar[Optional[str]] = ContextVar(
 )
 
 
-class MultiTenancyMiddleware(BaseHTTPMiddleware):
+class MultiTenancyMiddleware:
     """
     Middleware to extract and store organization context from requests.
     
@@ -24,42 +23,66 @@ class MultiTenancyMiddleware(BaseHTTPMiddleware):
     the request lifecycle.
     """
     
-    async def dispatch(self, request: Request, call_next):
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """
         Process the request and extract organization context.
         
         Args:
-            request: FastAPI request object
-            call_next: Next middleware in the chain
-            
-        Returns:
-            Response from the next middleware
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
-        # Initialize organization ID as None
-        organization_id = None
-        
-        # Extract organization ID from the request
-        # This can come from JWT claims, headers, or path parameters
-        if hasattr(request.state, "user") and request.state.user:
-            # Get organization ID from authenticated user
-            # Assuming the user object has current_organization_id
-            organization_id = getattr(request.state.user, "current_organization_id", None)
-        elif "x-organization-id" in request.headers:
-            # Alternative: Get from custom header (useful for API keys)
-            organization_id = request.headers["x-organization-id"]
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
         # Set the organization ID in context
-        token = current_organization_id.set(organization_id)
+        token = current_organization_id.set(resolve_organization_id(scope))
         
         try:
             # Process the request
-            response = await call_next(request)
-            return response
+            await self.app(scope, receive, send)
         finally:
             # Reset the context
             current_organization_id.reset(token)
 
 
+def resolve_organization_id(scope: Scope) -> Optional[str]:
+    """
+    Extract the organization ID for a request.
+    
+    The ID is also stored in request.state.organization_id for request
+    logging.
+    
+    Args:
+        scope: ASGI HTTP connection scope
+        
+    Returns:
+        Organization ID or None
+    """
+    request = Request(scope)
+    
+    # Initialize organization ID as None
+    organization_id = None
+    
+    # Extract organization ID from the request
+    # This can come from JWT claims, headers, or path parameters
+    user = getattr(request.state, "user", None)
+    if user:
+        # Get organization ID from authenticated user
+        # Assuming the user object has current_organization_id
+        organization_id = getattr(user, "current_organization_id", None)
+    elif "x-organization-id" in request.headers:
+        # Alternative: Get from custom header (useful for API keys)
+        organization_id = request.headers["x-organization-id"]
+    
+    request.state.organization_id = organization_id
+    return organization_id
+
+
 def get_current_organization_id() -> Optional[str]:
     """
     Get the current organization ID from context.
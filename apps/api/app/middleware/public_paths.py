@@ -0,0 +1,178 @@
+"""
+Public path classification for authentication.
+
+Routes opt out of authentication with route metadata:
+
+    @router.get("/by-short-code/{short_code}", openapi_extra=PUBLIC_ROUTE)
+
+The public routes of an application are compiled once into a
+PublicPathMatcher: a set of exact paths and one regex holding the public
+path prefixes, as a trie, and the path patterns of parameterized routes.
+"""
+import re
+from typing import Any, Dict, Iterable, Optional
+
+from fastapi.routing import APIRoute
+from starlette.types import ASGIApp
+
+# Route metadata marking an endpoint as public
+PUBLIC_ROUTE: Dict[str, Any] = {"x-public": True}
+
+# Path prefixes that are always public (static mounts)
+PUBLIC_PATH_PREFIXES = (
+    "/static",
+    "/public",
+)
+
+_PARAM_GROUP = re.compile(r"\(\?P<\w+>")
+
+
+class PublicPathMatcher:
+    """
+    Compiled matcher for public request paths.
+    
+    A path is public if it equals a public path, starts with a public
+    prefix or matches a public route pattern. Exact paths are a set lookup;
+    prefixes and patterns are tried with a single regex match.
+    """
+    
+    def __init__(
+        self,
+        paths: Iterable[str] = (),
+        prefixes: Iterable[str] = (),
+        patterns: Iterable[str] = (),
+    ) -> None:
+        """
+        Compile the matcher.
+        
+        Args:
+            paths: Exact public paths
+            prefixes: Public path prefixes
+            patterns: Public path regexes, as generated for Starlette routes
+        """
+        self.paths = frozenset(paths)
+        
+        alternatives = []
+        prefix_pattern = _trie_pattern(prefixes)
+        if prefix_pattern is not None:
+            alternatives.append(prefix_pattern)
+        
+        # Route regexes are anchored and use named groups, which can't repeat
+        # across alternatives
+        route_patterns = [
+            _PARAM_GROUP.sub("(?:", pattern.lstrip("^").rstrip("$"))
+            for pattern in patterns
+        ]
+        if route_patterns:
+            alternatives.append("(?:" + "|".join(route_patterns) + ")$")
+        
+        self.regex = re.compile("|".join(alternatives)) if alternatives else None
+    
+    @classmethod
+    def from_app(cls, app: ASGIApp) -> "PublicPathMatcher":
+        """
+        Build the matcher for an application's public routes.
+        
+        Routes marked with PUBLIC_ROUTE are public, as are the application's
+        OpenAPI schema and documentation URLs.
+        
+        Args:
+            app: FastAPI or Starlette application
+        
+        Returns:
+            Public path matcher
+        """
+        paths = {
+            url
+            for url in (
+                getattr(app, "openapi_url", None),
+                getattr(app, "docs_url", None),
+                getattr(app, "redoc_url", None),
+            )
+            if url
+        }
+        patterns = []
+        
+        for route in getattr(app, "routes", ()):
+            if not isinstance(route, APIRoute):
+                continue
+            if not (route.openapi_extra or {}).get("x-public"):
+                continue
+            
+            if route.param_convertors:
+                patterns.append(route.path_regex.pattern)
+            else:
+                paths.add(route.path)
+        
+        return cls(paths, PUBLIC_PATH_PREFIXES, patterns)
+    
+    def __call__(self, path: str) -> bool:
+        """
+        Check if the path is public and doesn't require authentication.
+        
+        Args:
+            path: Request path
+        
+        Returns:
+            True if path is public
+        """
+        if path in self.paths:
+            return True
+        return self.regex is not None and self.regex.match(path) is not None
+
+
+def get_public_paths(app: Optional[ASGIApp]) -> PublicPathMatcher:
+    """
+    Get the public path matcher of an application.
+    
+    The matcher is compiled on first use and kept in app.state, so
+    applications can also compile it at startup.
+    
+    Args:
+        app: Application serving the request
+    
+    Returns:
+        Public path matcher
+    """
+    state = getattr(app, "state", None)
+    if state is None:
+        return PublicPathMatcher.from_app(app)
+    
+    matcher = getattr(state, "public_paths", None)
+    if matcher is None:
+        matcher = PublicPathMatcher.from_app(app)
+        state.public_paths = matcher
+    return matcher
+
+
+def _trie_pattern(prefixes: Iterable[str]) -> Optional[str]:
+    """
+    Compile path prefixes into a regex that factors out shared prefixes.
+    
+    Args:
+        prefixes: Path prefixes
+    
+    Returns:
+        Regex source, or None without prefixes
+    """
+    trie: Dict[str, dict] = {}
+    for prefix in prefixes:
+        node = trie
+        for char in prefix:
+            node = node.setdefault(char, {})
+        # An empty key marks the end of a prefix
+        node[""] = {}
+    
+    if not trie:
+        return None
+    
+    def render(node: Dict[str, dict]) -> str:
+        # A complete prefix matches every longer one
+        if "" in node:
+            return ""
+        branches = [re.escape(char) + render(child) for char, child in sorted(node.items())]
+        if len(branches) == 1:
+            return branches[0]
+        return "(?:" + "|".join(branches) + ")"
+    
+    return render(trie)
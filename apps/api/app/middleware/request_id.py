@@ -2,85 +2,129 @@
 Request ID middleware for request tracking and correlation.
 """
 import uuid
-from typing import Callable
+from typing import Awaitable, Callable, Optional
 
-from fastapi import Request, Response
-from starlette.middleware.base import BaseHTTPMiddleware
+from fastapi import Request
+from starlette.datastructures import MutableHeaders
+from starlette.responses import PlainTextResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 
 from app.core.logging import bind_request_context, logger
 
 
-class RequestIDMiddleware(BaseHTTPMiddleware):
+class RequestIDMiddleware:
     """Middleware to add request IDs to all requests."""
     
-    async def dispatch(self, request: Request, call_next: Callable) -> Response:
+    def __init__(self, app: ASGIApp) -> None:
+        self.app = app
+    
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
         """Process the request and add request ID.
         
         Args:
-            request: FastAPI request
-            call_next: Next middleware/handler
-            
-        Returns:
-            Response with X-Request-ID header
+            scope: ASGI connection scope
+            receive: ASGI receive channel
+            send: ASGI send channel
         """
-        # Get or generate request ID
-        request_id = request.headers.get("X-Request-ID")
-        if not request_id:
-            request_id = str(uuid.uuid4())
-        
-        # Store request ID in request state
-        request.state.request_id = request_id
-        
-        # Get user info from request if available
-        user_id = None
-        organization_id = None
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
         
-        # This would be populated by authentication middleware
-        if hasattr(request.state, "user_id"):
-            user_id = request.state.user_id
-        if hasattr(request.state, "organization_id"):
-            organization_id = request.state.organization_id
-        
-        # Bind logging context
-        request_logger = bind_request_context(
-            request_id=request_id,
-            user_id=user_id,
-            organization_id=organization_id
-        )
+        await track_request(self.app, scope, receive, send)
+
+
+async def track_request(
+    app: ASGIApp,
+    scope: Scope,
+    receive: Receive,
+    send: Send,
+    setup: Optional[Callable[[Scope], Awaitable[None]]] = None
+) -> None:
+    """Run an HTTP request with a request ID and request logging.
+    
+    The request ID is taken from the X-Request-ID header or generated,
+    stored in request.state and echoed in the X-Request-ID response header.
+    An error raised before the response started is answered with a 500
+    that carries the header too.
+    
+    Args:
+        app: ASGI application handling the request
+        scope: ASGI HTTP connection scope
+        receive: ASGI receive channel
+        send: ASGI send channel
+        setup: Runs before the application within the request's logging
+            context, e.g. authentication; the user and organization it
+            stores in request.state are added to the context afterwards
+    """
+    request = Request(scope)
+    
+    # Get or generate request ID
+    request_id = request.headers.get("X-Request-ID")
+    if not request_id:
+        request_id = str(uuid.uuid4())
+    
+    # Store request ID in request state
+    request.state.request_id = request_id
+    
+    # Populated by the authentication and multi-tenancy middleware
+    user_id = getattr(request.state, "user_id", None)
+    organization_id = getattr(request.state, "organization_id", None)
+    
+    # Bind logging context
+    request_logger = bind_request_context(
+        request_id=request_id,
+        user_id=user_id,
+        organization_id=organization_id
+    )
+    
+    # Log request
+    request_logger.info(
+        "request_started",
+        method=request.method,
+        path=request.url.path,
+        query_params=dict(request.query_params),
+        client_host=request.client.host if request.client else None
+    )
+    
+    status_code = None
+    
+    async def send_with_request_id(message: Message) -> None:
+        nonlocal status_code
+        if message["type"] == "http.response.start":
+            status_code = message["status"]
+            # Add request ID to response headers
+            MutableHeaders(scope=message)["X-Request-ID"] = request_id
+        await send(message)
+    
+    try:
+        if setup is not None:
+            await setup(scope)
+            request_logger = bind_request_context(
+                request_id=request_id,
+                user_id=getattr(request.state, "user_id", None),
+                organization_id=getattr(request.state, "organization_id", None)
+            )
         
-        # Log request
-        request_logger.info(
-            "request_started",
+        # Process request
+        await app(scope, receive, send_with_request_id)
+    except Exception as e:
+        # Log error
+        request_logger.error(
+            "request_failed",
             method=request.method,
             path=request.url.path,
-            query_params=dict(request.query_params),
-            client_host=request.client.host if request.client else None
+            error=str(e),
+            error_type=type(e).__name__
         )
-        
-        try:
-            # Process request
-            response = await call_next(request)
-            
-            # Add request ID to response headers
-            response.headers["X-Request-ID"] = request_id
-            
-            # Log response
-            request_logger.info(
-                "request_completed",
-                method=request.method,
-                path=request.url.path,
-                status_code=response.status_code
-            )
-            
-            return response
-            
-        except Exception as e:
-            # Log error
-            request_logger.error(
-                "request_failed",
-                method=request.method,
-                path=request.url.path,
-                error=str(e),
-                error_type=type(e).__name__
-            )
-            raise 
\ No newline at end of file
+        if status_code is None:
+            response = PlainTextResponse("Internal Server Error", status_code=500)
+            await response(scope, receive, send_with_request_id)
+        raise
+    
+    # Log response
+    request_logger.info(
+        "request_completed",
+        method=request.method,
+        path=request.url.path,
+        status_code=status_code
+    )
@@ -56,6 +56,7 @@ from .generated import (
     ProviderConfig,
     ProviderRoute,
     ProviderTransaction,
+    SequenceCounter,
     Subscription,
     SubscriptionItem,
     User,
@@ -114,6 +115,7 @@ __all__ = [
     "ProviderConfig",
     "ProviderRoute",
     "ProviderTransaction",
+    "SequenceCounter",
     "Subscription",
     "SubscriptionItem",
     "User",
@@ -20,7 +20,8 @@ from sqlalchemy import (
     Numeric,
     String,
     Table,
-    UniqueConstraint
+    UniqueConstraint,
+    text
 )
 from sqlalchemy.sql import func
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column, relationship
@@ -33,7 +34,9 @@ from sqlalchemy.dialects.postgresql import ARRAY, JSON
 
 class Base(DeclarativeBase):
     """Base class for all models"""
-    pass
+    # Fetch server-generated columns with RETURNING as part of each INSERT
+    # and UPDATE, so repositories don't need a refresh() SELECT after flushing
+    __mapper_args__ = {"eager_defaults": True}
 
 
 class AgentType(enum.Enum):
@@ -526,8 +529,11 @@ class PaymentEvent(Base):
     __tablename__ = "payment_event"
 
     id: Mapped[str] = mapped_column(String, primary_key=True, nullable=False)
-    payment_order_id: Mapped[str] = mapped_column(String, nullable=False)
-    payment_order: Mapped[str] = mapped_column(String, ForeignKey("payment_order.id"), nullable=False)
+    payment_order_id: Mapped[Optional[str]] = mapped_column(String, nullable=True)
+    payment_order: Mapped[Optional[str]] = mapped_column(String, ForeignKey("payment_order.id"), nullable=True)
+    event_id: Mapped[str] = mapped_column(String, unique=True, nullable=False)
+    aggregate_type: Mapped[str] = mapped_column(String, nullable=False)
+    aggregate_id: Mapped[str] = mapped_column(String, nullable=False)
     sequence_number: Mapped[int] = mapped_column(Integer, nullable=False)
     event_type: Mapped[str] = mapped_column(String, nullable=False, index=True)
     event_version: Mapped[str] = mapped_column(String, nullable=False, default="1.0")
@@ -537,9 +543,11 @@ class PaymentEvent(Base):
     kafka_partition: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
     kafka_offset: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
     occurred_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=func.now(), index=True)
+    published_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
     __table_args__ = (
-        UniqueConstraint("payment_order_id", "sequence_number"),
+        Index("idx_paymentevent_publishedAt_occurredAt", "published_at", "occurred_at"),
+        UniqueConstraint("aggregate_type", "aggregate_id", "sequence_number")
     )
 
 class PaymentLink(Base):
@@ -574,6 +582,11 @@ class PaymentLink(Base):
     requires_kyc: Mapped[bool] = mapped_column(Boolean, nullable=False, default=False)
     expires_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
     redirect_urls: Mapped[Optional[dict]] = mapped_column(JSONType, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=func.now())
+
+    __table_args__ = (
+        Index("idx_paymentlink_organizationId_createdAt_id", "organization_id", text("created_at DESC"), text("id DESC")),
+    )
 
 class PaymentOrder(Base):
     """Generated from Prisma model PaymentOrder"""
@@ -624,6 +637,7 @@ class PaymentOrder(Base):
 
     __table_args__ = (
         Index("idx_paymentorder_organizationId_status", "organization_id", "status"),
+        Index("idx_paymentorder_organizationId_createdAt_id", "organization_id", text("created_at DESC"), text("id DESC"))
     )
 
 class Price(Base):
@@ -663,6 +677,10 @@ class Product(Base):
     updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
     # prices: Mapped["Price"] = relationship(back_populates="product")
 
+    __table_args__ = (
+        Index("idx_product_organizationId_createdAt_id", "organization_id", text("created_at DESC"), text("id DESC")),
+    )
+
 class Provider(Base):
     """Generated from Prisma model Provider"""
     __tablename__ = "provider"
@@ -737,6 +755,15 @@ class ProviderTransaction(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=func.now())
     completed_at: Mapped[Optional[datetime]] = mapped_column(DateTime, nullable=True)
 
+class SequenceCounter(Base):
+    """Generated from Prisma model SequenceCounter"""
+    __tablename__ = "sequence_counter"
+
+    scope: Mapped[str] = mapped_column(String, primary_key=True, nullable=False)
+    period: Mapped[str] = mapped_column(String, primary_key=True, nullable=False)
+    value: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False, default=func.now(), onupdate=func.now())
+
 class Subscription(Base):
     """Generated from Prisma model Subscription"""
     __tablename__ = "subscription"
@@ -2,10 +2,11 @@
 Base repository abstract class with generic CRUD operations.
 """
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Generic, List, Optional, Type, TypeVar
+from typing import Any, Dict, Generic, List, Optional, Sequence, Type, TypeVar, Union
 
 from pydantic import BaseModel
-from sqlalchemy import Select, and_, delete, func, select, update
+from sqlalchemy import Select, and_, delete, func, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.exc import IntegrityError, SQLAlchemyError
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
@@ -13,6 +14,11 @@ from sqlalchemy.orm import selectinload
 from app.core.exceptions import DuplicateError, NotFoundError, RepositoryException
 from app.core.logging import log_database_query, log_execution, logger
 from app.models import Base as SQLAlchemyBase
+from app.repositories.pagination import CountMode, Page, apply_keyset, fetch_page
+from app.repositories.transitions import StatusTransitions, TransitionResult, transition
+
+# Bind parameters a single statement may carry, per dialect
+_MAX_BIND_PARAMETERS = {"postgresql": 65535, "sqlite": 32766}
 
 ModelType = TypeVar("ModelType", bound=SQLAlchemyBase)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
@@ -59,6 +65,25 @@ class BaseRepository(ABC, Generic[ModelType, CreateSchemaType, UpdateSchemaType]
             )
         return query
     
+    def _apply_filters(self, query: Select, filters: Optional[Dict[str, Any]]) -> Select:
+        """Apply field:value equality filters.
+        
+        Args:
+            query: SQLAlchemy select query
+            filters: Filters as field:value dict
+            
+        Returns:
+            Filtered query
+        """
+        if filters:
+            filter_clauses = []
+            for field, value in filters.items():
+                if hasattr(self.model, field):
+                    filter_clauses.append(getattr(self.model, field) == value)
+            if filter_clauses:
+                query = query.where(and_(*filter_clauses))
+        return query
+    
     @log_execution(log_args=False, log_result=False)
     async def create(
         self,
@@ -66,6 +91,7 @@ class BaseRepository(ABC, Generic[ModelType, CreateSchemaType, UpdateSchemaType]
         *,
         obj_in: CreateSchemaType,
         organization_id: Optional[str] = None,
+        returning: bool = True,
         **kwargs: Any
     ) -> ModelType:
         """Create a new entity.
@@ -74,6 +100,8 @@ class BaseRepository(ABC, Generic[ModelType, CreateSchemaType, UpdateSchemaType]
             db: Database session
             obj_in: Pydantic schema with creation data
             organization_id: Organization ID for multi-tenancy
+            returning: Rely on the INSERT's RETURNING for server-generated
+                columns; pass False to reload the row with a refresh
             **kwargs: Additional fields to set
             
         Returns:
@@ -106,7 +134,8 @@ class BaseRepository(ABC, Generic[ModelType, CreateSchemaType, UpdateSchemaType]
             db_obj = self.model(**obj_data)
             db.add(db_obj)
             await db.flush()
-            await db.refresh(db_obj)
+            if not returning:
+                await db.refresh(db_obj)
             
             # Log successful creation
             logger.info(
@@ -143,6 +172,223 @@ class BaseRepository(ABC, Generic[ModelType, CreateSchemaType, UpdateSchemaType]
             )
             raise RepositoryException(f"Database error: {e}")
     
+    def _prepare_rows(
+        self,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        organization_id: Optional[str],
+        extra: Dict[str, Any]
+    ) -> List[Dict[str, Any]]:
+        """Convert creation inputs into column dicts for bulk statements.
+        
+        Args:
+            objs_in: Pydantic schemas or dicts with creation data
+            organization_id: Organization ID for multi-tenancy
+            extra: Additional fields to set on every row
+            
+        Returns:
+            Row dicts
+        """
+        rows = []
+        for obj_in in objs_in:
+            if isinstance(obj_in, BaseModel):
+                row = obj_in.model_dump(exclude_unset=True)
+            else:
+                row = dict(obj_in)
+            if self._organization_id_field and organization_id:
+                row[self._organization_id_field] = organization_id
+            row.update(extra)
+            rows.append(row)
+        return rows
+    
+    @staticmethod
+    def _group_by_columns(rows: List[Dict[str, Any]]) -> Dict[tuple, List[int]]:
+        """Group row positions by column set.
+        
+        Bulk statements are compiled from the columns of their first row, so
+        rows supplying different columns have to go in separate statements.
+        
+        Args:
+            rows: Row dicts
+            
+        Returns:
+            Positions of the rows, by sorted column names
+        """
+        groups: Dict[tuple, List[int]] = {}
+        for position, row in enumerate(rows):
+            groups.setdefault(tuple(sorted(row)), []).append(position)
+        return groups
+    
+    def _handle_bulk_error(self, e: SQLAlchemyError, organization_id: Optional[str]) -> None:
+        """Translate a bulk statement error into a repository exception."""
+        logger.error(
+            "bulk_write_error",
+            model=self.model.__name__,
+            error=str(e),
+            error_type=type(e).__name__,
+            organization_id=organization_id
+        )
+        if isinstance(e, IntegrityError):
+            if "unique" in str(e).lower():
+                raise DuplicateError(
+                    resource=self.model.__name__,
+                    field="unknown",
+                    value="duplicate"
+                )
+            raise RepositoryException(f"Database integrity error: {e}")
+        raise RepositoryException(f"Database error: {e}")
+    
+    @log_execution(log_args=False, log_result=False)
+    async def create_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        organization_id: Optional[str] = None,
+        **kwargs: Any
+    ) -> List[ModelType]:
+        """Create many entities with multi-row INSERT ... RETURNING.
+        
+        Rows are sent in batched multi-row statements, one series per set of
+        supplied columns, and the inserted entities (including
+        server-generated columns) are returned without a refresh per row.
+        
+        Args:
+            db: Database session
+            objs_in: Pydantic schemas or dicts with creation data
+            organization_id: Organization ID for multi-tenancy
+            **kwargs: Additional fields to set on every row
+            
+        Returns:
+            Created model instances, in input order
+            
+        Raises:
+            DuplicateError: If a row violates unique constraints
+            RepositoryException: For other database errors
+        """
+        rows = self._prepare_rows(objs_in, organization_id, kwargs)
+        if not rows:
+            return []
+        
+        entities: List[Optional[ModelType]] = [None] * len(rows)
+        try:
+            for positions in self._group_by_columns(rows).values():
+                # Executed as batched multi-row INSERTs sized within the
+                # driver's bind parameter limit
+                result = await db.scalars(
+                    insert(self.model).returning(self.model, sort_by_parameter_order=True),
+                    [rows[position] for position in positions]
+                )
+                for position, entity in zip(positions, result.all()):
+                    entities[position] = entity
+        except SQLAlchemyError as e:
+            await db.rollback()
+            self._handle_bulk_error(e, organization_id)
+        
+        logger.info(
+            "entities_created",
+            model=self.model.__name__,
+            count=len(entities),
+            organization_id=organization_id
+        )
+        return entities
+    
+    @log_execution(log_args=False, log_result=False)
+    async def upsert_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        conflict_fields: List[str],
+        update_fields: Optional[List[str]] = None,
+        organization_id: Optional[str] = None,
+        **kwargs: Any
+    ) -> List[ModelType]:
+        """Insert or update many entities with INSERT ... ON CONFLICT.
+        
+        Conflicting rows are only updated when they belong to the same
+        organization, so an upsert can never overwrite another tenant's row.
+        Inputs sharing conflict values are collapsed to the last one, since
+        one statement can't update a row twice. Rows are sent in multi-row
+        statements that stay within the dialect's bind parameter limit.
+        
+        Args:
+            db: Database session
+            objs_in: Pydantic schemas or dicts with entity data
+            conflict_fields: Columns of the unique constraint to upsert on
+            update_fields: Columns to overwrite on conflict; defaults to every
+                supplied column except the conflict columns and ``id``
+            organization_id: Organization ID for multi-tenancy
+            **kwargs: Additional fields to set on every row
+            
+        Returns:
+            Inserted or updated model instances
+            
+        Raises:
+            RepositoryException: For database errors
+        """
+        rows = self._prepare_rows(objs_in, organization_id, kwargs)
+        if not rows:
+            return []
+        
+        dialect = (await db.connection()).dialect.name
+        if dialect == "postgresql":
+            dialect_insert = postgresql.insert
+        elif dialect == "sqlite":
+            dialect_insert = sqlite.insert
+        else:
+            raise RepositoryException(f"Upsert is not supported on {dialect}")
+        
+        # The last input for a conflict key wins; rows missing a conflict
+        # value can't conflict with each other
+        unique_rows: Dict[Any, Dict[str, Any]] = {}
+        for position, row in enumerate(rows):
+            key = tuple(row.get(field) for field in conflict_fields)
+            if None in key:
+                key = ("__row__", position)
+            unique_rows.pop(key, None)
+            unique_rows[key] = row
+        rows = list(unique_rows.values())
+        
+        entities: List[ModelType] = []
+        try:
+            for columns, positions in self._group_by_columns(rows).items():
+                fields = update_fields or [
+                    column for column in columns
+                    if column not in conflict_fields and column != "id"
+                ]
+                chunk_size = max(1, _MAX_BIND_PARAMETERS[dialect] // max(1, len(columns)))
+                for start in range(0, len(positions), chunk_size):
+                    chunk = [rows[position] for position in positions[start:start + chunk_size]]
+                    stmt = dialect_insert(self.model).values(chunk)
+                    where = None
+                    if self._organization_id_field and organization_id:
+                        org_column = getattr(self.model, self._organization_id_field)
+                        where = org_column == getattr(stmt.excluded, self._organization_id_field)
+                    if fields:
+                        stmt = stmt.on_conflict_do_update(
+                            index_elements=conflict_fields,
+                            set_={field: getattr(stmt.excluded, field) for field in fields},
+                            where=where
+                        )
+                    else:
+                        stmt = stmt.on_conflict_do_nothing(index_elements=conflict_fields)
+                    result = await db.scalars(
+                        stmt.returning(self.model),
+                        execution_options={"populate_existing": True}
+                    )
+                    entities.extend(result.all())
+        except SQLAlchemyError as e:
+            await db.rollback()
+            self._handle_bulk_error(e, organization_id)
+        
+        logger.info(
+            "entities_upserted",
+            model=self.model.__name__,
+            count=len(entities),
+            organization_id=organization_id
+        )
+        return entities
+    
     async def get(
         self,
         db: AsyncSession,
@@ -225,43 +471,46 @@ class BaseRepository(ABC, Generic[ModelType, CreateSchemaType, UpdateSchemaType]
         organization_id: Optional[str] = None,
         filters: Optional[Dict[str, Any]] = None,
         order_by: Optional[List[Any]] = None,
-        load_options: Optional[List[Any]] = None
+        load_options: Optional[List[Any]] = None,
+        cursor: Optional[str] = None
     ) -> List[ModelType]:
         """Get multiple entities with pagination.
         
+        Without ``order_by`` rows are returned newest first by
+        ``(created_at, id)``; pass ``cursor`` (see
+        ``app.repositories.pagination.next_cursor``) instead of ``skip`` to
+        continue after a previous page without scanning skipped rows.
+        
         Args:
             db: Database session
-            skip: Number of records to skip
+            skip: Number of records to skip (ignored when cursor is given)
             limit: Maximum number of records to return
             organization_id: Organization ID for multi-tenancy
             filters: Additional filters as field:value dict
             order_by: List of order_by clauses
             load_options: SQLAlchemy load options
+            cursor: Keyset cursor of the last row of the previous page
             
         Returns:
             List of model instances
         """
+        if cursor and order_by:
+            raise ValueError("cursor pagination uses the default ordering")
+        
         query = select(self.model)
         
         # Apply organization filter
         query = self._apply_organization_filter(query, organization_id)
         
         # Apply additional filters
-        if filters:
-            filter_clauses = []
-            for field, value in filters.items():
-                if hasattr(self.model, field):
-                    filter_clauses.append(getattr(self.model, field) == value)
-            if filter_clauses:
-                query = query.where(and_(*filter_clauses))
+        query = self._apply_filters(query, filters)
         
         # Apply ordering
         if order_by:
             query = query.order_by(*order_by)
         else:
-            # Default ordering by created_at if available
-            if hasattr(self.model, "created_at"):
-                query = query.order_by(self.model.created_at.desc())
+            # Default keyset ordering: created_at (if available) then id
+            query = apply_keyset(query, self.model, cursor)
         
         # Apply load options
         if load_options:
@@ -269,26 +518,82 @@ class BaseRepository(ABC, Generic[ModelType, CreateSchemaType, UpdateSchemaType]
                 query = query.options(option)
         
         # Apply pagination
-        query = query.offset(skip).limit(limit)
+        if not cursor:
+            query = query.offset(skip)
+        query = query.limit(limit)
         
         result = await db.execute(query)
         return list(result.scalars().all())
     
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        skip: int = 0,
+        limit: int = 100,
+        organization_id: Optional[str] = None,
+        filters: Optional[Dict[str, Any]] = None,
+        load_options: Optional[List[Any]] = None,
+        cursor: Optional[str] = None,
+        count_mode: CountMode = CountMode.EXACT
+    ) -> Page:
+        """Get a page of entities and its total in one round trip.
+        
+        Replaces a ``get_multi`` + ``count`` pair: the exact total comes from
+        a window count in the page query, ``CountMode.ESTIMATED`` reads the
+        planner's row estimate instead, and ``CountMode.NONE`` skips the
+        total and only reports ``has_next``.
+        
+        Args:
+            db: Database session
+            skip: Number of records to skip (ignored when cursor is given)
+            limit: Maximum number of records to return
+            organization_id: Organization ID for multi-tenancy
+            filters: Additional filters as field:value dict
+            load_options: SQLAlchemy load options
+            cursor: Keyset cursor of the last row of the previous page
+            count_mode: How to compute the total
+            
+        Returns:
+            Page of model instances
+        """
+        query = select(self.model)
+        query = self._apply_organization_filter(query, organization_id)
+        query = self._apply_filters(query, filters)
+        
+        # Apply load options
+        if load_options:
+            for option in load_options:
+                query = query.options(option)
+        
+        return await fetch_page(
+            db,
+            query,
+            self.model,
+            limit=limit,
+            skip=skip,
+            cursor=cursor,
+            count_mode=count_mode
+        )
+    
     async def update(
         self,
         db: AsyncSession,
         *,
         db_obj: ModelType,
-        obj_in: UpdateSchemaType,
-        partial: bool = True
+        obj_in: Union[UpdateSchemaType, Dict[str, Any]],
+        partial: bool = True,
+        returning: bool = True
     ) -> ModelType:
         """Update an entity.
         
         Args:
             db: Database session
             db_obj: Model instance to update
-            obj_in: Pydantic schema with update data
+            obj_in: Pydantic schema or dict with update data
             partial: If True, only update provided fields
+            returning: Rely on the UPDATE's RETURNING for server-generated
+                columns; pass False to reload the row with a refresh
             
         Returns:
             Updated model instance
@@ -298,7 +603,9 @@ class BaseRepository(ABC, Generic[ModelType, CreateSchemaType, UpdateSchemaType]
         """
         try:
             # Get update data
-            if partial:
+            if isinstance(obj_in, dict):
+                update_data = obj_in
+            elif partial:
                 update_data = obj_in.model_dump(exclude_unset=True)
             else:
                 update_data = obj_in.model_dump()
@@ -310,14 +617,110 @@ class BaseRepository(ABC, Generic[ModelType, CreateSchemaType, UpdateSchemaType]
             
             db.add(db_obj)
             await db.flush()
-            await db.refresh(db_obj)
+            if not returning:
+                await db.refresh(db_obj)
             
             return db_obj
         except SQLAlchemyError as e:
             await db.rollback()
             raise RepositoryException(f"Database error: {e}")
     
+    async def update_by_id(
+        self,
+        db: AsyncSession,
+        *,
+        id: Any,
+        values: Dict[str, Any],
+        organization_id: Optional[str] = None
+    ) -> Optional[ModelType]:
+        """Update an entity by ID with a single UPDATE ... RETURNING.
+        
+        The row doesn't need to be loaded first; values may be SQL
+        expressions (e.g. ``func.now()``) evaluated by the database. The
+        session's copy of the entity, if any, is refreshed from the result.
+        
+        Args:
+            db: Database session
+            id: Entity ID
+            values: Column values to set
+            organization_id: Organization ID for multi-tenancy
+            
+        Returns:
+            Updated model instance or None if not found
+            
+        Raises:
+            RepositoryException: For database errors
+        """
+        query = update(self.model).where(self.model.id == id)
+        if self._organization_id_field and organization_id:
+            query = query.where(
+                getattr(self.model, self._organization_id_field) == organization_id
+            )
+        query = (
+            query.values(**values)
+            .returning(self.model)
+            .execution_options(populate_existing=True, synchronize_session=False)
+        )
+        
+        try:
+            result = await db.execute(query)
+            return result.scalar_one_or_none()
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise RepositoryException(f"Database error: {e}")
+    
     @log_execution(log_args=False)
+    async def transition(
+        self,
+        db: AsyncSession,
+        *,
+        id: Any,
+        status: Any,
+        transitions: StatusTransitions,
+        values: Optional[Dict[str, Any]] = None,
+        organization_id: Optional[str] = None
+    ) -> TransitionResult:
+        """Atomically move an entity to a new status.
+        
+        The status check and the write happen in the database, so a
+        concurrent writer can't be overwritten; when the entity is not in a
+        status the target is reachable from, nothing is written.
+        
+        Args:
+            db: Database session
+            id: Entity ID
+            status: Requested status
+            transitions: State machine to check the transition against
+            values: Other column values to set with the status
+            organization_id: Organization ID for multi-tenancy
+            
+        Returns:
+            Transition result with the updated entity, or a conflict
+            
+        Raises:
+            NotFoundError: If entity not found
+            RepositoryException: For database errors
+        """
+        filters = []
+        if self._organization_id_field and organization_id:
+            filters.append(
+                getattr(self.model, self._organization_id_field) == organization_id
+            )
+        
+        try:
+            return await transition(
+                db,
+                self.model,
+                id=id,
+                status=status,
+                transitions=transitions,
+                values=values,
+                filters=filters
+            )
+        except SQLAlchemyError as e:
+            await db.rollback()
+            raise RepositoryException(f"Database error: {e}")
+    
     async def delete(
         self,
         db: AsyncSession,
@@ -401,13 +804,7 @@ class BaseRepository(ABC, Generic[ModelType, CreateSchemaType, UpdateSchemaType]
         query = self._apply_organization_filter(query, organization_id)
         
         # Apply additional filters
-        if filters:
-            filter_clauses = []
-            for field, value in filters.items():
-                if hasattr(self.model, field):
-                    filter_clauses.append(getattr(self.model, field) == value)
-            if filter_clauses:
-                query = query.where(and_(*filter_clauses))
+        query = self._apply_filters(query, filters)
         
         result = await db.execute(query)
         return result.scalar_one()
@@ -7,6 +7,7 @@ from sqlalchemy import Select, and_
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.repositories.base import BaseRepository, ModelType, CreateSchemaType, UpdateSchemaType
+from app.repositories.pagination import apply_keyset
 from app.repositories.specifications.base import Specification
 
 
@@ -57,24 +58,29 @@ class SpecificationRepository(BaseRepository[ModelType, CreateSchemaType, Update
         limit: int = 100,
         order_by: Optional[List[Any]] = None,
         load_options: Optional[List[Any]] = None,
-        organization_id: Optional[str] = None
+        organization_id: Optional[str] = None,
+        cursor: Optional[str] = None
     ) -> List[ModelType]:
         """Find entities matching specification.
         
         Args:
             db: Database session
             specification: Specification to match
-            skip: Number of records to skip
+            skip: Number of records to skip (ignored when cursor is given)
             limit: Maximum number of records to return
             order_by: List of order_by clauses
             load_options: SQLAlchemy load options
             organization_id: Organization ID for multi-tenancy
+            cursor: Keyset cursor of the last row of the previous page
             
         Returns:
             List of matching entities
         """
         from sqlalchemy import select
         
+        if cursor and order_by:
+            raise ValueError("cursor pagination uses the default ordering")
+        
         query = select(self.model)
         
         # Apply organization filter if needed
@@ -87,9 +93,8 @@ class SpecificationRepository(BaseRepository[ModelType, CreateSchemaType, Update
         if order_by:
             query = query.order_by(*order_by)
         else:
-            # Default ordering by created_at if available
-            if hasattr(self.model, "created_at"):
-                query = query.order_by(self.model.created_at.desc())
+            # Default keyset ordering: created_at (if available) then id
+            query = apply_keyset(query, self.model, cursor)
         
         # Apply load options
         if load_options:
@@ -97,7 +102,9 @@ class SpecificationRepository(BaseRepository[ModelType, CreateSchemaType, Update
                 query = query.options(option)
         
         # Apply pagination
-        query = query.offset(skip).limit(limit)
+        if not cursor:
+            query = query.offset(skip)
+        query = query.limit(limit)
         
         result = await db.execute(query)
         return list(result.scalars().all())
@@ -16,6 +16,7 @@ from app.models import (
     PaymentOrder,
 )
 from app.repositories.base import BaseRepository, DuplicateError, NotFoundError
+from app.repositories.pagination import apply_keyset
 from app.schemas.customer import (
     CustomerCreate,
     CustomerFilter,
@@ -144,7 +145,8 @@ class CustomerRepository(BaseRepository[Customer, CustomerCreate, CustomerUpdate
         filters: CustomerFilter,
         organization_id: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[Customer]:
         """
         Search customers with multiple filters.
@@ -153,8 +155,9 @@ class CustomerRepository(BaseRepository[Customer, CustomerCreate, CustomerUpdate
             db: Database session
             filters: Search filters
             organization_id: Organization ID
-            skip: Number of records to skip
+            skip: Number of records to skip (ignored when cursor is given)
             limit: Maximum number of records to return
+            cursor: Keyset cursor of the last row of the previous page
             
         Returns:
             List of matching customers
@@ -190,7 +193,10 @@ class CustomerRepository(BaseRepository[Customer, CustomerCreate, CustomerUpdate
                 query = query.where(~Customer.id.in_(subquery))
         
         # Apply ordering and pagination
-        query = query.order_by(Customer.created_at.desc()).offset(skip).limit(limit)
+        query = apply_keyset(query, Customer, cursor)
+        if not cursor:
+            query = query.offset(skip)
+        query = query.limit(limit)
         
         result = await db.execute(query)
         return list(result.scalars().all())
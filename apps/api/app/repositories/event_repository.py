@@ -4,11 +4,11 @@ Event-aware repository that emits domain events.
 This module extends the base repository to automatically emit
 domain events after successful operations.
 """
-from typing import Any, List, Optional, Type
+from typing import Any, Dict, List, Optional, Sequence, Type, Union
 
 from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.events.publisher import DomainEvent, publish_event
+from app.events.publisher import DomainEvent, publish_event, publish_events
 from app.repositories.base import (
     BaseRepository,
     CreateSchemaType,
@@ -82,6 +82,24 @@ class EventRepository(BaseRepository[ModelType, CreateSchemaType, UpdateSchemaTy
         """
         return None
     
+    async def _emit_upserted_event(
+        self,
+        entity: ModelType,
+        organization_id: Optional[str] = None
+    ) -> Optional[DomainEvent]:
+        """Create event for an entity written by an upsert.
+        
+        Override this in subclasses to emit specific events.
+        
+        Args:
+            entity: Inserted or updated entity
+            organization_id: Organization ID if applicable
+            
+        Returns:
+            Domain event or None if no event should be emitted
+        """
+        return None
+    
     async def _emit_custom_event(
         self,
         entity: ModelType,
@@ -138,6 +156,82 @@ class EventRepository(BaseRepository[ModelType, CreateSchemaType, UpdateSchemaTy
         
         return entity
     
+    async def create_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        organization_id: Optional[str] = None,
+        **kwargs: Any
+    ) -> List[ModelType]:
+        """Create many entities and emit their created events in one batch.
+        
+        Args:
+            db: Database session
+            objs_in: Creation data
+            organization_id: Organization ID for multi-tenancy
+            **kwargs: Additional fields
+            
+        Returns:
+            Created entities
+        """
+        entities = await super().create_many(
+            db,
+            objs_in=objs_in,
+            organization_id=organization_id,
+            **kwargs
+        )
+        
+        events = []
+        for entity in entities:
+            event = await self._emit_created_event(entity, organization_id)
+            if event:
+                events.append(event)
+        await publish_events(events)
+        
+        return entities
+    
+    async def upsert_many(
+        self,
+        db: AsyncSession,
+        *,
+        objs_in: Sequence[Union[CreateSchemaType, Dict[str, Any]]],
+        conflict_fields: List[str],
+        update_fields: Optional[List[str]] = None,
+        organization_id: Optional[str] = None,
+        **kwargs: Any
+    ) -> List[ModelType]:
+        """Upsert many entities and emit their events in one batch.
+        
+        Args:
+            db: Database session
+            objs_in: Entity data
+            conflict_fields: Columns of the unique constraint to upsert on
+            update_fields: Columns to overwrite on conflict
+            organization_id: Organization ID for multi-tenancy
+            **kwargs: Additional fields
+            
+        Returns:
+            Inserted or updated entities
+        """
+        entities = await super().upsert_many(
+            db,
+            objs_in=objs_in,
+            conflict_fields=conflict_fields,
+            update_fields=update_fields,
+            organization_id=organization_id,
+            **kwargs
+        )
+        
+        events = []
+        for entity in entities:
+            event = await self._emit_upserted_event(entity, organization_id)
+            if event:
+                events.append(event)
+        await publish_events(events)
+        
+        return entities
+    
     async def update(
         self,
         db: AsyncSession,
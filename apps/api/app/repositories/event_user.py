@@ -17,6 +17,7 @@ from app.repositories.user import UserRepository
 
 from app.events import (
     UserCreatedEvent,
+    UserUpdatedEvent,
     UserVerifiedEvent,
     UserWalletLinkedEvent,
 )
@@ -89,7 +90,11 @@ class EventUserRepository(EventRepository[User, UserCreate, UserUpdate]):
                 wallet_address="0x..."  # Would fetch from wallet
             )
         
-        # For other updates, we might not emit events
+        if changes:
+            return UserUpdatedEvent(
+                user_id=str(entity.id),
+                updated_fields=list(changes)
+            )
         return None
     
     async def verify_email(
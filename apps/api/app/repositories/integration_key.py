@@ -20,6 +20,11 @@ class IntegrationKeyRepository(BaseRepository[IntegrationKey]):
         """Initialize the repository."""
         super().__init__(model)
     
+    @property
+    def _organization_id_field(self) -> Optional[str]:
+        """Integration keys belong to an organization."""
+        return "organization_id"
+    
     async def create_with_key(
         self,
         db: AsyncSession,
@@ -7,6 +7,7 @@ from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.cache import cached, coalesced
 from app.models import (
     Organization,
     OrganizationUser,
@@ -310,6 +311,12 @@ class OrganizationRepository(BaseRepository[Organization, OrganizationCreate, Or
         
         return role
     
+    @cached(
+        "organization.stats",
+        tags=["organization:{organization_id}", "payment_link:organization:{organization_id}"],
+        ttl=60
+    )
+    @coalesced("organization.stats")
     async def get_stats(
         self,
         db: AsyncSession,
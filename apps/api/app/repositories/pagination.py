@@ -0,0 +1,249 @@
+"""
+Keyset (cursor) pagination helpers for repositories.
+
+Pages are ordered newest first by ``(created_at, id)`` and a cursor encodes
+the position of the last row of the previous page, so fetching any page
+is an index range scan instead of skipping ``OFFSET`` rows.
+
+``fetch_page`` returns a page together with its total in a single round
+trip (window count), an estimated total read from planner statistics, or
+no total at all with ``has_next`` served by fetching one extra row.
+"""
+import base64
+import json
+from datetime import datetime
+from enum import Enum
+from typing import Any, List, Optional, Sequence, Tuple
+
+from sqlalchemy import Select, func, select, tuple_
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import BadRequestException
+
+
+class CountMode(str, Enum):
+    """How the total of a page is computed."""
+    
+    # Exact total via COUNT(*) OVER () in the page query itself
+    EXACT = "exact"
+    # Planner row estimate (Postgres EXPLAIN); exact count elsewhere
+    ESTIMATED = "estimated"
+    # No total; has_next only
+    NONE = "none"
+
+
+class InvalidCursorError(BadRequestException):
+    """Raised when a pagination cursor cannot be decoded."""
+    
+    def __init__(self, cursor: str):
+        super().__init__(
+            message=f"Invalid pagination cursor '{cursor}'",
+            code="INVALID_CURSOR"
+        )
+
+
+def _sort_columns(model: Any) -> List[Any]:
+    """Get the keyset columns of a model, newest first then by ID."""
+    if hasattr(model, "created_at"):
+        return [model.created_at, model.id]
+    return [model.id]
+
+
+def encode_cursor(row: Any) -> str:
+    """Encode the keyset position of a row as an opaque cursor.
+    
+    Args:
+        row: Model instance
+    
+    Returns:
+        URL-safe cursor string
+    """
+    values = []
+    for column in _sort_columns(type(row)):
+        value = getattr(row, column.key)
+        values.append(value.isoformat() if isinstance(value, datetime) else value)
+    raw = json.dumps(values, separators=(",", ":")).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(model: Any, cursor: str) -> Tuple[Any, ...]:
+    """Decode a cursor into keyset values for a model.
+    
+    Args:
+        model: SQLAlchemy model class
+        cursor: Cursor produced by encode_cursor
+    
+    Returns:
+        Keyset values in sort column order
+    
+    Raises:
+        InvalidCursorError: If the cursor is malformed
+    """
+    columns = _sort_columns(model)
+    try:
+        raw = base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4))
+        values = json.loads(raw)
+        if not isinstance(values, list) or len(values) != len(columns):
+            raise ValueError("cursor does not match sort columns")
+        if len(columns) == 2:
+            values[0] = datetime.fromisoformat(values[0])
+    except (ValueError, TypeError):
+        raise InvalidCursorError(cursor)
+    return tuple(values)
+
+
+def apply_keyset(query: Select, model: Any, cursor: Optional[str] = None) -> Select:
+    """Order a query by the model's keyset and start after a cursor.
+    
+    Args:
+        query: SQLAlchemy select query
+        model: SQLAlchemy model class
+        cursor: Cursor of the last row of the previous page
+    
+    Returns:
+        Ordered (and positioned) query; the caller applies the limit
+    """
+    columns = _sort_columns(model)
+    if cursor:
+        values = decode_cursor(model, cursor)
+        if len(columns) == 1:
+            query = query.where(columns[0] < values[0])
+        else:
+            # Row-value comparison matches a (created_at, id) index range scan
+            query = query.where(tuple_(*columns) < tuple_(*values))
+    return query.order_by(*(column.desc() for column in columns))
+
+
+def next_cursor(items: Sequence[Any], limit: int) -> Optional[str]:
+    """Get the cursor of the following page from a fetched page.
+    
+    Args:
+        items: Rows fetched with ``limit``
+        limit: Page size the rows were fetched with
+    
+    Returns:
+        Cursor after the last row, or None if the page was not full
+    """
+    if items and len(items) >= limit:
+        return encode_cursor(items[-1])
+    return None
+
+
+class Page:
+    """A page of results with optional total."""
+    
+    def __init__(
+        self,
+        items: List[Any],
+        *,
+        total: Optional[int],
+        has_next: bool,
+        total_is_estimate: bool = False
+    ):
+        """Initialize the page.
+        
+        Args:
+            items: Rows of the page
+            total: Total matching rows, None when not counted
+            has_next: Whether another page follows
+            total_is_estimate: Whether total is a planner estimate
+        """
+        self.items = items
+        self.total = total
+        self.has_next = has_next
+        self.total_is_estimate = total_is_estimate
+    
+    @property
+    def next_cursor(self) -> Optional[str]:
+        """Cursor of the following page, None on the last page."""
+        if self.has_next and self.items:
+            return encode_cursor(self.items[-1])
+        return None
+
+
+async def _exact_count(db: AsyncSession, query: Select) -> int:
+    """Count the rows of a query with a separate statement."""
+    count_query = select(func.count()).select_from(query.order_by(None).subquery())
+    return (await db.execute(count_query)).scalar_one()
+
+
+async def _estimated_count(db: AsyncSession, query: Select) -> Tuple[int, bool]:
+    """Estimate the rows of a query from planner statistics.
+    
+    Returns:
+        Row count and whether it is an estimate
+    """
+    connection = await db.connection()
+    if connection.dialect.name != "postgresql":
+        return await _exact_count(db, query), False
+    
+    compiled = query.order_by(None).compile(dialect=connection.dialect)
+    params = compiled.params
+    if compiled.positiontup is not None:
+        params = tuple(params[name] for name in compiled.positiontup)
+    result = await connection.exec_driver_sql(f"EXPLAIN (FORMAT JSON) {compiled}", params)
+    plan = result.scalar_one()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"]), True
+
+
+async def fetch_page(
+    db: AsyncSession,
+    query: Select,
+    model: Any,
+    *,
+    limit: int,
+    skip: int = 0,
+    cursor: Optional[str] = None,
+    count_mode: CountMode = CountMode.EXACT
+) -> Page:
+    """Fetch a page of a filtered query, newest first.
+    
+    Args:
+        db: Database session
+        query: Filtered select of ``model`` without ordering or pagination
+        model: SQLAlchemy model class being listed
+        limit: Page size
+        skip: Number of rows to skip (ignored when cursor is given)
+        cursor: Keyset cursor of the last row of the previous page
+        count_mode: How to compute the total
+        
+    Returns:
+        Page of model instances
+    """
+    page_query = apply_keyset(query, model, cursor)
+    if not cursor:
+        page_query = page_query.offset(skip)
+    
+    # The window count sees every filtered row, so it only equals the total
+    # when no cursor predicate narrows the query
+    windowed = count_mode == CountMode.EXACT and not cursor
+    if windowed:
+        page_query = page_query.add_columns(func.count().over().label("_total"))
+    
+    # One extra row tells whether another page follows
+    result = await db.execute(page_query.limit(limit + 1))
+    if windowed:
+        rows = result.all()
+        items = [row[0] for row in rows]
+    else:
+        rows = None
+        items = list(result.scalars().all())
+    
+    has_next = len(items) > limit
+    items = items[:limit]
+    
+    total: Optional[int] = None
+    total_is_estimate = False
+    if count_mode == CountMode.EXACT:
+        if rows:
+            total = rows[0][1]
+        elif windowed and not skip:
+            total = 0
+        else:
+            total = await _exact_count(db, query)
+    elif count_mode == CountMode.ESTIMATED:
+        total, total_is_estimate = await _estimated_count(db, query)
+    
+    return Page(items, total=total, has_next=has_next, total_is_estimate=total_is_estimate)
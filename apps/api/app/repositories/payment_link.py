@@ -1,7 +1,6 @@
 """
 Payment link repository with status filters.
 """
-import secrets
 from datetime import datetime
 from typing import Dict, List, Optional
 
@@ -9,8 +8,14 @@ from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.cache import cached, coalesced, entity_tag
+from app.core.exceptions import NotFoundError
+from app.core.short_codes import short_code_encoder
+from app.db.sequences import short_code_allocator
 from app.models import PaymentLink, PaymentLinkStatus, PaymentOrder, PaymentOrderStatus
 from app.repositories.base import BaseRepository
+from app.repositories.pagination import apply_keyset
+from app.repositories.transitions import PAYMENT_LINK_TRANSITIONS, TransitionResult
 from app.schemas.payment_link import PaymentLinkCreate, PaymentLinkFilter, PaymentLinkUpdate
 
 
@@ -47,7 +52,7 @@ class PaymentLinkRepository(BaseRepository[PaymentLink, PaymentLinkCreate, Payme
             Created payment link
         """
         # Generate unique short code
-        short_code = await self._generate_unique_short_code(db)
+        short_code = await self.generate_short_code(db)
         
         # Generate QR code (placeholder - would use actual QR library)
         qr_code = f"QR_CODE_FOR_{short_code}"
@@ -62,33 +67,28 @@ class PaymentLinkRepository(BaseRepository[PaymentLink, PaymentLinkCreate, Payme
             qr_code=qr_code
         )
     
-    async def _generate_unique_short_code(self, db: AsyncSession, length: int = 8) -> str:
+    async def generate_short_code(self, db: AsyncSession) -> str:
         """
-        Generate a unique short code for the payment link.
+        Generate a unique short code for a payment link.
+        
+        Codes are encoded from a global sequence, so they are unique without
+        checking existing links; the unique constraint on ``short_code``
+        remains the only guard (e.g. against codes issued before).
         
         Args:
             db: Database session
-            length: Length of the short code
             
         Returns:
             Unique short code
         """
-        max_attempts = 10
-        for _ in range(max_attempts):
-            # Generate random alphanumeric code
-            short_code = ''.join(
-                secrets.choice('abcdefghijklmnopqrstuvwxyz0123456789')
-                for _ in range(length)
-            )
-            
-            # Check if it already exists
-            query = select(PaymentLink).where(PaymentLink.short_code == short_code)
-            result = await db.execute(query)
-            if not result.scalar_one_or_none():
-                return short_code
-        
-        raise ValueError("Failed to generate unique short code")
+        number = await short_code_allocator.next_value("payment_link", "")
+        return short_code_encoder.encode(number)
     
+    @cached(
+        "payment_link.by_short_code",
+        tags=[lambda link, arguments: [entity_tag("payment_link", link.id)]]
+    )
+    @coalesced("payment_link.by_short_code")
     async def get_by_short_code(
         self,
         db: AsyncSession,
@@ -220,14 +220,67 @@ class PaymentLinkRepository(BaseRepository[PaymentLink, PaymentLinkCreate, Payme
             
         Returns:
             Updated payment link
+            
+        Raises:
+            NotFoundError: If the payment link doesn't exist
         """
-        link = await self.get_or_404(db, id=payment_link_id)
-        link.status = PaymentLinkStatus.EXPIRED
-        db.add(link)
-        await db.flush()
-        await db.refresh(link)
+        link = await self.update_by_id(
+            db,
+            id=payment_link_id,
+            values={"status": PaymentLinkStatus.EXPIRED}
+        )
+        if link is None:
+            raise NotFoundError(resource="PaymentLink", identifier=payment_link_id)
         return link
     
+    async def transition_status(
+        self,
+        db: AsyncSession,
+        *,
+        payment_link_id: str,
+        status: PaymentLinkStatus,
+        organization_id: Optional[str] = None,
+        values: Optional[Dict] = None
+    ) -> TransitionResult:
+        """
+        Atomically move a payment link to a new status.
+        
+        Args:
+            db: Database session
+            payment_link_id: Payment link ID
+            status: New status
+            organization_id: Organization ID for multi-tenancy
+            values: Other fields to update together with the status
+            
+        Returns:
+            Transition result; a conflict if the link's current status
+            doesn't allow the new one
+            
+        Raises:
+            NotFoundError: If the payment link doesn't exist
+        """
+        columns = PaymentLink.__mapper__.column_attrs
+        values = {
+            key: value for key, value in (values or {}).items()
+            if key in columns
+        }
+        
+        return await self.transition(
+            db,
+            id=payment_link_id,
+            status=status,
+            transitions=PAYMENT_LINK_TRANSITIONS,
+            values=values,
+            organization_id=organization_id
+        )
+    
+    # Order events don't all name their payment link, so statistics are
+    # also bounded by a short TTL
+    @cached(
+        "payment_link.statistics",
+        tags=["payment_link:{payment_link_id}"],
+        ttl=60
+    )
     async def get_link_statistics(
         self,
         db: AsyncSession,
@@ -292,7 +345,8 @@ class PaymentLinkRepository(BaseRepository[PaymentLink, PaymentLinkCreate, Payme
         filters: PaymentLinkFilter,
         organization_id: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[PaymentLink]:
         """
         Search payment links with multiple filters.
@@ -301,8 +355,9 @@ class PaymentLinkRepository(BaseRepository[PaymentLink, PaymentLinkCreate, Payme
             db: Database session
             filters: Search filters
             organization_id: Organization ID
-            skip: Number of records to skip
+            skip: Number of records to skip (ignored when cursor is given)
             limit: Maximum number of records to return
+            cursor: Keyset cursor of the last row of the previous page
             
         Returns:
             List of matching payment links
@@ -353,7 +408,10 @@ class PaymentLinkRepository(BaseRepository[PaymentLink, PaymentLinkCreate, Payme
             query = query.where(PaymentLink.executing_agent_id == filters.executing_agent_id)
         
         # Apply ordering and pagination
-        query = query.order_by(PaymentLink.created_at.desc()).offset(skip).limit(limit)
+        query = apply_keyset(query, PaymentLink, cursor)
+        if not cursor:
+            query = query.offset(skip)
+        query = query.limit(limit)
         
         result = await db.execute(query)
         return list(result.scalars().all())
@@ -421,6 +479,5 @@ class PaymentLinkRepository(BaseRepository[PaymentLink, PaymentLinkCreate, Payme
             link.status = PaymentLinkStatus.PAID
             db.add(link)
             await db.flush()
-            await db.refresh(link)
         
         return link 
\ No newline at end of file
@@ -9,6 +9,8 @@ from sqlalchemy import and_, case, extract, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.exceptions import InvalidStateTransition
+from app.db.sequences import order_number_allocator
 from app.models import (
     KycStatus,
     PaymentLink,
@@ -18,6 +20,8 @@ from app.models import (
     EventType,
 )
 from app.repositories.base import BaseRepository
+from app.repositories.pagination import apply_keyset
+from app.repositories.transitions import PAYMENT_ORDER_TRANSITIONS, TransitionResult
 from app.schemas.payment_order import (
     PaymentOrderCreate,
     PaymentOrderFilter,
@@ -43,7 +47,8 @@ class PaymentOrderRepository(BaseRepository[PaymentOrder, PaymentOrderCreate, Pa
         db: AsyncSession,
         *,
         obj_in: PaymentOrderCreate,
-        organization_id: str
+        organization_id: str,
+        returning: bool = True
     ) -> PaymentOrder:
         """
         Create a new payment order with auto-generated order number.
@@ -52,6 +57,8 @@ class PaymentOrderRepository(BaseRepository[PaymentOrder, PaymentOrderCreate, Pa
             db: Database session
             obj_in: Payment order creation data
             organization_id: Organization ID
+            returning: Rely on the INSERT's RETURNING for server-generated
+                columns; pass False to reload the row with a refresh
             
         Returns:
             Created payment order
@@ -91,7 +98,8 @@ class PaymentOrderRepository(BaseRepository[PaymentOrder, PaymentOrderCreate, Pa
         
         db.add(db_obj)
         await db.flush()
-        await db.refresh(db_obj)
+        if not returning:
+            await db.refresh(db_obj)
         
         return db_obj
     
@@ -103,6 +111,9 @@ class PaymentOrderRepository(BaseRepository[PaymentOrder, PaymentOrderCreate, Pa
         """
         Generate a unique order number for the organization.
         
+        Numbers come from a per-organization, per-day counter reserved in
+        blocks, so no existing orders are scanned.
+        
         Args:
             db: Database session
             organization_id: Organization ID
@@ -110,26 +121,8 @@ class PaymentOrderRepository(BaseRepository[PaymentOrder, PaymentOrderCreate, Pa
         Returns:
             Unique order number
         """
-        # Get the current date prefix
-        today = datetime.utcnow()
-        date_prefix = today.strftime("%Y%m%d")
-        
-        # Find the highest order number for today
-        query = select(func.max(PaymentOrder.order_number)).where(
-            and_(
-                PaymentOrder.organization_id == organization_id,
-                PaymentOrder.order_number.like(f"{date_prefix}-%")
-            )
-        )
-        
-        result = await db.execute(query)
-        last_order_number = result.scalar_one_or_none()
-        
-        if last_order_number:
-            # Extract the sequence number and increment
-            sequence = int(last_order_number.split("-")[-1]) + 1
-        else:
-            sequence = 1
+        date_prefix = datetime.utcnow().strftime("%Y%m%d")
+        sequence = await order_number_allocator.next_value(organization_id, date_prefix)
         
         return f"{date_prefix}-{sequence:06d}"
     
@@ -231,7 +224,8 @@ class PaymentOrderRepository(BaseRepository[PaymentOrder, PaymentOrderCreate, Pa
         filters: PaymentOrderFilter,
         organization_id: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[PaymentOrder]:
         """
         Search payment orders with multiple filters.
@@ -240,8 +234,9 @@ class PaymentOrderRepository(BaseRepository[PaymentOrder, PaymentOrderCreate, Pa
             db: Database session
             filters: Search filters
             organization_id: Organization ID
-            skip: Number of records to skip
+            skip: Number of records to skip (ignored when cursor is given)
             limit: Maximum number of records to return
+            cursor: Keyset cursor of the last row of the previous page
             
         Returns:
             List of matching payment orders
@@ -310,7 +305,10 @@ class PaymentOrderRepository(BaseRepository[PaymentOrder, PaymentOrderCreate, Pa
             query = query.where(PaymentOrder.risk_score <= filters.max_risk_score)
         
         # Apply ordering and pagination
-        query = query.order_by(PaymentOrder.created_at.desc()).offset(skip).limit(limit)
+        query = apply_keyset(query, PaymentOrder, cursor)
+        if not cursor:
+            query = query.offset(skip)
+        query = query.limit(limit)
         
         result = await db.execute(query)
         return list(result.scalars().all())
@@ -518,44 +516,88 @@ class PaymentOrderRepository(BaseRepository[PaymentOrder, PaymentOrderCreate, Pa
             for row in result
         ]
     
-    async def update_status(
+    async def transition_status(
         self,
         db: AsyncSession,
         *,
         order_id: str,
         status: PaymentOrderStatus,
+        organization_id: Optional[str] = None,
         **kwargs
-    ) -> PaymentOrder:
+    ) -> TransitionResult:
         """
-        Update payment order status with timestamp tracking.
+        Atomically move a payment order to a new status.
+        
+        The status check, the write and the timestamps (``started_at`` on
+        the first PROCESSING, ``completed_at`` on COMPLETED/FAILED, both set
+        by the database) happen in one UPDATE ... RETURNING.
         
         Args:
             db: Database session
             order_id: Payment order ID
             status: New status
+            organization_id: Organization ID for multi-tenancy
             **kwargs: Additional fields to update
             
         Returns:
-            Updated payment order
+            Transition result; a conflict if the order's current status
+            doesn't allow the new one
+            
+        Raises:
+            NotFoundError: If the payment order doesn't exist
         """
-        order = await self.get_or_404(db, id=order_id)
-        
-        # Update status
-        order.status = status
+        values = {
+            key: value for key, value in kwargs.items()
+            if hasattr(PaymentOrder, key)
+        }
         
         # Update timestamps based on status
-        if status == PaymentOrderStatus.PROCESSING and not order.started_at:
-            order.started_at = datetime.utcnow()
+        if status == PaymentOrderStatus.PROCESSING:
+            values["started_at"] = func.coalesce(PaymentOrder.started_at, func.now())
         elif status in [PaymentOrderStatus.COMPLETED, PaymentOrderStatus.FAILED]:
-            order.completed_at = datetime.utcnow()
-        
-        # Update additional fields
-        for key, value in kwargs.items():
-            if hasattr(order, key):
-                setattr(order, key, value)
+            values["completed_at"] = func.now()
+        
+        return await self.transition(
+            db,
+            id=order_id,
+            status=status,
+            transitions=PAYMENT_ORDER_TRANSITIONS,
+            values=values,
+            organization_id=organization_id
+        )
+    
+    async def update_status(
+        self,
+        db: AsyncSession,
+        *,
+        order_id: str,
+        status: PaymentOrderStatus,
+        **kwargs
+    ) -> PaymentOrder:
+        """
+        Update payment order status with timestamp tracking.
         
-        db.add(order)
-        await db.flush()
-        await db.refresh(order)
+        Args:
+            db: Database session
+            order_id: Payment order ID
+            status: New status
+            **kwargs: Additional fields to update
+            
+        Returns:
+            Updated payment order
+            
+        Raises:
+            NotFoundError: If the payment order doesn't exist
+            InvalidStateTransition: If the current status doesn't allow the
+                new one
+        """
+        result = await self.transition_status(
+            db,
+            order_id=order_id,
+            status=status,
+            **kwargs
+        )
+        if result.conflict:
+            raise InvalidStateTransition("PaymentOrder", result.status.value, status.value)
         
-        return order 
\ No newline at end of file
+        return result.entity
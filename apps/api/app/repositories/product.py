@@ -7,8 +7,10 @@ from sqlalchemy import and_, func, or_, select
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import selectinload
 
+from app.core.cache import cached
 from app.models import Price, Product
 from app.repositories.base import BaseRepository, DuplicateError
+from app.repositories.pagination import apply_keyset
 from app.schemas.product import ProductCreate, ProductFilter, ProductUpdate
 
 
@@ -149,7 +151,8 @@ class ProductRepository(BaseRepository[Product, ProductCreate, ProductUpdate]):
         filters: ProductFilter,
         organization_id: str,
         skip: int = 0,
-        limit: int = 100
+        limit: int = 100,
+        cursor: Optional[str] = None
     ) -> List[Product]:
         """
         Search products with multiple filters.
@@ -158,8 +161,9 @@ class ProductRepository(BaseRepository[Product, ProductCreate, ProductUpdate]):
             db: Database session
             filters: Search filters
             organization_id: Organization ID
-            skip: Number of records to skip
+            skip: Number of records to skip (ignored when cursor is given)
             limit: Maximum number of records to return
+            cursor: Keyset cursor of the last row of the previous page
             
         Returns:
             List of matching products
@@ -205,7 +209,10 @@ class ProductRepository(BaseRepository[Product, ProductCreate, ProductUpdate]):
             query = query.where(Product.created_at <= filters.created_before)
         
         # Apply ordering and pagination
-        query = query.order_by(Product.created_at.desc()).offset(skip).limit(limit)
+        query = apply_keyset(query, Product, cursor)
+        if not cursor:
+            query = query.offset(skip)
+        query = query.limit(limit)
         
         result = await db.execute(query)
         return list(result.scalars().all())
@@ -299,6 +306,7 @@ class ProductRepository(BaseRepository[Product, ProductCreate, ProductUpdate]):
         result = await db.execute(query)
         return list(result.scalars().all())
     
+    @cached("product.categories", tags=["product:organization:{organization_id}"], ttl=60)
     async def get_categories(
         self,
         db: AsyncSession,
@@ -325,6 +333,7 @@ class ProductRepository(BaseRepository[Product, ProductCreate, ProductUpdate]):
         result = await db.execute(query)
         return [row[0] for row in result.all()]
     
+    @cached("product.tags", tags=["product:organization:{organization_id}"], ttl=60)
     async def get_all_tags(
         self,
         db: AsyncSession,
@@ -0,0 +1,220 @@
+"""
+Atomic compare-and-set status transitions.
+
+A transition is a single ``UPDATE ... WHERE id = :id AND status IN
+(:allowed_from) RETURNING *``: the database checks the current status and
+writes the new one in the same statement, so concurrent writers (e.g.
+duplicate provider callbacks) can't overwrite each other. When the row is
+not in a status the target can be reached from, nothing is written and a
+conflict result reports the status the row is actually in.
+"""
+from enum import Enum
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set
+
+from sqlalchemy import select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.exceptions import NotFoundError
+from app.models import PaymentLinkStatus, PaymentOrderStatus
+
+
+class StatusTransitions:
+    """Allowed status transitions of a state machine."""
+    
+    def __init__(self, transitions: Mapping[Enum, Iterable[Enum]]):
+        """Initialize the state machine.
+        
+        Args:
+            transitions: Statuses reachable from each status; statuses
+                missing from the mapping are final
+        """
+        self._transitions: Dict[Enum, Set[Enum]] = {
+            source: set(targets) for source, targets in transitions.items()
+        }
+    
+    def can_transition(self, current: Enum, new: Enum) -> bool:
+        """Check whether a status can move to another.
+        
+        Args:
+            current: Current status
+            new: Requested status
+        
+        Returns:
+            True if the transition is allowed
+        """
+        return new in self._transitions.get(current, set())
+    
+    def allowed_from(self, new: Enum) -> List[Enum]:
+        """Get the statuses a status can be reached from.
+        
+        Args:
+            new: Requested status
+        
+        Returns:
+            Source statuses, in definition order
+        """
+        return [
+            source for source, targets in self._transitions.items()
+            if new in targets
+        ]
+
+
+PAYMENT_ORDER_TRANSITIONS = StatusTransitions({
+    PaymentOrderStatus.CREATED: [
+        PaymentOrderStatus.AWAITING_PAYMENT,
+        PaymentOrderStatus.PROCESSING,
+        PaymentOrderStatus.FAILED,
+        PaymentOrderStatus.CANCELLED,
+    ],
+    PaymentOrderStatus.AWAITING_PAYMENT: [
+        PaymentOrderStatus.PROCESSING,
+        PaymentOrderStatus.FAILED,
+        PaymentOrderStatus.CANCELLED,
+    ],
+    PaymentOrderStatus.PROCESSING: [
+        PaymentOrderStatus.REQUIRES_ACTION,
+        PaymentOrderStatus.COMPLETED,
+        PaymentOrderStatus.FAILED,
+    ],
+    PaymentOrderStatus.REQUIRES_ACTION: [
+        PaymentOrderStatus.PROCESSING,
+        PaymentOrderStatus.COMPLETED,
+        PaymentOrderStatus.FAILED,
+        PaymentOrderStatus.CANCELLED,
+    ],
+    PaymentOrderStatus.COMPLETED: [
+        PaymentOrderStatus.REFUNDED,
+    ],
+})
+
+PAYMENT_LINK_TRANSITIONS = StatusTransitions({
+    PaymentLinkStatus.ACTIVE: [
+        PaymentLinkStatus.PAUSED,
+        PaymentLinkStatus.EXPIRED,
+        PaymentLinkStatus.COMPLETED,
+    ],
+    PaymentLinkStatus.PAUSED: [
+        PaymentLinkStatus.ACTIVE,
+        PaymentLinkStatus.EXPIRED,
+    ],
+})
+
+
+class TransitionResult:
+    """Outcome of a status transition."""
+    
+    def __init__(
+        self,
+        entity: Optional[Any],
+        *,
+        status: Enum,
+        previous_status: Optional[Enum]
+    ):
+        """Initialize the result.
+        
+        Args:
+            entity: Updated model instance, None on conflict
+            status: Status the row is in after the attempt
+            previous_status: Status the row was in before the attempt
+        """
+        self.entity = entity
+        self.status = status
+        self.previous_status = previous_status
+    
+    @property
+    def applied(self) -> bool:
+        """Whether the transition was written."""
+        return self.entity is not None
+    
+    @property
+    def conflict(self) -> bool:
+        """Whether the row was not in a status the target is reachable from."""
+        return self.entity is None
+
+
+async def _current_status(db: AsyncSession, model: Any, id: Any, filters: List[Any]) -> Enum:
+    """Read the status of a row, raising NotFoundError if it doesn't exist."""
+    query = select(model.status).where(model.id == id, *filters)
+    current = (await db.execute(query)).scalar_one_or_none()
+    if current is None:
+        raise NotFoundError(resource=model.__name__, identifier=id)
+    return current
+
+
+async def transition(
+    db: AsyncSession,
+    model: Any,
+    *,
+    id: Any,
+    status: Enum,
+    transitions: StatusTransitions,
+    values: Optional[Dict[str, Any]] = None,
+    filters: Optional[List[Any]] = None
+) -> TransitionResult:
+    """Move a row to a new status if its current status allows it.
+    
+    On PostgreSQL this is a single statement that also returns the previous
+    status from a locked read of the row. Other databases can't return
+    columns of a joined table, so the current status is read first and the
+    update is conditioned on exactly that status.
+    
+    Args:
+        db: Database session
+        model: SQLAlchemy model class with ``id`` and ``status`` columns
+        id: Row ID
+        status: Requested status
+        transitions: State machine to check the transition against
+        values: Other column values to set with the status; may be SQL
+            expressions evaluated by the database (e.g. ``func.now()``)
+        filters: Extra WHERE criteria (e.g. tenant scoping)
+    
+    Returns:
+        Transition result, holding the updated row unless it conflicted
+    
+    Raises:
+        NotFoundError: If the row doesn't exist
+    """
+    filters = list(filters or [])
+    values = {**(values or {}), "status": status}
+    options = {"populate_existing": True, "synchronize_session": False}
+    
+    connection = await db.connection()
+    if connection.dialect.name == "postgresql":
+        previous = (
+            select(model.id, model.status.label("previous_status"))
+            .where(model.id == id, *filters)
+            .with_for_update()
+            .subquery("previous")
+        )
+        query = (
+            update(model)
+            .where(model.id == previous.c.id)
+            .where(model.status.in_(transitions.allowed_from(status)))
+            .values(**values)
+            .returning(model, previous.c.previous_status)
+            .execution_options(**options)
+        )
+        row = (await db.execute(query)).first()
+        if row is not None:
+            return TransitionResult(row[0], status=status, previous_status=row[1])
+        
+        current = await _current_status(db, model, id, filters)
+        return TransitionResult(None, status=current, previous_status=current)
+    
+    current = await _current_status(db, model, id, filters)
+    if not transitions.can_transition(current, status):
+        return TransitionResult(None, status=current, previous_status=current)
+    
+    query = (
+        update(model)
+        .where(model.id == id, model.status == current, *filters)
+        .values(**values)
+        .returning(model)
+        .execution_options(**options)
+    )
+    entity = (await db.execute(query)).scalar_one_or_none()
+    if entity is None:
+        # Another writer moved the row between the read and the update
+        current = await _current_status(db, model, id, filters)
+        return TransitionResult(None, status=current, previous_status=current)
+    return TransitionResult(entity, status=status, previous_status=current)
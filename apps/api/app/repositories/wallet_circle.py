@@ -9,6 +9,7 @@ from typing import Any, Dict, List, Optional, Union
 from sqlalchemy import and_, func, select
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from app.core.cache import coalesced
 from app.core.exceptions import (
     BlockchainError,
     BusinessRuleViolation,
@@ -17,6 +18,7 @@ from app.core.exceptions import (
 )
 from app.core.logging import log_execution, logger
 from app.core.monitoring import track_performance
+from app.db.session import release_connection
 from app.models.generated import (
     Wallet as SQLAlchemyWallet,
     WalletType as SQLAlchemyWalletType,
@@ -121,6 +123,9 @@ class CircleWalletRepository(WalletRepository):
                 "app_environment": "production" if not wallet_data.is_test else "sandbox"
             }
             
+            # Don't hold a pooled connection across the Circle API calls
+            await release_connection(db)
+            
             # Create wallet in Circle - now returns a dictionary, not SDK model
             circle_wallet = await circle_service.create_wallet(
                 wallet_set_id=wallet_data.wallet_set_id,
@@ -223,6 +228,9 @@ class CircleWalletRepository(WalletRepository):
         Returns:
             List[CircleWallet]: Wallets in the set
         """
+        # Don't hold a pooled connection across the Circle API call
+        await release_connection(db)
+        
         try:
             # Get wallets from Circle - now returns a list of dictionaries
             wallets_data = await circle_service.get_wallets(wallet_set_id=wallet_set_id)
@@ -306,6 +314,9 @@ class CircleWalletRepository(WalletRepository):
                 entity="wallet"
             )
         
+        # Don't hold a pooled connection across the Circle API call
+        await release_connection(db)
+        
         try:
             # Get wallet details from Circle - now returns dictionary
             wallet_data = await circle_service.get_wallet(
@@ -332,6 +343,7 @@ class CircleWalletRepository(WalletRepository):
             )
             raise
     
+    @coalesced("circle_wallet.balance")
     async def get_circle_wallet_balance(
         self,
         db: AsyncSession,
@@ -369,6 +381,9 @@ class CircleWalletRepository(WalletRepository):
                 entity="wallet"
             )
         
+        # Don't hold a pooled connection across the Circle API call
+        await release_connection(db)
+        
         try:
             # Get balances from Circle - now returns dictionary
             balances_data = await circle_service.get_balances(
@@ -454,6 +469,9 @@ class CircleWalletRepository(WalletRepository):
             fee_level = transaction_data.get("fee_level", "MEDIUM")
             idempotency_key = transaction_data.get("idempotency_key", str(uuid.uuid4()))
 
+            # Don't hold a pooled connection across the Circle API call
+            await release_connection(db)
+
             # Create transaction in Circle
             response = await self.circle_service.create_transaction(
                 wallet_id=circle_wallet_id,
@@ -579,6 +597,9 @@ class CircleWalletRepository(WalletRepository):
 
             circle_wallet_id = metadata["circle_wallet_id"]
 
+            # Don't hold a pooled connection across the Circle API call
+            await release_connection(db)
+
             # Get transactions from Circle - directly uses circle_service now
             transactions_data = await circle_service.get_wallet_transactions(
                 wallet_id=circle_wallet_id,
@@ -18,6 +18,9 @@ from app.api.dependencies import (
 )
 from app.core.config import settings
 from app.core.logging import get_logger
+from app.db.unit_of_work import UnitOfWork
+from app.events import UserUpdatedEvent
+from app.middleware.public_paths import PUBLIC_ROUTE
 from app.models import User
 from app.repositories.user import UserRepository
 from app.schemas.user import UserOut, UserCreate
@@ -72,7 +75,7 @@ class ClerkWebhookEvent(BaseModel):
     type: str
 
 
-@router.post("/webhooks/clerk")
+@router.post("/webhooks/clerk", openapi_extra=PUBLIC_ROUTE)
 async def clerk_webhook_handler(
     request: Request,
     event: ClerkWebhookEvent,
@@ -145,6 +148,9 @@ async def clerk_webhook_handler(
             if user:
                 # Just mark as inactive (better for auditing)
                 await user_repository.update(db, db_obj=user, obj_in={"is_active": False})
+                async with UnitOfWork(db) as uow:
+                    uow.add_event(UserUpdatedEvent(user_id=str(user.id), updated_fields=["is_active"]))
+                    await uow.commit()
             return {"status": "success", "message": "User marked as deleted"}
         
         # Other event types (handle as needed)
@@ -187,10 +193,7 @@ async def sync_user_info(
             
         # Get user data from Clerk using clerk_service
         try:
-            # Create a fake token to use the get_user_by_token method
-            # In a real implementation, we would use a proper Clerk admin token
-            # or a direct API call to get user data by ID
-            clerk_user_data = await clerk_service.clerk_api.users.get(id=request.clerk_id)
+            clerk_user_data = await clerk_service.fetch_user(request.clerk_id)
         except Exception as e:
             logger.warning("User not found in Clerk", error=str(e))
             raise HTTPException(
@@ -203,13 +206,13 @@ async def sync_user_info(
         if not user:
             # Create user if it doesn't exist
             user = await clerk_service.create_or_update_local_user(
-                db, clerk_user_data.to_dict(), user_repository
+                db, clerk_user_data, user_repository
             )
             return {"status": "success", "message": "User created", "user_id": str(user.id)}
         else:
             # Update existing user
             user = await clerk_service.sync_user_data(
-                user, clerk_user_data.to_dict(), user_repository, db
+                user, clerk_user_data, user_repository, db
             )
             return {"status": "success", "message": "User updated", "user_id": str(user.id)}
     
@@ -19,13 +19,12 @@ from app.api.dependencies import (
     require_organization_context,
 )
 from app.core.logging import get_logger
-from app.db.session import get_db
+from app.db.session import get_db, get_read_db
 from app.events import (
     OrganizationCreatedEvent,
     MemberAddedEvent,
     MemberRemovedEvent,
 )
-from app.events.event_publisher import get_event_publisher, EventPublisher
 from app.models import User, UserRole
 from app.repositories.organization import OrganizationRepository
 from app.repositories.base import DuplicateError, NotFoundError
@@ -96,7 +95,6 @@ async def create_organization(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
     uow = Depends(get_unit_of_work),
-    event_publisher: EventPublisher = Depends(get_event_publisher),
 ) -> Organization:
     """
     Create a new organization.
@@ -136,16 +134,15 @@ async def create_organization(
                 invited_by=str(current_user.id),
             )
             
-            await uow.commit()
-            
-            # Emit organization created event
-            event = OrganizationCreatedEvent(
+            # Emit organization created event with the commit
+            uow.add_event(OrganizationCreatedEvent(
                 organization_id=organization.id,
                 name=organization.name,
                 slug=organization.slug,
                 owner_id=str(current_user.id),
-            )
-            await event_publisher.publish_event(event)
+            ))
+            
+            await uow.commit()
             
             logger.info(f"Organization created successfully: {organization.id}")
             return Organization.model_validate(organization)
@@ -300,7 +297,6 @@ async def add_organization_member(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
     uow = Depends(get_unit_of_work),
-    event_publisher: EventPublisher = Depends(get_event_publisher),
 ) -> OrganizationMembership:
     """
     Add a member to the organization.
@@ -328,16 +324,15 @@ async def add_organization_member(
                 invited_by=str(current_user.id),
             )
             
-            await uow.commit()
-            
-            # Emit event
-            event = MemberAddedEvent(
+            # Emit event with the commit
+            uow.add_event(MemberAddedEvent(
                 organization_id=organization_id,
                 user_id=member_data.user_id,
                 role=member_data.role,
                 invited_by=str(current_user.id),
-            )
-            await event_publisher.publish_event(event)
+            ))
+            
+            await uow.commit()
             
             logger.info(f"User {member_data.user_id} added to organization {organization_id}")
             return OrganizationMembership.model_validate(membership)
@@ -420,7 +415,6 @@ async def remove_organization_member(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
     uow = Depends(get_unit_of_work),
-    event_publisher: EventPublisher = Depends(get_event_publisher),
 ) -> None:
     """
     Remove a member from the organization.
@@ -456,15 +450,14 @@ async def remove_organization_member(
                     detail="Member not found in organization",
                 )
             
-            await uow.commit()
-            
-            # Emit event
-            event = MemberRemovedEvent(
+            # Emit event with the commit
+            uow.add_event(MemberRemovedEvent(
                 organization_id=organization_id,
                 user_id=user_id,
                 removed_by=str(current_user.id),
-            )
-            await event_publisher.publish_event(event)
+            ))
+            
+            await uow.commit()
             
             logger.info(f"User {user_id} removed from organization {organization_id}")
             
@@ -487,7 +480,7 @@ async def remove_organization_member(
 async def get_organization_stats(
     organization_id: str,
     current_user: User = Depends(get_current_user),
-    db: AsyncSession = Depends(get_db),
+    db: AsyncSession = Depends(get_read_db),
     organization_repository: OrganizationRepository = Depends(get_organization_repository),
 ) -> dict:
     """
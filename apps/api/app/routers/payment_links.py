@@ -11,23 +11,24 @@ This module provides endpoints for:
 from datetime import datetime, timezone
 from typing import List, Optional
 from uuid import UUID
-import nanoid
 
-from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, status
+from fastapi import APIRouter, Body, Depends, HTTPException, Path, Query, Request, Response, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.dependencies import get_current_user
 from app.core.examples import PaymentLinkExamples, ErrorExamples
+from app.core.exceptions import NotFoundError
 from app.db.unit_of_work import UnitOfWork, get_unit_of_work
 from app.events.domain_events import (
     PaymentLinkCreatedEvent,
     PaymentLinkUpdatedEvent,
     PaymentLinkArchivedEvent
 )
-from app.events.event_publisher import get_event_publisher, EventPublisher
+from app.middleware.public_paths import PUBLIC_ROUTE
 from app.models import PaymentLinkStatus, User
 from app.repositories.agent import AgentRepository
 from app.repositories.organization import OrganizationRepository
+from app.repositories.pagination import CountMode
 from app.repositories.payment_link import PaymentLinkRepository
 from app.schemas.payment_link import (
     PaymentLinkCreate,
@@ -39,6 +40,7 @@ from app.schemas.payment_link import (
     PaymentLinkSearchParams,
     PaymentLinkSearchResponse
 )
+from app.services.payment_page_cache import CachedPage, payment_page_cache
 router = APIRouter(
     prefix="/payment-links",
     tags=["Payment Links"],
@@ -50,12 +52,6 @@ router = APIRouter(
 )
 
 
-def generate_short_code() -> str:
-    """Generate a unique short code for payment links."""
-    # Generate a 10-character alphanumeric code
-    return f"PAY-{nanoid.generate(size=7)}"
-
-
 def generate_qr_code(payment_url: str) -> str:
     """Generate QR code for payment link (placeholder)."""
     # TODO: Implement actual QR code generation
@@ -114,6 +110,14 @@ async def list_payment_links(
     ),
     page: int = Query(1, ge=1, description="Page number"),
     limit: int = Query(20, ge=1, le=100, description="Items per page"),
+    cursor: Optional[str] = Query(
+        None,
+        description="Cursor from a previous page's next_cursor; takes precedence over page"
+    ),
+    count: CountMode = Query(
+        CountMode.EXACT,
+        description="Total to return: exact, estimated (planner statistics) or none"
+    ),
 ) -> PaymentLinkListResponse:
     """
     List payment links with optional filtering.
@@ -132,25 +136,20 @@ async def list_payment_links(
         if smart_contract_address:
             filters["smart_contract_address"] = smart_contract_address
         
-        # Get payment links
-        payment_links = await uow.payment_links.get_multi(
+        # Get payment links and their total in one query
+        result = await uow.payment_links.get_page(
             db=uow.session,
             skip=(page - 1) * limit,
             limit=limit,
             organization_id=current_user.organization_id,
-            filters=filters
-        )
-        
-        # Get total count
-        total = await uow.payment_links.count(
-            db=uow.session,
-            organization_id=current_user.organization_id,
-            filters=filters
+            filters=filters,
+            cursor=cursor,
+            count_mode=count
         )
         
         # Convert to response format
         items = []
-        for link in payment_links:
+        for link in result.items:
             item = {
                 "id": str(link.id),
                 "title": link.title,
@@ -167,10 +166,11 @@ async def list_payment_links(
         
         return PaymentLinkListResponse(
             items=items,
-            total=total,
+            total=result.total,
             page=page,
             limit=limit,
-            has_next=(page * limit) < total
+            has_next=result.has_next,
+            next_cursor=result.next_cursor
         )
 
 
@@ -222,8 +222,7 @@ async def create_payment_link(
         examples=PaymentLinkExamples.create_request
     ),
     current_user: User = Depends(get_current_user),
-    uow: UnitOfWork = Depends(get_unit_of_work),
-    event_publisher: EventPublisher = Depends(get_event_publisher)
+    uow: UnitOfWork = Depends(get_unit_of_work)
 ) -> PaymentLink:
     """
     Create a new payment link.
@@ -263,7 +262,9 @@ async def create_payment_link(
                 )
         
         # Generate short code and QR code
-        short_code = generate_short_code()
+        short_code = await uow.payment_links.generate_short_code(uow.session)
+        # Don't hold a pooled connection while rendering the QR code
+        await uow.release()
         payment_url = f"https://pay.wedi.co/{short_code}"
         qr_code = generate_qr_code(payment_url)
         
@@ -280,10 +281,8 @@ async def create_payment_link(
             }
         )
         
-        await uow.commit()
-        
-        # Emit event
-        await event_publisher.publish(
+        # Emit event with the commit
+        uow.add_event(
             PaymentLinkCreatedEvent(
                 payment_link_id=str(db_payment_link.id),
                 organization_id=current_user.organization_id,
@@ -293,6 +292,8 @@ async def create_payment_link(
             )
         )
         
+        await uow.commit()
+        
         # Convert to response schema
         return PaymentLink.model_validate(db_payment_link)
 
@@ -309,6 +310,7 @@ async def list_active_payment_links(
     uow: UnitOfWork = Depends(get_unit_of_work),
     page: int = Query(1, ge=1),
     limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None),
 ) -> PaymentLinkListResponse:
     """Get only active payment links for quick access."""
     return await list_payment_links(
@@ -316,7 +318,9 @@ async def list_active_payment_links(
         uow=uow,
         status=PaymentLinkStatus.ACTIVE,
         page=page,
-        limit=limit
+        limit=limit,
+        cursor=cursor,
+        count=CountMode.EXACT
     )
 
 
@@ -365,30 +369,28 @@ async def search_payment_links(
         # TODO: Implement text search and range filters in repository
         # For now, use basic filtering
         
-        payment_links = await uow.payment_links.get_multi(
+        result = await uow.payment_links.get_page(
             db=uow.session,
             skip=(search_params.page - 1) * search_params.limit,
             limit=search_params.limit,
             organization_id=current_user.organization_id,
-            filters=filters
-        )
-        
-        total = await uow.payment_links.count(
-            db=uow.session,
-            organization_id=current_user.organization_id,
-            filters=filters
+            filters=filters,
+            cursor=search_params.cursor,
+            count_mode=search_params.count
         )
         
         # Convert to response format
-        items = [PaymentLink.model_validate(link) for link in payment_links]
+        items = [PaymentLink.model_validate(link) for link in result.items]
         
         return PaymentLinkSearchResponse(
             items=items,
-            total=total,
+            total=result.total,
             page=search_params.page,
             limit=search_params.limit,
             query=search_params.query,
-            filters_applied=filters_applied
+            filters_applied=filters_applied,
+            has_next=result.has_next,
+            next_cursor=result.next_cursor
         )
 
 
@@ -499,6 +501,9 @@ async def get_payment_link(
                 }
             }
         },
+        304: {
+            "description": "Payment link unchanged since the ETag in If-None-Match"
+        },
         404: {
             "description": "Payment link not found",
             "content": {
@@ -507,22 +512,38 @@ async def get_payment_link(
                 }
             }
         }
-    }
+    },
+    openapi_extra=PUBLIC_ROUTE
 )
 async def get_payment_link_by_short_code(
+    request: Request,
     short_code: str = Path(
         ...,
         description="Payment link short code",
         example="PAY-ABC123"
     ),
     uow: UnitOfWork = Depends(get_unit_of_work),
-) -> PaymentLinkPublicResponse:
+) -> Response:
     """
     Get payment link information by short code.
     
     This is a public endpoint used by the payment page.
-    Returns only non-sensitive information.
+    Returns only non-sensitive information. Pages are served from an
+    in-memory cache when possible and support conditional requests via
+    ETag/If-None-Match.
     """
+    page = payment_page_cache.get(short_code)
+    if page is None:
+        page = await _load_payment_page(uow, short_code)
+    
+    headers = {"ETag": page.etag, "Cache-Control": "no-cache"}
+    if request.headers.get("if-none-match") == page.etag:
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    return Response(content=page.body, media_type="application/json", headers=headers)
+
+
+async def _load_payment_page(uow: UnitOfWork, short_code: str) -> CachedPage:
+    """Assemble the public payload of a payment link and cache it."""
     async with uow:
         payment_link = await uow.payment_links.get_by_short_code(
             db=uow.session,
@@ -549,7 +570,7 @@ async def get_payment_link_by_short_code(
         )
         
         # Return public information
-        return PaymentLinkPublicResponse(
+        public_response = PaymentLinkPublicResponse(
             id=str(payment_link.id),
             title=payment_link.title,
             description=payment_link.description,
@@ -564,6 +585,13 @@ async def get_payment_link_by_short_code(
             redirect_urls=payment_link.redirect_urls,
             organization_name=organization.name if organization else None
         )
+    
+    return payment_page_cache.set(
+        short_code,
+        public_response.id,
+        public_response.model_dump_json().encode(),
+        link_expires_at=public_response.expires_at
+    )
 
 
 @router.patch(
@@ -606,8 +634,7 @@ async def update_payment_link(
         examples=PaymentLinkExamples.update_request
     ),
     current_user: User = Depends(get_current_user),
-    uow: UnitOfWork = Depends(get_unit_of_work),
-    event_publisher: EventPublisher = Depends(get_event_publisher)
+    uow: UnitOfWork = Depends(get_unit_of_work)
 ) -> PaymentLink:
     """
     Update payment link details.
@@ -617,66 +644,68 @@ async def update_payment_link(
     - PAUSED -> ACTIVE, EXPIRED
     - Cannot update EXPIRED or COMPLETED links
     """
+    update_data = payment_link_update.model_dump(exclude_unset=True)
+    new_status = update_data.pop("status", None)
+    
     async with uow:
-        payment_link = await uow.payment_links.get(
-            db=uow.session,
-            id=str(payment_link_id),
-            organization_id=current_user.organization_id
-        )
-        
-        if not payment_link:
-            raise HTTPException(
-                status_code=status.HTTP_404_NOT_FOUND,
-                detail="Payment link not found"
-            )
-        
-        # Validate status transitions
-        if payment_link_update.status:
-            current_status = payment_link.status
-            new_status = payment_link_update.status
-            
-            # Define valid transitions
-            valid_transitions = {
-                PaymentLinkStatus.ACTIVE: [
-                    PaymentLinkStatus.PAUSED,
-                    PaymentLinkStatus.EXPIRED,
-                    PaymentLinkStatus.COMPLETED
-                ],
-                PaymentLinkStatus.PAUSED: [
-                    PaymentLinkStatus.ACTIVE,
-                    PaymentLinkStatus.EXPIRED
-                ],
-                PaymentLinkStatus.EXPIRED: [],
-                PaymentLinkStatus.COMPLETED: []
-            }
+        old_status = None
+        if new_status:
+            # Check and write the status (and other fields) in one statement,
+            # so concurrent updates can't apply an invalid transition
+            try:
+                result = await uow.payment_links.transition_status(
+                    db=uow.session,
+                    payment_link_id=str(payment_link_id),
+                    status=new_status,
+                    organization_id=current_user.organization_id,
+                    values=update_data
+                )
+            except NotFoundError:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Payment link not found"
+                )
             
-            if new_status not in valid_transitions.get(current_status, []):
+            if result.conflict:
                 raise HTTPException(
                     status_code=status.HTTP_400_BAD_REQUEST,
-                    detail=f"Cannot transition from {current_status} to {new_status}"
+                    detail=f"Cannot transition from {result.status} to {new_status}"
                 )
+            
+            updated_payment_link = result.entity
+            old_status = result.previous_status
+        else:
+            payment_link = await uow.payment_links.get(
+                db=uow.session,
+                id=str(payment_link_id),
+                organization_id=current_user.organization_id
+            )
+            
+            if not payment_link:
+                raise HTTPException(
+                    status_code=status.HTTP_404_NOT_FOUND,
+                    detail="Payment link not found"
+                )
+            
+            updated_payment_link = await uow.payment_links.update(
+                db=uow.session,
+                db_obj=payment_link,
+                obj_in=update_data
+            )
         
-        # Update payment link
-        old_status = payment_link.status if payment_link_update.status else None
-        updated_payment_link = await uow.payment_links.update(
-            db=uow.session,
-            db_obj=payment_link,
-            obj_in=payment_link_update.model_dump(exclude_unset=True)
-        )
-        
-        await uow.commit()
-        
-        # Emit event
-        await event_publisher.publish(
+        # Emit event with the commit
+        uow.add_event(
             PaymentLinkUpdatedEvent(
                 payment_link_id=str(updated_payment_link.id),
                 organization_id=current_user.organization_id,
                 updated_by=current_user.id,
-                old_status=old_status.value if old_status and payment_link_update.status else None,
-                new_status=updated_payment_link.status.value if payment_link_update.status else None
+                old_status=old_status.value if old_status else None,
+                new_status=updated_payment_link.status.value if new_status else None
             )
         )
         
+        await uow.commit()
+        
         return PaymentLink.model_validate(updated_payment_link)
 
 
@@ -710,8 +739,7 @@ async def update_payment_link(
 async def archive_payment_link(
     payment_link_id: UUID = Path(..., description="Payment link ID to archive"),
     current_user: User = Depends(get_current_user),
-    uow: UnitOfWork = Depends(get_unit_of_work),
-    event_publisher: EventPublisher = Depends(get_event_publisher)
+    uow: UnitOfWork = Depends(get_unit_of_work)
 ) -> None:
     """
     Archive (soft delete) a payment link.
@@ -745,16 +773,16 @@ async def archive_payment_link(
         
         # Archive the payment link
         payment_link.status = PaymentLinkStatus.EXPIRED
-        await uow.commit()
         
-        # Emit event
-        await event_publisher.publish(
+        # Emit event with the commit
+        uow.add_event(
             PaymentLinkArchivedEvent(
                 payment_link_id=str(payment_link.id),
                 organization_id=current_user.organization_id,
                 archived_by=current_user.id
             )
         )
+        await uow.commit()
 
 
 @router.post(
@@ -810,8 +838,7 @@ async def duplicate_payment_link(
         }
     ),
     current_user: User = Depends(get_current_user),
-    uow: UnitOfWork = Depends(get_unit_of_work),
-    event_publisher: EventPublisher = Depends(get_event_publisher)
+    uow: UnitOfWork = Depends(get_unit_of_work)
 ) -> PaymentLink:
     """
     Duplicate an existing payment link.
@@ -865,6 +892,5 @@ async def duplicate_payment_link(
         return await create_payment_link(
             payment_link=duplicate_data,
             current_user=current_user,
-            uow=uow,
-            event_publisher=event_publisher
+            uow=uow
         ) 
\ No newline at end of file
@@ -23,10 +23,10 @@ from app.core.exceptions import ForbiddenException, NotFoundException
 from app.core.logging import get_logger
 from app.db.session import get_db
 from app.events import (
+    UserUpdatedEvent,
     UserWalletLinkedEvent,
     WalletCreatedEvent,
 )
-from app.events.event_publisher import get_event_publisher, EventPublisher
 from app.models import User, UserRole, WalletType
 from app.repositories.user import UserRepository
 from app.repositories.wallet import WalletRepository
@@ -139,6 +139,7 @@ async def update_current_user_profile(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
     user_repository: UserRepository = Depends(get_user_repository),
+    uow = Depends(get_unit_of_work),
 ) -> UserSchema:
     """
     Update current user's profile.
@@ -148,10 +149,15 @@ async def update_current_user_profile(
     """
     logger.info(f"Updating profile for user: {current_user.id}")
     
-    # Update user
+    # Update user; the event is published once the change is committed
     updated_user = await user_repository.update(
         db, id=current_user.id, data=user_update
     )
+    uow.add_event(UserUpdatedEvent(
+        user_id=str(current_user.id),
+        updated_fields=list(user_update.model_dump(exclude_unset=True))
+    ))
+    await uow.commit()
     
     return UserSchema.model_validate(updated_user)
 
@@ -309,6 +315,7 @@ async def update_user(
     organization_context: Optional[dict] = Depends(require_organization_context),
     db: AsyncSession = Depends(get_db),
     user_repository: UserRepository = Depends(get_user_repository),
+    uow = Depends(get_unit_of_work),
 ) -> UserSchema:
     """
     Update user (admin only).
@@ -330,10 +337,15 @@ async def update_user(
         if organization_context["organization_id"] not in org_ids:
             raise NotFoundException("User not found in this organization")
     
-    # Update user
+    # Update user; the event is published once the change is committed
     updated_user = await user_repository.update(
         db, id=user_id, data=user_update
     )
+    uow.add_event(UserUpdatedEvent(
+        user_id=user_id,
+        updated_fields=list(user_update.model_dump(exclude_unset=True))
+    ))
+    await uow.commit()
     
     logger.info(f"User {user_id} updated by admin {current_user.id}")
     return UserSchema.model_validate(updated_user)
@@ -429,7 +441,7 @@ async def add_user_wallet(
     current_user: User = Depends(get_current_user),
     db: AsyncSession = Depends(get_db),
     wallet_repository: WalletRepository = Depends(get_wallet_repository),
-    event_publisher: EventPublisher = Depends(get_event_publisher),
+    uow = Depends(get_unit_of_work),
 ) -> Wallet:
     """
     Add a wallet to user.
@@ -459,7 +471,7 @@ async def add_user_wallet(
             chain_id=wallet.chain_id,
             owner_id=user_id,
         )
-        await event_publisher.publish_event(wallet_created_event)
+        uow.add_event(wallet_created_event)
         
         # Emit wallet linked event
         wallet_linked_event = UserWalletLinkedEvent(
@@ -467,7 +479,10 @@ async def add_user_wallet(
             wallet_id=wallet.id,
             wallet_address=wallet.address,
         )
-        await event_publisher.publish_event(wallet_linked_event)
+        uow.add_event(wallet_linked_event)
+        
+        # Publish only after the wallet is committed
+        await uow.commit()
         
         return Wallet.model_validate(wallet)
     except Exception as e:
@@ -507,7 +522,8 @@ async def remove_user_wallet(
         
         # Check if it's the primary wallet
         user = await uow.users.get(db, id=user_id)
-        if user.primary_wallet_id == wallet_id:
+        was_primary = user.primary_wallet_id == wallet_id
+        if was_primary:
             # Check if user has other wallets
             user_wallets = await uow.wallets.list(
                 db, filters={"user_id": user_id}
@@ -526,6 +542,12 @@ async def remove_user_wallet(
         # Delete wallet
         await uow.wallets.delete(db, id=wallet_id)
         
+        if was_primary:
+            uow.add_event(UserUpdatedEvent(
+                user_id=user_id,
+                updated_fields=["primary_wallet_id"]
+            ))
+        
         await uow.commit()
         
         logger.info(f"Wallet {wallet_id} removed from user {user_id}") 
\ No newline at end of file
@@ -8,6 +8,7 @@ from typing import Any, Dict, List, Optional
 from pydantic import BaseModel, Field, HttpUrl, validator
 
 from app.models import PaymentLinkStatus
+from app.repositories.pagination import CountMode
 
 
 class PaymentLinkBase(BaseModel):
@@ -158,10 +159,11 @@ class PaymentLinkListResponse(BaseModel):
     """Response schema for listing payment links."""
     
     items: List[PaymentLinkSummary]
-    total: int
+    total: Optional[int] = Field(None, description="Total matching links; omitted when count=none")
     page: int
     limit: int
     has_next: bool
+    next_cursor: Optional[str] = None
     
     class Config:
         """Pydantic config."""
@@ -206,17 +208,21 @@ class PaymentLinkSearchParams(BaseModel):
     expires_before: Optional[datetime] = None
     page: int = Field(1, ge=1)
     limit: int = Field(20, ge=1, le=100)
+    cursor: Optional[str] = Field(None, description="Cursor from a previous page's next_cursor; takes precedence over page")
+    count: CountMode = Field(CountMode.EXACT, description="Total to return: exact, estimated (planner statistics) or none")
 
 
 class PaymentLinkSearchResponse(BaseModel):
     """Response for payment link search."""
     
     items: List[PaymentLink]
-    total: int
+    total: Optional[int] = Field(None, description="Total matching links; omitted when count=none")
     page: int
     limit: int
     query: Optional[str]
     filters_applied: Dict[str, Any]
+    has_next: bool = False
+    next_cursor: Optional[str] = None
     
     class Config:
         """Pydantic config."""
@@ -0,0 +1,160 @@
+"""
+Local verification of Clerk session tokens.
+
+Clerk signs session JWTs with RS256 keys published as a JWKS. The key set
+is fetched once, kept in memory and refreshed periodically, so verifying a
+token is a signature check and a few claim comparisons with no network
+call. A token signed with an unknown key triggers an early refresh, which
+picks up rotated keys; refreshes are rate limited so bogus key IDs can't
+make every request call Clerk.
+"""
+import asyncio
+import time
+from typing import Any, Dict, List, Optional
+
+import httpx
+from jose import JWTError, jwk, jwt
+from jose.backends.base import Key
+
+from app.core.config import settings
+from app.core.logging import get_logger
+
+logger = get_logger(__name__)
+
+# Clerk backend API endpoint publishing the instance's signing keys
+DEFAULT_JWKS_URL = "https://api.clerk.com/v1/jwks"
+
+# Seconds between refreshes triggered by unknown key IDs
+_MIN_REFRESH_INTERVAL = 60
+
+
+class ClerkKeySet:
+    """Cached Clerk signing keys and local session token verification."""
+    
+    def __init__(
+        self,
+        *,
+        jwks_url: str = DEFAULT_JWKS_URL,
+        secret_key: Optional[str] = None,
+        verification_key: Optional[str] = None,
+        refresh_interval: float = 3600,
+        authorized_parties: Optional[List[str]] = None,
+        leeway: int = 5
+    ):
+        """Initialize the key set.
+        
+        Args:
+            jwks_url: URL of the JWKS document
+            secret_key: Clerk secret key, sent when fetching the JWKS
+            verification_key: PEM public key; when set, tokens are verified
+                against it and the JWKS is never fetched
+            refresh_interval: Seconds before the key set is refetched
+            authorized_parties: Origins allowed in the ``azp`` claim; any
+                when empty
+            leeway: Seconds of clock skew tolerated on ``exp`` and ``nbf``
+        """
+        self.jwks_url = jwks_url
+        self.secret_key = secret_key
+        self.refresh_interval = refresh_interval
+        self.authorized_parties = set(authorized_parties or [])
+        self.leeway = leeway
+        self._static_key: Optional[Key] = (
+            jwk.construct(verification_key, "RS256") if verification_key else None
+        )
+        self._keys: Dict[str, Key] = {}
+        self._fetched_at = 0.0
+        self._attempted_at = float("-inf")
+        self._lock = asyncio.Lock()
+    
+    async def verify(self, token: str) -> Dict[str, Any]:
+        """Verify a session token and return its claims.
+        
+        Args:
+            token: Clerk session JWT
+        
+        Returns:
+            Token claims
+        
+        Raises:
+            JWTError: If the token is malformed, expired, not signed by a
+                Clerk key or issued for another party
+        """
+        header = jwt.get_unverified_header(token)
+        key = await self._get_key(header.get("kid"))
+        claims = jwt.decode(
+            token,
+            key,
+            algorithms=["RS256"],
+            options={"verify_aud": False, "leeway": self.leeway}
+        )
+        
+        if self.authorized_parties and claims.get("azp") not in self.authorized_parties:
+            raise JWTError("Token issued for an unauthorized party")
+        return claims
+    
+    async def _get_key(self, kid: Optional[str]) -> Key:
+        """Get the signing key of a token, refreshing the key set if needed."""
+        if self._static_key is not None:
+            return self._static_key
+        
+        now = time.monotonic()
+        key = self._keys.get(kid)
+        if key is not None and now - self._fetched_at < self.refresh_interval:
+            return key
+        
+        async with self._lock:
+            # Another request may have refreshed while this one waited
+            if time.monotonic() - self._attempted_at >= _MIN_REFRESH_INTERVAL:
+                self._attempted_at = time.monotonic()
+                try:
+                    await self.refresh()
+                except httpx.HTTPError as e:
+                    if key is None:
+                        raise JWTError(f"Could not fetch signing keys: {e}")
+                    # Keep serving the known key while Clerk is unreachable
+                    logger.warning("clerk_jwks_refresh_failed", error=str(e))
+        
+        key = self._keys.get(kid)
+        if key is None:
+            raise JWTError(f"Unknown signing key {kid}")
+        return key
+    
+    async def refresh(self) -> None:
+        """Fetch the key set.
+        
+        Raises:
+            httpx.HTTPError: If the JWKS can't be fetched
+        """
+        headers = {}
+        if self.secret_key:
+            headers["Authorization"] = f"Bearer {self.secret_key}"
+        
+        async with httpx.AsyncClient(timeout=10) as client:
+            response = await client.get(self.jwks_url, headers=headers)
+            response.raise_for_status()
+        
+        self._keys = {
+            key["kid"]: jwk.construct(key, key.get("alg", "RS256"))
+            for key in response.json().get("keys", [])
+            if key.get("kid")
+        }
+        self._fetched_at = time.monotonic()
+        logger.info("clerk_jwks_refreshed", key_ids=list(self._keys))
+    
+    def set_keys(self, keys: List[Dict[str, Any]]) -> None:
+        """Replace the key set with known JWKs (e.g. in tests).
+        
+        Args:
+            keys: JWKs with ``kid`` members
+        """
+        self._keys = {key["kid"]: jwk.construct(key, key.get("alg", "RS256")) for key in keys}
+        self._fetched_at = time.monotonic()
+
+
+clerk_key_set = ClerkKeySet(
+    jwks_url=settings.CLERK_JWKS_URL or DEFAULT_JWKS_URL,
+    secret_key=settings.CLERK_SECRET_KEY,
+    verification_key=settings.CLERK_JWT_VERIFICATION_KEY,
+    refresh_interval=settings.CLERK_JWKS_REFRESH_SECONDS,
+    authorized_parties=settings.CLERK_AUTHORIZED_PARTIES
+)
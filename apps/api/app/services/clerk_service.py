@@ -2,17 +2,22 @@
 Clerk authentication service for user verification and session management.
 """
 from typing import Any, Dict, Optional, Union
+import json
 import os
-import httpx
 
-from clerk_backend_api import Clerk as ClerkAPI, authenticate_request
-from clerk_backend_api.security.types import AuthenticateRequestOptions, RequestState
+from clerk_backend_api import Clerk as ClerkAPI
 from fastapi import HTTPException, Request, status
+from jose import JWTError
 
+from app.core.cache import MemoryCacheBackend
 from app.core.config import settings
+from app.core.executors import run_blocking_io, run_cpu_bound
 from app.core.logging import get_logger
+from app.db.unit_of_work import UnitOfWork
+from app.events import UserUpdatedEvent
 from app.models import User
 from app.repositories.user import UserRepository
+from app.services.clerk_jwks import clerk_key_set
 from dotenv import load_dotenv
 
 load_dotenv()
@@ -34,10 +39,17 @@ class ClerkService:
         # Create Clerk API client
         self.clerk_api = ClerkAPI(bearer_auth=settings.CLERK_SECRET_KEY)
 
+        # Clerk user profiles, and users synced recently, by Clerk user ID
+        self._profiles = MemoryCacheBackend(max_entries=settings.USER_CACHE_MAX_ENTRIES)
+        self._synced = MemoryCacheBackend(max_entries=settings.USER_CACHE_MAX_ENTRIES)
+
     async def verify_token(self, token: str) -> Dict[str, Any]:
         """
         Verify a Clerk session token.
 
+        The token is verified locally against Clerk's cached signing keys,
+        so this makes no network call in the steady state.
+
         Args:
             token: The session token to verify
 
@@ -48,41 +60,75 @@ class ClerkService:
             HTTPException: If token is invalid
         """
         try:
-            # Create a mock request with the token in Authorization header
-            mock_request = httpx.Request(
-                "GET", "/", headers={"Authorization": f"Bearer {token}"}
+            claims = await clerk_key_set.verify(token)
+        except JWTError as e:
+            logger.warning("Token verification failed", error=str(e))
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication credentials",
             )
 
-            # Use the authenticate_request helper to validate the token
-            request_state = authenticate_request(
-                mock_request,
-                AuthenticateRequestOptions(
-                    allowed_syncing_strategies=["immediate"]
-                )
-            )
+        logger.debug("Token verified successfully", session_id=claims.get("sid"))
+        return claims
 
-            if not request_state.is_signed_in:
-                logger.warning(
-                    "Token verification failed",
-                    reason=request_state.reason
-                )
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid authentication credentials",
-                )
+    async def get_user_profile(self, clerk_user_id: str) -> Dict[str, Any]:
+        """
+        Get a Clerk user's profile, served from a TTL cache when possible.
 
-            logger.debug(
-                "Token verified successfully",
-                session_id=request_state.payload.get("sid")
-            )
-            return request_state.payload
+        Args:
+            clerk_user_id: Clerk user ID
+
+        Returns:
+            Dict containing user data
+
+        Raises:
+            HTTPException: If the user can't be fetched from Clerk
+        """
+        cached = await self._profiles.get(clerk_user_id)
+        if cached is not None:
+            return json.loads(cached)
 
+        try:
+            user_response = await self.clerk_api.users.get_async(user_id=clerk_user_id)
         except Exception as e:
-            logger.warning("Token verification failed", error=str(e))
+            logger.warning("Failed to get user from Clerk", error=str(e))
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
                 detail="Invalid authentication credentials",
             )
+        if user_response is None:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid authentication credentials",
+            )
+
+        profile = user_response.model_dump(mode="json")
+        await self._profiles.set(
+            clerk_user_id,
+            json.dumps(profile).encode(),
+            settings.CLERK_PROFILE_CACHE_TTL_SECONDS,
+        )
+        return profile
+
+    async def fetch_user(self, clerk_user_id: str) -> Dict[str, Any]:
+        """
+        Fetch a Clerk user's current profile, bypassing the profile cache.
+
+        The synchronous SDK call runs in the blocking-I/O thread pool.
+
+        Args:
+            clerk_user_id: Clerk user ID
+
+        Returns:
+            Dict containing user data
+
+        Raises:
+            ValueError: If Clerk has no such user
+        """
+        user_response = await run_blocking_io(self.clerk_api.users.get, user_id=clerk_user_id)
+        if user_response is None:
+            raise ValueError(f"Clerk user {clerk_user_id} not found")
+        return user_response.model_dump(mode="json")
 
     async def get_user_by_token(self, token: str) -> Dict[str, Any]:
         """
@@ -97,30 +143,38 @@ class ClerkService:
         Raises:
             HTTPException: If user not found or token invalid
         """
-        try:
-            # Verify token first
-            decoded = await self.verify_token(token)
-
-            # Get user ID from token
-            user_id = decoded.get("sub")
-
-            if not user_id:
-                raise HTTPException(
-                    status_code=status.HTTP_401_UNAUTHORIZED,
-                    detail="Invalid user identifier in token",
-                )
+        decoded = await self.verify_token(token)
 
-            # Get user from Clerk
-            user_response = self.clerk_api.users.get(id=user_id)
-            return user_response.to_dict()
-
-        except Exception as e:
-            logger.warning("Failed to get user from Clerk", error=str(e))
+        # Get user ID from token
+        user_id = decoded.get("sub")
+        if not user_id:
             raise HTTPException(
                 status_code=status.HTTP_401_UNAUTHORIZED,
-                detail="Invalid authentication credentials",
+                detail="Invalid user identifier in token",
             )
 
+        return await self.get_user_profile(user_id)
+
+    async def claim_profile_sync(self, clerk_user_id: str) -> bool:
+        """
+        Check whether a user's local record is due for a sync with Clerk.
+
+        A user is synced at most once per CLERK_PROFILE_SYNC_INTERVAL_SECONDS;
+        a True result claims the sync for the interval.
+
+        Args:
+            clerk_user_id: Clerk user ID
+
+        Returns:
+            True if the caller should sync the user now
+        """
+        if await self._synced.get(clerk_user_id) is not None:
+            return False
+        await self._synced.set(
+            clerk_user_id, b"1", settings.CLERK_PROFILE_SYNC_INTERVAL_SECONDS
+        )
+        return True
+
     async def create_or_update_local_user(
         self, db, clerk_user_data: Dict[str, Any], user_repository: UserRepository
     ) -> User:
@@ -174,6 +228,11 @@ class ClerkService:
             }
 
             updated_user = await user_repository.update(db, db_obj=existing_user, obj_in=user_data)
+            async with UnitOfWork(db) as uow:
+                uow.add_event(
+                    UserUpdatedEvent(user_id=str(updated_user.id), updated_fields=list(user_data))
+                )
+                await uow.commit()
             logger.info("Updated user from Clerk data", user_id=str(updated_user.id))
             return updated_user
 
@@ -228,6 +287,11 @@ class ClerkService:
         # Only update if needed
         if update_needed:
             updated_user = await user_repository.update(db, db_obj=user, obj_in=user_data)
+            async with UnitOfWork(db) as uow:
+                uow.add_event(
+                    UserUpdatedEvent(user_id=str(updated_user.id), updated_fields=list(user_data))
+                )
+                await uow.commit()
             logger.info("Synchronized user data with Clerk", user_id=str(updated_user.id))
             return updated_user
 
@@ -257,7 +321,9 @@ class ClerkService:
 
             wh = Webhook(settings.CLERK_WEBHOOK_SECRET)
             try:
-                wh.verify(payload.decode("utf-8"), {"svix-signature": signature})
+                await run_cpu_bound(
+                    wh.verify, payload.decode("utf-8"), {"svix-signature": signature}
+                )
                 return True
             except WebhookVerificationError as e:
                 logger.error("Webhook signature verification failed", error=str(e))
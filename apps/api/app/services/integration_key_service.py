@@ -67,24 +67,23 @@ class IntegrationKeyService:
         agent_id: Optional[str] = None
     ) -> tuple[List[IntegrationKey], int]:
         """List integration keys for an organization."""
+        filters = {}
+        if is_active is not None:
+            filters["is_active"] = is_active
+        if agent_id:
+            filters["agent_id"] = agent_id
+        
         async with uow:
-            keys = await uow.integration_keys.get_by_organization(
+            # Page and total in a single query
+            page = await uow.integration_keys.get_page(
                 uow.session,
-                organization_id,
                 skip=skip,
                 limit=limit,
-                is_active=is_active,
-                agent_id=agent_id
-            )
-            
-            total = await uow.integration_keys.count_by_organization(
-                uow.session,
-                organization_id,
-                is_active=is_active,
-                agent_id=agent_id
+                organization_id=organization_id,
+                filters=filters
             )
             
-            return keys, total
+            return page.items, page.total
     
     async def get_integration_key(
         self,
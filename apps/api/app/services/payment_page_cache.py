@@ -0,0 +1,174 @@
+"""
+In-process cache of public payment page payloads.
+
+The public by-short-code endpoint is the hottest customer-facing read, so
+its fully assembled JSON body is kept in memory per short code together
+with an ETag. Entries expire after a short TTL and are dropped as soon as a
+payment link event is published in this process.
+"""
+import hashlib
+import time
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Dict, Optional
+
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.events.local import subscribe
+from app.events.publisher import DomainEvent
+
+logger = get_logger(__name__)
+
+
+class CachedPage:
+    """Serialized payment page with its validator."""
+    
+    def __init__(
+        self,
+        payment_link_id: str,
+        body: bytes,
+        link_expires_at: Optional[datetime],
+        cached_until: float
+    ):
+        """Initialize the cached page.
+        
+        Args:
+            payment_link_id: ID of the payment link
+            body: JSON response body
+            link_expires_at: When the payment link itself expires
+            cached_until: Monotonic time the entry is valid until
+        """
+        self.payment_link_id = payment_link_id
+        self.body = body
+        self.etag = f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+        self.link_expires_at = link_expires_at
+        self.cached_until = cached_until
+    
+    def is_fresh(self) -> bool:
+        """Whether the entry can still be served."""
+        if time.monotonic() >= self.cached_until:
+            return False
+        if self.link_expires_at is None:
+            return True
+        
+        # A link that expired while cached must go through the database so
+        # it gets marked as expired
+        expires_at = self.link_expires_at
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        return expires_at > datetime.now(timezone.utc)
+
+
+class PaymentPageCache:
+    """LRU + TTL cache of payment pages keyed by short code."""
+    
+    def __init__(self, ttl_seconds: float, max_entries: int):
+        """Initialize the cache.
+        
+        Args:
+            ttl_seconds: How long an entry may be served
+            max_entries: Entries kept before the least recently used is evicted
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._pages: "OrderedDict[str, CachedPage]" = OrderedDict()
+        self._short_codes: Dict[str, str] = {}
+        self.hits = 0
+        self.misses = 0
+    
+    def get(self, short_code: str) -> Optional[CachedPage]:
+        """Get the cached page of a short code.
+        
+        Args:
+            short_code: Payment link short code
+        
+        Returns:
+            Cached page, or None if absent or stale
+        """
+        page = self._pages.get(short_code)
+        if page is None or not page.is_fresh():
+            if page is not None:
+                self._remove(short_code)
+            self.misses += 1
+            return None
+        
+        self._pages.move_to_end(short_code)
+        self.hits += 1
+        return page
+    
+    def set(
+        self,
+        short_code: str,
+        payment_link_id: str,
+        body: bytes,
+        link_expires_at: Optional[datetime] = None
+    ) -> CachedPage:
+        """Cache the page of a short code.
+        
+        Args:
+            short_code: Payment link short code
+            payment_link_id: ID of the payment link
+            body: JSON response body
+            link_expires_at: When the payment link itself expires
+        
+        Returns:
+            Cached page
+        """
+        page = CachedPage(
+            payment_link_id,
+            body,
+            link_expires_at,
+            cached_until=time.monotonic() + self.ttl_seconds
+        )
+        self._remove(short_code)
+        self._pages[short_code] = page
+        self._short_codes[payment_link_id] = short_code
+        
+        while len(self._pages) > self.max_entries:
+            oldest, evicted = self._pages.popitem(last=False)
+            self._forget_link(oldest, evicted)
+        return page
+    
+    def invalidate_link(self, payment_link_id: str) -> None:
+        """Drop the cached page of a payment link.
+        
+        Args:
+            payment_link_id: ID of the payment link
+        """
+        short_code = self._short_codes.pop(payment_link_id, None)
+        if short_code is not None:
+            self._pages.pop(short_code, None)
+    
+    def clear(self) -> None:
+        """Drop every cached page."""
+        self._pages.clear()
+        self._short_codes.clear()
+    
+    def _remove(self, short_code: str) -> None:
+        """Drop the page of a short code and its link index entry."""
+        page = self._pages.pop(short_code, None)
+        if page is not None:
+            self._forget_link(short_code, page)
+    
+    def _forget_link(self, short_code: str, page: CachedPage) -> None:
+        """Drop the link index entry of an evicted page."""
+        if self._short_codes.get(page.payment_link_id) == short_code:
+            del self._short_codes[page.payment_link_id]
+
+
+payment_page_cache = PaymentPageCache(
+    ttl_seconds=settings.PAYMENT_PAGE_CACHE_TTL_SECONDS,
+    max_entries=settings.PAYMENT_PAGE_CACHE_MAX_ENTRIES
+)
+
+
+@subscribe(
+    "payment_link.updated",
+    "payment_link.archived",
+    "payment_link.expired",
+    "payment_link.activated",
+)
+async def invalidate_payment_page(event: DomainEvent) -> None:
+    """Drop the cached page of a payment link that changed."""
+    payment_page_cache.invalidate_link(event.aggregate_id)
+    logger.debug("payment_page_invalidated", payment_link_id=event.aggregate_id)
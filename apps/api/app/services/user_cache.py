@@ -0,0 +1,173 @@
+"""
+In-process cache of authenticated users.
+
+Every authenticated request needs its user, and users change rarely, so a
+snapshot of each user row is kept in memory by user ID. Reads get a fresh
+copy merged into their session without querying. Snapshots expire after a
+short TTL and are dropped as soon as a user event is published in this
+process. Clerk-authenticated requests find the user ID through a cached
+Clerk ID mapping, dropped when a user's clerk_id changes.
+"""
+import pickle
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.cache import MemoryCacheBackend
+from app.core.config import settings
+from app.core.logging import get_logger
+from app.core.monitoring import get_cache_metrics
+from app.events.local import subscribe
+from app.events.publisher import DomainEvent
+from app.models import User
+from app.repositories.user import UserRepository
+
+logger = get_logger(__name__)
+
+
+class UserSnapshotCache:
+    """LRU + TTL cache of user snapshots keyed by user ID."""
+    
+    def __init__(self, ttl_seconds: float, max_entries: int, clerk_id_ttl_seconds: float):
+        """Initialize the cache.
+        
+        Args:
+            ttl_seconds: How long a snapshot may be served
+            max_entries: Snapshots kept before the least recently used is evicted
+            clerk_id_ttl_seconds: How long a Clerk ID mapping may be served
+        """
+        self.ttl_seconds = ttl_seconds
+        self.clerk_id_ttl_seconds = clerk_id_ttl_seconds
+        self._snapshots = MemoryCacheBackend(max_entries=max_entries)
+        # Clerk ID -> user ID, and back so a user's mapping can be dropped
+        self._user_ids = MemoryCacheBackend(max_entries=max_entries)
+        self._clerk_ids = MemoryCacheBackend(max_entries=max_entries)
+        self._metrics = get_cache_metrics("auth.user")
+    
+    async def get(self, user_id: str) -> Optional[User]:
+        """Get a detached copy of a cached user.
+        
+        Args:
+            user_id: User ID
+        
+        Returns:
+            Detached user, or None if absent or stale
+        """
+        raw = await self._snapshots.get(user_id)
+        if raw is None:
+            self._metrics.record_miss()
+            return None
+        self._metrics.record_hit("l1")
+        return pickle.loads(raw)
+    
+    async def set(self, user: User) -> None:
+        """Cache a snapshot of a freshly loaded user.
+        
+        Args:
+            user: User without pending changes
+        """
+        await self._snapshots.set(str(user.id), pickle.dumps(user), self.ttl_seconds)
+        self._metrics.record_set()
+        
+        clerk_id = getattr(user, "clerk_id", None)
+        if clerk_id:
+            await self._user_ids.set(clerk_id, str(user.id).encode(), self.clerk_id_ttl_seconds)
+            await self._clerk_ids.set(str(user.id), clerk_id.encode(), self.clerk_id_ttl_seconds)
+    
+    async def get_user_id(self, clerk_id: str) -> Optional[str]:
+        """Get the user ID last seen for a Clerk ID.
+        
+        Args:
+            clerk_id: Clerk user ID
+        
+        Returns:
+            User ID, or None if unknown or stale
+        """
+        raw = await self._user_ids.get(clerk_id)
+        return raw.decode() if raw is not None else None
+    
+    async def invalidate(self, user_id: str) -> None:
+        """Drop the snapshot of a user.
+        
+        Args:
+            user_id: User ID
+        """
+        await self._snapshots.delete(user_id)
+    
+    async def invalidate_clerk_id(self, user_id: str) -> None:
+        """Drop the Clerk ID mapping of a user.
+        
+        Args:
+            user_id: User ID
+        """
+        raw = await self._clerk_ids.get(user_id)
+        await self._clerk_ids.delete(user_id)
+        if raw is not None:
+            await self._user_ids.delete(raw.decode())
+    
+    async def clear(self) -> None:
+        """Drop every snapshot and Clerk ID mapping."""
+        await self._snapshots.clear()
+        await self._user_ids.clear()
+        await self._clerk_ids.clear()
+
+
+user_cache = UserSnapshotCache(
+    ttl_seconds=settings.USER_CACHE_TTL_SECONDS,
+    max_entries=settings.USER_CACHE_MAX_ENTRIES,
+    clerk_id_ttl_seconds=settings.USER_CLERK_ID_CACHE_TTL_SECONDS
+)
+
+
+async def load_user(db: AsyncSession, user_id: str) -> Optional[User]:
+    """Load a user, serving it from the snapshot cache when possible.
+    
+    A cached user is merged into the session without loading, so it behaves
+    like a row loaded by the session itself.
+    
+    Args:
+        db: Database session
+        user_id: User ID
+    
+    Returns:
+        User if found, None otherwise
+    """
+    user = await user_cache.get(user_id)
+    if user is not None:
+        return await db.merge(user, load=False)
+    
+    user = await UserRepository().get(db, id=user_id)
+    if user is not None:
+        await user_cache.set(user)
+    return user
+
+
+async def load_user_by_clerk_id(db: AsyncSession, clerk_id: str) -> Optional[User]:
+    """Load a user by Clerk ID, without querying when the user is cached.
+    
+    Args:
+        db: Database session
+        clerk_id: Clerk user ID
+    
+    Returns:
+        User if found, None otherwise
+    """
+    user_id = await user_cache.get_user_id(clerk_id)
+    if user_id is not None:
+        user = await load_user(db, user_id)
+        if user is not None and getattr(user, "clerk_id", None) == clerk_id:
+            return user
+    
+    user = await UserRepository().get_by_clerk_id(db, clerk_id=clerk_id)
+    if user is not None:
+        await user_cache.set(user)
+    return user
+
+
+@subscribe("user.updated", "user.verified", "user.wallet_linked")
+async def invalidate_user(event: DomainEvent) -> None:
+    """Drop the snapshot of a user that changed."""
+    await user_cache.invalidate(event.aggregate_id)
+    if "clerk_id" in event.data.get("updated_fields", ()):
+        await user_cache.invalidate_clerk_id(event.aggregate_id)
+    logger.debug("user_snapshot_invalidated", user_id=event.aggregate_id)
@@ -0,0 +1,161 @@
+#!/usr/bin/env python3
+"""
+Benchmark per-request middleware overhead.
+
+Compares the previous BaseHTTPMiddleware chain (request ID, JWT auth,
+DB session and multi-tenancy as four separate layers) with the fused pure
+ASGI RequestContextMiddleware, for a plain and a streaming response.
+
+Usage:
+    python scripts/bench_middleware.py [--requests N]
+"""
+import argparse
+import asyncio
+import logging
+import sys
+import time
+import uuid
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+import httpx
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.responses import PlainTextResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.core.logging import bind_request_context
+from app.db.session import request_session_scope
+from app.middleware.auth import JWTAuthMiddleware
+from app.middleware.multi_tenancy import current_organization_id, resolve_organization_id
+from app.middleware.request_context import RequestContextMiddleware
+
+
+class LegacyRequestIDMiddleware(BaseHTTPMiddleware):
+    """Request ID layer as a BaseHTTPMiddleware."""
+    
+    async def dispatch(self, request, call_next):
+        request_id = request.headers.get("X-Request-ID") or str(uuid.uuid4())
+        request.state.request_id = request_id
+        
+        request_logger = bind_request_context(
+            request_id=request_id,
+            user_id=getattr(request.state, "user_id", None),
+            organization_id=getattr(request.state, "organization_id", None)
+        )
+        request_logger.info(
+            "request_started",
+            method=request.method,
+            path=request.url.path,
+            query_params=dict(request.query_params),
+            client_host=request.client.host if request.client else None
+        )
+        
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id
+        
+        request_logger.info(
+            "request_completed",
+            method=request.method,
+            path=request.url.path,
+            status_code=response.status_code
+        )
+        return response
+
+
+class LegacyJWTAuthMiddleware(BaseHTTPMiddleware):
+    """JWT auth layer as a BaseHTTPMiddleware."""
+    
+    async def dispatch(self, request, call_next):
+        await JWTAuthMiddleware(self.app).authenticate(request.scope)
+        return await call_next(request)
+
+
+class LegacyDBSessionMiddleware(BaseHTTPMiddleware):
+    """Request session layer as a BaseHTTPMiddleware."""
+    
+    async def dispatch(self, request, call_next):
+        async with request_session_scope():
+            return await call_next(request)
+
+
+class LegacyMultiTenancyMiddleware(BaseHTTPMiddleware):
+    """Multi-tenancy layer as a BaseHTTPMiddleware."""
+    
+    async def dispatch(self, request, call_next):
+        token = current_organization_id.set(resolve_organization_id(request.scope))
+        try:
+            return await call_next(request)
+        finally:
+            current_organization_id.reset(token)
+
+
+async def plain(request):
+    return PlainTextResponse("ok")
+
+
+async def stream(request):
+    async def chunks():
+        for _ in range(16):
+            yield b"x" * 1024
+    
+    return StreamingResponse(chunks())
+
+
+ROUTES = [
+    Route("/api/v1/bench/plain", plain),
+    Route("/api/v1/bench/stream", stream),
+]
+
+STACKS = {
+    "none": [],
+    "BaseHTTPMiddleware chain": [
+        # Outermost first, matching the previous add_middleware order
+        Middleware(LegacyMultiTenancyMiddleware),
+        Middleware(LegacyDBSessionMiddleware),
+        Middleware(LegacyJWTAuthMiddleware),
+        Middleware(LegacyRequestIDMiddleware),
+    ],
+    "RequestContextMiddleware": [
+        Middleware(RequestContextMiddleware),
+    ],
+}
+
+
+async def run(stack, path: str, requests: int) -> float:
+    """Return the mean time per request in microseconds."""
+    app = Starlette(routes=ROUTES, middleware=stack)
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        # Warm up
+        for _ in range(min(requests, 200)):
+            await client.get(path)
+        
+        start = time.perf_counter()
+        for _ in range(requests):
+            await client.get(path)
+        elapsed = time.perf_counter() - start
+    
+    return elapsed / requests * 1_000_000
+
+
+async def main(requests: int) -> None:
+    # Keep request logging out of the measurement output
+    logging.disable(logging.CRITICAL)
+    
+    for path in ("/api/v1/bench/plain", "/api/v1/bench/stream"):
+        print(f"\n{path} ({requests} requests)")
+        baseline = await run(STACKS["none"], path, requests)
+        for name, stack in STACKS.items():
+            mean = await run(stack, path, requests)
+            print(f"  {name:<28} {mean:8.1f} us/request  (+{mean - baseline:.1f} us)")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=5000)
+    args = parser.parse_args()
+    asyncio.run(main(args.requests))
@@ -0,0 +1,93 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark for public path classification.
+
+Compares the previous hand-kept classification (set lookup, then a loop
+over prefixes, then a loop over regexes) with the compiled
+PublicPathMatcher, on the application's own routes plus synthetic public
+routes standing in for future webhook and public endpoints.
+
+Usage:
+    python scripts/bench_public_paths.py [--extra-routes N] [--number N]
+"""
+import argparse
+import re
+import sys
+import timeit
+from pathlib import Path
+
+# Add the app directory to the Python path
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from app.main import create_application
+from app.middleware.public_paths import PUBLIC_ROUTE, PublicPathMatcher
+
+
+class LegacyMatcher:
+    """Set, prefix loop and regex loop, as JWTAuthMiddleware used to do."""
+    
+    def __init__(self, paths, prefixes, patterns):
+        self.paths = set(paths)
+        self.prefixes = set(prefixes)
+        self.patterns = [re.compile(pattern) for pattern in patterns]
+    
+    def __call__(self, path: str) -> bool:
+        if path in self.paths:
+            return True
+        for prefix in self.prefixes:
+            if path.startswith(prefix):
+                return True
+        for pattern in self.patterns:
+            if pattern.match(path):
+                return True
+        return False
+
+
+def build_app(extra_routes: int):
+    """Create the application with additional public routes."""
+    app = create_application()
+    
+    async def endpoint(resource_id: str):
+        return {}
+    
+    for index in range(extra_routes):
+        app.add_api_route(f"/api/v1/webhooks/provider-{index}", endpoint, openapi_extra=PUBLIC_ROUTE)
+        app.add_api_route(f"/api/v1/public/resource-{index}/{{resource_id}}", endpoint, openapi_extra=PUBLIC_ROUTE)
+    
+    return app
+
+
+def main(extra_routes: int, number: int) -> None:
+    app = build_app(extra_routes)
+    matcher = PublicPathMatcher.from_app(app)
+    
+    legacy = LegacyMatcher(
+        matcher.paths,
+        ("/static", "/public"),
+        [
+            route.path_regex.pattern
+            for route in app.routes
+            if (getattr(route, "openapi_extra", None) or {}).get("x-public") and route.param_convertors
+        ],
+    )
+    
+    paths = {
+        "exact public": "/health",
+        "pattern public": "/api/v1/payment-links/by-short-code/abc123",
+        "protected": "/api/v1/organizations/org_123/members",
+    }
+    
+    print(f"{len(matcher.paths)} exact paths, {len(legacy.patterns)} patterns")
+    for label, path in paths.items():
+        assert matcher(path) == legacy(path)
+        for name, classify in (("legacy", legacy), ("compiled", matcher)):
+            seconds = timeit.timeit(lambda: classify(path), number=number)
+            print(f"  {label:<16} {name:<9} {seconds / number * 1e9:8.0f} ns/path")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--extra-routes", type=int, default=50)
+    parser.add_argument("--number", type=int, default=200_000)
+    args = parser.parse_args()
+    main(args.extra_routes, args.number)
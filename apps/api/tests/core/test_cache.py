@@ -0,0 +1,229 @@
+"""
+Tests for the application cache.
+"""
+import pytest
+from sqlalchemy import delete
+
+from app.core.cache import (
+    MemoryCacheBackend,
+    TieredCache,
+    cached,
+    entity_tag,
+    event_tags,
+    organization_tag,
+    set_cache,
+)
+from app.core.config import settings
+from app.core.monitoring import get_cache_metrics
+from app.db.session import db_manager
+from app.events.domain_events import PaymentLinkUpdatedEvent, PaymentOrderCreatedEvent
+from app.events.local import dispatch
+from app.models import SequenceCounter
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    """Install a fresh two-tier cache with an in-process L2."""
+    monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+    cache = TieredCache(
+        MemoryCacheBackend(max_entries=100),
+        MemoryCacheBackend(max_entries=100),
+        l1_ttl=30,
+        l2_ttl=300
+    )
+    set_cache(cache)
+    yield cache
+    set_cache(None)
+
+
+class CountingRepository:
+    """Repository stand-in counting how often reads reach the database."""
+    
+    def __init__(self):
+        self.calls = 0
+    
+    @cached("test.link", tags=["payment_link:{payment_link_id}"])
+    async def get_link(self, db, *, payment_link_id: str):
+        self.calls += 1
+        return {"id": payment_link_id, "calls": self.calls}
+    
+    @cached("test.optional")
+    async def get_missing(self, db, *, key: str):
+        self.calls += 1
+        return None
+
+
+class TestMemoryCacheBackend:
+    """Test cases for MemoryCacheBackend."""
+    
+    @pytest.mark.asyncio
+    async def test_evicts_least_recently_used(self):
+        """The least recently read key is evicted first."""
+        backend = MemoryCacheBackend(max_entries=2)
+        await backend.set("a", b"1", 60)
+        await backend.set("b", b"2", 60)
+        await backend.get("a")
+        await backend.set("c", b"3", 60)
+        
+        assert await backend.get("a") == b"1"
+        assert await backend.get("b") is None
+        assert await backend.get("c") == b"3"
+    
+    @pytest.mark.asyncio
+    async def test_expired_keys_are_misses(self):
+        """Keys are not served past their TTL."""
+        backend = MemoryCacheBackend()
+        await backend.set("a", b"1", 0)
+        
+        assert await backend.get("a") is None
+        assert len(backend) == 0
+    
+    @pytest.mark.asyncio
+    async def test_invalidates_by_tag(self):
+        """Invalidating a tag drops exactly the keys stored with it."""
+        backend = MemoryCacheBackend()
+        await backend.set("a", b"1", 60, tags=["x", "y"])
+        await backend.set("b", b"2", 60, tags=["y"])
+        await backend.set("c", b"3", 60, tags=["z"])
+        
+        assert await backend.invalidate_tags(["y"]) == 2
+        assert await backend.get("a") is None
+        assert await backend.get("b") is None
+        assert await backend.get("c") == b"3"
+        assert await backend.invalidate_tags(["x"]) == 0
+
+
+class TestTieredCache:
+    """Test cases for TieredCache."""
+    
+    @pytest.mark.asyncio
+    async def test_l2_hits_are_promoted_with_their_tags(self, cache):
+        """An L2 hit fills L1, and the promoted entry stays invalidatable."""
+        await cache.set("key", {"value": 1}, tags=["t"], namespace="test.tiers")
+        await cache.l1.clear()
+        get_cache_metrics("test.tiers").reset()
+        
+        assert await cache.get("key", "test.tiers") == (True, {"value": 1})
+        assert await cache.get("key", "test.tiers") == (True, {"value": 1})
+        stats = get_cache_metrics("test.tiers").snapshot()
+        assert (stats["l1_hits"], stats["l2_hits"]) == (1, 1)
+        
+        await cache.invalidate_tags(["t"])
+        assert await cache.get("key", "test.tiers") == (False, None)
+        assert await cache.l2.get("key") is None
+
+
+class TestCachedDecorator:
+    """Test cases for the cached decorator."""
+    
+    @pytest.mark.asyncio
+    async def test_serves_repeated_reads_from_cache(self, cache):
+        """Reads with the same arguments hit the database once."""
+        repository = CountingRepository()
+        get_cache_metrics("test.link").reset()
+        
+        first = await repository.get_link(None, payment_link_id="pl_1")
+        second = await repository.get_link(None, payment_link_id="pl_1")
+        other = await repository.get_link(None, payment_link_id="pl_2")
+        
+        assert first == second == {"id": "pl_1", "calls": 1}
+        assert other["calls"] == 2
+        stats = get_cache_metrics("test.link").snapshot()
+        assert stats["misses"] == 2
+        assert stats["l1_hits"] == 1
+        assert stats["hit_ratio"] == pytest.approx(1 / 3)
+    
+    @pytest.mark.asyncio
+    async def test_none_is_not_cached_by_default(self, cache):
+        """Missing rows are looked up again."""
+        repository = CountingRepository()
+        await repository.get_missing(None, key="a")
+        await repository.get_missing(None, key="a")
+        
+        assert repository.calls == 2
+    
+    @pytest.mark.asyncio
+    async def test_bypasses_disabled_cache(self, cache, monkeypatch):
+        """With caching disabled every read reaches the database."""
+        monkeypatch.setattr(settings, "CACHE_ENABLED", False)
+        repository = CountingRepository()
+        await repository.get_link(None, payment_link_id="pl_1")
+        await repository.get_link(None, payment_link_id="pl_1")
+        
+        assert repository.calls == 2
+    
+    @pytest.mark.asyncio
+    async def test_domain_events_invalidate_tagged_reads(self, cache):
+        """Publishing an event of an entity drops reads tagged with it."""
+        repository = CountingRepository()
+        await repository.get_link(None, payment_link_id="pl_1")
+        await repository.get_link(None, payment_link_id="pl_2")
+        
+        await dispatch([PaymentLinkUpdatedEvent(
+            payment_link_id="pl_1",
+            organization_id="org_1",
+            updated_by="user_1"
+        )])
+        
+        assert (await repository.get_link(None, payment_link_id="pl_1"))["calls"] == 3
+        assert (await repository.get_link(None, payment_link_id="pl_2"))["calls"] == 2
+    
+    @pytest.mark.asyncio
+    async def test_cached_entities_are_merged_into_the_session(self, cache, test_engine):
+        """ORM entities served from the cache belong to the caller's session."""
+        
+        class CounterRepository:
+            @cached("test.counter")
+            async def get(self, db, *, scope: str):
+                return await db.get(SequenceCounter, (scope, "20250101"))
+        
+        repository = CounterRepository()
+        try:
+            async with db_manager.session() as session:
+                session.add(SequenceCounter(scope="cache_test", period="20250101", value=7))
+                await session.flush()
+                await repository.get(session, scope="cache_test")
+            
+            async with db_manager.session() as session:
+                counter = await repository.get(session, scope="cache_test")
+                assert counter.value == 7
+                assert counter in session
+                counter.value = 8
+            
+            async with db_manager.session() as session:
+                assert (await session.get(SequenceCounter, ("cache_test", "20250101"))).value == 8
+        finally:
+            async with db_manager.session() as session:
+                await session.execute(
+                    delete(SequenceCounter).where(SequenceCounter.scope == "cache_test")
+                )
+
+
+class TestEventTags:
+    """Test cases for event-driven invalidation tags."""
+    
+    def test_tags_cover_aggregate_organization_and_references(self):
+        """Events tag their aggregate, organization and referenced entities."""
+        link_event = PaymentLinkUpdatedEvent(
+            payment_link_id="pl_1",
+            organization_id="org_1",
+            updated_by="user_1"
+        )
+        assert set(event_tags(link_event)) >= {
+            entity_tag("payment_link", "pl_1"),
+            organization_tag("payment_link", "org_1"),
+            entity_tag("organization", "org_1"),
+        }
+        
+        order_event = PaymentOrderCreatedEvent(
+            payment_order_id="po_1",
+            order_number="ORD-1",
+            payment_link_id="pl_1",
+            customer_email="customer@example.com",
+            requested_amount=10,
+            requested_currency="USD"
+        )
+        assert set(event_tags(order_event)) >= {
+            entity_tag("payment_order", "po_1"),
+            entity_tag("payment_link", "pl_1"),
+        }
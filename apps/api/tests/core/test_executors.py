@@ -0,0 +1,111 @@
+"""
+Tests for the bounded blocking-work executors.
+"""
+import asyncio
+import threading
+
+import pytest
+
+from app.core.exceptions import ExecutorSaturated
+from app.core.executors import BoundedExecutor
+from app.core.security import get_password_hash, verify_password
+
+
+@pytest.fixture
+def executor():
+    """A two-worker executor with room for two waiting calls."""
+    executor = BoundedExecutor("test", max_workers=2, max_queue=2)
+    yield executor
+    executor.shutdown()
+
+
+class TestBoundedExecutor:
+    """Test cases for BoundedExecutor."""
+    
+    @pytest.mark.asyncio
+    async def test_runs_off_the_event_loop_thread(self, executor):
+        """Calls run in a worker thread and return their result."""
+        result = await executor.run(lambda x, y=0: (threading.get_ident(), x + y), 1, y=2)
+        
+        assert result[0] != threading.get_ident()
+        assert result[1] == 3
+    
+    @pytest.mark.asyncio
+    async def test_concurrency_is_bounded(self, executor):
+        """No more than max_workers calls run at once; the rest wait."""
+        release = threading.Event()
+        active = 0
+        peak = 0
+        lock = threading.Lock()
+        
+        def work():
+            nonlocal active, peak
+            with lock:
+                active += 1
+                peak = max(peak, active)
+            release.wait(5)
+            with lock:
+                active -= 1
+        
+        calls = [asyncio.ensure_future(executor.run(work)) for _ in range(4)]
+        await asyncio.sleep(0.05)
+        
+        assert executor.running == 2
+        assert executor.queue_depth == 2
+        
+        release.set()
+        await asyncio.gather(*calls)
+        
+        stats = executor.metrics.snapshot()
+        assert peak == 2
+        assert stats["started"] == 4
+        assert stats["finished"] == 4
+        assert stats["max_queue_depth"] == 2
+        assert stats["max_wait_time"] > 0
+        assert stats["running"] == 0
+        assert stats["queue_depth"] == 0
+    
+    @pytest.mark.asyncio
+    async def test_full_queue_rejects_calls(self, executor):
+        """Calls beyond max_queue waiting are rejected."""
+        release = threading.Event()
+        calls = [asyncio.ensure_future(executor.run(release.wait, 5)) for _ in range(4)]
+        await asyncio.sleep(0.05)
+        
+        with pytest.raises(ExecutorSaturated):
+            await executor.run(release.wait, 5)
+        
+        release.set()
+        await asyncio.gather(*calls)
+        assert executor.metrics.snapshot()["rejected"] == 1
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_waiters_never_run(self, executor):
+        """A call cancelled while waiting gives up its place in the queue."""
+        release = threading.Event()
+        ran = []
+        running = [asyncio.ensure_future(executor.run(release.wait, 5)) for _ in range(2)]
+        waiting = asyncio.ensure_future(executor.run(ran.append, "cancelled"))
+        await asyncio.sleep(0.05)
+        
+        waiting.cancel()
+        await asyncio.sleep(0)
+        release.set()
+        await asyncio.gather(*running)
+        await executor.run(ran.append, "next")
+        
+        assert waiting.cancelled()
+        assert ran == ["next"]
+        assert executor.running == 0
+
+
+class TestPasswordHashing:
+    """Test cases for password hashing through the CPU pool."""
+    
+    @pytest.mark.asyncio
+    async def test_hash_and_verify(self):
+        """Hashes verify against their password only."""
+        hashed = await get_password_hash("correct horse")
+        
+        assert await verify_password("correct horse", hashed)
+        assert not await verify_password("wrong horse", hashed)
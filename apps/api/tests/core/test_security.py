@@ -0,0 +1,109 @@
+"""
+Tests for token decoding and the verified claims cache.
+"""
+import time
+from datetime import timedelta
+
+import pytest
+from jose import JWTError, jwt
+
+from app.core.security import (
+    TokenClaimsCache,
+    create_access_token,
+    decode_token,
+    revoke_token,
+    token_claims_cache,
+)
+
+
+@pytest.fixture(autouse=True)
+def clear_claims_cache():
+    """Start every test with an empty claims cache."""
+    token_claims_cache.clear()
+    yield
+    token_claims_cache.clear()
+
+
+class TestDecodeToken:
+    """Test cases for decode_token."""
+    
+    def test_verifies_each_token_once(self, monkeypatch):
+        """Repeated decodes of a token reuse its verified claims."""
+        token = create_access_token("user_1")
+        verifications = 0
+        original_decode = jwt.decode
+        
+        def counting_decode(*args, **kwargs):
+            nonlocal verifications
+            verifications += 1
+            return original_decode(*args, **kwargs)
+        monkeypatch.setattr(jwt, "decode", counting_decode)
+        
+        claims = [decode_token(token) for _ in range(3)]
+        
+        assert verifications == 1
+        assert all(claim["sub"] == "user_1" for claim in claims)
+    
+    def test_callers_cannot_change_cached_claims(self):
+        """Each decode returns its own copy of the claims."""
+        token = create_access_token("user_1")
+        decode_token(token)["sub"] = "user_2"
+        
+        assert decode_token(token)["sub"] == "user_1"
+    
+    def test_rejects_invalid_tokens(self):
+        """Tampered tokens are still rejected."""
+        token = create_access_token("user_1")
+        decode_token(token)
+        
+        with pytest.raises(JWTError):
+            decode_token(token[:-2] + ("AA" if not token.endswith("AA") else "BB"))
+    
+    def test_revoked_tokens_are_rejected(self):
+        """A revoked token fails even while its claims were cached."""
+        token = create_access_token("user_1")
+        decode_token(token)
+        
+        revoke_token(token)
+        
+        with pytest.raises(JWTError):
+            decode_token(token)
+        assert decode_token(create_access_token("user_2"))["sub"] == "user_2"
+    
+    def test_expired_tokens_are_not_served_from_cache(self):
+        """Claims are only cached until the token's expiry."""
+        token = create_access_token("user_1", expires_delta=timedelta(seconds=-1))
+        
+        with pytest.raises(JWTError):
+            decode_token(token)
+
+
+class TestTokenClaimsCache:
+    """Test cases for TokenClaimsCache."""
+    
+    def test_evicts_least_recently_used(self):
+        """The cache holds at most max_entries tokens."""
+        cache = TokenClaimsCache(max_entries=2)
+        expires_at = time.time() + 60
+        for digest in ("a", "b"):
+            cache.set(digest, {"sub": digest, "exp": expires_at})
+        cache.get("a")
+        cache.set("c", {"sub": "c", "exp": expires_at})
+        
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+    
+    def test_drops_expired_claims(self):
+        """Claims past their exp are misses."""
+        cache = TokenClaimsCache()
+        cache.set("a", {"sub": "a", "exp": time.time() - 1})
+        
+        assert cache.get("a") is None
+    
+    def test_skips_tokens_without_expiry(self):
+        """Tokens without exp are never cached."""
+        cache = TokenClaimsCache()
+        cache.set("a", {"sub": "a"})
+        
+        assert cache.get("a") is None
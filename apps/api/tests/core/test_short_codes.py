@@ -0,0 +1,59 @@
+"""
+Tests for sequence-encoded short codes.
+"""
+import pytest
+from sqlalchemy import delete
+
+from app.core.short_codes import ALPHABET, ShortCodeEncoder
+from app.db.session import db_manager
+from app.models import SequenceCounter
+from app.repositories.payment_link import PaymentLinkRepository
+
+
+class TestShortCodeEncoder:
+    """Test cases for ShortCodeEncoder."""
+    
+    def test_codes_are_unique_and_fixed_length(self):
+        """Distinct numbers map to distinct codes of the same length."""
+        encoder = ShortCodeEncoder("test-key")
+        codes = [encoder.encode(number) for number in range(5000)]
+        
+        assert len(set(codes)) == len(codes)
+        assert all(len(code) == 8 for code in codes)
+        assert all(set(code) <= set(ALPHABET) for code in codes)
+    
+    def test_permutation_is_a_bijection(self):
+        """Every code of a small code space is reached exactly once."""
+        encoder = ShortCodeEncoder("test-key", length=3)
+        codes = {encoder.encode(number) for number in range(encoder.capacity)}
+        
+        assert len(codes) == encoder.capacity
+    
+    def test_codes_depend_on_key(self):
+        """Consecutive numbers don't give consecutive codes."""
+        first = ShortCodeEncoder("key-one")
+        second = ShortCodeEncoder("key-two")
+        
+        assert first.encode(1) != second.encode(1)
+        assert first.encode(1)[:-1] != first.encode(2)[:-1]
+    
+    def test_out_of_range_numbers_are_rejected(self):
+        """Numbers outside the code space raise ValueError."""
+        encoder = ShortCodeEncoder("test-key", length=2)
+        with pytest.raises(ValueError):
+            encoder.encode(encoder.capacity)
+    
+    @pytest.mark.asyncio
+    async def test_repository_codes_need_no_lookup(self, test_engine):
+        """Payment link codes come from the sequence, not random retries."""
+        repository = PaymentLinkRepository()
+        try:
+            async with db_manager.session() as session:
+                codes = [await repository.generate_short_code(session) for _ in range(3)]
+            
+            assert len(set(codes)) == 3
+        finally:
+            async with db_manager.session() as session:
+                await session.execute(
+                    delete(SequenceCounter).where(SequenceCounter.scope == "payment_link")
+                )
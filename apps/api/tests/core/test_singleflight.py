@@ -0,0 +1,198 @@
+"""
+Tests for single-flight coalescing.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import delete, select, text
+from sqlalchemy.ext.asyncio import create_async_engine
+from sqlalchemy.pool import AsyncAdaptedQueuePool
+
+from app.core.cache import SingleFlight, coalesced
+from app.core.monitoring import get_coalescing_metrics
+from app.db.session import db_manager
+from app.models import SequenceCounter
+
+TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+
+
+class TestSingleFlight:
+    """Test cases for SingleFlight."""
+    
+    @pytest.mark.asyncio
+    async def test_concurrent_calls_share_one_load(self):
+        """Concurrent calls for a key run the load once."""
+        group = SingleFlight()
+        loads = 0
+        release = asyncio.Event()
+        
+        async def load():
+            nonlocal loads
+            loads += 1
+            await release.wait()
+            return "value"
+        
+        get_coalescing_metrics("test.flight").reset()
+        calls = [asyncio.ensure_future(group.do("key", load, "test.flight")) for _ in range(5)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*calls)
+        
+        assert loads == 1
+        assert [value for value, _ in results] == ["value"] * 5
+        assert [shared for _, shared in results].count(False) == 1
+        assert get_coalescing_metrics("test.flight").snapshot()["deduplicated"] == 4
+        assert len(group) == 0
+    
+    @pytest.mark.asyncio
+    async def test_finished_loads_are_not_reused(self):
+        """Calls after a load finished start a new load."""
+        group = SingleFlight()
+        loads = 0
+        
+        async def load():
+            nonlocal loads
+            loads += 1
+            return loads
+        
+        assert (await group.do("key", load))[0] == 1
+        assert (await group.do("key", load))[0] == 2
+    
+    @pytest.mark.asyncio
+    async def test_errors_reach_every_caller(self):
+        """A failing load fails every caller waiting on it."""
+        group = SingleFlight()
+        release = asyncio.Event()
+        
+        async def load():
+            await release.wait()
+            raise ValueError("boom")
+        
+        calls = [asyncio.ensure_future(group.do("key", load)) for _ in range(3)]
+        await asyncio.sleep(0)
+        release.set()
+        results = await asyncio.gather(*calls, return_exceptions=True)
+        
+        assert all(isinstance(result, ValueError) for result in results)
+    
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_cancel_the_load(self):
+        """The load keeps running for the others when its starter is cancelled."""
+        group = SingleFlight()
+        release = asyncio.Event()
+        
+        async def load():
+            await release.wait()
+            return "value"
+        
+        first = asyncio.ensure_future(group.do("key", load))
+        second = asyncio.ensure_future(group.do("key", load))
+        await asyncio.sleep(0)
+        first.cancel()
+        release.set()
+        
+        assert await second == ("value", True)
+
+
+class TestCoalescedDecorator:
+    """Test cases for the coalesced decorator."""
+    
+    @pytest.mark.asyncio
+    async def test_joined_entities_belong_to_each_callers_session(self, test_engine):
+        """Callers joining a load get entities of their own session."""
+        loads = 0
+        
+        class CounterRepository:
+            @coalesced("test.coalesced_counter")
+            async def get(self, db, *, scope: str):
+                nonlocal loads
+                loads += 1
+                await asyncio.sleep(0.01)
+                return await db.get(SequenceCounter, (scope, "20250101"))
+        
+        repository = CounterRepository()
+        try:
+            async with db_manager.session() as session:
+                session.add(SequenceCounter(scope="coalesce_test", period="20250101", value=3))
+            
+            async with db_manager.session() as first, db_manager.session() as second:
+                counters = await asyncio.gather(
+                    repository.get(first, scope="coalesce_test"),
+                    repository.get(second, scope="coalesce_test"),
+                )
+                
+                assert loads == 1
+                assert counters[0] in first
+                assert counters[1] in second
+                assert counters[0] is not counters[1]
+                assert counters[1].value == 3
+        finally:
+            async with db_manager.session() as session:
+                await session.execute(
+                    delete(SequenceCounter).where(SequenceCounter.scope == "coalesce_test")
+                )
+    
+    @pytest.mark.asyncio
+    async def test_loads_outlive_the_leaders_session(self, test_engine):
+        """The load runs on its own session, so the leader may go away."""
+        release = asyncio.Event()
+        sessions = []
+        
+        class EchoRepository:
+            @coalesced("test.coalesced_echo")
+            async def get(self, db, *, key: str):
+                sessions.append(db)
+                await release.wait()
+                return key
+        
+        repository = EchoRepository()
+        async with db_manager.session() as first, db_manager.session() as second:
+            leader = asyncio.ensure_future(repository.get(first, key="a"))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(repository.get(second, key="a"))
+            await asyncio.sleep(0)
+            leader.cancel()
+            await first.close()
+            release.set()
+            
+            assert await follower == "a"
+        
+        assert len(sessions) == 1
+        assert sessions[0] is not first
+        assert sessions[0].info["read_only"]
+    
+    @pytest.mark.asyncio
+    async def test_loads_fit_in_a_saturated_pool(self, test_engine):
+        """A caller holding the pool's only connection can still load."""
+        engine = create_async_engine(
+            TEST_DATABASE_URL,
+            poolclass=AsyncAdaptedQueuePool,
+            pool_size=1,
+            max_overflow=0,
+            pool_timeout=1
+        )
+        sessions = []
+        
+        class CounterRepository:
+            @coalesced("test.coalesced_pool")
+            async def get(self, db, *, scope: str):
+                sessions.append(db)
+                return await db.scalar(
+                    select(SequenceCounter.value).where(SequenceCounter.scope == scope)
+                )
+        
+        repository = CounterRepository()
+        try:
+            async with db_manager.async_session_factory(bind=engine) as session:
+                # The caller's read transaction holds the only connection
+                await session.execute(text("SELECT 1"))
+                assert await repository.get(session, scope="coalesce_pool") is None
+                assert sessions[-1] is not session
+                
+                # Pending writes keep the read on the caller's session
+                session.add(SequenceCounter(scope="coalesce_pool", period="20250101", value=1))
+                assert await repository.get(session, scope="coalesce_pool") == 1
+                assert sessions[-1] is session
+                await session.rollback()
+        finally:
+            await engine.dispose()
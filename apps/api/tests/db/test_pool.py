@@ -0,0 +1,73 @@
+"""
+Tests for database pool modes and pool telemetry.
+"""
+import pytest
+from sqlalchemy import text
+
+from app.core.monitoring import get_pool_stats
+from app.db.pool import InstrumentedAsyncQueuePool, InstrumentedNullPool, PoolMode
+from app.db.session import DatabaseManager
+
+TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+
+
+class TestDatabasePoolModes:
+    """Test cases for DatabaseManager pool modes."""
+    
+    @pytest.mark.asyncio
+    async def test_managed_mode_records_checkouts(self):
+        """Managed mode pools connections and reports live gauges."""
+        manager = DatabaseManager(TEST_DATABASE_URL, pool_mode="managed")
+        try:
+            assert isinstance(manager.engine.pool, InstrumentedAsyncQueuePool)
+            
+            async with manager.session() as session:
+                await session.execute(text("SELECT 1"))
+                stats = get_pool_stats()["primary"]
+                assert stats["checked_out"] == 1
+            
+            async with manager.session() as session:
+                await session.execute(text("SELECT 1"))
+            
+            stats = get_pool_stats()["primary"]
+            assert stats["mode"] == PoolMode.MANAGED.value
+            assert stats["checkouts"] == 2
+            # The second checkout reuses the pooled connection
+            assert stats["connects"] == 1
+            assert stats["checked_out"] == 0
+        finally:
+            await manager.close()
+    
+    @pytest.mark.asyncio
+    async def test_serverless_mode_connects_per_checkout(self):
+        """Serverless mode opens a new connection for every checkout."""
+        manager = DatabaseManager(TEST_DATABASE_URL, pool_mode="serverless")
+        try:
+            assert isinstance(manager.engine.pool, InstrumentedNullPool)
+            
+            for _ in range(2):
+                async with manager.session() as session:
+                    await session.execute(text("SELECT 1"))
+            
+            stats = get_pool_stats()["primary"]
+            assert stats["connects"] == 2
+            assert "checked_out" not in stats
+        finally:
+            await manager.close()
+    
+    @pytest.mark.asyncio
+    async def test_metrics_survive_dispose(self):
+        """Pools recreated by dispose keep reporting to the same tracker."""
+        manager = DatabaseManager(TEST_DATABASE_URL, pool_mode="managed")
+        try:
+            await manager.engine.dispose()
+            async with manager.session() as session:
+                await session.execute(text("SELECT 1"))
+            assert get_pool_stats()["primary"]["checkouts"] == 1
+        finally:
+            await manager.close()
+    
+    def test_invalid_pool_mode(self):
+        """Unknown pool modes are rejected."""
+        with pytest.raises(ValueError):
+            DatabaseManager(TEST_DATABASE_URL, pool_mode="bogus")
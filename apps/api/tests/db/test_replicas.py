@@ -0,0 +1,110 @@
+"""
+Tests for read-replica routing in DatabaseManager.
+"""
+import asyncio
+
+import pytest
+from sqlalchemy import text, update
+
+from app.db.session import (
+    DatabaseManager,
+    is_pinned_to_primary,
+    pin_to_primary,
+    request_session_scope,
+)
+from app.db.unit_of_work import UnitOfWork
+from app.models import User
+
+TEST_DATABASE_URL = "sqlite+aiosqlite:///./test.db"
+
+
+class TestReadReplicaRouting:
+    """Test cases for replica selection and read-your-writes pinning."""
+    
+    @pytest.mark.asyncio
+    async def test_read_session_uses_replicas_round_robin(self):
+        """Read sessions are balanced across in-sync replicas."""
+        manager = DatabaseManager(
+            TEST_DATABASE_URL,
+            replica_urls=[TEST_DATABASE_URL, TEST_DATABASE_URL]
+        )
+        try:
+            await manager.check_replica_lag()
+            first, second = (r.engine for r in manager.replicas)
+            assert manager.select_read_engine() is first
+            assert manager.select_read_engine() is second
+            
+            async with manager.read_session() as session:
+                assert session.bind is first
+                await session.execute(text("SELECT 1"))
+        finally:
+            await manager.close()
+    
+    @pytest.mark.asyncio
+    async def test_lagging_replicas_fall_back_to_primary(self):
+        """Replicas over the lag limit or unreachable are skipped."""
+        manager = DatabaseManager(
+            TEST_DATABASE_URL,
+            replica_urls=[TEST_DATABASE_URL, TEST_DATABASE_URL]
+        )
+        try:
+            # Replicas are not used before their lag has been measured
+            assert manager.select_read_engine() is manager.engine
+            
+            lagging, healthy = manager.replicas
+            lagging.lag_seconds = 3600
+            healthy.lag_seconds = 0.0
+            assert manager.select_read_engine() is healthy.engine
+            
+            healthy.lag_seconds = None
+            assert manager.select_read_engine() is manager.engine
+            
+            await manager.check_replica_lag()
+            assert lagging.lag_seconds == 0
+            assert manager.select_read_engine() is not manager.engine
+        finally:
+            await manager.close()
+    
+    @pytest.mark.asyncio
+    async def test_committed_writes_pin_to_primary(self, test_engine):
+        """Reads after a committed write in the same request use the primary."""
+        manager = DatabaseManager(TEST_DATABASE_URL, replica_urls=[TEST_DATABASE_URL])
+        
+        async def request():
+            async with manager.session() as session:
+                await session.execute(text("SELECT 1"))
+            assert not is_pinned_to_primary()
+            
+            async with manager.session() as session:
+                await session.execute(
+                    update(User).where(User.id == "missing").values(name="x")
+                )
+            assert is_pinned_to_primary()
+            assert manager.select_read_engine() is manager.engine
+        
+        try:
+            # Run in a task so the pin stays scoped to the simulated request
+            await asyncio.create_task(request())
+            assert not is_pinned_to_primary()
+        finally:
+            await manager.close()
+    
+    @pytest.mark.asyncio
+    async def test_request_scope_resets_the_pin(self):
+        """A pin set during a request ends with the request's session scope."""
+        async with request_session_scope():
+            pin_to_primary()
+            assert is_pinned_to_primary()
+        
+        assert not is_pinned_to_primary()
+    
+    @pytest.mark.asyncio
+    async def test_read_only_unit_of_work_rejects_writes(self):
+        """Read-only units of work cannot flush or commit changes."""
+        uow = UnitOfWork(read_only=True)
+        async with uow:
+            uow.session.add(User(id="u1", email="reader@example.com"))
+            with pytest.raises(RuntimeError):
+                await uow.flush()
+            with pytest.raises(RuntimeError):
+                await uow.commit()
@@ -0,0 +1,40 @@
+"""
+Tests for the request-scoped shared database session.
+"""
+import pytest
+from sqlalchemy import text
+
+from app.db.session import db_manager, get_db, get_request_session, request_session_scope
+
+
+class TestRequestSession:
+    """Test cases for request_session_scope and get_db."""
+    
+    @pytest.mark.asyncio
+    async def test_session_is_created_lazily(self):
+        """No session or connection is taken until first use."""
+        async with request_session_scope() as scope:
+            assert get_request_session() is scope
+            assert not scope.is_open
+            assert db_manager.engine.pool.checkedout() == 0
+        
+        assert get_request_session() is None
+    
+    @pytest.mark.asyncio
+    async def test_get_db_reuses_request_session(self):
+        """Middleware and dependencies share one session per request."""
+        async with request_session_scope() as scope:
+            middleware_session = scope.get()
+            await middleware_session.execute(text("SELECT 1"))
+            
+            dependency = get_db()
+            db = await anext(dependency)
+            assert db is middleware_session
+            await db.execute(text("SELECT 1"))
+            assert db_manager.engine.pool.checkedout() == 1
+            
+            with pytest.raises(StopAsyncIteration):
+                await anext(dependency)
+        
+        assert not scope.is_open
+        assert db_manager.engine.pool.checkedout() == 0
@@ -0,0 +1,92 @@
+"""
+Tests for block-allocated sequence counters.
+"""
+import asyncio
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, literal, select
+
+from app.db.sequences import SequenceAllocator
+from app.db.session import db_manager
+from app.models import SequenceCounter
+
+
+@pytest_asyncio.fixture
+async def counter_scope(test_engine):
+    """Remove the test counters afterwards."""
+    yield "org_sequence"
+    
+    async with db_manager.session() as session:
+        await session.execute(
+            delete(SequenceCounter).where(SequenceCounter.scope == "org_sequence")
+        )
+
+
+class TestSequenceAllocator:
+    """Test cases for SequenceAllocator."""
+    
+    @pytest.mark.asyncio
+    async def test_values_come_from_reserved_blocks(self, counter_scope):
+        """One counter increment serves a whole block of values."""
+        allocator = SequenceAllocator(block_size=3)
+        async with db_manager.session() as session:
+            values = [
+                await allocator.next_value(counter_scope, "20250101")
+                for _ in range(4)
+            ]
+            counter = await session.get(SequenceCounter, (counter_scope, "20250101"))
+        
+        assert values == [1, 2, 3, 4]
+        assert counter.value == 6
+    
+    @pytest.mark.asyncio
+    async def test_workers_never_share_values(self, counter_scope):
+        """Allocators of different workers get disjoint blocks."""
+        workers = [SequenceAllocator(block_size=2) for _ in range(3)]
+        
+        async def allocate(allocator):
+            return [
+                await allocator.next_value(counter_scope, "20250101")
+                for _ in range(3)
+            ]
+        
+        results = await asyncio.gather(*(allocate(worker) for worker in workers))
+        values = [value for result in results for value in result]
+        
+        assert len(set(values)) == len(values)
+    
+    @pytest.mark.asyncio
+    async def test_periods_are_counted_separately(self, counter_scope):
+        """A new period starts from 1 and drops blocks of earlier periods."""
+        allocator = SequenceAllocator(block_size=5)
+        async with db_manager.session() as session:
+            await allocator.next_value(counter_scope, "20250101")
+            assert await allocator.next_value(counter_scope, "20250102") == 1
+            
+            periods = (await session.execute(
+                select(SequenceCounter.period)
+                .where(SequenceCounter.scope == counter_scope)
+                .order_by(SequenceCounter.period)
+            )).scalars().all()
+        
+        assert periods == ["20250101", "20250102"]
+        assert list(allocator._blocks) == [(counter_scope, "20250102")]
+        assert list(allocator._locks) == [(counter_scope, "20250102")]
+    
+    @pytest.mark.asyncio
+    async def test_new_counters_continue_after_the_seed(self, counter_scope):
+        """A new counter starts after the highest value already in use."""
+        seeded = SequenceAllocator(
+            block_size=2,
+            seed=lambda scope, period: select(literal(41)).scalar_subquery()
+        )
+        unseeded = SequenceAllocator(
+            block_size=2,
+            seed=lambda scope, period: select(literal(None)).scalar_subquery()
+        )
+        
+        assert await seeded.next_value(counter_scope, "20250101") == 42
+        assert await unseeded.next_value(counter_scope, "20250102") == 1
+        # The seed is only read when the counter row is created
+        assert await unseeded.next_value(counter_scope, "20250101") == 44
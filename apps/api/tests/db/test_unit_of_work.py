@@ -0,0 +1,82 @@
+"""
+Tests for connection acquisition and early release in UnitOfWork.
+"""
+import pytest
+from sqlalchemy import text, update
+
+from app.db.session import db_manager
+from app.db.unit_of_work import UnitOfWork
+from app.models import User
+from app.repositories.wallet_circle import CircleWalletRepository
+from app.services.circle_service import circle_service
+
+
+class TestUnitOfWorkConnections:
+    """Test cases for UnitOfWork connection handling."""
+    
+    @pytest.mark.asyncio
+    async def test_connection_taken_on_first_statement(self):
+        """Entering a unit of work doesn't check out a connection."""
+        pool = db_manager.engine.pool
+        async with UnitOfWork() as uow:
+            assert pool.checkedout() == 0
+            
+            await uow.session.execute(text("SELECT 1"))
+            assert pool.checkedout() == 1
+        
+        assert pool.checkedout() == 0
+    
+    @pytest.mark.asyncio
+    async def test_release_returns_read_only_connection(self):
+        """Released connections go back to the pool until the next statement."""
+        pool = db_manager.engine.pool
+        async with UnitOfWork() as uow:
+            await uow.session.execute(text("SELECT 1"))
+            assert await uow.release()
+            assert pool.checkedout() == 0
+            
+            await uow.session.execute(text("SELECT 1"))
+            assert pool.checkedout() == 1
+    
+    @pytest.mark.asyncio
+    async def test_release_keeps_pending_writes(self, test_engine):
+        """Connections with uncommitted writes are not released early."""
+        pool = db_manager.engine.pool
+        async with UnitOfWork() as uow:
+            await uow.session.execute(
+                update(User).where(User.id == "missing").values(name="x")
+            )
+            assert not await uow.release()
+            assert pool.checkedout() == 1
+            await uow.rollback()
+    
+    @pytest.mark.asyncio
+    async def test_circle_calls_run_without_a_connection(self, monkeypatch):
+        """No pool slot is held while the Circle API is called."""
+        pool = db_manager.engine.pool
+        held = []
+        
+        async def get_wallets(wallet_set_id):
+            held.append(pool.checkedout())
+            return []
+        
+        monkeypatch.setattr(circle_service, "get_wallets", get_wallets)
+        async with UnitOfWork() as uow:
+            await uow.session.execute(text("SELECT 1"))
+            wallets = await CircleWalletRepository().get_circle_wallets_by_set(
+                uow.session, wallet_set_id="set_1"
+            )
+        
+        assert wallets == []
+        assert held == [0]
+    
+    @pytest.mark.asyncio
+    async def test_hold_time_is_recorded(self):
+        """Returning a connection records how long it was held."""
+        metrics = db_manager.engine.pool.metrics
+        releases = metrics.releases
+        async with UnitOfWork() as uow:
+            await uow.session.execute(text("SELECT 1"))
+        
+        assert metrics.releases == releases + 1
+        assert metrics.snapshot()["max_hold_time"] > 0
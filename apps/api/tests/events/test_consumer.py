@@ -0,0 +1,210 @@
+"""
+Tests for the event consumer runtime.
+"""
+import asyncio
+import functools
+import json
+import zlib
+from typing import Callable, List
+
+import pytest
+
+from app.events.consumer import EventConsumer
+from app.events.local_broker import LocalBroker, LocalConsumer, LocalProducer, TopicPartition
+from app.events.publisher import DomainEvent, get_topic_name
+from tests.events.test_pipeline import make_event
+
+TOPIC = get_topic_name("test")
+GROUP = "test-group"
+
+
+def make_consumer(broker: LocalBroker) -> EventConsumer:
+    """Create a consumer of the local broker with short timeouts."""
+    return EventConsumer(
+        GROUP,
+        lambda topics: LocalConsumer(broker, *topics, group_id=GROUP, fetch_interval_ms=10),
+        lambda: LocalProducer(broker),
+        retries=1,
+        retry_backoff_ms=1,
+        poll_timeout_ms=50
+    )
+
+
+def append(broker: LocalBroker, events: List[DomainEvent]) -> None:
+    """Append events as the publisher would."""
+    broker.append([
+        (TOPIC, event.aggregate_id.encode(), event.model_dump_json().encode())
+        for event in events
+    ])
+
+
+async def wait_until(condition: Callable[[], bool]) -> None:
+    """Wait for a condition to hold."""
+    for _ in range(500):
+        if condition():
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("condition not met in time")
+
+
+class TestEventConsumer:
+    """Test cases for EventConsumer."""
+    
+    @pytest.mark.asyncio
+    async def test_handlers_get_events_in_order_and_offsets_are_committed(self, tmp_path):
+        """Events reach their handlers in order and are committed afterwards."""
+        broker = LocalBroker(str(tmp_path), partitions=2)
+        consumer = make_consumer(broker)
+        handled: List[DomainEvent] = []
+        
+        @consumer.handles("test.event")
+        async def record(events: List[DomainEvent]) -> None:
+            handled.extend(events)
+        
+        @consumer.handles("test.other")
+        async def unused(events: List[DomainEvent]) -> None:
+            raise AssertionError("only test.event was published")
+        
+        append(broker, [make_event("a", sequence) for sequence in range(20)])
+        await consumer.start()
+        
+        await wait_until(lambda: len(handled) == 20)
+        assert [event.data["sequence"] for event in handled] == list(range(20))
+        await wait_until(lambda: sum(broker.lag(GROUP, TOPIC).values()) == 0)
+        
+        await consumer.stop()
+        broker.close()
+    
+    @pytest.mark.asyncio
+    async def test_partitions_are_handled_concurrently(self, tmp_path):
+        """A slow partition doesn't hold up the others."""
+        broker = LocalBroker(str(tmp_path), partitions=2)
+        by_partition = {zlib.crc32(f"agg{index}".encode()) % 2: f"agg{index}" for index in range(10)}
+        slow, fast = by_partition[0], by_partition[1]
+        gate = asyncio.Event()
+        handled: List[DomainEvent] = []
+        
+        consumer = make_consumer(broker)
+        
+        @consumer.handles("test.event")
+        async def record(events: List[DomainEvent]) -> None:
+            if events[0].aggregate_id == slow:
+                await gate.wait()
+            handled.extend(events)
+        
+        append(broker, [make_event(slow, 0), make_event(fast, 0)])
+        await consumer.start()
+        
+        await wait_until(lambda: [event.aggregate_id for event in handled] == [fast])
+        gate.set()
+        await wait_until(lambda: len(handled) == 2)
+        
+        await consumer.stop()
+        broker.close()
+    
+    @pytest.mark.asyncio
+    async def test_failing_events_are_dead_lettered(self, tmp_path):
+        """An event that keeps failing is set aside and the rest are handled."""
+        broker = LocalBroker(str(tmp_path), partitions=1)
+        consumer = make_consumer(broker)
+        handled: List[int] = []
+        
+        @consumer.handles("test.event")
+        async def record(events: List[DomainEvent]) -> None:
+            if any(event.data["sequence"] == 3 for event in events):
+                raise ValueError("cannot project")
+            handled.extend(event.data["sequence"] for event in events)
+        
+        append(broker, [make_event("a", sequence) for sequence in range(6)])
+        await consumer.start()
+        
+        await wait_until(lambda: len(handled) == 5)
+        assert handled == [0, 1, 2, 4, 5]
+        await wait_until(lambda: broker.lag(GROUP, TOPIC) == {0: 0})
+        
+        records, _ = broker.fetch(TopicPartition(f"{TOPIC}.{GROUP}.dlq", 0), 0, 10)
+        letter = json.loads(records[0].value)
+        assert len(records) == 1
+        assert letter["offset"] == 3
+        assert letter["error_type"] == "ValueError"
+        assert DomainEvent.model_validate_json(letter["value"]).data["sequence"] == 3
+        assert consumer.metrics.dead_lettered == 1
+        
+        await consumer.stop()
+        broker.close()
+    
+    @pytest.mark.asyncio
+    async def test_failed_batches_are_retried(self, tmp_path):
+        """A batch that fails once is handled by the retry."""
+        broker = LocalBroker(str(tmp_path), partitions=1)
+        consumer = make_consumer(broker)
+        handled: List[DomainEvent] = []
+        failures = [ConnectionError("database unavailable")]
+        
+        @consumer.handles("test.event")
+        async def record(events: List[DomainEvent]) -> None:
+            if failures:
+                raise failures.pop()
+            handled.extend(events)
+        
+        append(broker, [make_event("a", sequence) for sequence in range(3)])
+        await consumer.start()
+        
+        await wait_until(lambda: len(handled) == 3)
+        assert consumer.metrics.handler_failures == 1
+        assert consumer.metrics.dead_lettered == 0
+        
+        await consumer.stop()
+        broker.close()
+    
+    @pytest.mark.asyncio
+    async def test_handlers_without_qualname_are_named_in_dead_letters(self, tmp_path):
+        """Partials and callable objects can be dead-lettered too."""
+        broker = LocalBroker(str(tmp_path), partitions=1)
+        consumer = make_consumer(broker)
+        
+        async def fail(reason: str, events: List[DomainEvent]) -> None:
+            raise ValueError(reason)
+        
+        consumer.register(functools.partial(fail, "cannot project"), "test.event")
+        append(broker, [make_event("a", 0)])
+        await consumer.start()
+        
+        await wait_until(lambda: consumer.metrics.dead_lettered == 1)
+        records, _ = broker.fetch(TopicPartition(f"{TOPIC}.{GROUP}.dlq", 0), 0, 10)
+        assert json.loads(records[0].value)["handler"].startswith("functools.partial")
+        
+        await consumer.stop()
+        broker.close()
+    
+    @pytest.mark.asyncio
+    async def test_dead_workers_are_restarted(self, tmp_path):
+        """A worker that dies is restarted from the first unhandled record."""
+        broker = LocalBroker(str(tmp_path), partitions=1)
+        consumer = make_consumer(broker)
+        handled: List[int] = []
+        
+        @consumer.handles("test.event")
+        async def record(events: List[DomainEvent]) -> None:
+            handled.extend(event.data["sequence"] for event in events)
+        
+        commit = consumer._commit
+        failures = [RuntimeError("worker bug")]
+        
+        async def failing_commit(tp, offset):
+            if failures:
+                raise failures.pop()
+            await commit(tp, offset)
+        
+        consumer._commit = failing_commit
+        append(broker, [make_event("a", sequence) for sequence in range(5)])
+        await consumer.start()
+        
+        await wait_until(lambda: broker.lag(GROUP, TOPIC) == {0: 0})
+        assert consumer.metrics.worker_failures == 1
+        # The batch of the dead worker is handled again
+        assert handled[-5:] == list(range(5))
+        assert len(handled) == 10
+        
+        await consumer.stop()
+        broker.close()
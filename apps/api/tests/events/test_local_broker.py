@@ -0,0 +1,187 @@
+"""
+Tests for the file-backed local broker and its publisher.
+"""
+import asyncio
+import os
+import time
+
+import pytest
+
+from app.events.local_broker import LocalBroker, LocalConsumer, TopicPartition
+from app.events.publisher import DomainEvent, LocalEventPublisher
+from tests.events.test_pipeline import make_event
+
+
+def append(broker: LocalBroker, key: bytes, count: int, topic: str = "test") -> None:
+    """Append numbered values with one key."""
+    broker.append([(topic, key, str(value).encode()) for value in range(count)])
+
+
+class TestLocalBroker:
+    """Test cases for LocalBroker."""
+    
+    def test_keys_keep_their_partition_and_order(self, tmp_path):
+        """Records of a key land on one partition with consecutive offsets."""
+        broker = LocalBroker(str(tmp_path), partitions=4)
+        metadata = broker.append([("test", b"a", b"1"), ("test", b"b", b"1"), ("test", b"a", b"2")])
+        
+        assert metadata[0].partition == metadata[2].partition
+        assert metadata[2].offset == metadata[0].offset + 1
+        assert broker.partitions_for("test") == [0, 1, 2, 3]
+        
+        records, _ = broker.fetch(TopicPartition("test", metadata[0].partition), 0, 10)
+        assert [(record.key, record.value) for record in records if record.key == b"a"] == [(b"a", b"1"), (b"a", b"2")]
+        broker.close()
+    
+    def test_fetch_reads_across_segments(self, tmp_path):
+        """Fetches start at any offset and continue into newer segments."""
+        broker = LocalBroker(str(tmp_path), partitions=1, segment_bytes=100)
+        append(broker, b"a", 5)
+        append(broker, b"a", 5)
+        tp = TopicPartition("test", 0)
+        
+        records, cursor = broker.fetch(tp, 3, 4)
+        assert [record.offset for record in records] == [3, 4, 5, 6]
+        records, _ = broker.fetch(tp, 7, 10, cursor)
+        assert [record.offset for record in records] == [7, 8, 9]
+        assert broker.end_offset(tp) == 10
+        broker.close()
+    
+    def test_brokers_on_one_directory_share_offsets(self, tmp_path):
+        """Appends from separate brokers, as from separate processes, never reuse an offset."""
+        first = LocalBroker(str(tmp_path), partitions=1)
+        second = LocalBroker(str(tmp_path), partitions=1)
+        
+        append(first, b"a", 2)
+        append(second, b"a", 2)
+        append(first, b"a", 1)
+        
+        records, _ = first.fetch(TopicPartition("test", 0), 0, 10)
+        assert [record.offset for record in records] == [0, 1, 2, 3, 4]
+        assert [record.value for record in records] == [b"0", b"1", b"0", b"1", b"0"]
+        first.close()
+        second.close()
+    
+    def test_retention_deletes_old_segments(self, tmp_path):
+        """Closed segments beyond retention are deleted and reads skip them."""
+        broker = LocalBroker(str(tmp_path), partitions=1, segment_bytes=100, retention_ms=60000)
+        for _ in range(10):
+            append(broker, b"a", 1)
+        tp = TopicPartition("test", 0)
+        
+        # Age every segment past the retention period
+        for path in (tmp_path / "test" / "0").glob("*.log"):
+            os.utime(path, (time.time() - 120, time.time() - 120))
+        
+        assert broker.enforce_retention() > 0
+        start = broker.log_start_offset(tp)
+        assert start > 0
+        records, _ = broker.fetch(tp, 0, 100)
+        assert records[0].offset == start
+        assert records[-1].offset == 9
+        broker.close()
+    
+    def test_torn_append_is_truncated(self, tmp_path):
+        """A record cut short by a crash is dropped and its offset reused."""
+        append(LocalBroker(str(tmp_path), partitions=1), b"a", 2)
+        segment = next((tmp_path / "test" / "0").glob("*.log"))
+        with open(segment, "ab") as file:
+            file.write(b"\x00" * 10)
+        
+        broker = LocalBroker(str(tmp_path), partitions=1)
+        assert broker.append([("test", b"a", b"2")])[0].offset == 2
+        records, _ = broker.fetch(TopicPartition("test", 0), 0, 10)
+        assert [record.value for record in records] == [b"0", b"1", b"2"]
+        broker.close()
+
+
+class TestLocalConsumer:
+    """Test cases for LocalConsumer."""
+    
+    @pytest.mark.asyncio
+    async def test_group_resumes_from_committed_offset(self, tmp_path):
+        """A new member starts where the group committed."""
+        broker = LocalBroker(str(tmp_path), partitions=1)
+        append(broker, b"a", 5)
+        
+        consumer = LocalConsumer(broker, "test", group_id="group")
+        await consumer.start()
+        batches = await consumer.getmany(max_records=3)
+        assert [record.value for record in batches[TopicPartition("test", 0)]] == [b"0", b"1", b"2"]
+        await consumer.commit()
+        assert broker.lag("group", "test") == {0: 2}
+        await consumer.stop()
+        
+        consumer = LocalConsumer(broker, "test", group_id="group")
+        await consumer.start()
+        batches = await consumer.getmany()
+        assert [record.value for record in batches[TopicPartition("test", 0)]] == [b"3", b"4"]
+        await consumer.stop()
+        broker.close()
+    
+    @pytest.mark.asyncio
+    async def test_members_share_partitions(self, tmp_path):
+        """Partitions are split between members and taken over when one leaves."""
+        broker = LocalBroker(str(tmp_path), partitions=4)
+        broker.create_topic("test")
+        
+        first = LocalConsumer(broker, "test", group_id="group", heartbeat_interval_ms=0)
+        second = LocalConsumer(broker, "test", group_id="group", heartbeat_interval_ms=0)
+        await first.start()
+        await second.start()
+        # The first member hands over the share of the second
+        await first.getmany()
+        await second.getmany()
+        
+        assert len(first.assignment()) == 2
+        assert len(second.assignment()) == 2
+        assert not first.assignment() & second.assignment()
+        
+        await second.stop()
+        await first.getmany()
+        assert len(first.assignment()) == 4
+        await first.stop()
+        broker.close()
+    
+    @pytest.mark.asyncio
+    async def test_getmany_waits_for_records(self, tmp_path):
+        """getmany returns records appended while it waits."""
+        broker = LocalBroker(str(tmp_path), partitions=1)
+        broker.create_topic("test")
+        consumer = LocalConsumer(broker, "test", group_id="group", fetch_interval_ms=10)
+        await consumer.start()
+        
+        asyncio.get_running_loop().call_later(0.05, append, broker, b"a", 1)
+        batches = await consumer.getmany(timeout_ms=2000)
+        assert [record.value for record in batches[TopicPartition("test", 0)]] == [b"0"]
+        await consumer.stop()
+        broker.close()
+
+
+class TestLocalEventPublisher:
+    """Test cases for LocalEventPublisher."""
+    
+    @pytest.mark.asyncio
+    async def test_published_events_can_be_consumed(self, tmp_path):
+        """Events are stored per aggregate type topic and read back in order."""
+        broker = LocalBroker(str(tmp_path), partitions=2)
+        publisher = LocalEventPublisher(broker, pipeline_config={"linger_ms": 0})
+        
+        receipts = await publisher.deliver([make_event("a", sequence) for sequence in range(3)])
+        assert [receipt.offset for receipt in receipts] == [0, 1, 2]
+        for sequence in range(3, 6):
+            await publisher.publish(make_event("a", sequence))
+        await publisher.flush()
+        
+        consumer = LocalConsumer(broker, receipts[0].topic, group_id="group")
+        await consumer.start()
+        batches = await consumer.getmany()
+        events = [
+            DomainEvent.model_validate_json(record.value)
+            for records in batches.values()
+            for record in records
+        ]
+        assert [event.data["sequence"] for event in events] == list(range(6))
+        
+        await consumer.stop()
+        await publisher.close()
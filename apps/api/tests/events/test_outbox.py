@@ -0,0 +1,165 @@
+"""
+Tests for the transactional event outbox and its relay.
+"""
+from typing import List, Optional
+from uuid import uuid4
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, insert, select
+
+from app.db.session import db_manager
+from app.db.unit_of_work import UnitOfWork
+from app.events.outbox import OutboxRelay, _to_row, write_outbox
+from app.events.publisher import DeliveryReceipt, DomainEvent, InMemoryEventPublisher
+from app.models import PaymentEvent
+
+
+class ReceiptPublisher(InMemoryEventPublisher):
+    """In-memory publisher returning broker positions, optionally failing."""
+    
+    def __init__(self, fail: bool = False):
+        super().__init__()
+        self.fail = fail
+    
+    async def deliver(self, events: List[DomainEvent]) -> List[Optional[DeliveryReceipt]]:
+        if self.fail:
+            raise ConnectionError("broker unavailable")
+        offset = len(self.events)
+        await self.publish_batch(events)
+        return [
+            DeliveryReceipt(f"wedi.events.{event.aggregate_type}", 0, offset + index)
+            for index, event in enumerate(events)
+        ]
+
+
+def make_event(aggregate_id: str, **data) -> DomainEvent:
+    """Create a test event."""
+    return DomainEvent(
+        event_type="test.changed",
+        aggregate_id=aggregate_id,
+        aggregate_type="outbox_test",
+        data=data
+    )
+
+
+async def load_rows(aggregate_id: str) -> List[PaymentEvent]:
+    """Load an aggregate's outbox rows in sequence order."""
+    async with db_manager.session() as session:
+        result = await session.execute(
+            select(PaymentEvent)
+            .where(PaymentEvent.aggregate_id == aggregate_id)
+            .order_by(PaymentEvent.sequence_number)
+        )
+        return list(result.scalars())
+
+
+@pytest_asyncio.fixture
+async def aggregate_id(test_engine):
+    """Start from an empty outbox and remove the test rows afterwards."""
+    async with db_manager.session() as session:
+        await session.execute(delete(PaymentEvent))
+    
+    yield str(uuid4())
+    
+    async with db_manager.session() as session:
+        await session.execute(delete(PaymentEvent))
+
+
+class TestWriteOutbox:
+    """Test cases for writing events to the outbox."""
+    
+    @pytest.mark.asyncio
+    async def test_events_are_numbered_per_aggregate(self, aggregate_id):
+        """Sequence numbers continue from the aggregate's last event."""
+        other_id = str(uuid4())
+        async with db_manager.session() as session:
+            await write_outbox(session, [make_event(aggregate_id, step=1)])
+        async with db_manager.session() as session:
+            await write_outbox(session, [
+                make_event(aggregate_id, step=2),
+                make_event(other_id, step=1),
+                make_event(aggregate_id, step=3),
+            ])
+        
+        rows = await load_rows(aggregate_id)
+        assert [row.sequence_number for row in rows] == [1, 2, 3]
+        assert [row.data["step"] for row in rows] == [1, 2, 3]
+        assert all(row.published_at is None for row in rows)
+        assert [row.sequence_number for row in await load_rows(other_id)] == [1]
+    
+    @pytest.mark.asyncio
+    async def test_numbering_continues_after_stored_events(self, aggregate_id):
+        """A new counter starts after events stored before it existed."""
+        async with db_manager.session() as session:
+            await session.execute(insert(PaymentEvent), [_to_row(make_event(aggregate_id, step=1), 5)])
+        async with db_manager.session() as session:
+            await write_outbox(session, [make_event(aggregate_id, step=2)])
+        
+        assert [row.sequence_number for row in await load_rows(aggregate_id)] == [5, 6]
+    
+    @pytest.mark.asyncio
+    async def test_unit_of_work_writes_events_with_commit(self, aggregate_id):
+        """Staged events are stored by the commit and dropped by a rollback."""
+        async with UnitOfWork() as uow:
+            uow.add_event(make_event(aggregate_id, step=1))
+            await uow.rollback()
+            uow.add_event(make_event(aggregate_id, step=2))
+            await uow.commit()
+        
+        rows = await load_rows(aggregate_id)
+        assert [row.data["step"] for row in rows] == [2]
+
+
+class TestOutboxRelay:
+    """Test cases for OutboxRelay."""
+    
+    @pytest.mark.asyncio
+    async def test_relay_records_broker_positions(self, aggregate_id):
+        """Relayed events are sent in order and marked with their offsets."""
+        events = [make_event(aggregate_id, step=step) for step in range(3)]
+        async with db_manager.session() as session:
+            await write_outbox(session, events)
+        
+        publisher = ReceiptPublisher()
+        relay = OutboxRelay(publisher, name="outbox_test", batch_size=10)
+        
+        assert await relay.relay_batch() == 3
+        assert [event.event_id for event in publisher.events] == [event.event_id for event in events]
+        
+        rows = await load_rows(aggregate_id)
+        assert [row.kafka_offset for row in rows] == [0, 1, 2]
+        assert all(row.kafka_topic == "wedi.events.outbox_test" for row in rows)
+        assert all(row.published_at is not None for row in rows)
+        
+        # Nothing left to relay
+        assert await relay.relay_batch() == 0
+    
+    @pytest.mark.asyncio
+    async def test_failed_delivery_leaves_events_pending(self, aggregate_id):
+        """Events stay in the outbox until the broker accepts them."""
+        async with db_manager.session() as session:
+            await write_outbox(session, [make_event(aggregate_id, step=1)])
+        
+        failing = OutboxRelay(ReceiptPublisher(fail=True), name="outbox_test")
+        with pytest.raises(ConnectionError):
+            await failing.relay_batch()
+        assert (await load_rows(aggregate_id))[0].published_at is None
+        
+        relay = OutboxRelay(ReceiptPublisher(), name="outbox_test")
+        assert await relay.relay_batch() == 1
+        assert (await load_rows(aggregate_id))[0].published_at is not None
+    
+    @pytest.mark.asyncio
+    async def test_claimed_aggregates_share_the_batch(self, aggregate_id):
+        """A long backlog doesn't keep other claimed aggregates from being relayed."""
+        other_id = str(uuid4())
+        async with db_manager.session() as session:
+            await write_outbox(session, [make_event(aggregate_id, step=step) for step in range(10)])
+            await write_outbox(session, [make_event(other_id, step=0)])
+        
+        relay = OutboxRelay(ReceiptPublisher(), name="outbox_test", batch_size=4)
+        assert await relay.relay_batch() == 3
+        
+        assert [row.published_at is not None for row in await load_rows(aggregate_id)][:3] == [True, True, False]
+        assert (await load_rows(other_id))[0].published_at is not None
@@ -0,0 +1,120 @@
+"""
+Tests for the background event publishing pipeline.
+"""
+import asyncio
+
+import pytest
+
+from app.events.pipeline import EventPipeline
+from app.events.publisher import DomainEvent
+
+
+def make_event(aggregate_id: str, sequence: int) -> DomainEvent:
+    """Create a test event."""
+    return DomainEvent(
+        event_type="test.event",
+        aggregate_id=aggregate_id,
+        aggregate_type="test",
+        data={"sequence": sequence},
+    )
+
+
+class RecordingSender:
+    """Batch sender that records batches, optionally blocking or failing."""
+    
+    def __init__(self, failures: int = 0):
+        self.batches = []
+        self.failures = failures
+        self.gate = asyncio.Event()
+        self.gate.set()
+    
+    async def __call__(self, events):
+        await self.gate.wait()
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionError("broker unavailable")
+        self.batches.append(list(events))
+    
+    @property
+    def events(self):
+        return [event for batch in self.batches for event in batch]
+
+
+class TestEventPipeline:
+    """Test cases for EventPipeline."""
+    
+    @pytest.mark.asyncio
+    async def test_publish_returns_before_delivery(self):
+        """Publishing only queues the event."""
+        sender = RecordingSender()
+        sender.gate.clear()
+        pipeline = EventPipeline(sender, name="test.queue", linger_ms=0)
+        
+        await asyncio.wait_for(pipeline.publish(make_event("a", 1)), timeout=1)
+        assert pipeline.queue_depth == 1
+        assert sender.events == []
+        
+        sender.gate.set()
+        await pipeline.close()
+        assert len(sender.events) == 1
+        assert pipeline.queue_depth == 0
+    
+    @pytest.mark.asyncio
+    async def test_events_are_batched_in_order_per_aggregate(self):
+        """Each aggregate's events are delivered in publish order, in batches."""
+        sender = RecordingSender()
+        pipeline = EventPipeline(sender, name="test.order", batch_size=50, linger_ms=20, lanes=4)
+        
+        for sequence in range(100):
+            await pipeline.publish(make_event(f"agg-{sequence % 5}", sequence))
+        await pipeline.close()
+        
+        assert len(sender.events) == 100
+        assert len(sender.batches) < 100
+        assert all(len(batch) <= 50 for batch in sender.batches)
+        for aggregate in range(5):
+            sequences = [
+                event.data["sequence"]
+                for event in sender.events
+                if event.aggregate_id == f"agg-{aggregate}"
+            ]
+            assert sequences == sorted(sequences)
+        
+        stats = pipeline.metrics.snapshot()
+        assert stats["delivered"] == 100
+        assert stats["batches"] == len(sender.batches)
+    
+    @pytest.mark.asyncio
+    async def test_full_queue_applies_backpressure(self):
+        """Publishing waits while the queue is full."""
+        sender = RecordingSender()
+        sender.gate.clear()
+        pipeline = EventPipeline(sender, name="test.backpressure", max_queue_size=2, linger_ms=0)
+        
+        await pipeline.publish(make_event("a", 1))
+        await pipeline.publish(make_event("a", 2))
+        blocked = asyncio.ensure_future(pipeline.publish(make_event("a", 3)))
+        await asyncio.sleep(0.05)
+        assert not blocked.done()
+        
+        sender.gate.set()
+        await asyncio.wait_for(blocked, timeout=1)
+        await pipeline.close()
+        assert [event.data["sequence"] for event in sender.events] == [1, 2, 3]
+    
+    @pytest.mark.asyncio
+    async def test_failed_batches_are_retried_then_dropped(self):
+        """A failing batch is retried, and dropped once retries run out."""
+        sender = RecordingSender(failures=1)
+        pipeline = EventPipeline(sender, name="test.retry", linger_ms=0, retries=1, retry_backoff_ms=1)
+        
+        await pipeline.publish(make_event("a", 1))
+        await pipeline.flush()
+        assert len(sender.events) == 1
+        
+        sender.failures = 2
+        await pipeline.publish(make_event("a", 2))
+        await pipeline.close()
+        
+        assert len(sender.events) == 1
+        assert pipeline.metrics.snapshot()["failed"] == 1
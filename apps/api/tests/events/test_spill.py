@@ -0,0 +1,208 @@
+"""
+Tests for the local disk spill log and spilling in the event pipeline.
+"""
+import asyncio
+
+import pytest
+
+from app.events.pipeline import EventPipeline
+from app.events.spill import SpillLog
+from tests.events.test_pipeline import RecordingSender, make_event
+
+
+class TestSpillLog:
+    """Test cases for SpillLog."""
+    
+    @pytest.mark.asyncio
+    async def test_records_are_read_in_order_until_committed(self, tmp_path):
+        """Reads return the same records until they're committed."""
+        log = SpillLog(str(tmp_path), name="test.spill", segment_bytes=64)
+        log.append([b"first", b"second", b"third"])
+        
+        assert log.read(2) == [b"first", b"second"]
+        assert log.read(2) == [b"first", b"second"]
+        log.commit()
+        assert log.read(2) == [b"third"]
+        
+        await log.close()
+    
+    @pytest.mark.asyncio
+    async def test_replayed_segments_are_deleted(self, tmp_path):
+        """Disk space is released as segments are replayed."""
+        log = SpillLog(str(tmp_path), name="test.spill", segment_bytes=32)
+        log.append([bytes(20)] * 4)
+        assert log.segment_count == 4
+        
+        log.read(3)
+        log.commit()
+        assert log.segment_count == 1
+        assert log.backlog_bytes == 28
+        
+        log.read(3)
+        log.commit()
+        assert log.disk_bytes == 0
+        
+        await log.close()
+    
+    @pytest.mark.asyncio
+    async def test_backlog_survives_restart(self, tmp_path):
+        """A reopened log resumes from its checkpoint and drops torn records."""
+        log = SpillLog(str(tmp_path), name="test.spill")
+        log.append([b"replayed", b"pending"])
+        log.read(1)
+        log.commit()
+        await log.close()
+        
+        # A crash in the middle of an append
+        segment = next(log.directory.glob("0/*.seg"))
+        with open(segment, "ab") as file:
+            file.write(b"\x00\x00\x01\x00torn")
+        
+        reopened = SpillLog(str(tmp_path), name="test.spill")
+        assert reopened.read(10) == [b"pending"]
+        await reopened.close()
+    
+    @pytest.mark.asyncio
+    async def test_disk_usage_is_bounded(self, tmp_path):
+        """Appends beyond max_bytes are rejected."""
+        log = SpillLog(str(tmp_path), name="test.spill", max_bytes=100)
+        
+        assert log.append([bytes(40)] * 3) == 2
+        assert log.disk_bytes <= 100
+        assert log.metrics.dropped == 1
+        
+        await log.close()
+    
+    @pytest.mark.asyncio
+    async def test_processes_get_separate_slots(self, tmp_path):
+        """Concurrent logs on one directory never share files."""
+        first = SpillLog(str(tmp_path), name="test.spill")
+        second = SpillLog(str(tmp_path), name="test.spill")
+        first.open()
+        second.open()
+        
+        assert first.path != second.path
+        
+        await first.close()
+        await second.close()
+    
+    @pytest.mark.asyncio
+    async def test_orphaned_slots_are_adopted(self, tmp_path):
+        """The backlog of a slot nobody claims is replayed by another log."""
+        first = SpillLog(str(tmp_path), name="test.spill")
+        second = SpillLog(str(tmp_path), name="test.spill")
+        first.append([b"first"])
+        second.append([b"replayed", b"second"])
+        second.read(1)
+        second.commit()
+        await first.close()
+        await second.close()
+        
+        # Only one process comes back
+        survivor = SpillLog(str(tmp_path), name="test.spill")
+        assert survivor.read(10) == [b"first", b"second"]
+        assert survivor.orphaned_bytes == 0
+        assert not list((tmp_path / "1").glob("*.seg"))
+        await survivor.close()
+    
+    @pytest.mark.asyncio
+    async def test_orphans_that_dont_fit_are_reported(self, tmp_path):
+        """A backlog too large to adopt stays in its slot and is reported."""
+        orphan = SpillLog(str(tmp_path / "spill"), name="test.spill")
+        orphan.append([bytes(50)])
+        await orphan.close()
+        (tmp_path / "spill" / "0").rename(tmp_path / "spill" / "1")
+        
+        survivor = SpillLog(str(tmp_path / "spill"), name="test.spill", max_bytes=30)
+        survivor.open()
+        assert survivor.orphaned_bytes == 58
+        assert survivor.metrics.snapshot()["orphaned_bytes"] == 58
+        assert survivor.read(10) == []
+        await survivor.close()
+
+
+class TestPipelineSpill:
+    """Test cases for EventPipeline with a spill log."""
+    
+    @pytest.mark.asyncio
+    async def test_failed_batches_are_replayed_in_order(self, tmp_path):
+        """Events spilled during an outage are delivered in order afterwards."""
+        sender = RecordingSender(failures=1000)
+        pipeline = EventPipeline(
+            sender,
+            name="test.spill",
+            batch_size=5,
+            linger_ms=0,
+            lanes=1,
+            retries=1,
+            retry_backoff_ms=1,
+            spill=SpillLog(str(tmp_path), name="test.spill")
+        )
+        
+        for sequence in range(20):
+            await pipeline.publish(make_event("a", sequence))
+        await pipeline.flush()
+        assert sender.events == []
+        assert pipeline.spill.backlog_bytes > 0
+        
+        # The broker recovers
+        sender.failures = 0
+        for _ in range(100):
+            if not pipeline.spill.backlog_bytes:
+                break
+            await asyncio.sleep(0.01)
+        
+        assert [event.data["sequence"] for event in sender.events] == list(range(20))
+        await pipeline.close()
+    
+    @pytest.mark.asyncio
+    async def test_publish_does_not_wait_for_a_hung_broker(self, tmp_path):
+        """Sends that time out are spilled instead of blocking publishers."""
+        sender = RecordingSender()
+        sender.gate.clear()
+        pipeline = EventPipeline(
+            sender,
+            name="test.spill",
+            max_queue_size=10,
+            linger_ms=0,
+            lanes=1,
+            send_timeout_ms=50,
+            spill=SpillLog(str(tmp_path), name="test.spill")
+        )
+        
+        await asyncio.wait_for(
+            asyncio.gather(*(pipeline.publish(make_event("a", sequence)) for sequence in range(100))),
+            timeout=5
+        )
+        assert pipeline.spill.metrics.spilled > 0
+        
+        sender.gate.set()
+        await pipeline.close()
+    
+    @pytest.mark.asyncio
+    async def test_full_queue_with_a_healthy_broker_is_not_spilled(self, tmp_path):
+        """A burst that fills the queue waits for the broker instead of spilling."""
+        sender = RecordingSender()
+        sender.gate.clear()
+        pipeline = EventPipeline(
+            sender,
+            name="test.spill",
+            max_queue_size=5,
+            linger_ms=0,
+            lanes=1,
+            spill=SpillLog(str(tmp_path), name="test.spill")
+        )
+        
+        publishing = asyncio.ensure_future(asyncio.gather(
+            *(pipeline.publish(make_event("a", sequence)) for sequence in range(20))
+        ))
+        await asyncio.sleep(0.05)
+        assert not publishing.done()
+        
+        sender.gate.set()
+        await asyncio.wait_for(publishing, timeout=5)
+        await pipeline.flush()
+        
+        assert pipeline.spill.metrics.spilled == 0
+        assert [event.data["sequence"] for event in sender.events] == list(range(20))
+        await pipeline.close()
@@ -0,0 +1,104 @@
+"""
+Tests for the compiled public path matcher.
+"""
+from fastapi import FastAPI
+
+from app.middleware.public_paths import (
+    PUBLIC_ROUTE,
+    PublicPathMatcher,
+    get_public_paths,
+)
+
+
+def create_app() -> FastAPI:
+    """Create an app with public and protected routes."""
+    app = FastAPI(docs_url=None, redoc_url="/redoc", openapi_url="/openapi.json")
+    
+    @app.get("/health", openapi_extra=PUBLIC_ROUTE)
+    async def health():
+        return {}
+    
+    @app.get("/api/v1/links/by-code/{code}", openapi_extra=PUBLIC_ROUTE)
+    async def link_by_code(code: str):
+        return {}
+    
+    @app.get("/api/v1/links/{link_id}")
+    async def link(link_id: str):
+        return {}
+    
+    @app.get("/api/v1/orders/{order_id:int}/items/{item_id}", openapi_extra=PUBLIC_ROUTE)
+    async def order_item(order_id: int, item_id: str):
+        return {}
+    
+    return app
+
+
+class TestPublicPathMatcher:
+    """Test cases for PublicPathMatcher."""
+    
+    def test_routes_marked_public(self):
+        """Only routes marked with PUBLIC_ROUTE are public."""
+        matcher = PublicPathMatcher.from_app(create_app())
+        
+        assert matcher("/health")
+        assert matcher("/api/v1/links/by-code/abc123")
+        assert matcher("/api/v1/orders/42/items/x")
+        assert not matcher("/api/v1/links/abc123")
+        assert not matcher("/api/v1/links/by-code/abc/extra")
+        assert not matcher("/api/v1/orders/not-an-int/items/x")
+    
+    def test_path_convertors(self):
+        """Parameters match what their path convertor matches, not their annotation."""
+        app = FastAPI()
+        
+        @app.get("/invoices/{invoice_id}", openapi_extra=PUBLIC_ROUTE)
+        async def invoice(invoice_id: int):
+            return {}
+        
+        @app.get("/files/{name:path}", openapi_extra=PUBLIC_ROUTE)
+        async def file(name: str):
+            return {}
+        
+        matcher = PublicPathMatcher.from_app(app)
+        
+        # Starlette routes any segment here; validation rejects it later
+        assert matcher("/invoices/not-an-int")
+        assert matcher("/files/a/b/c.txt")
+        assert not matcher("/invoices/1/extra")
+    
+    def test_documentation_urls_and_prefixes(self):
+        """Schema and docs URLs and static prefixes are public."""
+        matcher = PublicPathMatcher.from_app(create_app())
+        
+        assert matcher("/openapi.json")
+        assert matcher("/redoc")
+        assert matcher("/static/app.js")
+        assert matcher("/public/logo.png")
+        assert not matcher("/docs")
+    
+    def test_prefix_trie(self):
+        """Prefixes sharing a stem are all matched."""
+        matcher = PublicPathMatcher(prefixes=["/api/hooks", "/api/hooks/v2", "/api/health", "/assets"])
+        
+        assert matcher("/api/hooks/stripe")
+        assert matcher("/api/hooks/v2/x")
+        assert matcher("/api/health")
+        assert matcher("/assets/a.css")
+        assert not matcher("/api/home")
+        assert not matcher("/")
+    
+    def test_empty_matcher(self):
+        """A matcher without public paths matches nothing."""
+        matcher = PublicPathMatcher()
+        
+        assert not matcher("/")
+        assert not matcher("/health")
+    
+    def test_matcher_is_compiled_once(self):
+        """The matcher is kept in app.state."""
+        app = create_app()
+        
+        matcher = get_public_paths(app)
+        
+        assert get_public_paths(app) is matcher
+        assert app.state.public_paths is matcher
@@ -0,0 +1,117 @@
+"""
+Tests for the fused request context middleware.
+"""
+import pytest
+from httpx import ASGITransport, AsyncClient
+from starlette.applications import Starlette
+from starlette.middleware import Middleware
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.db.session import get_request_session
+from app.middleware.multi_tenancy import get_current_organization_id
+from app.middleware.request_context import RequestContextMiddleware
+
+
+async def context(request):
+    """Report the request context seen by the endpoint."""
+    return JSONResponse({
+        "request_id": request.state.request_id,
+        "user_id": request.state.user_id,
+        "organization_id": get_current_organization_id(),
+        "has_session": get_request_session() is not None,
+    })
+
+
+async def stream(request):
+    """Stream chunks while the request session is still open."""
+    async def chunks():
+        for _ in range(3):
+            yield b"open\n" if get_request_session() is not None else b"closed\n"
+    
+    return StreamingResponse(chunks())
+
+
+@pytest.fixture
+def context_client():
+    """Client for a bare app behind RequestContextMiddleware."""
+    app = Starlette(
+        routes=[
+            Route("/api/v1/context", context),
+            Route("/api/v1/stream", stream),
+        ],
+        middleware=[Middleware(RequestContextMiddleware)],
+    )
+    return AsyncClient(transport=ASGITransport(app=app), base_url="http://testserver")
+
+
+class TestRequestContextMiddleware:
+    """Test cases for RequestContextMiddleware."""
+    
+    @pytest.mark.asyncio
+    async def test_sets_up_request_context(self, context_client):
+        """The endpoint runs with a request ID, session scope and tenant."""
+        async with context_client as client:
+            response = await client.get(
+                "/api/v1/context",
+                headers={"X-Request-ID": "req-1", "X-Organization-ID": "org-1"},
+            )
+        
+        assert response.status_code == 200
+        assert response.headers["X-Request-ID"] == "req-1"
+        assert response.json() == {
+            "request_id": "req-1",
+            "user_id": None,
+            "organization_id": "org-1",
+            "has_session": True,
+        }
+        assert get_current_organization_id() is None
+        assert get_request_session() is None
+    
+    @pytest.mark.asyncio
+    async def test_generates_request_id(self, context_client):
+        """A request ID is generated when the client sends none."""
+        async with context_client as client:
+            response = await client.get("/api/v1/context")
+        
+        request_id = response.headers["X-Request-ID"]
+        assert request_id
+        assert response.json()["request_id"] == request_id
+    
+    @pytest.mark.asyncio
+    async def test_invalid_token_is_anonymous(self, context_client):
+        """An invalid bearer token leaves the request unauthenticated."""
+        async with context_client as client:
+            response = await client.get(
+                "/api/v1/context",
+                headers={"Authorization": "Bearer not-a-jwt"},
+            )
+        
+        assert response.status_code == 200
+        assert response.json()["user_id"] is None
+    
+    @pytest.mark.asyncio
+    async def test_authentication_errors_carry_the_request_id(self):
+        """A failure during authentication is answered with the request ID."""
+        middleware = RequestContextMiddleware(Starlette(routes=[Route("/api/v1/context", context)]))
+        
+        async def fail(scope):
+            raise ConnectionError("database unavailable")
+        
+        middleware.auth.authenticate = fail
+        transport = ASGITransport(app=middleware, raise_app_exceptions=False)
+        async with AsyncClient(transport=transport, base_url="http://testserver") as client:
+            response = await client.get("/api/v1/context", headers={"X-Request-ID": "req-2"})
+        
+        assert response.status_code == 500
+        assert response.headers["X-Request-ID"] == "req-2"
+        assert get_current_organization_id() is None
+    
+    @pytest.mark.asyncio
+    async def test_streams_within_request_context(self, context_client):
+        """Streaming bodies are sent while the request context is active."""
+        async with context_client as client:
+            response = await client.get("/api/v1/stream")
+        
+        assert response.text == "open\nopen\nopen\n"
+        assert "X-Request-ID" in response.headers
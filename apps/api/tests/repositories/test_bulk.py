@@ -0,0 +1,161 @@
+"""
+Tests for bulk create and upsert.
+"""
+import pytest
+from sqlalchemy import delete
+
+from app.db.session import db_manager
+from app.events.publisher import (
+    DomainEvent,
+    InMemoryEventPublisher,
+    get_event_publisher,
+    set_event_publisher,
+)
+from app.models import Organization
+from app.repositories import base
+from app.repositories.event_repository import EventRepository
+from app.repositories.organization import OrganizationRepository
+
+
+class EventOrganizationRepository(EventRepository):
+    """Organization repository emitting a created event per row."""
+    
+    def __init__(self):
+        super().__init__(Organization)
+    
+    @property
+    def _organization_id_field(self):
+        return None
+    
+    async def _emit_created_event(self, entity, organization_id=None):
+        return DomainEvent(
+            event_type="organization.created",
+            aggregate_id=entity.id,
+            aggregate_type="organization",
+            data={"name": entity.name}
+        )
+
+
+def organization_row(org_id: str, name: str) -> dict:
+    """Build organization column data for bulk writes."""
+    return {
+        "id": org_id,
+        "name": name,
+        "slug": org_id,
+        "billing_email": f"{org_id}@example.com",
+        "country": "CO",
+        "settings": {},
+        "owner_id": "owner",
+    }
+
+
+class TestBulkWrites:
+    """Test cases for BaseRepository.create_many and upsert_many."""
+    
+    @pytest.mark.asyncio
+    async def test_create_many_returns_rows_in_order(self, test_engine):
+        """All rows are inserted and returned in input order."""
+        ids = [f"org_bulk_{i}" for i in range(3)]
+        repository = OrganizationRepository()
+        try:
+            async with db_manager.session() as session:
+                created = await repository.create_many(
+                    session,
+                    objs_in=[organization_row(org_id, org_id) for org_id in ids]
+                )
+                assert [org.id for org in created] == ids
+                assert await repository.count(session) >= 3
+        finally:
+            async with db_manager.session() as session:
+                await session.execute(delete(Organization).where(Organization.id.in_(ids)))
+    
+    @pytest.mark.asyncio
+    async def test_upsert_many_updates_conflicting_rows(self, test_engine):
+        """Conflicting rows are updated and new rows inserted."""
+        repository = OrganizationRepository()
+        try:
+            async with db_manager.session() as session:
+                await repository.create_many(
+                    session, objs_in=[organization_row("org_upsert_0", "Old")]
+                )
+            
+            async with db_manager.session() as session:
+                upserted = await repository.upsert_many(
+                    session,
+                    objs_in=[
+                        organization_row("org_upsert_0", "New"),
+                        organization_row("org_upsert_1", "Fresh"),
+                    ],
+                    conflict_fields=["id"],
+                    update_fields=["name"]
+                )
+                assert sorted((org.id, org.name) for org in upserted) == [
+                    ("org_upsert_0", "New"),
+                    ("org_upsert_1", "Fresh"),
+                ]
+        finally:
+            async with db_manager.session() as session:
+                await session.execute(
+                    delete(Organization).where(Organization.id.in_(["org_upsert_0", "org_upsert_1"]))
+                )
+    
+    @pytest.mark.asyncio
+    async def test_create_many_accepts_rows_with_different_columns(self, test_engine):
+        """Rows supplying different columns are inserted and kept in order."""
+        ids = [f"org_columns_{i}" for i in range(3)]
+        rows = [organization_row(org_id, org_id) for org_id in ids]
+        rows[1]["description"] = "Described"
+        repository = OrganizationRepository()
+        try:
+            async with db_manager.session() as session:
+                created = await repository.create_many(session, objs_in=rows)
+                assert [org.id for org in created] == ids
+                assert [org.description for org in created] == [None, "Described", None]
+        finally:
+            async with db_manager.session() as session:
+                await session.execute(delete(Organization).where(Organization.id.in_(ids)))
+    
+    @pytest.mark.asyncio
+    async def test_upsert_many_keeps_the_last_duplicate_and_chunks(self, test_engine, monkeypatch):
+        """Duplicate conflict keys collapse to the last row; large groups are split."""
+        monkeypatch.setitem(base._MAX_BIND_PARAMETERS, "sqlite", 20)
+        ids = [f"org_chunk_{i}" for i in range(5)]
+        repository = OrganizationRepository()
+        try:
+            async with db_manager.session() as session:
+                upserted = await repository.upsert_many(
+                    session,
+                    objs_in=[
+                        organization_row("org_chunk_0", "First"),
+                        *(organization_row(org_id, org_id) for org_id in ids[1:]),
+                        organization_row("org_chunk_0", "Last"),
+                    ],
+                    conflict_fields=["id"]
+                )
+                assert sorted((org.id, org.name) for org in upserted) == [
+                    ("org_chunk_0", "Last"),
+                    *((org_id, org_id) for org_id in ids[1:]),
+                ]
+        finally:
+            async with db_manager.session() as session:
+                await session.execute(delete(Organization).where(Organization.id.in_(ids)))
+    
+    @pytest.mark.asyncio
+    async def test_create_many_publishes_events_in_one_batch(self, test_engine):
+        """Event repositories publish all created events together."""
+        previous = get_event_publisher()
+        publisher = InMemoryEventPublisher()
+        set_event_publisher(publisher)
+        ids = ["org_events_0", "org_events_1"]
+        try:
+            async with db_manager.session() as session:
+                await EventOrganizationRepository().create_many(
+                    session,
+                    objs_in=[organization_row(org_id, org_id) for org_id in ids]
+                )
+            assert [event.aggregate_id for event in publisher.get_events("organization.created")] == ids
+            assert len(publisher.events) == 2
+        finally:
+            set_event_publisher(previous)
+            async with db_manager.session() as session:
+                await session.execute(delete(Organization).where(Organization.id.in_(ids)))
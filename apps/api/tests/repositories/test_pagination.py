@@ -0,0 +1,120 @@
+"""
+Tests for keyset (cursor) pagination and page queries.
+"""
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete
+
+from app.db.session import db_manager
+from app.models import Organization, PaymentLink
+from app.repositories.organization import OrganizationRepository
+from app.repositories.pagination import (
+    CountMode,
+    InvalidCursorError,
+    decode_cursor,
+    encode_cursor,
+    next_cursor,
+)
+
+
+@pytest_asyncio.fixture
+async def organizations(test_engine):
+    """Insert five organizations and remove them afterwards."""
+    ids = [f"org_page_{i}" for i in range(5)]
+    async with db_manager.session() as session:
+        for org_id in ids:
+            session.add(Organization(
+                id=org_id,
+                name=org_id,
+                slug=org_id,
+                billing_email=f"{org_id}@example.com",
+                country="CO",
+                settings={},
+                owner_id="owner",
+            ))
+    
+    yield ids
+    
+    async with db_manager.session() as session:
+        await session.execute(delete(Organization).where(Organization.id.in_(ids)))
+
+
+class TestKeysetPagination:
+    """Test cases for cursor encoding and keyset paging."""
+    
+    def test_cursor_round_trip(self):
+        """Cursors encode the (created_at, id) position of a row."""
+        created_at = datetime(2025, 1, 2, 3, 4, 5, 678)
+        link = PaymentLink(id="pl_1", created_at=created_at)
+        
+        cursor = encode_cursor(link)
+        
+        assert decode_cursor(PaymentLink, cursor) == (created_at, "pl_1")
+    
+    def test_invalid_cursor_is_rejected(self):
+        """Malformed cursors raise a 400 error instead of a server error."""
+        with pytest.raises(InvalidCursorError) as exc_info:
+            decode_cursor(PaymentLink, "not-a-cursor")
+        assert exc_info.value.status_code == 400
+    
+    def test_next_cursor_only_for_full_pages(self):
+        """A short page is the last page."""
+        rows = [Organization(id="org_2"), Organization(id="org_1")]
+        
+        assert next_cursor(rows, limit=3) is None
+        assert decode_cursor(Organization, next_cursor(rows, limit=2)) == ("org_1",)
+    
+    @pytest.mark.asyncio
+    async def test_get_multi_pages_with_cursor(self, organizations):
+        """Walking cursors returns every row exactly once."""
+        repository = OrganizationRepository()
+        seen = []
+        cursor = None
+        async with db_manager.session() as session:
+            while True:
+                page = await repository.get_multi(session, limit=2, cursor=cursor)
+                seen.extend(org.id for org in page)
+                cursor = next_cursor(page, limit=2)
+                if cursor is None:
+                    break
+        
+        assert seen == sorted(organizations, reverse=True)
+    
+    @pytest.mark.asyncio
+    async def test_get_page_exact_total(self, organizations):
+        """The exact total comes back with the page."""
+        repository = OrganizationRepository()
+        async with db_manager.session() as session:
+            page = await repository.get_page(session, skip=2, limit=2)
+        
+        assert [org.id for org in page.items] == sorted(organizations, reverse=True)[2:4]
+        assert page.total == 5
+        assert page.has_next
+    
+    @pytest.mark.asyncio
+    async def test_get_page_without_total(self, organizations):
+        """count_mode=none serves has_next from one extra row."""
+        repository = OrganizationRepository()
+        async with db_manager.session() as session:
+            first = await repository.get_page(session, limit=3, count_mode=CountMode.NONE)
+            last = await repository.get_page(
+                session, limit=3, cursor=first.next_cursor, count_mode=CountMode.NONE
+            )
+        
+        assert first.total is None and first.has_next
+        assert len(last.items) == 2 and not last.has_next
+        assert last.next_cursor is None
+    
+    @pytest.mark.asyncio
+    async def test_get_page_estimated_falls_back_to_exact(self, organizations):
+        """Backends without planner estimates report an exact total."""
+        repository = OrganizationRepository()
+        async with db_manager.session() as session:
+            page = await repository.get_page(
+                session, limit=2, filters={"country": "CO"}, count_mode=CountMode.ESTIMATED
+            )
+        
+        assert page.total == 5
+        assert not page.total_is_estimate
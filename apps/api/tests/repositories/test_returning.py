@@ -0,0 +1,103 @@
+"""
+Tests for RETURNING-based repository writes.
+"""
+from contextlib import contextmanager
+
+import pytest
+from sqlalchemy import delete, event
+
+from app.db.session import db_manager
+from app.models import Organization
+from app.repositories.organization import OrganizationRepository
+
+
+@contextmanager
+def capture_statements():
+    """Collect the SQL statements executed on the primary engine."""
+    statements = []
+    
+    def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement)
+    
+    engine = db_manager.engine.sync_engine
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield statements
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+class TestReturningWrites:
+    """Test cases for writes that skip the post-flush refresh."""
+    
+    @pytest.mark.asyncio
+    async def test_update_by_id_is_a_single_statement(self, test_engine):
+        """update_by_id updates and returns the row without a SELECT."""
+        repository = OrganizationRepository()
+        try:
+            async with db_manager.session() as session:
+                session.add(Organization(
+                    id="org_ret_1",
+                    name="Before",
+                    slug="org_ret_1",
+                    billing_email="org_ret_1@example.com",
+                    country="CO",
+                    settings={},
+                    owner_id="owner",
+                ))
+            
+            async with db_manager.session() as session:
+                with capture_statements() as statements:
+                    org = await repository.update_by_id(
+                        session,
+                        id="org_ret_1",
+                        values={"name": "After"}
+                    )
+                    missing = await repository.update_by_id(
+                        session,
+                        id="org_ret_missing",
+                        values={"name": "After"}
+                    )
+                
+                assert org.name == "After"
+                assert missing is None
+                assert len(statements) == 2
+                assert all(s.lstrip().upper().startswith("UPDATE") for s in statements)
+        finally:
+            async with db_manager.session() as session:
+                await session.execute(delete(Organization).where(Organization.id == "org_ret_1"))
+    
+    @pytest.mark.asyncio
+    async def test_update_skips_refresh_unless_opted_out(self, test_engine):
+        """update only reloads the row when returning is disabled."""
+        repository = OrganizationRepository()
+        try:
+            async with db_manager.session() as session:
+                org = Organization(
+                    id="org_ret_2",
+                    name="Before",
+                    slug="org_ret_2",
+                    billing_email="org_ret_2@example.com",
+                    country="CO",
+                    settings={},
+                    owner_id="owner",
+                )
+                session.add(org)
+                await session.flush()
+                
+                with capture_statements() as statements:
+                    await repository.update(session, db_obj=org, obj_in={"name": "During"})
+                assert not any(s.lstrip().upper().startswith("SELECT") for s in statements)
+                
+                with capture_statements() as statements:
+                    await repository.update(
+                        session,
+                        db_obj=org,
+                        obj_in={"name": "After"},
+                        returning=False
+                    )
+                assert any(s.lstrip().upper().startswith("SELECT") for s in statements)
+                assert org.name == "After"
+        finally:
+            async with db_manager.session() as session:
+                await session.execute(delete(Organization).where(Organization.id == "org_ret_2"))
@@ -0,0 +1,107 @@
+"""
+Tests for compare-and-set status transitions.
+"""
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete
+
+from app.core.exceptions import NotFoundError
+from app.db.session import db_manager
+from app.models import PaymentLink, PaymentLinkStatus
+from app.repositories.payment_link import PaymentLinkRepository
+from app.repositories.transitions import PAYMENT_LINK_TRANSITIONS
+
+
+@pytest_asyncio.fixture
+async def payment_link(test_engine):
+    """Insert an active payment link and remove it afterwards."""
+    async with db_manager.session() as session:
+        session.add(PaymentLink(
+            id="pl_transition",
+            organization_id="org_1",
+            organization="org_1",
+            created_by_id="user_1",
+            created_by="user_1",
+            executing_agent_id="agent_1",
+            executing_agent="agent_1",
+            integration_key_id="key_1",
+            integration_key="key_1",
+            title="Transition",
+            short_code="TRANSITION",
+            amount=Decimal("10"),
+            currency="USD",
+            status=PaymentLinkStatus.ACTIVE,
+        ))
+    
+    yield "pl_transition"
+    
+    async with db_manager.session() as session:
+        await session.execute(delete(PaymentLink).where(PaymentLink.id == "pl_transition"))
+
+
+class TestStatusTransitions:
+    """Test cases for the transition engine."""
+    
+    def test_allowed_from(self):
+        """Source statuses are derived from the transition map."""
+        assert PAYMENT_LINK_TRANSITIONS.allowed_from(PaymentLinkStatus.EXPIRED) == [
+            PaymentLinkStatus.ACTIVE,
+            PaymentLinkStatus.PAUSED,
+        ]
+        assert PAYMENT_LINK_TRANSITIONS.allowed_from(PaymentLinkStatus.DRAFT) == []
+        assert not PAYMENT_LINK_TRANSITIONS.can_transition(
+            PaymentLinkStatus.EXPIRED, PaymentLinkStatus.ACTIVE
+        )
+    
+    @pytest.mark.asyncio
+    async def test_transition_applies_and_reports_previous_status(self, payment_link):
+        """An allowed transition writes the status and other values."""
+        repository = PaymentLinkRepository()
+        async with db_manager.session() as session:
+            result = await repository.transition_status(
+                session,
+                payment_link_id=payment_link,
+                status=PaymentLinkStatus.PAUSED,
+                organization_id="org_1",
+                values={"title": "Paused", "metadata": {"ignored": True}}
+            )
+        
+        assert result.applied
+        assert result.previous_status == PaymentLinkStatus.ACTIVE
+        assert result.entity.status == PaymentLinkStatus.PAUSED
+        assert result.entity.title == "Paused"
+    
+    @pytest.mark.asyncio
+    async def test_disallowed_transition_is_a_conflict(self, payment_link):
+        """A transition from a final status writes nothing."""
+        repository = PaymentLinkRepository()
+        async with db_manager.session() as session:
+            await repository.transition_status(
+                session,
+                payment_link_id=payment_link,
+                status=PaymentLinkStatus.EXPIRED
+            )
+            result = await repository.transition_status(
+                session,
+                payment_link_id=payment_link,
+                status=PaymentLinkStatus.ACTIVE
+            )
+        
+        assert result.conflict
+        assert result.entity is None
+        assert result.status == PaymentLinkStatus.EXPIRED
+    
+    @pytest.mark.asyncio
+    async def test_transition_is_scoped_to_organization(self, payment_link):
+        """Rows of another organization are not found."""
+        repository = PaymentLinkRepository()
+        async with db_manager.session() as session:
+            with pytest.raises(NotFoundError):
+                await repository.transition_status(
+                    session,
+                    payment_link_id=payment_link,
+                    status=PaymentLinkStatus.PAUSED,
+                    organization_id="org_2"
+                )
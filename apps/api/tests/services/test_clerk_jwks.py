@@ -0,0 +1,119 @@
+"""
+Tests for local Clerk session token verification.
+"""
+import time
+
+import pytest
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import JWTError, jwk, jwt
+
+from app.services.clerk_jwks import ClerkKeySet
+from app.services.clerk_service import ClerkService
+
+
+@pytest.fixture(scope="module")
+def signing_key():
+    """Generate an RSA key pair as (private PEM, public JWK)."""
+    private_key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = private_key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption()
+    ).decode()
+    public_pem = private_key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo
+    ).decode()
+    public_jwk = jwk.construct(public_pem, "RS256").to_dict()
+    public_jwk["kid"] = "ins_key_1"
+    return private_pem, public_jwk
+
+
+def make_token(private_pem, kid="ins_key_1", **claims):
+    """Sign a Clerk-like session token."""
+    now = int(time.time())
+    payload = {"sub": "user_clerk_1", "sid": "sess_1", "iat": now, "nbf": now, "exp": now + 60}
+    payload.update(claims)
+    return jwt.encode(payload, private_pem, algorithm="RS256", headers={"kid": kid})
+
+
+class TestClerkKeySet:
+    """Test cases for ClerkKeySet."""
+    
+    @pytest.mark.asyncio
+    async def test_verifies_tokens_without_fetching_keys(self, signing_key, monkeypatch):
+        """Tokens signed by a cached key verify with no network call."""
+        private_pem, public_jwk = signing_key
+        key_set = ClerkKeySet()
+        key_set.set_keys([public_jwk])
+        
+        async def fail_refresh():
+            raise AssertionError("keys should not be fetched")
+        monkeypatch.setattr(key_set, "refresh", fail_refresh)
+        
+        claims = await key_set.verify(make_token(private_pem))
+        assert claims["sub"] == "user_clerk_1"
+    
+    @pytest.mark.asyncio
+    async def test_rejects_expired_tokens(self, signing_key):
+        """Expired tokens are rejected."""
+        private_pem, public_jwk = signing_key
+        key_set = ClerkKeySet(leeway=0)
+        key_set.set_keys([public_jwk])
+        
+        with pytest.raises(JWTError):
+            await key_set.verify(make_token(private_pem, exp=int(time.time()) - 10))
+    
+    @pytest.mark.asyncio
+    async def test_unknown_keys_refresh_at_most_once_per_interval(self, signing_key, monkeypatch):
+        """Unknown key IDs trigger a rate limited refresh."""
+        private_pem, public_jwk = signing_key
+        key_set = ClerkKeySet()
+        refreshes = 0
+        
+        async def refresh():
+            nonlocal refreshes
+            refreshes += 1
+            key_set._keys = {}
+            key_set._fetched_at = time.monotonic()
+        monkeypatch.setattr(key_set, "refresh", refresh)
+        
+        for _ in range(3):
+            with pytest.raises(JWTError):
+                await key_set.verify(make_token(private_pem, kid="ins_rotated"))
+        assert refreshes == 1
+    
+    @pytest.mark.asyncio
+    async def test_checks_authorized_parties(self, signing_key):
+        """Tokens issued for other origins are rejected."""
+        private_pem, public_jwk = signing_key
+        key_set = ClerkKeySet(authorized_parties=["https://app.wedi.la"])
+        key_set.set_keys([public_jwk])
+        
+        await key_set.verify(make_token(private_pem, azp="https://app.wedi.la"))
+        with pytest.raises(JWTError):
+            await key_set.verify(make_token(private_pem, azp="https://evil.example"))
+    
+    @pytest.mark.asyncio
+    async def test_verification_key_skips_jwks(self, signing_key):
+        """A configured PEM key verifies tokens of any key ID."""
+        private_pem, public_jwk = signing_key
+        public_pem = jwk.construct(public_jwk, "RS256").to_pem().decode()
+        key_set = ClerkKeySet(verification_key=public_pem)
+        
+        claims = await key_set.verify(make_token(private_pem, kid="anything"))
+        assert claims["sid"] == "sess_1"
+
+
+class TestProfileSync:
+    """Test cases for throttled Clerk profile sync."""
+    
+    @pytest.mark.asyncio
+    async def test_sync_is_claimed_once_per_interval(self):
+        """Only the first request in an interval syncs a user."""
+        service = ClerkService()
+        
+        assert await service.claim_profile_sync("user_clerk_1") is True
+        assert await service.claim_profile_sync("user_clerk_1") is False
+        assert await service.claim_profile_sync("user_clerk_2") is True
@@ -0,0 +1,110 @@
+"""
+Tests for the public payment page cache.
+"""
+from datetime import datetime, timedelta, timezone
+from decimal import Decimal
+
+import pytest
+import pytest_asyncio
+from httpx import AsyncClient
+from sqlalchemy import delete
+
+from app.db.session import db_manager
+from app.events.domain_events import PaymentLinkUpdatedEvent
+from app.events.publisher import publish_event
+from app.models import Organization, PaymentLink, PaymentLinkStatus
+from app.services.payment_page_cache import PaymentPageCache, payment_page_cache
+
+
+@pytest_asyncio.fixture
+async def public_link(test_engine):
+    """Insert a payment link with its organization and remove them afterwards."""
+    async with db_manager.session() as session:
+        session.add(Organization(
+            id="org_page",
+            name="Page Org",
+            slug="org_page",
+            billing_email="org_page@example.com",
+            country="CO",
+            settings={},
+            owner_id="owner",
+        ))
+        session.add(PaymentLink(
+            id="pl_page",
+            organization_id="org_page",
+            organization="org_page",
+            created_by_id="user_1",
+            created_by="user_1",
+            executing_agent_id="agent_1",
+            executing_agent="agent_1",
+            integration_key_id="key_1",
+            integration_key="key_1",
+            title="Page",
+            short_code="pagecode",
+            amount=Decimal("10"),
+            currency="USD",
+            status=PaymentLinkStatus.ACTIVE,
+        ))
+    payment_page_cache.clear()
+    
+    yield "pagecode"
+    
+    payment_page_cache.clear()
+    async with db_manager.session() as session:
+        await session.execute(delete(PaymentLink).where(PaymentLink.id == "pl_page"))
+        await session.execute(delete(Organization).where(Organization.id == "org_page"))
+
+
+class TestPaymentPageCache:
+    """Test cases for PaymentPageCache."""
+    
+    def test_entries_expire_and_evict(self):
+        """Stale, expired-link and least recently used entries are dropped."""
+        cache = PaymentPageCache(ttl_seconds=60, max_entries=2)
+        cache.set("a", "pl_a", b"{}")
+        cache.set("b", "pl_b", b"{}")
+        assert cache.get("a") is not None
+        
+        cache.set("c", "pl_c", b"{}")
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        
+        past = datetime.now(timezone.utc) - timedelta(seconds=1)
+        cache.set("d", "pl_d", b"{}", link_expires_at=past)
+        assert cache.get("d") is None
+        
+        stale = PaymentPageCache(ttl_seconds=0, max_entries=2)
+        stale.set("a", "pl_a", b"{}")
+        assert stale.get("a") is None
+    
+    @pytest.mark.asyncio
+    async def test_link_events_invalidate_entries(self):
+        """Publishing a payment link event drops its cached page."""
+        payment_page_cache.set("evtcode", "pl_evt", b"{}")
+        
+        await publish_event(PaymentLinkUpdatedEvent(
+            payment_link_id="pl_evt",
+            organization_id="org_1",
+            updated_by="user_1"
+        ))
+        
+        assert payment_page_cache.get("evtcode") is None
+    
+    @pytest.mark.asyncio
+    async def test_endpoint_serves_cached_page_with_etag(self, client: AsyncClient, public_link):
+        """Repeated requests are cached and revalidate with If-None-Match."""
+        url = f"/api/v1/payment-links/by-short-code/{public_link}"
+        
+        first = await client.get(url)
+        assert first.status_code == 200
+        assert first.json()["organization_name"] == "Page Org"
+        etag = first.headers["etag"]
+        
+        hits = payment_page_cache.hits
+        second = await client.get(url)
+        assert second.content == first.content
+        assert payment_page_cache.hits == hits + 1
+        
+        not_modified = await client.get(url, headers={"If-None-Match": etag})
+        assert not_modified.status_code == 304
+        assert not_modified.headers["etag"] == etag
@@ -0,0 +1,131 @@
+"""
+Tests for the authenticated user cache.
+"""
+from datetime import datetime
+
+import pytest
+import pytest_asyncio
+from sqlalchemy import delete, event
+from starlette.requests import Request
+
+from app.api.dependencies import get_current_user_optional
+from app.db.session import db_manager
+from app.events.domain_events import UserUpdatedEvent
+from app.events.publisher import publish_event
+from app.models import User
+from app.repositories.user import UserRepository
+from app.services.clerk_service import clerk_service
+from app.services.user_cache import load_user, user_cache
+
+
+@pytest_asyncio.fixture
+async def cached_user(test_engine):
+    """Insert a user and remove it and its snapshot afterwards."""
+    async with db_manager.session() as session:
+        session.add(User(
+            id="user_cache",
+            email="user_cache@example.com",
+            name="Cached User",
+            updated_at=datetime.utcnow(),
+        ))
+    await user_cache.clear()
+    
+    yield "user_cache"
+    
+    await user_cache.clear()
+    async with db_manager.session() as session:
+        await session.execute(delete(User).where(User.id == "user_cache"))
+
+
+def count_queries(engine):
+    """Count statements executed on an engine."""
+    statements = []
+    event.listen(
+        engine.sync_engine,
+        "before_cursor_execute",
+        lambda *args: statements.append(args[2])
+    )
+    return statements
+
+
+class TestUserSnapshotCache:
+    """Test cases for the user snapshot cache."""
+    
+    @pytest.mark.asyncio
+    async def test_cached_users_load_without_queries(self, cached_user):
+        """Once cached, a user is loaded into a session without querying."""
+        async with db_manager.session() as session:
+            await load_user(session, cached_user)
+        
+        statements = count_queries(db_manager.engine)
+        async with db_manager.session() as session:
+            user = await load_user(session, cached_user)
+            
+            assert user.email == "user_cache@example.com"
+            assert user in session
+        assert statements == []
+    
+    @pytest.mark.asyncio
+    async def test_reads_get_independent_copies(self, cached_user):
+        """Changes to a loaded user don't leak into other requests."""
+        async with db_manager.session() as session:
+            user = await load_user(session, cached_user)
+            user.name = "Changed"
+            await session.rollback()
+        
+        async with db_manager.session() as session:
+            assert (await load_user(session, cached_user)).name == "Cached User"
+    
+    @pytest.mark.asyncio
+    async def test_user_events_invalidate_snapshot(self, cached_user):
+        """A published user update drops the cached snapshot."""
+        async with db_manager.session() as session:
+            await load_user(session, cached_user)
+            user = await session.get(User, cached_user)
+            user.name = "Renamed"
+        
+        await publish_event(UserUpdatedEvent(user_id=cached_user, updated_fields=["name"]))
+        
+        assert await user_cache.get(cached_user) is None
+        async with db_manager.session() as session:
+            assert (await load_user(session, cached_user)).name == "Renamed"
+    
+    @pytest.mark.asyncio
+    async def test_missing_users_are_not_cached(self, cached_user):
+        """Unknown user IDs are looked up again."""
+        async with db_manager.session() as session:
+            assert await load_user(session, "user_missing") is None
+        
+        assert await user_cache.get("user_missing") is None
+    
+    @pytest.mark.asyncio
+    async def test_clerk_requests_authenticate_without_queries(self, cached_user, monkeypatch):
+        """Repeated Clerk-authenticated requests find their user without querying."""
+        async with db_manager.session() as session:
+            user = await session.get(User, cached_user)
+            user.clerk_id = "clerk_cached"
+        
+        async def verify_token(token):
+            return {"sub": "clerk_cached"}
+        
+        async def claim_profile_sync(clerk_id):
+            return False
+        
+        monkeypatch.setattr(clerk_service, "verify_token", verify_token)
+        monkeypatch.setattr(clerk_service, "claim_profile_sync", claim_profile_sync)
+        
+        async def authenticate():
+            async with db_manager.session() as session:
+                request = Request({"type": "http", "headers": []})
+                return await get_current_user_optional(
+                    request, "Bearer clerk-session", session, UserRepository()
+                )
+        
+        assert (await authenticate()).id == cached_user
+        statements = count_queries(db_manager.engine)
+        assert (await authenticate()).id == cached_user
+        assert statements == []
+        
+        # A changed Clerk ID drops the mapping
+        await publish_event(UserUpdatedEvent(user_id=cached_user, updated_fields=["clerk_id"]))
+        assert await user_cache.get_user_id("clerk_cached") is None
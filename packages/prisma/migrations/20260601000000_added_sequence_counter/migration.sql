@@ -0,0 +1,9 @@
+-- CreateTable
+CREATE TABLE "SequenceCounter" (
+    "scope" TEXT NOT NULL,
+    "period" TEXT NOT NULL,
+    "value" INTEGER NOT NULL DEFAULT 0,
+    "updatedAt" TIMESTAMP(3) NOT NULL DEFAULT CURRENT_TIMESTAMP,
+
+    CONSTRAINT "SequenceCounter_pkey" PRIMARY KEY ("scope","period")
+);
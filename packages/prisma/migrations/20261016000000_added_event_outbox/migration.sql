@@ -0,0 +1,36 @@
+-- DropForeignKey
+ALTER TABLE "PaymentEvent" DROP CONSTRAINT "PaymentEvent_paymentOrderId_fkey";
+
+-- DropIndex
+DROP INDEX "PaymentEvent_paymentOrderId_sequenceNumber_key";
+
+-- AlterTable
+ALTER TABLE "PaymentEvent" ADD COLUMN     "aggregateId" TEXT,
+ADD COLUMN     "aggregateType" TEXT,
+ADD COLUMN     "eventId" TEXT,
+ADD COLUMN     "publishedAt" TIMESTAMP(3),
+ALTER COLUMN "paymentOrderId" DROP NOT NULL;
+
+-- Backfill: existing events are payment order events that were already published
+UPDATE "PaymentEvent"
+SET "aggregateType" = 'payment_order',
+    "aggregateId" = "paymentOrderId",
+    "eventId" = "id",
+    "publishedAt" = "occurredAt";
+
+-- AlterTable
+ALTER TABLE "PaymentEvent" ALTER COLUMN "aggregateId" SET NOT NULL,
+ALTER COLUMN "aggregateType" SET NOT NULL,
+ALTER COLUMN "eventId" SET NOT NULL;
+
+-- CreateIndex
+CREATE UNIQUE INDEX "PaymentEvent_eventId_key" ON "PaymentEvent"("eventId");
+
+-- CreateIndex
+CREATE INDEX "PaymentEvent_publishedAt_occurredAt_idx" ON "PaymentEvent"("publishedAt", "occurredAt");
+
+-- CreateIndex
+CREATE UNIQUE INDEX "PaymentEvent_aggregateType_aggregateId_sequenceNumber_key" ON "PaymentEvent"("aggregateType", "aggregateId", "sequenceNumber");
+
+-- AddForeignKey
+ALTER TABLE "PaymentEvent" ADD CONSTRAINT "PaymentEvent_paymentOrderId_fkey" FOREIGN KEY ("paymentOrderId") REFERENCES "PaymentOrder"("id") ON DELETE SET NULL ON UPDATE CASCADE;
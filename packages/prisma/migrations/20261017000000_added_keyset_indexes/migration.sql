@@ -0,0 +1,11 @@
+-- CreateIndex
+CREATE INDEX "Customer_organizationId_createdAt_id_idx" ON "Customer"("organizationId", "createdAt" DESC, "id" DESC);
+
+-- CreateIndex
+CREATE INDEX "Product_organizationId_createdAt_id_idx" ON "Product"("organizationId", "createdAt" DESC, "id" DESC);
+
+-- CreateIndex
+CREATE INDEX "PaymentLink_organizationId_createdAt_id_idx" ON "PaymentLink"("organizationId", "createdAt" DESC, "id" DESC);
+
+-- CreateIndex
+CREATE INDEX "PaymentOrder_organizationId_createdAt_id_idx" ON "PaymentOrder"("organizationId", "createdAt" DESC, "id" DESC);
@@ -180,7 +180,11 @@ class PrismaSchemaParser:
         if line.startswith('@@index'):
             index_match = re.search(r'@@index\(\[([^\]]+)\]\)', line)
             if index_match:
-                fields = [f.strip() for f in index_match.group(1).split(',')]
+                # Descending fields, e.g. createdAt(sort: Desc), are kept as "createdAt DESC"
+                fields = [
+                    re.sub(r'\(sort:\s*Desc\)', ' DESC', re.sub(r'\(sort:\s*Asc\)', '', f.strip()))
+                    for f in index_match.group(1).split(',')
+                ]
                 model.indexes.append(fields)
         elif line.startswith('@@unique'):
             unique_match = re.search(r'@@unique\(\[([^\]]+)\]\)', line)
@@ -254,7 +258,9 @@ class SQLAlchemyGenerator:
         # Base class
         output.append('class Base(DeclarativeBase):')
         output.append('    """Base class for all models"""')
-        output.append('    pass')
+        output.append('    # Fetch server-generated columns with RETURNING as part of each INSERT')
+        output.append("    # and UPDATE, so repositories don't need a refresh() SELECT after flushing")
+        output.append('    __mapper_args__ = {"eager_defaults": True}')
         output.append('')
         output.append('')
         
@@ -281,6 +287,8 @@ class SQLAlchemyGenerator:
         self.imports.add('Table')
         self.imports.add('Index')
         self.imports.add('UniqueConstraint')
+        if any(f.endswith(' DESC') for model in self.models.values() for idx in model.indexes for f in idx):
+            self.imports.add('text')
         
         # Check for specific types
         for model in self.models.values():
@@ -500,8 +508,9 @@ class SQLAlchemyGenerator:
         # Composite indexes
         for idx_fields in model.indexes:
             if len(idx_fields) > 1:
-                fields_str = ', '.join(f'"{self._to_snake_case(f)}"' for f in idx_fields)
-                args.append(f'Index("idx_{model.name.lower()}_{"_".join(idx_fields)}", {fields_str})')
+                fields_str = ', '.join(self._index_column(f) for f in idx_fields)
+                names = [f.split(' ')[0] for f in idx_fields]
+                args.append(f'Index("idx_{model.name.lower()}_{"_".join(names)}", {fields_str})')
         
         # Unique constraints
         for unique_fields in model.unique_constraints:
@@ -510,6 +519,12 @@ class SQLAlchemyGenerator:
         
         return args
     
+    def _index_column(self, index_field: str) -> str:
+        """Render an index field as a column name or a descending expression"""
+        if index_field.endswith(' DESC'):
+            return f'text("{self._to_snake_case(index_field[:-5])} DESC")'
+        return f'"{self._to_snake_case(index_field)}"'
+    
     def _to_snake_case(self, name: str) -> str:
         """Convert PascalCase/camelCase to snake_case"""
         # Insert underscore before uppercase letters